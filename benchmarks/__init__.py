@@ -0,0 +1,30 @@
+"""Synthetic-corpus benchmarks for JayBrain's hot paths.
+
+The unit tests prove correctness on a handful of rows; this package answers
+how recall, deep_recall, consolidation clustering, SignalForge story
+clustering and the Forge study queue behave at 10k, 100k or 1M rows.
+
+Usage (from the repository root):
+    python -m benchmarks run --scale 10k --stub-embedder --out base.json
+    python -m benchmarks run --scale 100k --scenarios recall,forge_study_queue
+    python -m benchmarks compare base.json new.json --threshold 0.2
+    python -m benchmarks soak --duration 60 --mix mcp=3,daemon=1,session_hook=3
+    python -m benchmarks plans
+    python -m benchmarks fts --rows 20000
+
+The plans subcommand (benchmarks.query_plans) explains every literal SQL
+statement in the package and scripts and fails on new full scans of large
+tables, suggesting an index for each. The fts subcommand
+(benchmarks.fts_report) compares FTS5 index layouts on size and write rate.
+
+The soak subcommand (benchmarks.soak) is separate: it spawns the MCP
+server, daemon, hook, Telegram and watchdog write mixes as concurrent
+processes against one database to measure lock contention.
+
+Corpora are generated deterministically from --seed into a scratch data
+directory, so two runs at the same scale and seed see identical data.
+"""
+
+from .runner import compare, run_benchmarks
+
+__all__ = ["compare", "run_benchmarks"]
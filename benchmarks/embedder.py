@@ -0,0 +1,105 @@
+"""Deterministic offline embedder with a topic-structured vector space.
+
+Real MiniLM embeddings are not uniformly spread: texts about the same
+subject sit close together and everything shares a common direction. The
+stub reproduces that shape without the model download. Every topic gets a
+fixed centroid mixed with a shared background direction; samples are the
+centroid plus Gaussian noise, renormalized. Any text containing a
+``topic-<k>`` token embeds near centroid k, so queries built by the
+generators land among the documents they were written for.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from contextlib import contextmanager
+from typing import Iterator
+
+import numpy as np
+
+from jaybrain.config import EMBEDDING_DIM
+
+_TOPIC_RE = re.compile(r"\btopic-(\d+)\b")
+
+# Modules that bind embed_text at import time and so need patching directly.
+_EMBED_MODULES = (
+    "jaybrain.search",
+    "jaybrain.memory",
+    "jaybrain.knowledge",
+    "jaybrain.deep_recall",
+    "jaybrain.consolidation",
+)
+
+
+def _text_seed(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-9)
+
+
+class StubEmbedder:
+    """Seeded stand-in for search.embed_text.
+
+    ``noise`` is the per-sample noise norm used for query embeddings. Two
+    samples of one topic with noise s have expected cosine ~1/(1+s^2).
+    """
+
+    def __init__(self, seed: int = 0, dim: int = EMBEDDING_DIM,
+                 background: float = 0.35, noise: float = 0.6):
+        self.seed = seed
+        self.dim = dim
+        self.noise = noise
+        rng = np.random.default_rng([seed, 0])
+        self._background = background * _normalize(rng.standard_normal(dim))
+        self._centroids: dict[int, np.ndarray] = {}
+
+    def centroid(self, topic: int) -> np.ndarray:
+        vec = self._centroids.get(topic)
+        if vec is None:
+            rng = np.random.default_rng([self.seed, 1, topic])
+            vec = _normalize(self._background + _normalize(rng.standard_normal(self.dim)))
+            vec = vec.astype(np.float32)
+            self._centroids[topic] = vec
+        return vec
+
+    def centroids(self, topics: np.ndarray) -> np.ndarray:
+        return np.stack([self.centroid(int(t)) for t in topics])
+
+    def sample(self, anchors: np.ndarray, noise: float,
+               rng: np.random.Generator) -> np.ndarray:
+        """Draw one unit vector around each row of ``anchors`` (float32)."""
+        jitter = rng.standard_normal(anchors.shape).astype(np.float32)
+        jitter *= noise / np.sqrt(self.dim)
+        return _normalize(anchors + jitter).astype(np.float32)
+
+    def embed(self, text: str) -> list[float]:
+        rng = np.random.default_rng([self.seed, 2, _text_seed(text)])
+        match = _TOPIC_RE.search(text)
+        if match is None:
+            anchor = _normalize(self._background + _normalize(rng.standard_normal(self.dim)))
+            return anchor.astype(np.float32).tolist()
+        anchor = self.centroid(int(match.group(1)))[None, :]
+        return self.sample(anchor, self.noise, rng)[0].tolist()
+
+    __call__ = embed
+
+
+@contextmanager
+def installed(embedder: StubEmbedder) -> Iterator[StubEmbedder]:
+    """Route every embed_text call site through ``embedder`` for the block."""
+    import importlib
+
+    saved = []
+    for name in _EMBED_MODULES:
+        module = importlib.import_module(name)
+        saved.append((module, module.embed_text))
+        module.embed_text = embedder.embed
+    try:
+        yield embedder
+    finally:
+        for module, original in saved:
+            module.embed_text = original
@@ -0,0 +1,182 @@
+"""Size and write cost of the FTS5 index layouts, on the knowledge table.
+
+Builds one scratch database per variant, inserts the same synthetic
+articles into each, then updates a non-text column (as access counters and
+status changes do) on every row:
+
+- standalone: the FTS table keeps its own copy of the text and the update
+  trigger fires on any column, the layout before external content.
+- external_wide: external-content index, update trigger on any column.
+- external: external-content index, update trigger only on indexed
+  columns (the current schema).
+- external_column: as external, with detail=column (see FTS_DETAIL).
+
+Reports file size, index size (dbstat, where available) and rows/s for the
+inserts and the non-text updates.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from jaybrain.db import FTS_TABLES, fts_create_sql, fts_trigger_sql
+
+from .generators import _sentence, vocabulary, zipf_weights
+
+FTS = "knowledge_fts"
+VARIANTS = ("standalone", "external_wide", "external", "external_column")
+BATCH_ROWS = 500
+TOPICS = 200
+
+_TABLE_SQL = """
+CREATE TABLE knowledge (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    tags TEXT NOT NULL DEFAULT '[]',
+    access_count INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def _standalone_sql() -> str:
+    _, cols = FTS_TABLES[FTS]
+    col_list = ", ".join(cols)
+    new = ", ".join(f"new.{c}" for c in cols)
+    return f"""
+CREATE VIRTUAL TABLE {FTS} USING fts5({col_list});
+CREATE TRIGGER knowledge_ai AFTER INSERT ON knowledge BEGIN
+    INSERT INTO {FTS}(rowid, {col_list}) VALUES (new.rowid, {new});
+END;
+CREATE TRIGGER knowledge_ad AFTER DELETE ON knowledge BEGIN
+    DELETE FROM {FTS} WHERE rowid = old.rowid;
+END;
+CREATE TRIGGER knowledge_au AFTER UPDATE ON knowledge BEGIN
+    DELETE FROM {FTS} WHERE rowid = old.rowid;
+    INSERT INTO {FTS}(rowid, {col_list}) VALUES (new.rowid, {new});
+END;
+"""
+
+
+def variant_sql(variant: str) -> str:
+    """Schema for one variant: the knowledge table plus its index and triggers."""
+    if variant == "standalone":
+        return _TABLE_SQL + _standalone_sql()
+    detail = "column" if variant == "external_column" else "full"
+    triggers = fts_trigger_sql(FTS)
+    if variant == "external_wide":
+        triggers = triggers.replace("AFTER UPDATE OF title, content, tags ON", "AFTER UPDATE ON")
+    return _TABLE_SQL + fts_create_sql(FTS, detail=detail) + ";" + triggers
+
+
+def articles(n: int, seed: int = 0) -> list[tuple]:
+    """``n`` deterministic knowledge rows written in per-topic vocabularies."""
+    rng = np.random.default_rng([seed, 50])
+    vocab = np.array(vocabulary(seed))
+    topics = rng.choice(TOPICS, size=n, p=zipf_weights(TOPICS))
+    rows = []
+    for i, topic in enumerate(topics):
+        words = vocab[np.random.default_rng([seed, 4, int(topic)]).choice(len(vocab), 40, replace=False)]
+        title = _sentence(rng, int(topic), words, vocab, 6)
+        content = " ".join(
+            _sentence(rng, int(topic), words, vocab, int(rng.integers(12, 30)))
+            for _ in range(int(rng.integers(4, 12)))
+        )
+        tags = f'["topic-{topic}", "{words[0]}"]'
+        rows.append((f"k{i:07d}", title, content, tags))
+    return rows
+
+
+def _fts_bytes(conn: sqlite3.Connection) -> Optional[int]:
+    try:
+        return conn.execute(
+            "SELECT COALESCE(SUM(pgsize), 0) FROM dbstat WHERE name LIKE ?", (f"{FTS}_%",),
+        ).fetchone()[0]
+    except sqlite3.OperationalError:
+        return None
+
+
+def _phrase_queries(conn: sqlite3.Connection) -> bool:
+    try:
+        conn.execute(f"SELECT rowid FROM {FTS} WHERE {FTS} MATCH '\"topic 1\"' LIMIT 1").fetchall()
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def measure_variant(variant: str, rows: list[tuple], path: Path) -> dict:
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(variant_sql(variant))
+        start = time.perf_counter()
+        for i in range(0, len(rows), BATCH_ROWS):
+            conn.executemany(
+                "INSERT INTO knowledge (id, title, content, tags) VALUES (?, ?, ?, ?)",
+                rows[i:i + BATCH_ROWS],
+            )
+            conn.commit()
+        insert_s = time.perf_counter() - start
+
+        ids = [(r[0],) for r in rows]
+        start = time.perf_counter()
+        for i in range(0, len(ids), BATCH_ROWS):
+            conn.executemany(
+                "UPDATE knowledge SET access_count = access_count + 1 WHERE id = ?",
+                ids[i:i + BATCH_ROWS],
+            )
+            conn.commit()
+        update_s = time.perf_counter() - start
+
+        conn.execute(f"INSERT INTO {FTS}({FTS}) VALUES ('optimize')")
+        conn.commit()
+        conn.execute("VACUUM")
+        return {
+            "db_bytes": path.stat().st_size,
+            "fts_bytes": _fts_bytes(conn),
+            "insert_rows_per_s": round(len(rows) / insert_s, 1),
+            "update_rows_per_s": round(len(rows) / update_s, 1),
+            "phrase_queries": _phrase_queries(conn),
+        }
+    finally:
+        conn.close()
+
+
+def fts_report(rows: int = 5000, seed: int = 0, variants: Optional[list[str]] = None,
+               data_dir: Optional[Path] = None) -> dict:
+    unknown = set(variants or ()) - set(VARIANTS)
+    if unknown:
+        raise ValueError(f"Unknown variant(s): {', '.join(sorted(unknown))}")
+    corpus = articles(rows, seed)
+    with contextlib.ExitStack() as stack:
+        if data_dir is None:
+            data_dir = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="jaybrain-fts-")))
+        data_dir.mkdir(parents=True, exist_ok=True)
+        results = {}
+        for variant in variants or VARIANTS:
+            path = data_dir / f"{variant}.db"
+            path.unlink(missing_ok=True)
+            results[variant] = measure_variant(variant, corpus, path)
+    return {"rows": rows, "seed": seed, "sqlite": sqlite3.sqlite_version, "variants": results}
+
+
+def print_report(report: dict) -> None:
+    print(f"{report['rows']} knowledge rows, SQLite {report['sqlite']}")
+    print(f"{'variant':<18}{'db MB':>9}{'fts MB':>9}{'insert/s':>11}{'update/s':>11}  phrases")
+    base = report["variants"].get("standalone")
+    for name, v in report["variants"].items():
+        fts = "-" if v["fts_bytes"] is None else f"{v['fts_bytes'] / 1e6:.2f}"
+        print(f"{name:<18}{v['db_bytes'] / 1e6:>9.2f}{fts:>9}"
+              f"{v['insert_rows_per_s']:>11.0f}{v['update_rows_per_s']:>11.0f}"
+              f"  {'yes' if v['phrase_queries'] else 'no'}")
+    if base:
+        for name, v in report["variants"].items():
+            if name != "standalone":
+                print(f"{name}: {v['db_bytes'] / base['db_bytes']:.0%} of standalone size, "
+                      f"{v['update_rows_per_s'] / base['update_rows_per_s']:.1f}x update rate")
@@ -0,0 +1,378 @@
+"""Deterministic synthetic corpora for the benchmark scenarios.
+
+Each generator writes straight into the live schema with batched
+executemany calls (the db.insert_* helpers commit per row, which would
+dominate setup at 1M rows) and fills the same columns those helpers do,
+including the vec0 tables; FTS indexes follow via the schema triggers.
+
+Shapes are chosen to look like a real install rather than uniform noise:
+
+- memories: Zipf topic popularity, ~5% near-duplicates, exponential age
+  spread, skewed importance and access counts;
+- news: articles grouped into stories (singletons plus geometric bursts)
+  across ~24 feeds, spread over 30 days so only the newest slice falls in
+  the SignalForge clustering window;
+- forge: subjects with weighted objectives, concepts linked to one or two
+  objectives, and review histories that drive mastery and due dates.
+
+Embeddings always come from the StubEmbedder's vector space, whether or
+not queries are embedded with the stub or the real model.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from .embedder import StubEmbedder
+
+BATCH_SIZE = 5000
+
+MEMORY_CATEGORIES = ["semantic", "episodic", "procedural", "decision", "preference"]
+MEMORY_CATEGORY_WEIGHTS = [0.45, 0.25, 0.12, 0.1, 0.08]
+MEMORY_NOISE = 0.9
+DUPLICATE_RATE = 0.05
+DUPLICATE_NOISE = 0.15
+
+NEWS_SOURCES = [f"feed-{i:02d}" for i in range(24)]
+NEWS_SPAN_DAYS = 30
+STORY_NOISE = 0.7
+ARTICLE_NOISE = 0.35
+
+REVIEW_OUTCOMES = ["understood", "reviewed", "struggled", "skipped"]
+REVIEW_OUTCOME_WEIGHTS = [0.45, 0.3, 0.2, 0.05]
+OBJECTIVES_PER_SUBJECT = 24
+
+_SYLLABLES = [
+    "ka", "lo", "mi", "nu", "ra", "te", "vo", "zi", "an", "el", "or", "us",
+    "pri", "sto", "gra", "fen", "dul", "mar", "sek", "tor", "qua", "bel",
+]
+
+
+def vocabulary(seed: int, size: int = 4000) -> list[str]:
+    """Pronounceable pseudo-words, stable for a given seed."""
+    rng = np.random.default_rng([seed, 3])
+    words: dict[str, None] = {}
+    while len(words) < size:
+        parts = rng.choice(_SYLLABLES, size=int(rng.integers(2, 4)))
+        words["".join(parts)] = None
+    return list(words)
+
+
+def topic_words(seed: int, topic: int, vocab: list[str], k: int = 40) -> list[str]:
+    """The words a topic's documents are written in."""
+    rng = np.random.default_rng([seed, 4, topic])
+    return [vocab[i] for i in rng.choice(len(vocab), size=k, replace=False)]
+
+
+def topic_query(seed: int, topic: int, vocab: list[str], i: int) -> str:
+    """A short query that should hit documents of ``topic``."""
+    words = topic_words(seed, topic, vocab)
+    return f"topic-{topic} {words[i % len(words)]} {words[(i * 7 + 3) % len(words)]}"
+
+
+def _word_lookup(seed: int, vocab: list[str]):
+    cache: dict[int, np.ndarray] = {}
+
+    def lookup(topic: int) -> np.ndarray:
+        words = cache.get(topic)
+        if words is None:
+            words = cache[topic] = np.array(topic_words(seed, topic, vocab))
+        return words
+
+    return lookup
+
+
+def zipf_weights(n: int, exponent: float = 1.1) -> np.ndarray:
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+def _sentence(rng: np.random.Generator, topic: int, words: np.ndarray,
+              filler: np.ndarray, length: int) -> str:
+    own = words[rng.integers(len(words), size=length - length // 3)]
+    other = filler[rng.integers(len(filler), size=length // 3)]
+    body = np.concatenate([own, other])
+    rng.shuffle(body)
+    return f"topic-{topic} " + " ".join(body)
+
+
+def _iso(ts: datetime) -> str:
+    return ts.isoformat()
+
+
+def generate_memories(conn, n: int, seed: int, embedder: StubEmbedder,
+                      now: datetime | None = None) -> dict:
+    """Insert ``n`` memories with embeddings. Returns corpus facts."""
+    now = now or datetime.now(timezone.utc)
+    rng = np.random.default_rng([seed, 10])
+    vocab = vocabulary(seed)
+    filler = np.array(vocab)
+    n_topics = max(8, int(np.sqrt(n)))
+    weights = zipf_weights(n_topics)
+    words_for = _word_lookup(seed, vocab)
+    duplicates = 0
+
+    for start in range(0, n, BATCH_SIZE):
+        m = min(BATCH_SIZE, n - start)
+        topics = rng.choice(n_topics, size=m, p=weights)
+        is_dup = rng.random(m) < DUPLICATE_RATE
+        is_dup[0] = False
+        vectors = embedder.sample(embedder.centroids(topics), MEMORY_NOISE, rng)
+        categories = rng.choice(MEMORY_CATEGORIES, size=m, p=MEMORY_CATEGORY_WEIGHTS)
+        importance = np.round(rng.beta(2.0, 3.0, size=m), 3)
+        age_days = np.minimum(rng.exponential(120.0, size=m), 1095.0)
+        access = rng.negative_binomial(1, 0.3, size=m)
+        lengths = rng.integers(8, 30, size=m)
+
+        memory_rows, vec_rows = [], []
+        content = ""
+        for j in range(m):
+            if is_dup[j]:
+                # Restate the previous memory with one word changed.
+                topics[j] = topics[j - 1]
+                vectors[j] = embedder.sample(vectors[j - 1][None, :], DUPLICATE_NOISE, rng)[0]
+                tokens = content.split()
+                tokens[int(rng.integers(1, len(tokens)))] = str(filler[rng.integers(len(filler))])
+                content = " ".join(tokens)
+                duplicates += 1
+            else:
+                content = _sentence(rng, int(topics[j]), words_for(int(topics[j])),
+                                    filler, int(lengths[j]))
+            created = now - timedelta(days=float(age_days[j]))
+            accessed = (
+                _iso(created + (now - created) * float(rng.random()))
+                if access[j] else None
+            )
+            memory_id = f"bm{start + j:010d}"
+            memory_rows.append((
+                memory_id, content, str(categories[j]),
+                json.dumps([f"topic-{topics[j]}"]), float(importance[j]),
+                int(access[j]), accessed, _iso(created), _iso(created),
+            ))
+            vec_rows.append((memory_id, vectors[j].tobytes()))
+
+        conn.executemany(
+            """INSERT INTO memories (id, content, category, tags, importance,
+                access_count, last_accessed, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            memory_rows,
+        )
+        conn.executemany("INSERT INTO memories_vec (id, embedding) VALUES (?, ?)", vec_rows)
+        conn.commit()
+
+    return {"rows": n, "topics": n_topics, "duplicates": duplicates}
+
+
+def _story_sizes(rng: np.random.Generator, n: int) -> list[int]:
+    sizes: list[int] = []
+    total = 0
+    while total < n:
+        size = 1 if rng.random() < 0.4 else min(int(rng.geometric(0.25)) + 1, 30)
+        size = min(size, n - total)
+        sizes.append(size)
+        total += size
+    return sizes
+
+
+def generate_news(conn, n: int, seed: int, embedder: StubEmbedder,
+                  now: datetime | None = None) -> dict:
+    """Insert ``n`` feed articles as knowledge + SignalForge rows."""
+    now = now or datetime.now(timezone.utc)
+    rng = np.random.default_rng([seed, 20])
+    vocab = vocabulary(seed)
+    filler = np.array(vocab)
+    n_topics = max(8, int(np.sqrt(n) / 2))
+    weights = zipf_weights(n_topics)
+    words_for = _word_lookup(seed, vocab)
+    sizes = _story_sizes(rng, n)
+    story_topics = rng.choice(n_topics, size=len(sizes), p=weights)
+    story_anchors = embedder.sample(embedder.centroids(story_topics), STORY_NOISE, rng)
+    story_starts = rng.random(len(sizes)) * NEWS_SPAN_DAYS
+
+    created = _iso(now - timedelta(days=NEWS_SPAN_DAYS))
+    conn.executemany(
+        """INSERT INTO news_feed_sources (id, name, url, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?)""",
+        [(s, s, f"https://{s}.example/rss", created, created) for s in NEWS_SOURCES],
+    )
+
+    knowledge_rows, vec_rows, sf_rows, feed_rows = [], [], [], []
+    article = 0
+
+    def flush():
+        conn.executemany(
+            """INSERT INTO knowledge (id, title, content, category, tags, source,
+                created_at, updated_at)
+            VALUES (?, ?, ?, 'news_feed', ?, ?, ?, ?)""",
+            knowledge_rows,
+        )
+        conn.executemany("INSERT INTO knowledge_vec (id, embedding) VALUES (?, ?)", vec_rows)
+        conn.executemany(
+            """INSERT INTO signalforge_articles (id, knowledge_id, resolved_url,
+                word_count, char_count, fetch_status, fetched_at, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            sf_rows,
+        )
+        conn.executemany(
+            """INSERT INTO news_feed_articles (source_id, source_article_id,
+                knowledge_id, title, url, published_at, fetched_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            feed_rows,
+        )
+        conn.commit()
+        for rows in (knowledge_rows, vec_rows, sf_rows, feed_rows):
+            rows.clear()
+
+    for story, size in enumerate(sizes):
+        topic = int(story_topics[story])
+        words = words_for(topic)
+        headline = " ".join(rng.choice(words, size=4))
+        vectors = embedder.sample(np.repeat(story_anchors[story][None, :], size, 0),
+                                  ARTICLE_NOISE, rng)
+        for j in range(size):
+            kid = f"bk{article:010d}"
+            source = NEWS_SOURCES[int(rng.integers(len(NEWS_SOURCES)))]
+            age = max(story_starts[story] - rng.exponential(0.25), 0.0)
+            created = _iso(now - timedelta(days=float(age)))
+            title = f"topic-{topic} {headline} {filler[rng.integers(len(filler))]}"
+            content = _sentence(rng, topic, words, filler, int(rng.integers(40, 120)))
+            url = f"https://{source}.example/{story}/{article}"
+            status = rng.choice(["fetched", "failed", "pending"], p=[0.9, 0.05, 0.05])
+            knowledge_rows.append((
+                kid, title, content, json.dumps([f"topic-{topic}", source]),
+                source, created, created,
+            ))
+            vec_rows.append((kid, vectors[j].tobytes()))
+            sf_rows.append((
+                f"bs{article:010d}", kid, url, len(content.split()), len(content),
+                str(status), created if status == "fetched" else None, created, created,
+            ))
+            feed_rows.append((source, str(article), kid, title, url, created, created))
+            article += 1
+        if len(knowledge_rows) >= BATCH_SIZE:
+            flush()
+    if knowledge_rows:
+        flush()
+
+    return {"rows": n, "topics": n_topics, "stories": len(sizes),
+            "multi_article_stories": sum(1 for s in sizes if s > 1)}
+
+
+def generate_forge(conn, n: int, seed: int, embedder: StubEmbedder,
+                   now: datetime | None = None) -> dict:
+    """Insert about ``n`` Forge reviews over ``n // 4`` concepts.
+
+    Reviews are the table that grows without bound, so scale is measured
+    in review rows.
+    """
+    now = now or datetime.now(timezone.utc)
+    rng = np.random.default_rng([seed, 30])
+    vocab = vocabulary(seed)
+    n_concepts = max(50, n // 4)
+    n_subjects = min(20, max(1, n_concepts // 2500))
+    created = _iso(now - timedelta(days=365))
+
+    subject_ids = [f"bsub{i:03d}" for i in range(n_subjects)]
+    conn.executemany(
+        """INSERT INTO forge_subjects (id, name, short_name, description, pass_score,
+            total_questions, time_limit_minutes, created_at, updated_at)
+        VALUES (?, ?, ?, '', 0.75, 90, 90, ?, ?)""",
+        [(sid, f"Benchmark subject {i}", f"B{i}", created, created)
+         for i, sid in enumerate(subject_ids)],
+    )
+    objectives: dict[str, list[str]] = {}
+    objective_rows = []
+    for i, sid in enumerate(subject_ids):
+        weights = rng.dirichlet(np.ones(OBJECTIVES_PER_SUBJECT))
+        objectives[sid] = []
+        for j in range(OBJECTIVES_PER_SUBJECT):
+            oid = f"bobj{i:03d}{j:03d}"
+            objectives[sid].append(oid)
+            objective_rows.append((
+                oid, sid, f"{j // 5 + 1}.{j % 5 + 1}", f"Objective {i}.{j}",
+                f"Domain {j // 5 + 1}", round(float(weights[j]), 4), created,
+            ))
+    conn.executemany(
+        """INSERT INTO forge_objectives (id, subject_id, code, title, domain,
+            exam_weight, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        objective_rows,
+    )
+    conn.commit()
+
+    n_topics = max(8, int(np.sqrt(n_concepts)))
+    words_for = _word_lookup(seed, vocab)
+    reviews = 0
+    for start in range(0, n_concepts, BATCH_SIZE):
+        m = min(BATCH_SIZE, n_concepts - start)
+        topics = rng.integers(n_topics, size=m)
+        vectors = embedder.sample(embedder.centroids(topics), MEMORY_NOISE, rng)
+        subjects = rng.integers(n_subjects, size=m)
+        review_counts = rng.poisson(4.0, size=m)
+
+        concept_rows, vec_rows, link_rows, review_rows = [], [], [], []
+        for j in range(m):
+            cid = f"bc{start + j:010d}"
+            sid = subject_ids[int(subjects[j])]
+            words = words_for(int(topics[j]))
+            count = int(review_counts[j])
+            outcomes = rng.choice(REVIEW_OUTCOMES, size=count, p=REVIEW_OUTCOME_WEIGHTS)
+            days_ago = np.sort(rng.random(count) * 180.0)[::-1]
+            correct = 0
+            mastery = 0.0
+            for outcome, ago in zip(outcomes, days_ago):
+                was_correct = outcome == "understood"
+                correct += was_correct
+                mastery = min(1.0, max(0.0, mastery + (0.15 if was_correct else -0.05)))
+                review_rows.append((
+                    cid, str(outcome), int(rng.integers(1, 6)), int(rng.integers(10, 300)),
+                    _iso(now - timedelta(days=float(ago))), int(was_correct), sid,
+                ))
+            last = _iso(now - timedelta(days=float(days_ago[-1]))) if count else None
+            next_review = (
+                _iso(now + timedelta(days=float(rng.normal(2.0, 6.0)))) if count else None
+            )
+            concept_rows.append((
+                cid, f"topic-{topics[j]} {words[0]} {words[j % len(words)]}",
+                " ".join(rng.choice(words, size=20)), "security",
+                str(rng.choice(["beginner", "intermediate", "advanced"])),
+                json.dumps([f"topic-{topics[j]}"]), round(mastery, 3), count, correct,
+                last, next_review, sid, created, last or created,
+            ))
+            vec_rows.append((cid, vectors[j].tobytes()))
+            for oid in rng.choice(objectives[sid], size=int(rng.integers(1, 3)), replace=False):
+                link_rows.append((cid, str(oid)))
+            reviews += count
+
+        conn.executemany(
+            """INSERT INTO forge_concepts (id, term, definition, category, difficulty,
+                tags, mastery_level, review_count, correct_count, last_reviewed,
+                next_review, subject_id, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            concept_rows,
+        )
+        conn.executemany("INSERT INTO forge_concepts_vec (id, embedding) VALUES (?, ?)", vec_rows)
+        conn.executemany(
+            "INSERT INTO forge_concept_objectives (concept_id, objective_id) VALUES (?, ?)",
+            link_rows,
+        )
+        conn.executemany(
+            """INSERT INTO forge_reviews (concept_id, outcome, confidence,
+                time_spent_seconds, reviewed_at, was_correct, subject_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            review_rows,
+        )
+        conn.commit()
+
+    return {"rows": reviews, "concepts": n_concepts, "subjects": subject_ids,
+            "topics": n_topics}
+
+
+GENERATORS = {
+    "memories": generate_memories,
+    "news": generate_news,
+    "forge": generate_forge,
+}
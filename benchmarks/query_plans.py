@@ -0,0 +1,343 @@
+"""EXPLAIN QUERY PLAN regression check and missing-index advisor.
+
+Collects every SQL statement passed literally to ``.execute()`` /
+``.executemany()`` in src/jaybrain and scripts/ (f-string interpolations
+are rendered as a single ``?``, which covers the ``IN ({placeholders})``
+idiom), builds a scratch database with the full schema and asks SQLite
+for each statement's plan.
+
+A full ``SCAN`` of a table in LARGE_TABLES by a statement that filters,
+joins, groups or sorts is reported together with a suggested index.
+Known scans live in query_plan_baseline.json; anything not in it is a
+regression and makes ``python -m benchmarks plans`` exit 1. Refresh the
+baseline with ``--update-baseline`` after deciding a scan is acceptable.
+
+Statements that cannot be prepared on their own (dynamic table names,
+tables created at runtime elsewhere) are listed as skipped.
+"""
+
+from __future__ import annotations
+
+import ast
+import contextlib
+import hashlib
+import json
+import re
+import sqlite3
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from .runner import PROJECT_ROOT, _redirect_data
+
+SOURCE_DIRS = (PROJECT_ROOT / "src" / "jaybrain", PROJECT_ROOT / "scripts")
+BASELINE_PATH = Path(__file__).with_name("query_plan_baseline.json")
+
+# Tables that grow with use. Scans of the small config/state tables are fine.
+LARGE_TABLES = frozenset({
+    "applications", "claude_sessions", "consolidation_log",
+    "conversation_archive_sessions", "cram_reviews", "daemon_execution_log",
+    "daemon_lifecycle_log", "db_maintenance_log", "discovered_events",
+    "fact_history", "feedly_articles", "file_deletion_log", "forge_concepts",
+    "forge_reviews", "git_shadow_log", "graph_entities", "graph_relationships",
+    "heartbeat_log", "job_postings", "knowledge", "memories", "memory_archive",
+    "news_feed_articles", "perf_rollups", "session_activity_log", "sessions",
+    "signalforge_articles", "signalforge_cluster_articles",
+    "signalforge_clusters", "tasks", "telegram_messages", "telegram_send_log",
+    "trash_manifest", "watchdog_log",
+})
+
+_STATEMENT = re.compile(r"^\s*(SELECT|WITH|UPDATE|DELETE|INSERT|REPLACE)\b", re.I)
+_SELECTIVE = re.compile(r"\b(WHERE|ORDER\s+BY|GROUP\s+BY|ON)\b", re.I)
+_FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+_TABLE_REF = re.compile(
+    r"\b(?:FROM|JOIN|UPDATE|INTO)\s+(?:(?:main|ops)\.)?(\w+)"
+    r"(?:\s+(?:AS\s+)?(?!WHERE|ON|JOIN|LEFT|INNER|CROSS|ORDER|GROUP|LIMIT|SET|USING|VALUES)(\w+))?",
+    re.I,
+)
+_USES = re.compile(r"uses (\d+),")
+_NAMED = re.compile(r"(?<![:\w]):(\w+)")
+
+
+@dataclass
+class Query:
+    module: str
+    function: str
+    line: int
+    sql: str
+
+    @property
+    def normalized(self) -> str:
+        return " ".join(self.sql.split())
+
+    def key(self, table: str) -> str:
+        digest = hashlib.sha1(self.normalized.encode()).hexdigest()[:10]
+        return f"{self.module}:{self.function}:{table}:{digest}"
+
+
+@dataclass
+class Scan:
+    query: Query
+    table: str
+    detail: str
+    suggestion: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return self.query.key(self.table)
+
+
+@dataclass
+class PlanReport:
+    queries: int = 0
+    explained: int = 0
+    skipped: list[dict] = field(default_factory=list)
+    scans: list[Scan] = field(default_factory=list)
+    new: list[Scan] = field(default_factory=list)
+    fixed: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        def scan(s: Scan) -> dict:
+            return {"key": s.key, "line": s.query.line, "table": s.table,
+                    "sql": s.query.normalized, "suggestion": s.suggestion}
+
+        return {
+            "queries": self.queries,
+            "explained": self.explained,
+            "skipped": self.skipped,
+            "scans": [scan(s) for s in self.scans],
+            "new": [scan(s) for s in self.new],
+            "fixed": self.fixed,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Extraction
+# ---------------------------------------------------------------------------
+
+def _literal_sql(node: ast.AST) -> Optional[str]:
+    """SQL text of a str constant, f-string or concatenation of those."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.JoinedStr):
+        parts = []
+        for value in node.values:
+            if isinstance(value, ast.Constant):
+                parts.append(value.value)
+            else:
+                parts.append("?")
+        return "".join(parts)
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+        left, right = _literal_sql(node.left), _literal_sql(node.right)
+        if left is not None and right is not None:
+            return left + right
+    return None
+
+
+class _Collector(ast.NodeVisitor):
+    def __init__(self, module: str):
+        self.module = module
+        self.scope: list[str] = []
+        self.queries: list[Query] = []
+
+    def _visit_scope(self, node) -> None:
+        self.scope.append(node.name)
+        self.generic_visit(node)
+        self.scope.pop()
+
+    visit_FunctionDef = visit_AsyncFunctionDef = visit_ClassDef = _visit_scope
+
+    def visit_Call(self, node: ast.Call) -> None:
+        func = node.func
+        if isinstance(func, ast.Attribute) and func.attr in ("execute", "executemany") and node.args:
+            sql = _literal_sql(node.args[0])
+            if sql is not None and _STATEMENT.match(sql):
+                self.queries.append(Query(
+                    self.module, ".".join(self.scope) or "<module>", node.lineno, sql,
+                ))
+        self.generic_visit(node)
+
+
+def extract_queries(paths: Optional[list[Path]] = None) -> list[Query]:
+    """Literal DML/SELECT statements passed to execute() in ``paths``."""
+    if paths is None:
+        paths = [p for d in SOURCE_DIRS for p in sorted(d.glob("*.py"))]
+    queries = []
+    for path in paths:
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+        collector = _Collector(path.stem if path.parent.name == "jaybrain" else f"scripts/{path.stem}")
+        collector.visit(tree)
+        queries.extend(collector.queries)
+    return queries
+
+
+# ---------------------------------------------------------------------------
+# Planning
+# ---------------------------------------------------------------------------
+
+def explain(conn: sqlite3.Connection, sql: str) -> list[str]:
+    """Plan detail lines for ``sql``, binding NULL for every parameter."""
+    sql = "EXPLAIN QUERY PLAN " + sql
+    try:
+        rows = conn.execute(sql, ()).fetchall()
+    except sqlite3.ProgrammingError as e:
+        match = _USES.search(str(e))
+        if match:
+            rows = conn.execute(sql, (None,) * int(match.group(1))).fetchall()
+        elif "binding parameter :" in str(e):
+            rows = conn.execute(sql, dict.fromkeys(_NAMED.findall(sql))).fetchall()
+        else:
+            raise
+    return [row[3] for row in rows]
+
+
+def _aliases(sql: str) -> dict[str, str]:
+    """Map every table name and alias in ``sql`` to its table."""
+    out = {}
+    for table, alias in _TABLE_REF.findall(sql):
+        out[table] = table
+        if alias:
+            out[alias] = table
+    return out
+
+
+def suggest_index(sql: str, table: str, columns: set[str], alias: Optional[str] = None) -> Optional[str]:
+    """CREATE INDEX for the equality, range and ORDER BY columns of ``table``.
+
+    A text heuristic, not a planner: it reads ``col = ?`` / ``col IN``
+    terms first, then one range term, then ORDER BY columns, keeping only
+    columns that exist on ``table`` (qualified by ``alias`` when given).
+    """
+    qualifier = alias if alias and alias != table else table
+    # Qualified by this table's name/alias, or unqualified
+    col = rf"(?:\b{re.escape(qualifier)}\.|(?<![.\w]))(\w+)"
+    picked: list[str] = []
+
+    def add(name: str) -> None:
+        if name in columns and name not in picked:
+            picked.append(name)
+
+    where = re.split(r"\b(?:ORDER\s+BY|GROUP\s+BY|LIMIT)\b", sql, flags=re.I)[0]
+    if re.match(r"\s*UPDATE\b", where, re.I):
+        where = re.split(r"\bWHERE\b", where, maxsplit=1, flags=re.I)[-1]  # not SET
+    for name in re.findall(rf"{col}\s*(?:=\s*(?:\?|:|'|\d)|IN\s*\(|IS\s+NULL)", where, re.I):
+        add(name)
+    ranges = re.findall(rf"{col}\s*(?:[<>]=?\s*(?:\?|:|'|\d)|BETWEEN\b|IS\s+NOT\s+NULL)", where, re.I)
+    for name in ranges[:1]:
+        add(name)
+    order = re.search(r"\bORDER\s+BY\s+(.+?)(?:\bLIMIT\b|$)", sql, re.I | re.S)
+    if order:
+        for term in order.group(1).split(","):
+            match = re.match(rf"\s*{col}", term)
+            if match:
+                add(match.group(1))
+    if not picked:
+        return None
+    return (f"CREATE INDEX IF NOT EXISTS idx_{table}_{'_'.join(picked)} "
+            f"ON {table}({', '.join(picked)})")
+
+
+def _table_columns(conn: sqlite3.Connection) -> dict[str, set[str]]:
+    """Indexable columns per table (INTEGER PRIMARY KEY is the rowid already)."""
+    out = {}
+    for schema in ("main", "ops"):
+        for (name,) in conn.execute(f"SELECT name FROM {schema}.sqlite_master WHERE type = 'table'"):
+            out[name] = {
+                row[1] for row in conn.execute(f"PRAGMA {schema}.table_info('{name}')")
+                if not (row[5] and row[2].upper() == "INTEGER")
+            }
+    return out
+
+
+def find_scans(conn: sqlite3.Connection, queries: list[Query], report: PlanReport) -> None:
+    columns = _table_columns(conn)
+    for query in queries:
+        try:
+            details = explain(conn, query.sql)
+        except sqlite3.Error as e:
+            report.skipped.append({"where": f"{query.module}:{query.line}", "error": str(e)})
+            continue
+        report.explained += 1
+        if not _SELECTIVE.search(query.sql):
+            continue
+        names = _aliases(query.sql)
+        for detail in details:
+            match = _FULL_SCAN.match(detail)
+            if not match:
+                continue
+            name = match.group(1)
+            table = names.get(name, name)
+            if table not in LARGE_TABLES:
+                continue
+            report.scans.append(Scan(
+                query, table, detail,
+                suggest_index(query.sql, table, columns.get(table, set()), name),
+            ))
+
+
+@contextlib.contextmanager
+def scratch_database(data_dir: Optional[Path] = None):
+    """A connection to a fresh database with every table the code queries."""
+    from .soak import _load_script
+
+    with contextlib.ExitStack() as stack:
+        if data_dir is None:
+            data_dir = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="jaybrain-plans-")))
+        data_dir.mkdir(parents=True, exist_ok=True)
+        _redirect_data(data_dir)
+
+        from jaybrain.daemon import _ensure_daemon_table
+        from jaybrain.db import get_connection, init_db
+
+        init_db()
+        conn = get_connection()
+        try:
+            _load_script("session_hook").ensure_tables(conn)
+            _ensure_daemon_table(conn)
+            yield conn
+        finally:
+            conn.close()
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict[str, str]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())["scans"]
+
+
+def save_baseline(report: PlanReport, path: Path = BASELINE_PATH) -> None:
+    scans = {s.key: s.query.normalized[:160] for s in report.scans}
+    path.write_text(json.dumps({"scans": dict(sorted(scans.items()))}, indent=2) + "\n")
+
+
+def check_query_plans(
+    baseline: Optional[dict[str, str]] = None,
+    paths: Optional[list[Path]] = None,
+    data_dir: Optional[Path] = None,
+) -> PlanReport:
+    """Explain every extracted query and diff its full scans against ``baseline``."""
+    if baseline is None:
+        baseline = load_baseline()
+    queries = extract_queries(paths)
+    report = PlanReport(queries=len(queries))
+    with scratch_database(data_dir) as conn:
+        find_scans(conn, queries, report)
+    seen = {s.key for s in report.scans}
+    report.new = [s for s in report.scans if s.key not in baseline]
+    report.fixed = sorted(k for k in baseline if k not in seen)
+    return report
+
+
+def print_report(report: PlanReport) -> None:
+    print(f"{report.queries} statements, {report.explained} explained, "
+          f"{len(report.skipped)} skipped, {len(report.scans)} full scan(s) of large tables")
+    for scan in report.new:
+        q = scan.query
+        print(f"NEW SCAN  {q.module}:{q.line} ({q.function}) {scan.detail}")
+        print(f"    {q.normalized[:200]}")
+        if scan.suggestion:
+            print(f"    suggest: {scan.suggestion}")
+    for key in report.fixed:
+        print(f"FIXED     {key} (no longer scans; run --update-baseline)")
+    print(f"{len(report.new)} new scan(s), {len(report.fixed)} fixed")
@@ -0,0 +1,415 @@
+"""Run benchmark scenarios against generated corpora and compare runs."""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from .embedder import StubEmbedder, installed
+from .generators import GENERATORS, vocabulary
+from .scenarios import SCENARIOS
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Metrics compared between runs and whether a larger value is worse.
+COMPARED_METRICS = {"p50_ms": True, "p95_ms": True, "cpu_ms": True, "ops_per_s": False}
+
+
+def parse_scale(value: str) -> int:
+    """'10k' -> 10_000, '1m' -> 1_000_000, '2500' -> 2500."""
+    text = value.strip().lower().replace("_", "")
+    multiplier = 1
+    if text.endswith("k"):
+        text, multiplier = text[:-1], 1_000
+    elif text.endswith("m"):
+        text, multiplier = text[:-1], 1_000_000
+    try:
+        scale = int(float(text) * multiplier)
+    except ValueError:
+        raise ValueError(f"Invalid scale '{value}'. Use e.g. 10k, 100k, 1m or a row count.")
+    if scale < 1:
+        raise ValueError(f"Invalid scale '{value}'. Must be at least 1 row.")
+    return scale
+
+
+def _redirect_data(data_dir: Path) -> None:
+    """Point every module-level data path at ``data_dir``.
+
+    Mirrors the test suite's temp_data_dir fixture: modules that imported a
+    path constant by name need their own copy patched too.
+    """
+    import jaybrain.config as config
+    import jaybrain.db as db
+    import jaybrain.signalforge as signalforge
+
+    config.DATA_DIR = data_dir
+    config.DB_PATH = data_dir / "jaybrain.db"
+    config.MEMORIES_DIR = data_dir / "memories"
+    config.SESSIONS_DIR = data_dir / "sessions"
+    config.MODELS_DIR = data_dir / "models"
+    config.FORGE_DIR = data_dir / "forge"
+    config.TRASH_DIR = data_dir / "trash"
+    config.SIGNALFORGE_ARTICLES_DIR = data_dir / "articles"
+    db.DB_PATH = config.DB_PATH
+    signalforge.SIGNALFORGE_ARTICLES_DIR = config.SIGNALFORGE_ARTICLES_DIR
+
+
+def _rss_mb() -> Optional[float]:
+    """Current resident set size, or None where /proc is unavailable."""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return round(pages * os.sysconf("SC_PAGE_SIZE") / 1_048_576, 1)
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    divisor = 1_048_576 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        proc = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return proc.stdout.strip() or None
+
+
+def _measure(scenario, ctx: dict, iterations: int, warmup: int) -> dict:
+    for i in range(warmup):
+        scenario.run(ctx, i)
+    rss_before = _rss_mb()
+    timings = []
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        scenario.run(ctx, warmup + i)
+        timings.append((time.perf_counter() - t0) * 1000)
+    total = time.perf_counter() - start
+    cpu_total = time.process_time() - cpu_start
+    rss_after = _rss_mb()
+
+    timings.sort()
+    return {
+        "status": "ok",
+        "iterations": iterations,
+        "p50_ms": round(_percentile(timings, 0.50), 3),
+        "p95_ms": round(_percentile(timings, 0.95), 3),
+        "p99_ms": round(_percentile(timings, 0.99), 3),
+        "mean_ms": round(sum(timings) / len(timings), 3),
+        "max_ms": round(timings[-1], 3),
+        # Process CPU per op: unlike wall time, excludes waits on locks and I/O
+        "cpu_ms": round(cpu_total * 1000 / iterations, 3),
+        "ops_per_s": round(iterations / total, 2) if total > 0 else None,
+        "rss_mb": rss_after,
+        "rss_delta_mb": (
+            round(rss_after - rss_before, 1)
+            if rss_before is not None and rss_after is not None else None
+        ),
+    }
+
+
+def run_benchmarks(
+    scale: int,
+    scenarios: Optional[list[str]] = None,
+    iterations: int = 20,
+    seed: int = 0,
+    stub_embedder: bool = True,
+    warmup: int = 1,
+    data_dir: Optional[Path] = None,
+) -> dict:
+    """Generate corpora at ``scale`` rows and time each scenario.
+
+    With ``stub_embedder`` off, queries are embedded by the real model
+    (which must already be downloaded); corpus vectors are always synthetic.
+    """
+    names = scenarios or list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        raise ValueError(
+            f"Unknown scenario(s): {', '.join(unknown)}. "
+            f"Available: {', '.join(SCENARIOS)}"
+        )
+
+    started_at = datetime.now(timezone.utc).isoformat()
+    results: dict[str, dict] = {}
+    runnable = []
+    for name in names:
+        scenario = SCENARIOS[name]
+        if scenario.max_scale is not None and scale > scenario.max_scale:
+            results[name] = {
+                "status": "skipped",
+                "reason": f"scale {scale} exceeds max {scenario.max_scale}: {scenario.note}",
+            }
+        else:
+            runnable.append(scenario)
+
+    with contextlib.ExitStack() as stack:
+        if data_dir is None:
+            data_dir = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="jaybrain-bench-")))
+        data_dir.mkdir(parents=True, exist_ok=True)
+        _redirect_data(data_dir)
+
+        from jaybrain.db import get_connection, init_db
+
+        init_db()
+        embedder = StubEmbedder(seed)
+        corpora: dict[str, dict] = {}
+        conn = get_connection()
+        try:
+            for corpus in dict.fromkeys(s.corpus for s in runnable):
+                t0 = time.perf_counter()
+                facts = GENERATORS[corpus](conn, scale, seed, embedder)
+                facts["setup_s"] = round(time.perf_counter() - t0, 2)
+                corpora[corpus] = facts
+        finally:
+            conn.close()
+
+        ctx = {"seed": seed, "vocab": vocabulary(seed), "corpora": corpora}
+        if stub_embedder:
+            stack.enter_context(installed(embedder))
+        for scenario in runnable:
+            count = iterations
+            if scenario.max_iterations is not None:
+                count = min(count, scenario.max_iterations)
+            try:
+                results[scenario.name] = _measure(scenario, ctx, count, warmup)
+            except Exception as e:
+                results[scenario.name] = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+
+    return {
+        "meta": {
+            "started_at": started_at,
+            "scale": scale,
+            "seed": seed,
+            "iterations": iterations,
+            "embedder": "stub" if stub_embedder else "model",
+            "git_rev": _git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "peak_rss_mb": _peak_rss_mb(),
+        },
+        "corpora": {
+            name: {k: v for k, v in facts.items() if k != "subjects"}
+            for name, facts in corpora.items()
+        },
+        "scenarios": results,
+    }
+
+
+def compare(base: dict, new: dict, threshold: float = 0.2, min_ms: float = 1.0) -> dict:
+    """Diff two run results and flag metrics that moved by more than ``threshold``.
+
+    Latencies where both runs are under ``min_ms`` are ignored: at that size
+    timer noise swamps any real change.
+    """
+    report = {"regressions": [], "improvements": [], "skipped": [], "warnings": []}
+    for key in ("scale", "seed", "embedder"):
+        if base["meta"].get(key) != new["meta"].get(key):
+            report["warnings"].append(
+                f"{key} differs: {base['meta'].get(key)} vs {new['meta'].get(key)}"
+            )
+
+    for name, old in base["scenarios"].items():
+        cur = new["scenarios"].get(name)
+        if cur is None or old.get("status") != "ok" or cur.get("status") != "ok":
+            report["skipped"].append(name)
+            continue
+        for metric, higher_is_worse in COMPARED_METRICS.items():
+            before, after = old.get(metric), cur.get(metric)
+            if not before or not after:
+                continue
+            if metric.endswith("_ms") and max(before, after) < min_ms:
+                continue
+            ratio = after / before
+            worse = ratio if higher_is_worse else 1 / ratio
+            entry = {"scenario": name, "metric": metric, "base": before,
+                     "new": after, "ratio": round(ratio, 3)}
+            if worse > 1 + threshold:
+                report["regressions"].append(entry)
+            elif worse < 1 / (1 + threshold):
+                report["improvements"].append(entry)
+    return report
+
+
+def _print_run(result: dict) -> None:
+    meta = result["meta"]
+    print(f"scale={meta['scale']} seed={meta['seed']} embedder={meta['embedder']} "
+          f"rev={meta['git_rev']} peak_rss={meta['peak_rss_mb']}MB")
+    for name, facts in result["corpora"].items():
+        print(f"  corpus {name:<10} rows={facts['rows']:<9} setup={facts['setup_s']}s")
+    print(f"  {'scenario':<24} {'p50':>10} {'p95':>10} {'p99':>10} {'cpu/op':>10} "
+          f"{'ops/s':>9} {'rss':>8}")
+    for name, r in result["scenarios"].items():
+        if r["status"] != "ok":
+            print(f"  {name:<24} {r['status']}: {r.get('reason') or r.get('error')}")
+            continue
+        print(f"  {name:<24} {r['p50_ms']:>8.1f}ms {r['p95_ms']:>8.1f}ms "
+              f"{r['p99_ms']:>8.1f}ms {r['cpu_ms']:>8.1f}ms {r['ops_per_s']:>9} "
+              f"{r['rss_mb']!s:>6}MB")
+
+
+def _print_compare(report: dict) -> None:
+    for warning in report["warnings"]:
+        print(f"WARNING: {warning}")
+    for label in ("regressions", "improvements"):
+        for e in report[label]:
+            print(f"{label[:-1].upper():<12} {e['scenario']:<24} {e['metric']:<10} "
+                  f"{e['base']} -> {e['new']} (x{e['ratio']})")
+    if report["skipped"]:
+        print(f"skipped: {', '.join(report['skipped'])}")
+    print(f"{len(report['regressions'])} regression(s), "
+          f"{len(report['improvements'])} improvement(s)")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="generate a corpus and time scenarios")
+    run_p.add_argument("--scale", default="10k", help="rows per corpus: 10k, 100k, 1m or N")
+    run_p.add_argument("--scenarios", default="",
+                       help=f"comma-separated subset of: {', '.join(SCENARIOS)}")
+    run_p.add_argument("--iterations", type=int, default=20)
+    run_p.add_argument("--warmup", type=int, default=1)
+    run_p.add_argument("--seed", type=int, default=0)
+    run_p.add_argument("--stub-embedder", action="store_true",
+                       help="embed queries offline with the deterministic stub")
+    run_p.add_argument("--data-dir", type=Path, help="keep the generated database here")
+    run_p.add_argument("--out", type=Path, help="write the JSON result to this file")
+    run_p.add_argument("--json", action="store_true", help="print JSON instead of a table")
+
+    cmp_p = sub.add_parser("compare", help="flag regressions between two runs")
+    cmp_p.add_argument("base", type=Path)
+    cmp_p.add_argument("new", type=Path)
+    cmp_p.add_argument("--threshold", type=float, default=0.2,
+                       help="relative change that counts as a regression (default 0.2)")
+    cmp_p.add_argument("--min-ms", type=float, default=1.0,
+                       help="ignore latencies below this in both runs")
+    cmp_p.add_argument("--json", action="store_true")
+
+    soak_p = sub.add_parser("soak", help="multi-process SQLite contention soak test")
+    soak_p.add_argument("--duration", type=float, default=30.0, help="seconds of load")
+    soak_p.add_argument("--mix", default="",
+                        help="processes per role, e.g. mcp=2,daemon=1,session_hook=2")
+    soak_p.add_argument("--rate", default="",
+                        help="events/s per process by role, e.g. session_hook=20")
+    soak_p.add_argument("--seed", type=int, default=0)
+    soak_p.add_argument("--seed-rows", type=int, default=0,
+                        help="pre-populate this many memories before the soak")
+    soak_p.add_argument("--stall-ms", type=float, default=250.0,
+                        help="commits at least this slow count as checkpoint stalls")
+    soak_p.add_argument("--data-dir", type=Path, help="keep the soak database here")
+    soak_p.add_argument("--out", type=Path, help="write the JSON report to this file")
+    soak_p.add_argument("--json", action="store_true", help="print JSON instead of a table")
+
+    plans_p = sub.add_parser("plans", help="EXPLAIN QUERY PLAN check and index advisor")
+    plans_p.add_argument("--update-baseline", action="store_true",
+                         help="accept the current full scans as the new baseline")
+    plans_p.add_argument("--json", action="store_true", help="print JSON instead of a summary")
+
+    fts_p = sub.add_parser("fts", help="FTS5 index size and write cost per layout")
+    fts_p.add_argument("--rows", type=int, default=5000, help="knowledge rows per variant")
+    fts_p.add_argument("--seed", type=int, default=0)
+    fts_p.add_argument("--data-dir", type=Path, help="keep the variant databases here")
+    fts_p.add_argument("--json", action="store_true", help="print JSON instead of a table")
+
+    args = parser.parse_args(argv)
+    if args.command == "fts":
+        from .fts_report import fts_report, print_report
+
+        report = fts_report(rows=args.rows, seed=args.seed, data_dir=args.data_dir)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print_report(report)
+        return 0
+
+    if args.command == "plans":
+        from .query_plans import check_query_plans, print_report, save_baseline
+
+        report = check_query_plans()
+        if args.update_baseline:
+            save_baseline(report)
+        if args.json:
+            print(json.dumps(report.to_dict(), indent=2))
+        else:
+            print_report(report)
+        return 1 if report.new and not args.update_baseline else 0
+
+    if args.command == "soak":
+        from .soak import parse_pairs, print_report, run_soak
+
+        report = run_soak(
+            mix=parse_pairs(args.mix, int) or None,
+            rates=parse_pairs(args.rate, float),
+            duration=args.duration,
+            seed=args.seed,
+            seed_rows=args.seed_rows,
+            stall_ms=args.stall_ms,
+            data_dir=args.data_dir,
+        )
+        if args.out:
+            args.out.write_text(json.dumps(report, indent=2))
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print_report(report)
+        return 1 if report["errors"] else 0
+
+    if args.command == "run":
+        result = run_benchmarks(
+            parse_scale(args.scale),
+            scenarios=[s for s in args.scenarios.split(",") if s] or None,
+            iterations=args.iterations,
+            seed=args.seed,
+            stub_embedder=args.stub_embedder,
+            warmup=args.warmup,
+            data_dir=args.data_dir,
+        )
+        if args.out:
+            args.out.write_text(json.dumps(result, indent=2))
+        if args.json:
+            print(json.dumps(result, indent=2))
+        else:
+            _print_run(result)
+        return 0
+
+    report = compare(
+        json.loads(args.base.read_text()), json.loads(args.new.read_text()),
+        threshold=args.threshold, min_ms=args.min_ms,
+    )
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_compare(report)
+    return 1 if report["regressions"] else 0
@@ -0,0 +1,115 @@
+"""Benchmark scenarios: one public entry point each, driven by iteration.
+
+A scenario names the corpus it needs and a callable taking the run context
+and the iteration number, so queries rotate deterministically through the
+generated topics and subjects. Paths that are quadratic in the corpus size
+carry a ``max_scale`` and are reported as skipped above it instead of
+stalling the whole run.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from .generators import topic_query
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    corpus: str
+    run: Callable[[dict, int], Any]
+    max_scale: Optional[int] = None
+    max_iterations: Optional[int] = None
+    note: str = ""
+
+
+def _query(ctx: dict, corpus: str, i: int) -> str:
+    topics = ctx["corpora"][corpus]["topics"]
+    return topic_query(ctx["seed"], i % topics, ctx["vocab"], i)
+
+
+def _recall(ctx: dict, i: int):
+    from jaybrain.memory import recall
+
+    return recall(_query(ctx, "memories", i), limit=10)
+
+
+def _deep_recall(ctx: dict, i: int):
+    from jaybrain.deep_recall import deep_recall
+
+    return deep_recall(_query(ctx, "memories", i), limit=10)
+
+
+def _recall_ranking(ctx: dict, i: int):
+    """recall() with both searches pinned to fixed candidate lists.
+
+    Times what recall does after search (candidate fetch, decay, ranking,
+    building results, access updates) independent of embedding and index
+    lookups, and of whether sqlite-vec KNN works on this machine.
+    """
+    from unittest import mock
+
+    from jaybrain import memory
+    from jaybrain.config import SEARCH_CANDIDATES
+
+    rows = ctx["corpora"]["memories"]["rows"]
+    picks = random.Random(i).sample(range(rows), min(rows, SEARCH_CANDIDATES * 3 // 2))
+    ids = [f"bm{k:010d}" for k in picks]
+    vec = [(mid, 0.2 + 0.02 * k) for k, mid in enumerate(ids[:SEARCH_CANDIDATES])]
+    fts = [(mid, -12.0 + 0.3 * k) for k, mid in enumerate(ids[-SEARCH_CANDIDATES:])]
+    with mock.patch.object(memory, "search_memories_vec", return_value=vec), \
+            mock.patch.object(memory, "search_memories_fts", return_value=fts):
+        return memory.recall(_query(ctx, "memories", i), limit=10)
+
+
+def _find_clusters(ctx: dict, i: int):
+    from jaybrain.consolidation import find_clusters
+
+    return find_clusters(limit=10)
+
+
+def _signalforge_clustering(ctx: dict, i: int):
+    from jaybrain.signalforge import run_signalforge_clustering
+
+    return run_signalforge_clustering()
+
+
+def _subject(ctx: dict, i: int) -> str:
+    subjects = ctx["corpora"]["forge"]["subjects"]
+    return subjects[i % len(subjects)]
+
+
+def _study_queue(ctx: dict, i: int):
+    from jaybrain.forge import get_study_queue
+
+    return get_study_queue(limit=10, subject_id=_subject(ctx, i))
+
+
+def _readiness(ctx: dict, i: int):
+    from jaybrain.forge import calculate_readiness
+
+    return calculate_readiness(_subject(ctx, i))
+
+
+SCENARIOS: dict[str, Scenario] = {
+    s.name: s for s in [
+        Scenario("recall", "memories", _recall),
+        Scenario("deep_recall", "memories", _deep_recall),
+        Scenario("recall_ranking", "memories", _recall_ranking),
+        Scenario(
+            "find_clusters", "memories", _find_clusters,
+            max_scale=10_000, max_iterations=3,
+            note="pairwise similarity over every memory is O(n^2)",
+        ),
+        Scenario(
+            "signalforge_clustering", "news", _signalforge_clustering,
+            max_scale=50_000, max_iterations=3,
+            note="pairwise similarity over the clustering window is O(n^2)",
+        ),
+        Scenario("forge_study_queue", "forge", _study_queue),
+        Scenario("forge_readiness", "forge", _readiness),
+    ]
+}
@@ -0,0 +1,665 @@
+"""Multi-process SQLite contention soak test.
+
+In production several processes write the same jaybrain.db: one MCP server
+per Claude session, the daemon's scheduler jobs, session_hook.py on every
+tool call, precompact_hook.py, the Telegram bot and the watchdog. This
+spawns a configurable mix of those roles as real OS processes against a
+scratch database, drives each with Poisson arrivals at a set rate, and
+reports:
+
+- per-operation latency percentiles, error and "database is locked" counts;
+- busy-wait: time the first write of each transaction spent acquiring the
+  write lock, plus commit latency (fsync and any WAL auto-checkpoint the
+  committing connection runs);
+- WAL growth sampled from the -wal file, and completed checkpoints counted
+  from the WAL header's checkpoint sequence number;
+- checkpoint stalls: commits slower than --stall-ms.
+
+Roles call the same code the real processes run (memory.remember,
+session_hook.handle_event, the watchdog's log writes, ...). Hook roles stay
+resident instead of starting an interpreter per event, so interpreter
+startup is excluded; each event still opens its own connection as the real
+hook does.
+
+Usage:
+    python -m benchmarks soak --duration 60
+    python -m benchmarks soak --mix mcp=3,daemon=1,session_hook=3 --rate session_hook=20
+    python -m benchmarks soak --seed-rows 50000 --out soak.json
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+import multiprocessing
+import os
+import platform
+import queue as queue_mod
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Optional
+
+from .runner import PROJECT_ROOT, _git_rev, _percentile, _redirect_data
+
+SOAK_SOURCE_ID = "soak-feed"
+READY_TIMEOUT = 120.0
+
+
+@dataclass(frozen=True)
+class Role:
+    name: str
+    rate: float  # default events per second, per process
+    ops: tuple[tuple[str, float], ...]  # (operation, weight)
+
+
+ROLES: dict[str, Role] = {
+    r.name: r for r in [
+        Role("mcp", 2.0, (
+            ("recall", 5), ("remember", 2), ("knowledge_store", 1), ("pulse_sessions", 2),
+        )),
+        Role("daemon", 1.0, (
+            ("daemon_heartbeat", 4), ("news_ingest", 3), ("signalforge_fetch", 2),
+        )),
+        Role("session_hook", 5.0, (("hook_tool_use", 9), ("hook_stop", 1))),
+        Role("precompact_hook", 0.05, (("precompact", 1),)),
+        Role("telegram", 0.2, (("telegram_exchange", 1),)),
+        Role("watchdog", 0.2, (("watchdog_check", 1),)),
+    ]
+}
+
+DEFAULT_MIX = {
+    "mcp": 2, "daemon": 1, "session_hook": 2,
+    "precompact_hook": 1, "telegram": 1, "watchdog": 1,
+}
+
+_TOOLS = ["Read", "Edit", "Bash", "Grep", "mcp__jaybrain__recall", "mcp__jaybrain__remember"]
+
+
+def _load_script(name: str):
+    """Import scripts/<name>.py (not a package) as a module."""
+    path = PROJECT_ROOT / "scripts" / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(f"soak_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# ---------------------------------------------------------------------------
+# Worker process
+# ---------------------------------------------------------------------------
+
+
+class _Worker:
+    """One simulated process. Runs in a spawned child."""
+
+    def __init__(self, role: str, index: int, data_dir: Path, seed: int,
+                 stall_ms: float):
+        import jaybrain.config as config
+        from jaybrain import perf
+
+        _redirect_data(data_dir)
+        logging.getLogger("jaybrain").setLevel(logging.ERROR)
+
+        # Lock and commit timings come from perf.TimedConnection. Every
+        # connection this process opens, including the hook scripts' raw
+        # sqlite3.connect calls, gets it; samples stay in memory.
+        config.PERF_ENABLED = True
+        config.PERF_FLUSH_INTERVAL = 86400.0
+        self.stalls: list[float] = []
+        stalls = self.stalls
+
+        class SoakConnection(perf.TimedConnection):
+            def commit(self):
+                start = time.perf_counter()
+                try:
+                    return super().commit()
+                finally:
+                    ms = (time.perf_counter() - start) * 1000
+                    if ms >= stall_ms:
+                        stalls.append(ms)
+
+        connect = sqlite3.connect
+
+        def soak_connect(*args, **kwargs):
+            kwargs["factory"] = SoakConnection
+            return connect(*args, **kwargs)
+
+        sqlite3.connect = soak_connect
+
+        self.role = ROLES[role]
+        self.index = index
+        self.rng = random.Random(f"{seed}:{role}:{index}")
+        self.session_id = f"soak-{role}-{index}"
+        self._scripts: dict[str, object] = {}
+
+        from .embedder import StubEmbedder, installed
+
+        self._embedder = installed(StubEmbedder(seed))
+        self._embedder.__enter__()
+
+    def script(self, name: str):
+        module = self._scripts.get(name)
+        if module is None:
+            import jaybrain.config as config
+
+            module = self._scripts[name] = _load_script(name)
+            module.DB_PATH = config.DB_PATH
+        return module
+
+    def text(self, words: int) -> str:
+        topic = self.rng.randrange(50)
+        body = " ".join(f"w{self.rng.randrange(2000)}" for _ in range(words))
+        return f"topic-{topic} {body}"
+
+    def run(self, duration: float, rate: float) -> dict:
+        from jaybrain import perf
+
+        names = [name for name, _ in self.role.ops]
+        weights = [weight for _, weight in self.role.ops]
+        ops = {name: {"latencies": [], "errors": 0, "locked": 0} for name in names}
+        max_lag = 0.0
+
+        start = time.perf_counter()
+        end = start + duration
+        next_at = start + self.rng.expovariate(rate)
+        while next_at < end:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            max_lag = max(max_lag, (time.perf_counter() - next_at) * 1000)
+            name = self.rng.choices(names, weights)[0]
+            stats = ops[name]
+            t0 = time.perf_counter()
+            try:
+                OPERATIONS[name](self)
+            except sqlite3.OperationalError as e:
+                stats["errors"] += 1
+                if "locked" in str(e) or "busy" in str(e):
+                    stats["locked"] += 1
+            except Exception:
+                stats["errors"] += 1
+            stats["latencies"].append((time.perf_counter() - t0) * 1000)
+            next_at += self.rng.expovariate(rate)
+
+        result = {
+            "ops": ops,
+            "lock": perf.snapshot("lock"),
+            "sql": perf.snapshot("sql"),
+            "stalls": self.stalls,
+            "max_lag_ms": round(max_lag, 1),
+        }
+        perf.reset()
+        return result
+
+
+def _op_recall(w: _Worker) -> None:
+    from jaybrain.memory import recall
+
+    recall(w.text(2), limit=10)
+
+
+def _op_remember(w: _Worker) -> None:
+    from jaybrain.memory import remember
+
+    remember(w.text(20), tags=["soak"], importance=round(w.rng.random(), 2))
+
+
+def _op_knowledge_store(w: _Worker) -> None:
+    from jaybrain.knowledge import store_knowledge
+
+    store_knowledge(title=w.text(5), content=w.text(80), tags=["soak"], source="soak")
+
+
+def _op_pulse_sessions(w: _Worker) -> None:
+    from jaybrain.pulse import get_active_sessions
+
+    get_active_sessions()
+
+
+def _op_daemon_heartbeat(w: _Worker) -> None:
+    import json
+
+    from jaybrain.daemon import _ensure_daemon_table, _get_raw_conn
+
+    # Same statements as DaemonManager._write_heartbeat.
+    now = _now()
+    conn = _get_raw_conn()
+    try:
+        _ensure_daemon_table(conn)
+        conn.execute("SELECT pid FROM daemon_state WHERE id = 1").fetchone()
+        conn.execute(
+            """INSERT INTO daemon_state
+            (id, pid, started_at, last_heartbeat, modules, status, companions)
+            VALUES (1, ?, ?, ?, ?, 'running', ?)
+            ON CONFLICT(id) DO UPDATE SET
+                last_heartbeat = excluded.last_heartbeat,
+                modules = excluded.modules,
+                status = 'running',
+                companions = excluded.companions""",
+            (os.getpid(), now, now, json.dumps(["news_feeds", "signalforge"]), "{}"),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _op_news_ingest(w: _Worker) -> None:
+    from jaybrain.db import get_connection, insert_signalforge_article
+    from jaybrain.knowledge import store_knowledge
+    from jaybrain.news_feeds import _mark_seen
+
+    title = w.text(6)
+    k = store_knowledge(title=title, content=w.text(120), category="news_feed",
+                        tags=["soak"], source=SOAK_SOURCE_ID)
+    conn = get_connection()
+    try:
+        _mark_seen(conn, SOAK_SOURCE_ID, uuid.uuid4().hex, k.id, title,
+                   f"https://soak.example/{k.id}", _now())
+        insert_signalforge_article(conn, uuid.uuid4().hex[:12], k.id)
+    finally:
+        conn.close()
+
+
+def _op_signalforge_fetch(w: _Worker) -> None:
+    from jaybrain.db import get_connection, list_signalforge_pending, update_signalforge_article
+
+    conn = get_connection()
+    try:
+        for row in list_signalforge_pending(conn, limit=5):
+            update_signalforge_article(
+                conn, row["id"], fetch_status="fetched", fetched_at=_now(),
+                word_count=w.rng.randrange(200, 2000),
+            )
+    finally:
+        conn.close()
+
+
+def _hook_event(w: _Worker, event: str) -> None:
+    data = {"session_id": w.session_id, "cwd": "/soak", "hook_event_name": event}
+    if event == "PostToolUse":
+        data["tool_name"] = w.rng.choice(_TOOLS)
+        data["tool_input"] = {"command": w.text(8)}
+    w.script("session_hook").handle_event(data)
+
+
+def _op_precompact(w: _Worker) -> None:
+    w.script("precompact_hook").handle_precompact(
+        {"session_id": w.session_id, "cwd": "/soak", "hook_event_name": "PreCompact"}
+    )
+
+
+def _op_telegram_exchange(w: _Worker) -> None:
+    from jaybrain.db import (
+        get_connection, get_telegram_history, insert_telegram_message,
+        upsert_telegram_bot_state,
+    )
+
+    conn = get_connection()
+    try:
+        get_telegram_history(conn, limit=30)
+        insert_telegram_message(conn, "user", w.text(15))
+        insert_telegram_message(conn, "assistant", w.text(60), input_tokens=900,
+                                output_tokens=120, response_ms=1500)
+        upsert_telegram_bot_state(conn, last_heartbeat=_now())
+    finally:
+        conn.close()
+
+
+def _op_watchdog_check(w: _Worker) -> None:
+    watchdog = w.script("daemon_watchdog")
+    conn = watchdog._get_conn()
+    try:
+        watchdog._ensure_watchdog_table(conn)
+        row = conn.execute("SELECT * FROM daemon_state WHERE id = 1").fetchone()
+        watchdog._log_event(conn, "check_ok", daemon_pid=row["pid"] if row else None,
+                            action="no action needed")
+    finally:
+        conn.close()
+
+
+OPERATIONS: dict[str, Callable[[_Worker], None]] = {
+    "recall": _op_recall,
+    "remember": _op_remember,
+    "knowledge_store": _op_knowledge_store,
+    "pulse_sessions": _op_pulse_sessions,
+    "daemon_heartbeat": _op_daemon_heartbeat,
+    "news_ingest": _op_news_ingest,
+    "signalforge_fetch": _op_signalforge_fetch,
+    "hook_tool_use": lambda w: _hook_event(w, "PostToolUse"),
+    "hook_stop": lambda w: _hook_event(w, "Stop"),
+    "precompact": _op_precompact,
+    "telegram_exchange": _op_telegram_exchange,
+    "watchdog_check": _op_watchdog_check,
+}
+
+
+def _worker_main(role, index, data_dir, duration, rate, seed, stall_ms, results, start) -> None:
+    try:
+        worker = _Worker(role, index, Path(data_dir), seed, stall_ms)
+        results.put(("ready", role, index, None))
+        if not start.wait(READY_TIMEOUT):
+            return
+        results.put(("result", role, index, worker.run(duration, rate)))
+    except Exception as e:
+        results.put(("error", role, index, f"{type(e).__name__}: {e}"))
+
+
+# ---------------------------------------------------------------------------
+# Parent: setup, WAL sampling, aggregation
+# ---------------------------------------------------------------------------
+
+
+def _prepare(data_dir: Path, seed: int, seed_rows: int) -> None:
+    from jaybrain.daemon import _ensure_daemon_table
+    from jaybrain.db import get_connection, init_db
+
+    init_db()
+    conn = get_connection()
+    try:
+        _ensure_daemon_table(conn)
+        _load_script("session_hook").ensure_tables(conn)
+        _load_script("daemon_watchdog")._ensure_watchdog_table(conn)
+        conn.execute(
+            """INSERT OR IGNORE INTO news_feed_sources (id, name, url, created_at, updated_at)
+            VALUES (?, 'Soak feed', 'https://soak.example/rss', ?, ?)""",
+            (SOAK_SOURCE_ID, _now(), _now()),
+        )
+        conn.commit()
+        if seed_rows:
+            from .embedder import StubEmbedder
+            from .generators import generate_memories
+
+            generate_memories(conn, seed_rows, seed, StubEmbedder(seed))
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+
+
+def _wal_state(db_path: Path) -> tuple[int, Optional[int]]:
+    """(WAL size in bytes, checkpoint sequence number from the WAL header)."""
+    wal = Path(f"{db_path}-wal")
+    try:
+        with open(wal, "rb") as f:
+            header = f.read(32)
+            size = os.fstat(f.fileno()).st_size
+    except OSError:
+        return 0, None
+    seq = int.from_bytes(header[12:16], "big") if len(header) == 32 else None
+    return size, seq
+
+
+class _WalSampler(threading.Thread):
+    """Polls the -wal file while the soak runs.
+
+    Holds one idle connection open for the duration. Otherwise the WAL is
+    checkpointed and deleted whenever the last connection closes, which the
+    per-event connections here (and in the hooks) do constantly, and there
+    would be no growth to observe.
+    """
+
+    def __init__(self, db_path: Path, interval: float):
+        super().__init__(name="soak-wal-sampler", daemon=True)
+        self.db_path = db_path
+        self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self.conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+        self.interval = interval
+        self.stop = threading.Event()
+        self.initial, self._seq = _wal_state(db_path)
+        self.max_bytes = self.initial
+        self.checkpoints = 0
+        self.samples = 0
+
+    def sample(self) -> None:
+        size, seq = _wal_state(self.db_path)
+        self.max_bytes = max(self.max_bytes, size)
+        if seq is not None and self._seq is not None and seq != self._seq:
+            self.checkpoints += (seq - self._seq) % 2**32
+        if seq is not None:
+            self._seq = seq
+        self.samples += 1
+
+    def run(self) -> None:
+        while not self.stop.wait(self.interval):
+            self.sample()
+
+    def finish(self) -> None:
+        self.stop.set()
+        self.join()
+        self.sample()
+        self.conn.close()
+
+
+def _merge_hist(into: dict, stats: dict) -> None:
+    into["count"] += stats["count"]
+    into["total_ms"] += stats["total_ms"]
+    into["max_ms"] = max(into["max_ms"], stats["max_ms"])
+    if not into["buckets"]:
+        into["buckets"] = [0] * len(stats["buckets"])
+    for i, n in enumerate(stats["buckets"]):
+        into["buckets"][i] += n
+
+
+def _describe_hist(stats: dict) -> dict:
+    from jaybrain.perf import percentile
+
+    return {
+        "count": stats["count"],
+        "total_ms": round(stats["total_ms"], 1),
+        "p50_ms": percentile(stats["buckets"], 0.50),
+        "p95_ms": percentile(stats["buckets"], 0.95),
+        "p99_ms": percentile(stats["buckets"], 0.99),
+        "max_ms": round(stats["max_ms"], 3),
+    }
+
+
+def _summarize(results: list[dict], duration: float, stall_ms: float) -> dict:
+    ops: dict[str, dict] = {}
+    lock: dict[str, dict] = {}
+    sql: dict[str, dict] = {}
+    stalls: list[float] = []
+    for r in results:
+        for name, stats in r["ops"].items():
+            agg = ops.setdefault(name, {"latencies": [], "errors": 0, "locked": 0})
+            agg["latencies"].extend(stats["latencies"])
+            agg["errors"] += stats["errors"]
+            agg["locked"] += stats["locked"]
+        for table, source in ((lock, r["lock"]), (sql, r["sql"])):
+            for name, stats in source.items():
+                _merge_hist(table.setdefault(
+                    name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "buckets": []}
+                ), stats)
+        stalls.extend(r["stalls"])
+
+    operations = {}
+    for name, agg in sorted(ops.items()):
+        latencies = sorted(agg["latencies"])
+        if not latencies:
+            continue
+        operations[name] = {
+            "count": len(latencies),
+            "errors": agg["errors"],
+            "locked": agg["locked"],
+            "per_s": round(len(latencies) / duration, 2),
+            "p50_ms": round(_percentile(latencies, 0.50), 3),
+            "p95_ms": round(_percentile(latencies, 0.95), 3),
+            "p99_ms": round(_percentile(latencies, 0.99), 3),
+            "max_ms": round(latencies[-1], 3),
+        }
+
+    slowest = sorted(sql.items(), key=lambda kv: kv[1]["max_ms"], reverse=True)[:5]
+    return {
+        "operations": operations,
+        "busy_wait": {name: _describe_hist(stats) for name, stats in sorted(lock.items())},
+        "busy_wait_ms_total": round(lock.get("write_begin", {}).get("total_ms", 0.0), 1),
+        "checkpoint_stalls": {
+            "threshold_ms": stall_ms,
+            "count": len(stalls),
+            "max_ms": round(max(stalls), 1) if stalls else None,
+        },
+        "slowest_sql": [{"sql": name, **_describe_hist(stats)} for name, stats in slowest],
+        "max_schedule_lag_ms": max((r["max_lag_ms"] for r in results), default=0.0),
+    }
+
+
+def run_soak(
+    mix: Optional[dict[str, int]] = None,
+    rates: Optional[dict[str, float]] = None,
+    duration: float = 30.0,
+    seed: int = 0,
+    seed_rows: int = 0,
+    stall_ms: float = 250.0,
+    sample_interval: float = 0.25,
+    data_dir: Optional[Path] = None,
+) -> dict:
+    """Spawn the process mix against a scratch database and measure contention."""
+    mix = dict(DEFAULT_MIX if mix is None else mix)
+    rates = rates or {}
+    unknown = sorted((set(mix) | set(rates)) - set(ROLES))
+    if unknown:
+        raise ValueError(
+            f"Unknown role(s): {', '.join(unknown)}. Available: {', '.join(ROLES)}"
+        )
+    mix = {role: n for role, n in mix.items() if n > 0}
+    if not mix:
+        raise ValueError("Process mix is empty.")
+    role_rates = {role: rates.get(role, ROLES[role].rate) for role in mix}
+
+    started_at = _now()
+    cleanup = None
+    if data_dir is None:
+        cleanup = tempfile.TemporaryDirectory(prefix="jaybrain-soak-")
+        data_dir = Path(cleanup.name)
+    try:
+        data_dir.mkdir(parents=True, exist_ok=True)
+        _redirect_data(data_dir)
+        _prepare(data_dir, seed, seed_rows)
+        db_path = data_dir / "jaybrain.db"
+        db_before = db_path.stat().st_size
+
+        ctx = multiprocessing.get_context("spawn")
+        results_q = ctx.Queue()
+        start = ctx.Event()
+        procs = [
+            ctx.Process(
+                target=_worker_main, name=f"soak-{role}-{i}",
+                args=(role, i, str(data_dir), duration, role_rates[role], seed,
+                      stall_ms, results_q, start),
+            )
+            for role, count in mix.items() for i in range(count)
+        ]
+        for p in procs:
+            p.start()
+
+        errors: list[str] = []
+        results: list[dict] = []
+        sampler: Optional[_WalSampler] = None
+        try:
+            pending = len(procs)
+            deadline = time.monotonic() + READY_TIMEOUT
+            while pending:
+                kind, role, index, payload = results_q.get(
+                    timeout=max(deadline - time.monotonic(), 0.1)
+                )
+                pending -= 1
+                if kind == "error":
+                    errors.append(f"{role}[{index}]: {payload}")
+
+            sampler = _WalSampler(db_path, sample_interval)
+            sampler.start()
+            start.set()
+            pending = len(procs) - len(errors)
+            deadline = time.monotonic() + duration + READY_TIMEOUT
+            while pending:
+                kind, role, index, payload = results_q.get(
+                    timeout=max(deadline - time.monotonic(), 0.1)
+                )
+                pending -= 1
+                if kind == "error":
+                    errors.append(f"{role}[{index}]: {payload}")
+                else:
+                    results.append(payload)
+        except queue_mod.Empty:
+            errors.append("timed out waiting for worker processes")
+        finally:
+            if sampler is not None:
+                sampler.finish()
+            start.set()
+            for p in procs:
+                p.join(timeout=10)
+                if p.is_alive():
+                    p.terminate()
+
+        wal_final, _ = _wal_state(db_path)
+        report = {
+            "meta": {
+                "started_at": started_at,
+                "duration_s": duration,
+                "seed": seed,
+                "seed_rows": seed_rows,
+                "mix": mix,
+                "rates_per_s": role_rates,
+                "sqlite_version": sqlite3.sqlite_version,
+                "git_rev": _git_rev(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+            },
+            **_summarize(results, duration, stall_ms),
+            "wal": {
+                "initial_bytes": sampler.initial if sampler else None,
+                "max_bytes": sampler.max_bytes if sampler else None,
+                "final_bytes": wal_final,
+                "checkpoints": sampler.checkpoints if sampler else None,
+                "samples": sampler.samples if sampler else 0,
+            },
+            "db_bytes": {"before": db_before, "after": db_path.stat().st_size},
+            "errors": errors,
+        }
+    finally:
+        if cleanup is not None:
+            cleanup.cleanup()
+    return report
+
+
+def parse_pairs(text: str, cast: Callable = int) -> dict:
+    """'mcp=2,daemon=1' -> {'mcp': 2, 'daemon': 1}."""
+    pairs = {}
+    for item in filter(None, (p.strip() for p in text.split(","))):
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Expected role=value, got '{item}'")
+        pairs[key.strip()] = cast(value)
+    return pairs
+
+
+def print_report(report: dict) -> None:
+    meta = report["meta"]
+    mix = ", ".join(f"{r}x{n}@{meta['rates_per_s'][r]}/s" for r, n in meta["mix"].items())
+    print(f"soak {meta['duration_s']}s sqlite={meta['sqlite_version']} rev={meta['git_rev']}")
+    print(f"  mix: {mix}")
+    print(f"  {'operation':<20} {'count':>7} {'locked':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for name, o in report["operations"].items():
+        print(f"  {name:<20} {o['count']:>7} {o['locked']:>7} {o['p50_ms']:>7.1f}ms "
+              f"{o['p95_ms']:>7.1f}ms {o['p99_ms']:>7.1f}ms {o['max_ms']:>7.1f}ms")
+    for name, b in report["busy_wait"].items():
+        print(f"  lock {name:<15} n={b['count']:<7} total={b['total_ms']}ms "
+              f"p95={b['p95_ms']}ms max={b['max_ms']}ms")
+    stalls = report["checkpoint_stalls"]
+    wal = report["wal"]
+    print(f"  commits >= {stalls['threshold_ms']}ms: {stalls['count']}"
+          + (f" (max {stalls['max_ms']}ms)" if stalls["max_ms"] is not None else ""))
+    print(f"  wal: max={wal['max_bytes']}B final={wal['final_bytes']}B "
+          f"checkpoints={wal['checkpoints']}")
+    for error in report["errors"]:
+        print(f"  ERROR {error}")
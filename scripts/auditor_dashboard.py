@@ -31,6 +31,8 @@ def _get_conn() -> sqlite3.Connection:
     conn = sqlite3.connect(str(DB_PATH), timeout=10)
     conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("PRAGMA busy_timeout=10000")
+    # session_activity_log lives in jaybrain_ops.db next to jaybrain.db
+    conn.execute("ATTACH DATABASE ? AS ops", (str(DB_PATH.with_name("jaybrain_ops.db")),))
     conn.row_factory = sqlite3.Row
     return conn
 
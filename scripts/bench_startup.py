@@ -0,0 +1,142 @@
+"""Benchmark MCP server startup: import time and time to first tool response.
+
+Claude Code spawns the JayBrain MCP server once per session, so this cost is
+paid constantly. Each run starts a fresh interpreter against a scratch data
+directory; the first run creates the schema (cold), later runs hit the
+init_db fast path (warm).
+
+Usage:
+    python scripts/bench_startup.py              # 5 runs, human-readable
+    python scripts/bench_startup.py --runs 10    # more runs
+    python scripts/bench_startup.py --json       # machine-readable output
+    python scripts/bench_startup.py --data-dir D # reuse an existing data dir
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Modules that must not load until a tool actually needs them.
+HEAVY_MODULES = [
+    "numpy",
+    "onnxruntime",
+    "fastembed",
+    "anthropic",
+    "googleapiclient",
+    "google.oauth2",
+    "trafilatura",
+    "playwright",
+    "bs4",
+]
+
+# Runs in the child interpreter. Data paths are redirected before the server
+# module is imported, since importing it initializes the database.
+_CHILD = r"""
+import asyncio, json, sys, time
+from pathlib import Path
+
+start = time.perf_counter()
+data = Path(sys.argv[1])
+heavy = json.loads(sys.argv[2])
+
+import jaybrain.config as config
+config.DATA_DIR = data
+config.DB_PATH = data / "jaybrain.db"
+config.MEMORIES_DIR = data / "memories"
+config.SESSIONS_DIR = data / "sessions"
+config.MODELS_DIR = data / "models"
+config.FORGE_DIR = data / "forge"
+config.TRASH_DIR = data / "trash"
+config.SIGNALFORGE_ARTICLES_DIR = data / "articles"
+import jaybrain.db as db
+db.DB_PATH = config.DB_PATH
+
+t0 = time.perf_counter()
+import jaybrain.server as server
+t1 = time.perf_counter()
+response = json.loads(asyncio.run(server.stats()))
+t2 = time.perf_counter()
+
+print(json.dumps({
+    "import_ms": round((t1 - t0) * 1000, 1),
+    "first_call_ms": round((t2 - t1) * 1000, 1),
+    "ready_ms": round((t2 - start) * 1000, 1),
+    "first_call_ok": "error" not in response,
+    "heavy_modules": [m for m in heavy if m in sys.modules],
+}))
+"""
+
+
+def run_once(data_dir: Path) -> dict:
+    """Start one server process and return its startup timings."""
+    env_path = str(PROJECT_ROOT / "src")
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", _CHILD, str(data_dir), json.dumps(HEAVY_MODULES)],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": env_path},
+        timeout=120,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"startup run failed:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["process_ms"] = round(wall_ms, 1)
+    return result
+
+
+def _summary(runs: list[dict]) -> dict:
+    return {
+        key: round(statistics.median(r[key] for r in runs), 1)
+        for key in ("import_ms", "first_call_ms", "ready_ms", "process_ms")
+    }
+
+
+def benchmark(runs: int = 5, data_dir: Path | None = None) -> dict:
+    """Run the startup benchmark. First run is cold unless data_dir exists."""
+    with tempfile.TemporaryDirectory(prefix="jaybrain-bench-") as tmp:
+        data = data_dir or Path(tmp) / "data"
+        data.mkdir(parents=True, exist_ok=True)
+        results = [run_once(data) for _ in range(max(runs, 2))]
+    cold, warm = results[0], results[1:]
+    return {
+        "runs": len(results),
+        "cold": cold,
+        "warm": _summary(warm),
+        "first_call_ok": all(r["first_call_ok"] for r in results),
+        "heavy_modules": sorted({m for r in results for m in r["heavy_modules"]}),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--data-dir", type=Path, default=None)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    report = benchmark(args.runs, args.data_dir)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    warm = report["warm"]
+    print(f"Runs: {report['runs']} (1 cold + {report['runs'] - 1} warm, median)")
+    print(f"  import jaybrain.server   cold {report['cold']['import_ms']:8.1f} ms   warm {warm['import_ms']:8.1f} ms")
+    print(f"  first tool response      cold {report['cold']['first_call_ms']:8.1f} ms   warm {warm['first_call_ms']:8.1f} ms")
+    print(f"  process start to ready   cold {report['cold']['process_ms']:8.1f} ms   warm {warm['process_ms']:8.1f} ms")
+    print(f"  heavy modules at startup: {', '.join(report['heavy_modules']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
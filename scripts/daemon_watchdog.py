@@ -32,6 +32,7 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
 DB_PATH = DATA_DIR / "jaybrain.db"
+OPS_DB_NAME = "jaybrain_ops.db"  # watchdog_log, attached as "ops"
 START_DAEMON_SCRIPT = PROJECT_ROOT / "scripts" / "start_daemon.py"
 
 # If daemon heartbeat is older than this, consider it frozen
@@ -47,6 +48,8 @@ def _get_conn() -> sqlite3.Connection:
     conn = sqlite3.connect(str(DB_PATH), timeout=10)
     conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("PRAGMA busy_timeout=10000")
+    conn.execute("ATTACH DATABASE ? AS ops", (str(DB_PATH.with_name(OPS_DB_NAME)),))
+    conn.execute("PRAGMA ops.journal_mode=WAL")
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -54,7 +57,7 @@ def _get_conn() -> sqlite3.Connection:
 def _ensure_watchdog_table(conn: sqlite3.Connection) -> None:
     """Create the watchdog_log table if it doesn't exist."""
     conn.executescript("""
-        CREATE TABLE IF NOT EXISTS watchdog_log (
+        CREATE TABLE IF NOT EXISTS ops.watchdog_log (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             timestamp TEXT NOT NULL,
             event_type TEXT NOT NULL,
@@ -65,7 +68,7 @@ def _ensure_watchdog_table(conn: sqlite3.Connection) -> None:
             error_message TEXT NOT NULL DEFAULT '',
             telegram_sent INTEGER NOT NULL DEFAULT 0
         );
-        CREATE INDEX IF NOT EXISTS idx_watchdog_log_ts
+        CREATE INDEX IF NOT EXISTS ops.idx_watchdog_log_ts
             ON watchdog_log(timestamp);
     """)
     conn.commit()
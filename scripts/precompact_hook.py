@@ -18,6 +18,7 @@ from pathlib import Path
 
 # DB path computed relative to this script: scripts/ -> jaybrain/ -> data/
 DB_PATH = Path(__file__).resolve().parent.parent / "data" / "jaybrain.db"
+OPS_DB_NAME = "jaybrain_ops.db"  # session_activity_log, attached as "ops"
 
 
 def now_iso():
@@ -31,6 +32,7 @@ def get_conn():
     conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("PRAGMA busy_timeout=10000")
     conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("ATTACH DATABASE ? AS ops", (str(DB_PATH.with_name(OPS_DB_NAME)),))
     conn.row_factory = sqlite3.Row
     return conn
 
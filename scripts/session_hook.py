@@ -16,6 +16,9 @@ from pathlib import Path
 
 # DB path computed relative to this script: scripts/ -> jaybrain/ -> data/
 DB_PATH = Path(__file__).resolve().parent.parent / "data" / "jaybrain.db"
+# High-churn logs live in a sibling file attached as schema "ops"
+# (mirrors jaybrain.db.attach_ops).
+OPS_DB_NAME = "jaybrain_ops.db"
 
 SCHEMA = """
 CREATE TABLE IF NOT EXISTS claude_sessions (
@@ -30,7 +33,12 @@ CREATE TABLE IF NOT EXISTS claude_sessions (
     last_tool_input TEXT NOT NULL DEFAULT ''
 );
 
-CREATE TABLE IF NOT EXISTS session_activity_log (
+-- Same as jaybrain.db.CLAUDE_SESSIONS_INDEXES_SQL (pulse and crash checks
+-- sort/filter by last_heartbeat, time_allocation by started_at)
+CREATE INDEX IF NOT EXISTS idx_claude_sessions_heartbeat ON claude_sessions(last_heartbeat);
+CREATE INDEX IF NOT EXISTS idx_claude_sessions_started ON claude_sessions(started_at);
+
+CREATE TABLE IF NOT EXISTS ops.session_activity_log (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     session_id TEXT NOT NULL,
     event_type TEXT NOT NULL,
@@ -39,8 +47,8 @@ CREATE TABLE IF NOT EXISTS session_activity_log (
     timestamp TEXT NOT NULL
 );
 
-CREATE INDEX IF NOT EXISTS idx_sal_session ON session_activity_log(session_id);
-CREATE INDEX IF NOT EXISTS idx_sal_timestamp ON session_activity_log(timestamp);
+CREATE INDEX IF NOT EXISTS ops.idx_sal_session ON session_activity_log(session_id);
+CREATE INDEX IF NOT EXISTS ops.idx_sal_timestamp ON session_activity_log(timestamp);
 """
 
 
@@ -56,6 +64,9 @@ def get_conn():
     conn.execute("PRAGMA busy_timeout=30000")
     conn.execute("PRAGMA synchronous=NORMAL")
     conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("ATTACH DATABASE ? AS ops", (str(DB_PATH.with_name(OPS_DB_NAME)),))
+    conn.execute("PRAGMA ops.journal_mode=WAL")
+    conn.execute("PRAGMA ops.synchronous=NORMAL")
     conn.row_factory = sqlite3.Row
     return conn
 
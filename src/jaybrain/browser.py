@@ -3,6 +3,11 @@
 Provides Playwright-based browser control via MCP tools.
 Uses accessibility tree snapshots with element refs for interaction.
 
+Callers pick a handle name; each handle is an isolated browser session
+(own browser, context, pages and element refs) driven by its own worker
+thread, so several sessions can automate in parallel. Functions called
+directly (not through submit/run) use the default handle.
+
 Requires: pip install jaybrain[render] && playwright install chromium
 """
 
@@ -15,6 +20,8 @@ import os
 import subprocess
 import threading
 import time
+from collections.abc import MutableMapping
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
@@ -22,31 +29,205 @@ from .config import DATA_DIR
 
 logger = logging.getLogger("jaybrain.browser")
 
-# Reentrant lock protecting _state.  RLock (not Lock) so that nested calls
-# like launch_browser -> close_browser don't deadlock.
-_lock = threading.RLock()
+DEFAULT_HANDLE = "default"
+
+# Max live browser handles. Each handle owns a worker thread, a Playwright
+# driver and a browser; when the pool is full the least recently used idle
+# handle is closed to make room.
+MAX_BROWSER_HANDLES = 4
+
+
+def _new_state() -> dict:
+    """Browser state for one handle - persists across tool calls."""
+    return {
+        "playwright": None,
+        "browser": None,
+        "context": None,
+        "page": None,
+        "_element_refs": [],  # [{ref, role, name, nth}] from last snapshot
+        "_ref_registry": {},  # (role, name, nth) -> ref, stable for the current page
+        "_snapshot_baseline": None,  # {url, lines} of the last snapshot, for diffs
+        "_headless": True,
+        "_stealth": False,
+        "_cdp_endpoint": None,  # CDP WebSocket URL when using connect_over_cdp
+    }
+
+
+class _Handle:
+    """One isolated browser session: state, lock and a dedicated thread.
+
+    Playwright's sync API objects must only be used from the thread that
+    created them, so every call for a handle runs on that handle's own
+    single-thread executor. Different handles run in parallel.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = _new_state()
+        # Reentrant so nested calls like launch_browser -> close_browser
+        # don't deadlock.
+        self.lock = threading.RLock()
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.pending = 0
+        self.last_used = time.monotonic()
+
+    def ensure_executor(self) -> ThreadPoolExecutor:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"pw-{self.name}"[:40],
+            )
+        return self.executor
+
+
+_handles: dict[str, _Handle] = {}
+_handles_lock = threading.Lock()
+_local = threading.local()
+
+
+def _get_handle(name: str) -> _Handle:
+    with _handles_lock:
+        handle = _handles.get(name)
+        if handle is None:
+            handle = _handles[name] = _Handle(name)
+        return handle
+
+
+def _current() -> _Handle:
+    """Handle whose call is running on this thread (default handle otherwise)."""
+    handle = getattr(_local, "handle", None)
+    return handle if handle is not None else _get_handle(DEFAULT_HANDLE)
+
+
+class _StateProxy(MutableMapping):
+    """Routes _state[...] to the current handle's state dict."""
+
+    def __getitem__(self, key):
+        return _current().state[key]
+
+    def __setitem__(self, key, value):
+        _current().state[key] = value
+
+    def __delitem__(self, key):
+        del _current().state[key]
+
+    def __iter__(self):
+        return iter(_current().state)
+
+    def __len__(self):
+        return len(_current().state)
+
+
+_state = _StateProxy()
 
 
 def _synchronized(func):
-    """Decorator that holds _lock for the entire function call."""
+    """Decorator that holds the current handle's lock for the entire call."""
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        with _lock:
+        with _current().lock:
             return func(*args, **kwargs)
     return wrapper
 
 
-# Browser state singleton - persists across tool calls within a session
-_state: dict = {
-    "playwright": None,
-    "browser": None,
-    "context": None,
-    "page": None,
-    "_element_refs": [],  # [{ref, role, name}] from last snapshot
-    "_headless": True,
-    "_stealth": False,
-    "_cdp_endpoint": None,  # CDP WebSocket URL when using connect_over_cdp
-}
+def _run_bound(handle: _Handle, fn, args, kwargs):
+    _local.handle = handle
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _local.handle = None
+        handle.last_used = time.monotonic()
+
+
+def _evict_for(name: str) -> None:
+    """Close least recently used idle handles until a new one fits.
+
+    Caller must hold _handles_lock.
+    """
+    live = [h for h in _handles.values() if h.executor is not None and h.name != name]
+    while len(live) >= MAX_BROWSER_HANDLES:
+        idle = [h for h in live if h.pending == 0]
+        if not idle:
+            raise RuntimeError(
+                f"Browser pool full ({MAX_BROWSER_HANDLES} handles busy). "
+                "Close a handle with browser_close() and retry."
+            )
+        victim = min(idle, key=lambda h: h.last_used)
+        logger.info("Browser pool full, closing idle handle %r", victim.name)
+        live.remove(victim)
+        _handles.pop(victim.name, None)
+        victim.executor.submit(_run_bound, victim, close_browser, (), {})
+        victim.executor.shutdown(wait=False)
+        victim.executor = None
+
+
+def submit(handle: str | None, fn, *args, **kwargs) -> Future:
+    """Run a browser function on the handle's own Playwright thread.
+
+    handle: Caller-chosen session name ("" or None = the default handle).
+    Each handle has its own browser, context, pages and element refs.
+    """
+    name = handle or DEFAULT_HANDLE
+    with _handles_lock:
+        h = _handles.get(name)
+        if h is None or h.executor is None:
+            _evict_for(name)
+            if h is None:
+                h = _handles[name] = _Handle(name)
+        # Queue under the lock: release_handle() and eviction shut the
+        # executor down after popping the handle, so a call submitted here
+        # runs ahead of their close instead of hitting a closed executor.
+        future = h.ensure_executor().submit(_run_bound, h, fn, args, kwargs)
+        h.pending += 1
+        h.last_used = time.monotonic()
+
+    def _done(_future):
+        with _handles_lock:
+            h.pending -= 1
+
+    # Outside the lock: the callback runs inline if the call already finished.
+    future.add_done_callback(_done)
+    return future
+
+
+def run(handle: str | None, fn, *args, **kwargs):
+    """Blocking form of submit()."""
+    return submit(handle, fn, *args, **kwargs).result()
+
+
+def list_handles() -> dict:
+    """Describe live browser handles (no Playwright calls)."""
+    now = time.monotonic()
+    with _handles_lock:
+        handles = []
+        for h in _handles.values():
+            page = h.state["page"]
+            handles.append({
+                "handle": h.name,
+                "browser_open": h.state["browser"] is not None,
+                "url": page.url if page is not None else None,
+                "busy": h.pending > 0,
+                "idle_seconds": round(now - h.last_used, 1),
+            })
+    return {"handles": handles, "count": len(handles), "max_handles": MAX_BROWSER_HANDLES}
+
+
+def release_handle(handle: str | None) -> dict:
+    """Close a handle's browser and stop its thread."""
+    name = handle or DEFAULT_HANDLE
+    # Unregister first: calls already queued on the handle still run before
+    # the close, and later submits for this name start a fresh handle.
+    with _handles_lock:
+        h = _handles.pop(name, None)
+        if h is None:
+            return {"status": "not_found", "handle": name}
+        executor = h.ensure_executor()
+        h.executor = None
+    try:
+        result = executor.submit(_run_bound, h, close_browser, (), {}).result()
+    finally:
+        executor.shutdown(wait=False)
+    return {**result, "handle": name}
+
 
 # Default CDP port for cross-process browser reconnection
 CDP_DEFAULT_PORT = 9222
@@ -84,7 +265,7 @@ SNAPSHOT_MAX_LINES = 500
 def _ensure_playwright(stealth: bool | None = None):
     """Import and start Playwright (or Patchright in stealth mode).
 
-    Caller must hold _lock.
+    Caller must hold the handle's lock.
     """
     use_stealth = stealth if stealth is not None else _state["_stealth"]
 
@@ -123,96 +304,67 @@ def _ensure_page() -> object:
     return page
 
 
-def _build_snapshot(tree: dict | None) -> tuple[str, list[dict]]:
-    """Walk accessibility tree, assign refs to interactive elements.
+_HIDDEN_ROLES = ("generic", "none", "presentation", "Group")
 
-    Returns (text_representation, element_refs_list).
-    """
-    if not tree:
-        return "(empty page)", []
 
-    elements: list[dict] = []
-    ref_counter = [0]
-    line_counter = [0]
+def _tree_entries(tree: dict | None) -> list[dict]:
+    """Flatten an accessibility tree into the nodes shown in snapshots.
 
-    def walk(node: dict, depth: int = 0) -> list[str]:
-        if line_counter[0] >= SNAPSHOT_MAX_LINES:
-            return []
+    Each entry is {role, name, value, depth, interactive}. Depth only
+    counts shown ancestors, like the snapshot's indentation.
+    """
+    entries: list[dict] = []
+    if not tree:
+        return entries
 
+    def walk(node: dict, depth: int) -> None:
         role = node.get("role", "")
         name = (node.get("name", "") or "").strip()
-        value = node.get("value", "")
-
-        is_interactive = role in INTERACTIVE_ROLES
-        ref = None
-
-        if is_interactive:
-            ref_counter[0] += 1
-            ref = ref_counter[0]
-            elements.append({"ref": ref, "role": role, "name": name})
-
-        indent = "  " * min(depth, 10)
-        line = ""
-
-        if ref:
-            display_name = name if name else "(unnamed)"
-            line = f"{indent}[{ref}] {role} \"{display_name}\""
-        elif role in STRUCTURAL_ROLES:
-            if name:
-                line = f"{indent}{role} \"{name}\""
-            else:
-                line = f"{indent}{role}"
-        elif name and role not in ("generic", "none", "presentation", "Group"):
-            line = f"{indent}{role} \"{name}\""
-
-        if value and line:
-            line += f" value=\"{value}\""
-
-        lines = []
-        if line.strip():
-            lines.append(line)
-            line_counter[0] += 1
-
+        interactive = role in INTERACTIVE_ROLES
+        shown = (
+            interactive
+            or role in STRUCTURAL_ROLES
+            or bool(name and role not in _HIDDEN_ROLES)
+        )
+        if shown:
+            entries.append({
+                "role": role,
+                "name": name,
+                "value": node.get("value", ""),
+                "depth": depth,
+                "interactive": interactive,
+            })
         for child in node.get("children", []):
-            lines.extend(walk(child, depth + (1 if line.strip() else 0)))
-
-        return lines
+            walk(child, depth + (1 if shown else 0))
 
-    text_lines = walk(tree)
+    walk(tree, 0)
+    return entries
 
-    if line_counter[0] >= SNAPSHOT_MAX_LINES:
-        text_lines.append(f"  ... (truncated at {SNAPSHOT_MAX_LINES} lines)")
 
-    return "\n".join(text_lines), elements
-
-
-def _build_snapshot_from_aria(raw: str) -> tuple[str, list[dict]]:
-    """Parse Patchright's aria_snapshot() YAML-like output into our ref format.
+def _aria_entries(raw: str) -> list[dict]:
+    """Parse Patchright's aria_snapshot() YAML-like output into entries.
 
     Input lines look like:
       - heading "Example Domain" [level=1]
       - link "Learn more":
       - textbox "Search"
+    Text content lines become entries with text=True.
     """
-    elements: list[dict] = []
-    ref_counter = [0]
-    output_lines: list[str] = []
-
+    entries: list[dict] = []
     for line in raw.split("\n"):
         stripped = line.lstrip()
+        depth = (len(line) - len(stripped)) // 2
         if not stripped.startswith("- "):
             # Text content or continuation - include as-is
             if stripped and not stripped.startswith("/"):
-                indent = len(line) - len(stripped)
-                output_lines.append("  " * (indent // 2) + stripped)
+                entries.append({
+                    "role": "", "name": stripped, "value": "", "depth": depth,
+                    "interactive": False, "text": True,
+                })
             continue
 
         # Parse "- role "name" [attrs]:" or "- role:"
         content = stripped[2:].rstrip(":")
-        indent = len(line) - len(stripped)
-        depth = indent // 2
-
-        # Extract role and name
         parts = content.split(" ", 1)
         role = parts[0].strip()
         name = ""
@@ -224,26 +376,147 @@ def _build_snapshot_from_aria(raw: str) -> tuple[str, list[dict]]:
                 if end_quote != -1:
                     name = rest[1:end_quote]
 
-        is_interactive = role in INTERACTIVE_ROLES
-        prefix = "  " * min(depth, 10)
+        interactive = role in INTERACTIVE_ROLES
+        if interactive or role in STRUCTURAL_ROLES or name:
+            entries.append({
+                "role": role, "name": name, "value": "", "depth": depth,
+                "interactive": interactive,
+            })
+    return entries
+
+
+def _assign_refs(entries: list[dict], registry: dict | None = None) -> list[dict]:
+    """Give every entry a stable key and every interactive entry a ref.
+
+    The key is (role, name, n) where n counts earlier entries with the same
+    role and name. registry maps keys to refs from earlier snapshots of the
+    same page, so an element keeps its ref while other nodes come and go;
+    new elements get the next unused number. Returns the element refs list.
+    """
+    registry = {} if registry is None else registry
+    next_ref = max(registry.values(), default=0) + 1
+    seen: dict[tuple, int] = {}
+    elements: list[dict] = []
+    for entry in entries:
+        base = (entry["role"], entry["name"])
+        entry["nth"] = seen.get(base, 0)
+        seen[base] = entry["nth"] + 1
+        entry["key"] = base + (entry["nth"],)
+        if entry["interactive"]:
+            ref = registry.get(entry["key"])
+            if ref is None:
+                ref = registry[entry["key"]] = next_ref
+                next_ref += 1
+            entry["ref"] = ref
+            elements.append({
+                "ref": ref, "role": entry["role"], "name": entry["name"],
+                "nth": entry["nth"],
+            })
+    return elements
+
+
+def _format_entry(entry: dict, indent: bool = True) -> str:
+    prefix = "  " * min(entry["depth"], 10) if indent else ""
+    role, name = entry["role"], entry["name"]
+    if entry.get("ref"):
+        line = f'{prefix}[{entry["ref"]}] {role} "{name if name else "(unnamed)"}"'
+    elif entry.get("text"):
+        line = f"{prefix}{name}"
+    elif name:
+        line = f'{prefix}{role} "{name}"'
+    else:
+        line = f"{prefix}{role}"
+    if entry.get("value"):
+        line += f' value="{entry["value"]}"'
+    return line
+
 
-        if is_interactive:
-            ref_counter[0] += 1
-            ref = ref_counter[0]
-            elements.append({"ref": ref, "role": role, "name": name})
-            display = name if name else "(unnamed)"
-            output_lines.append(f'{prefix}[{ref}] {role} "{display}"')
-        elif role in STRUCTURAL_ROLES or name:
-            if name:
-                output_lines.append(f'{prefix}{role} "{name}"')
-            else:
-                output_lines.append(f"{prefix}{role}")
+def _join_lines(lines: list[str]) -> str:
+    if len(lines) > SNAPSHOT_MAX_LINES:
+        lines = lines[:SNAPSHOT_MAX_LINES] + [f"  ... (truncated at {SNAPSHOT_MAX_LINES} lines)"]
+    return "\n".join(lines)
+
+
+def _build_snapshot(tree: dict | None) -> tuple[str, list[dict]]:
+    """Walk accessibility tree, assign refs to interactive elements.
+
+    Returns (text_representation, element_refs_list).
+    """
+    if not tree:
+        return "(empty page)", []
+    entries = _tree_entries(tree)
+    elements = _assign_refs(entries)
+    return _join_lines([_format_entry(e) for e in entries]), elements
+
+
+def _build_snapshot_from_aria(raw: str) -> tuple[str, list[dict]]:
+    """Parse Patchright's aria_snapshot() output into our ref format."""
+    entries = _aria_entries(raw)
+    elements = _assign_refs(entries)
+    return _join_lines([_format_entry(e) for e in entries]), elements
+
+
+def _diff_entries(previous: dict, entries: list[dict]) -> dict:
+    """Compare entries with the previous snapshot's {key: line} map.
+
+    Returns {"added": [...], "removed": [...], "changed": [...]} where added
+    and changed are current entries (document order) and removed are the
+    previous lines that disappeared. Indentation changes alone are ignored.
+    """
+    current = {e["key"]: _format_entry(e, indent=False) for e in entries}
+    return {
+        "added": [e for e in entries if e["key"] not in previous],
+        "changed": [
+            e for e in entries
+            if e["key"] in previous and previous[e["key"]] != current[e["key"]]
+        ],
+        "removed": [line for key, line in previous.items() if key not in current],
+    }
+
+
+# Accessible-name candidates of elements intersecting the viewport. Names
+# are normalized like Playwright's (collapsed whitespace) so snapshot
+# entries can be matched against them.
+_VIEWPORT_NAMES_JS = """() => {
+  const vw = window.innerWidth, vh = window.innerHeight, names = new Set();
+  const norm = (s) => (typeof s === 'string' ? s : '').replace(/\\s+/g, ' ').trim();
+  for (const el of document.querySelectorAll('body *')) {
+    const r = el.getBoundingClientRect();
+    if (!r.width || !r.height || r.bottom < 0 || r.right < 0 || r.top > vh || r.left > vw) continue;
+    const candidates = [el.getAttribute('aria-label'), el.getAttribute('alt'),
+      el.getAttribute('title'), el.getAttribute('placeholder'), el.value, el.innerText];
+    for (const l of (el.labels || [])) candidates.push(l.innerText);
+    for (const c of candidates) {
+      const t = norm(c);
+      if (t && t.length <= 500) names.add(t);
+    }
+  }
+  return Array.from(names);
+}"""
+
+
+def _filter_entries(
+    entries: list[dict],
+    roles: set[str] | None,
+    visible_names: set[str] | None,
+) -> list[dict]:
+    """Apply the role filter and viewport scope to snapshot entries."""
+    kept = []
+    for entry in entries:
+        if roles is not None and entry["role"].lower() not in roles:
+            continue
+        if visible_names is not None and \
+                " ".join(entry["name"].split()) not in visible_names:
+            continue
+        kept.append(entry)
+    return kept
 
-        if len(output_lines) >= SNAPSHOT_MAX_LINES:
-            output_lines.append(f"  ... (truncated at {SNAPSHOT_MAX_LINES} lines)")
-            break
 
-    return "\n".join(output_lines), elements
+def _reset_refs() -> None:
+    """Forget element refs and the diff baseline (page changed)."""
+    _state["_element_refs"] = []
+    _state["_ref_registry"] = {}
+    _state["_snapshot_baseline"] = None
 
 
 def _resolve_ref(ref: int) -> dict:
@@ -251,9 +524,10 @@ def _resolve_ref(ref: int) -> dict:
     for el in _state["_element_refs"]:
         if el["ref"] == ref:
             return el
+    available = ", ".join(str(el["ref"]) for el in _state["_element_refs"][:50])
     raise ValueError(
         f"Element ref [{ref}] not found. "
-        f"Available refs: 1-{len(_state['_element_refs'])}. "
+        f"Available refs: {available or 'none'}. "
         "Run browser_snapshot() to refresh."
     )
 
@@ -263,8 +537,10 @@ def _locate(page, ref: int | None = None, selector: str | None = None):
     if ref is not None:
         el = _resolve_ref(ref)
         locator = page.get_by_role(el["role"], name=el["name"])
-        if locator.count() > 1:
-            locator = locator.first
+        count = locator.count()
+        if count > 1:
+            nth = el.get("nth", 0)
+            locator = locator.nth(nth) if nth < count else locator.first
         return locator
     elif selector:
         return page.locator(selector)
@@ -311,7 +587,7 @@ def launch_browser(
         ),
     )
     _state["page"] = _state["context"].new_page()
-    _state["_element_refs"] = []
+    _reset_refs()
 
     result = {"status": "launched", "headless": headless, "stealth": stealth}
 
@@ -327,7 +603,7 @@ def launch_browser(
 def navigate(url: str) -> dict:
     """Navigate to a URL."""
     page = _ensure_page()
-    _state["_element_refs"] = []
+    _reset_refs()
     page.goto(url, wait_until="domcontentloaded", timeout=30000)
     return {
         "status": "navigated",
@@ -337,27 +613,83 @@ def navigate(url: str) -> dict:
 
 
 @_synchronized
-def snapshot() -> dict:
-    """Get accessibility tree snapshot with numbered element refs."""
+def snapshot(
+    full: bool = False,
+    viewport: bool = False,
+    roles: list[str] | None = None,
+) -> dict:
+    """Get accessibility tree snapshot with numbered element refs.
+
+    After the first snapshot of a page, only nodes added, removed or
+    changed since the previous snapshot are returned (lines prefixed
+    +, - and ~) unless full=True. Element refs are stable across
+    snapshots of the same page. viewport=True limits output to nodes
+    whose name is visible in the viewport; roles limits output to those
+    roles. Filters only affect what is returned: refs and the diff
+    baseline always cover the whole page.
+    """
     page = _ensure_page()
 
     if hasattr(page, "accessibility"):
         # Standard Playwright path
-        tree = page.accessibility.snapshot()
-        text, elements = _build_snapshot(tree)
+        entries = _tree_entries(page.accessibility.snapshot())
     else:
         # Patchright path - use aria_snapshot() and parse
-        raw = page.locator(":root").aria_snapshot()
-        text, elements = _build_snapshot_from_aria(raw)
-
+        entries = _aria_entries(page.locator(":root").aria_snapshot())
+
+    url = page.url
+    baseline = _state.get("_snapshot_baseline")
+    if baseline is not None and baseline["url"] != url:
+        _reset_refs()  # navigated without going through navigate()
+        baseline = None
+    if not _state.get("_ref_registry"):
+        _state["_ref_registry"] = {}
+    elements = _assign_refs(entries, _state["_ref_registry"])
     _state["_element_refs"] = elements
-    return {
+    _state["_snapshot_baseline"] = {
+        "url": url,
+        "lines": {e["key"]: _format_entry(e, indent=False) for e in entries},
+    }
+
+    full_lines = [_format_entry(e) for e in entries]
+    full_text = _join_lines(full_lines) if entries else "(empty page)"
+
+    role_filter = {r.lower() for r in roles} if roles else None
+    visible = set(page.evaluate(_VIEWPORT_NAMES_JS)) if viewport else None
+    filtered = role_filter is not None or visible is not None
+
+    result = {
         "status": "ok",
-        "url": page.url,
+        "url": url,
         "title": page.title(),
-        "snapshot": text,
         "interactive_elements": len(elements),
     }
+    if full or baseline is None:
+        shown = _filter_entries(entries, role_filter, visible) if filtered else entries
+        text = full_text if not filtered else (
+            _join_lines([_format_entry(e) for e in shown]) or "(no matching nodes)"
+        )
+        result["mode"] = "full"
+    else:
+        diff = _diff_entries(baseline["lines"], entries)
+        added = _filter_entries(diff["added"], role_filter, visible)
+        changed = _filter_entries(diff["changed"], role_filter, visible)
+        lines = [f"+ {_format_entry(e, indent=False)}" for e in added]
+        lines += [f"~ {_format_entry(e, indent=False)}" for e in changed]
+        lines += [f"- {line}" for line in diff["removed"]]
+        text = _join_lines(lines) or "(no changes)"
+        result["mode"] = "diff"
+        result["changes"] = {
+            "added": len(added), "removed": len(diff["removed"]), "changed": len(changed),
+        }
+
+    result["snapshot"] = text
+    result["size"] = {
+        "full_lines": len(full_lines),
+        "full_chars": len(full_text),
+        "returned_chars": len(text),
+    }
+    return result
 
 
 @_synchronized
@@ -488,7 +820,7 @@ def close_browser() -> dict:
     _state["browser"] = None
     _state["context"] = None
     _state["page"] = None
-    _state["_element_refs"] = []
+    _reset_refs()
     _state["_stealth"] = False
 
     return {"status": "closed"}
@@ -688,7 +1020,7 @@ def connect_to_cdp(endpoint: str = "") -> dict:
         )
         _state["page"] = _state["context"].new_page()
 
-    _state["_element_refs"] = []
+    _reset_refs()
 
     page = _state["page"]
     return {
@@ -717,7 +1049,7 @@ def disconnect_cdp() -> dict:
     _state["browser"] = None
     _state["context"] = None
     _state["page"] = None
-    _state["_element_refs"] = []
+    _reset_refs()
 
     return {"status": "disconnected", "browser_still_running": True}
 
@@ -792,7 +1124,7 @@ def session_load(
         storage_state=storage_state,
     )
     _state["page"] = _state["context"].new_page()
-    _state["_element_refs"] = []
+    _reset_refs()
 
     cookie_count = len(storage_state.get("cookies", []))
     result = {
@@ -991,7 +1323,7 @@ def go_back() -> dict:
     """Navigate back in browser history."""
     page = _ensure_page()
     page.go_back(wait_until="domcontentloaded", timeout=10000)
-    _state["_element_refs"] = []
+    _reset_refs()
     return {
         "status": "navigated_back",
         "url": page.url,
@@ -1004,7 +1336,7 @@ def go_forward() -> dict:
     """Navigate forward in browser history."""
     page = _ensure_page()
     page.go_forward(wait_until="domcontentloaded", timeout=10000)
-    _state["_element_refs"] = []
+    _reset_refs()
     return {
         "status": "navigated_forward",
         "url": page.url,
@@ -1043,7 +1375,7 @@ def tab_new(url: str = "") -> dict:
 
     new_page = _state["context"].new_page()
     _state["page"] = new_page
-    _state["_element_refs"] = []
+    _reset_refs()
 
     result = {"status": "opened", "tab_count": len(_state["context"].pages)}
 
@@ -1070,7 +1402,7 @@ def tab_switch(index: int) -> dict:
         )
 
     _state["page"] = pages[index]
-    _state["_element_refs"] = []
+    _reset_refs()
 
     return {
         "status": "switched",
@@ -1102,10 +1434,10 @@ def tab_close(index: int | None = None) -> dict:
     remaining = [p for p in _state["context"].pages if not p.is_closed()]
     if remaining:
         _state["page"] = remaining[-1]
-        _state["_element_refs"] = []
+        _reset_refs()
     else:
         _state["page"] = None
-        _state["_element_refs"] = []
+        _reset_refs()
 
     return {
         "status": "closed_tab",
@@ -48,6 +48,7 @@ def _init_env_vars() -> None:
     global TELEGRAM_BOT_TOKEN, TELEGRAM_AUTHORIZED_USER
     global ANTHROPIC_API_KEY, GRAMCRACKER_CLAUDE_MODEL
     global HOMELAB_JOURNAL_FILENAME, LIFE_DOMAINS_DOC_ID, EVENTBRITE_API_KEY
+    global GOOGLE_API_ENDPOINT, ANTHROPIC_BASE_URL
 
     SERVICE_ACCOUNT_PATH = Path(
         os.environ.get(
@@ -59,6 +60,7 @@ def _init_env_vars() -> None:
     GDOC_FOLDER_ID = os.environ.get("GDOC_FOLDER_ID", "")
     HOMELAB_TOOLS_SHEET_ID = os.environ.get("HOMELAB_TOOLS_SHEET_ID", "")
     SHEETS_INDEX_ID = os.environ.get("SHEETS_INDEX_ID", "")
+    GOOGLE_API_ENDPOINT = os.environ.get("JAYBRAIN_GOOGLE_API_ENDPOINT", "")
     NEWSAPI_KEY = os.environ.get("NEWSAPI_KEY", "")
 
     TELEGRAM_BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN", "")
@@ -73,6 +75,7 @@ def _init_env_vars() -> None:
         )
 
     ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY", "")
+    ANTHROPIC_BASE_URL = os.environ.get("JAYBRAIN_ANTHROPIC_BASE_URL", "")
     GRAMCRACKER_CLAUDE_MODEL = os.environ.get(
         "GRAMCRACKER_CLAUDE_MODEL", "claude-sonnet-4-20250514"
     )
@@ -82,6 +85,12 @@ def _init_env_vars() -> None:
     LIFE_DOMAINS_DOC_ID = os.environ.get("LIFE_DOMAINS_DOC_ID", "")
     EVENTBRITE_API_KEY = os.environ.get("EVENTBRITE_API_KEY", "")
 
+    global PERF_ENABLED
+    PERF_ENABLED = os.environ.get("JAYBRAIN_PERF", "").lower() in ("1", "true", "yes")
+
+    global WRITER_ENABLED
+    WRITER_ENABLED = os.environ.get("JAYBRAIN_WRITER", "").lower() in ("1", "true", "yes")
+
     global FEEDLY_ACCESS_TOKEN, FEEDLY_STREAM_ID, FEEDLY_POLL_INTERVAL_MINUTES
     FEEDLY_ACCESS_TOKEN = os.environ.get("FEEDLY_ACCESS_TOKEN", "")
     FEEDLY_STREAM_ID = os.environ.get("FEEDLY_STREAM_ID", "")
@@ -95,6 +104,7 @@ def _init_env_vars() -> None:
 
 DATA_DIR = PROJECT_ROOT / "data"
 DB_PATH = DATA_DIR / "jaybrain.db"
+OPS_DB_FILENAME = "jaybrain_ops.db"  # high-churn logs, next to DB_PATH
 MEMORIES_DIR = DATA_DIR / "memories"
 SESSIONS_DIR = DATA_DIR / "sessions"
 ACTIVE_SESSION_FILE = DATA_DIR / ".active_session"
@@ -130,6 +140,9 @@ OAUTH_SCOPES = [
     "https://www.googleapis.com/auth/gmail.readonly",
     "https://www.googleapis.com/auth/calendar.readonly",
 ]
+# Redirect all Google API clients to another host (e.g. a local fake server).
+# Empty means the real Google endpoints.
+GOOGLE_API_ENDPOINT = ""
 
 # NewsAPI configuration
 NEWSAPI_KEY = ""
@@ -139,6 +152,15 @@ NEWSAPI_BASE_URL = "https://newsapi.org/v2"
 SCRAPE_TIMEOUT = 30  # seconds
 SCRAPE_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
 SCRAPE_MAX_PAGES = 3  # default pagination pages to follow
+SCRAPE_MAX_RETRIES = 2  # HTTP retries on connection errors / 429 / 5xx
+SCRAPE_RETRY_BACKOFF = 0.5  # seconds, doubled per retry (honours Retry-After)
+SCRAPE_RETRY_AFTER_MAX = 10  # longest Retry-After honoured, in seconds (fetches hold their domain slot)
+SCRAPE_POOL_MAXSIZE = 10  # keep-alive connections kept per host
+SCRAPE_BLOCK_RESOURCES = True  # skip images/fonts/media when rendering with Playwright
+SCRAPE_BROWSER_IDLE_SECONDS = 300  # close pooled browser contexts (then Chromium) after this idle time
+SCRAPE_PER_DOMAIN_CONCURRENCY = 2  # simultaneous fetches/renders per host
+SCRAPE_PREFETCH_PAGES = 2  # predicted ?page=N pages fetched ahead while paginating
+JOB_BOARD_FETCH_WORKERS = 8  # boards fetched in parallel by auto_fetch_boards
 
 # Embedding model
 EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
@@ -244,7 +266,10 @@ GRAPH_RELATIONSHIP_TYPES = [
     "works_at", "created_by", "collaborates_with", "learned_from",
 ]
 GRAPH_DEFAULT_DEPTH = 1
-GRAPH_MAX_DEPTH = 3
+GRAPH_MAX_DEPTH = 6
+GRAPH_PATH_MAX_DEPTH = 8         # hop limit for shortest-path queries
+GRAPH_ADJACENCY_CACHE = True     # keep an in-process CSR adjacency for traversal
+GRAPH_FUZZY_MIN_SIMILARITY = 0.3  # trigram Jaccard floor for fuzzy entity search
 
 # --- GramCracker (Telegram bot) ---
 TELEGRAM_BOT_TOKEN = ""  # nosec B105 -- empty default, real value set by init()
@@ -256,9 +281,22 @@ TELEGRAM_RATE_LIMIT_WINDOW = 60
 TELEGRAM_RATE_LIMIT_MAX = 20
 TELEGRAM_HISTORY_LIMIT = 30
 TELEGRAM_MAX_RESPONSE_TOKENS = 4096
+TELEGRAM_TOOL_WORKERS = 4  # concurrent read-only tool calls per Claude round
+TELEGRAM_SYSTEM_PROMPT_TTL = 300  # seconds before the live-context system prompt is rebuilt
+TELEGRAM_STREAM_EDIT_INTERVAL = 1.5  # min seconds between streamed message edits
+TELEGRAM_STREAM_MIN_CHARS = 40  # don't post a streaming draft until this much text
 ANTHROPIC_API_KEY = ""
 GRAMCRACKER_CLAUDE_MODEL = "claude-sonnet-4-20250514"
 
+# --- LLM call layer (Anthropic API) ---
+ANTHROPIC_BASE_URL = ""  # override API host (env JAYBRAIN_ANTHROPIC_BASE_URL), e.g. a mock server
+LLM_MAX_CONCURRENCY = 4  # process-wide cap on in-flight Claude requests
+LLM_MAX_RETRIES = 4  # retries on 429/529/5xx/connection errors
+LLM_RETRY_BASE_DELAY = 1.0  # seconds; doubled per attempt, plus jitter
+LLM_RETRY_MAX_DELAY = 30.0
+LLM_BATCH_POLL_INTERVAL = 30.0  # seconds between Message Batches status polls
+LLM_BATCH_TIMEOUT = 3600.0  # give up (and cancel) a batch after this long
+
 # Homelab project paths (file-based, not in SQLite)
 HOMELAB_ROOT = Path(os.path.expanduser("~")) / "projects" / "homelab"
 HOMELAB_NOTES_DIR = HOMELAB_ROOT / "notes"
@@ -276,11 +314,17 @@ HOMELAB_JOURNAL_FILENAME = "Learn Out Loud Lab_{date}.md"
 FILE_WATCHER_ENABLED = True
 FILE_WATCHER_PATHS = [str(PROJECT_ROOT)]
 FILE_WATCHER_IGNORE_PATTERNS: list[str] = []  # additional patterns beyond defaults
+FILE_WATCHER_QUEUE_MAX = 10000  # pending events beyond this are dropped (and counted)
+FILE_WATCHER_BATCH_SIZE = 500  # flush when this many events are pending...
+FILE_WATCHER_FLUSH_INTERVAL = 2.0  # ...or this many seconds after the first one
+FILE_WATCHER_FOLD_WINDOW = 300  # rows written this long before a dir deletion fold into it
 
 # --- GitShadow (Working Tree Snapshots) ---
 GIT_SHADOW_ENABLED = True
 GIT_SHADOW_INTERVAL_SECONDS = 600  # 10 minutes
 GIT_SHADOW_REPO_PATHS = [str(PROJECT_ROOT)]
+GIT_SHADOW_WORKERS = 4  # repos snapshotted in parallel
+GIT_SHADOW_SKIP_LOG_DAYS = 7  # keep unchanged/clean skip records this long
 
 
 # --- Daemon ---
@@ -291,6 +335,12 @@ DAEMON_HEARTBEAT_INTERVAL = 60  # seconds between heartbeat writes
 # --- Daily Briefing ---
 DAILY_BRIEFING_HOUR = 7
 DAILY_BRIEFING_MINUTE = 0
+BRIEFING_COLLECTOR_WORKERS = 6  # thread pool size for section collectors
+BRIEFING_COLLECTOR_TIMEOUT = 30  # seconds before a section renders as unavailable
+BRIEFING_COLLECTOR_TIMEOUTS = {  # per-section overrides of the default timeout
+    "news": 40,  # two sequential NewsAPI requests
+}
+BRIEFING_CACHE_TTL_SECONDS = 1800  # email + Telegram briefings share one collection pass
 
 # --- Conversation Archive ---
 CLAUDE_PROJECTS_DIR = Path(os.path.expanduser("~")) / ".claude" / "projects"
@@ -359,6 +409,8 @@ SIGNALFORGE_SYNTHESIS_MAX_TOKENS_PER_CLUSTER = 600
 SIGNALFORGE_SYNTHESIS_MAX_TOKENS_COMBINE = 1500
 SIGNALFORGE_SYNTHESIS_EXCERPT_CHARS = 500
 SIGNALFORGE_SYNTHESIS_MIN_SIGNIFICANCE = 2.0
+SIGNALFORGE_SYNTHESIS_USE_BATCH = False  # scheduled runs via Message Batches (cheaper, slower)
+SIGNALFORGE_SUMMARY_CACHE_DAYS = 30  # drop memoized cluster summaries unused this long
 # SignalForge HTTP feed
 SIGNALFORGE_FEED_PORT = int(os.environ.get("SIGNALFORGE_FEED_PORT", "8247"))
 
@@ -380,6 +432,86 @@ TRASH_RETENTION_BY_CATEGORY = {
     "general": 30,
 }
 
+# --- MCP Tool Execution Lanes ---
+# Blocking tools run on bounded per-lane thread pools instead of the
+# server's event loop: "cpu" = embedding/ONNX inference, "io" = network
+# calls (Google, Anthropic, feeds), "db" = everything else (SQLite).
+TOOL_LANE_WORKERS = {"cpu": 2, "io": 8, "db": 4}
+TOOL_TIMEOUT = 120.0  # seconds before a tool call returns a timeout error
+TOOL_TIMEOUTS = {  # per-tool overrides for known long operations
+    "daily_briefing_send": 300.0,
+    "conversation_archive_run": 600.0,
+    "event_discover": 300.0,
+    "feedly_fetch": 300.0,
+    "forge_backup": 300.0,
+    "forge_reembed": 900.0,
+    "fts_rebuild": 900.0,
+    "job_board_fetch": 300.0,
+    "news_feed_poll": 600.0,
+    "signalforge_synthesize": 900.0,
+}
+TOOL_JOB_RETENTION_SECONDS = 3600  # finished background jobs kept for polling
+TOOL_JOB_MAX_FINISHED = 100
+
+# --- Performance Instrumentation (opt-in) ---
+# Latency histograms for MCP tools, daemon modules, SQL statements and
+# embedding calls, rolled up hourly into perf_rollups. Off by default;
+# enable with env JAYBRAIN_PERF=1.
+PERF_ENABLED = False
+PERF_FLUSH_INTERVAL = 60  # seconds between in-memory -> perf_rollups flushes
+PERF_ROLLUP_RETENTION_DAYS = 60
+PERF_TOP_N = 10  # slowest queries / names shown by perf_report
+PERF_REGRESSION_RATIO = 1.5  # p95 growth vs the same window last week to flag
+PERF_REGRESSION_MIN_COUNT = 20  # samples needed in both windows to compare
+
+# --- Operational Log Database ---
+# session/daemon/telegram/file/git/heartbeat/watchdog logs live in
+# jaybrain_ops.db (own WAL), attached to every connection as schema "ops".
+OPS_MIGRATION_CHUNK_ROWS = 5000  # rows per commit when moving logs out of jaybrain.db
+OPS_MAINTENANCE_HOUR = 4  # daily retention prune + WAL checkpoint (local time)
+OPS_LOG_RETENTION_DAYS = {  # 0 or missing = keep forever
+    "session_activity_log": 30,
+    "daemon_execution_log": 90,
+    "telegram_send_log": 90,
+    "heartbeat_log": 90,
+    "watchdog_log": 90,
+    "file_deletion_log": 365,
+    "git_shadow_log": 365,
+    "db_maintenance_log": 30,
+}
+
+# --- Database Maintenance (daemon db_maintenance module) ---
+# Small, frequent steps instead of a full VACUUM: WAL checkpoints sized by
+# the -wal file, PRAGMA optimize, incremental_vacuum slices and a rotating
+# per-table quick_check, for jaybrain.db and jaybrain_ops.db.
+MAINT_INTERVAL_MINUTES = 15
+MAINT_WAL_PASSIVE_BYTES = 4 * 1024 * 1024  # PASSIVE checkpoint above this -wal size
+MAINT_WAL_TRUNCATE_BYTES = 64 * 1024 * 1024  # TRUNCATE checkpoint above this
+MAINT_CHECKPOINT_BUSY_MS = 2000  # max wait on readers/writers for TRUNCATE
+MAINT_OPTIMIZE_INTERVAL_HOURS = 6
+MAINT_VACUUM_SLICE_PAGES = 256  # pages per incremental_vacuum slice (one commit each)
+MAINT_VACUUM_MAX_SLICES = 8  # per database per run
+MAINT_QUICK_CHECK_TABLES = 2  # tables quick_check'ed per database per run
+
+# --- Full-Text Search Indexes ---
+# FTS5 indexes are external-content (the text lives only in the source
+# table) and rebuilt online by maintenance.rebuild_fts in chunks.
+FTS_REBUILD_CHUNK_ROWS = 2000  # source rows indexed per commit during a rebuild
+# detail level per FTS table, applied on its next rebuild_fts. "column"
+# shrinks the index several-fold but FTS5 then rejects phrase queries, and
+# fts5_safe_query turns a term like foo_bar into the phrase "foo bar".
+FTS_DETAIL: dict[str, str] = {}  # e.g. {"knowledge_fts": "column"}
+
+# --- Write Coordinator (opt-in) ---
+# One writer thread per process owns the write connection and group-commits
+# queued write ops in short windows. Off by default; enable with env
+# JAYBRAIN_WRITER=1.
+WRITER_ENABLED = False
+WRITER_BATCH_WINDOW_MS = 2.0  # how long a batch collects ops before committing
+WRITER_MAX_BATCH = 256  # ops per group commit
+WRITER_QUEUE_MAX = 10000  # submitters block when this many ops are queued
+WRITER_LOG_DURABILITY = "async"  # access counters and logs: "async" or "sync"
+
 # --- SSRF Protection ---
 # Hosts that are allowed to bypass private-IP checks (e.g., local services you trust).
 # Add entries like "192.168.1.50" or "my-homelab.local" if needed.
@@ -14,6 +14,7 @@ from .config import (
     CONSOLIDATION_DEFAULT_SIMILARITY,
     CONSOLIDATION_DUPLICATE_THRESHOLD,
     CONSOLIDATION_MAX_CLUSTER_SIZE,
+    WRITER_LOG_DURABILITY,
 )
 from .db import (
     get_connection,
@@ -27,6 +28,7 @@ from .db import (
 )
 from .memory import _parse_memory_row
 from .search import embed_text
+from .writer import write
 
 logger = logging.getLogger(__name__)
 
@@ -258,11 +260,12 @@ def merge_memories(
                 consolidation_run_id=run_id,
             )
 
-        insert_consolidation_log(
-            conn, run_id, "merge", memory_ids,
+        write(
+            conn, insert_consolidation_log, run_id, "merge", memory_ids,
             result_memory_id=new_id,
             merged_content_preview=merged_content[:200],
             reason=reason or f"Merged {len(memory_ids)} similar memories",
+            durability=WRITER_LOG_DURABILITY,
         )
 
         return {
@@ -298,9 +301,9 @@ def archive_memories(
                 not_found.append(mid)
 
         if archived:
-            insert_consolidation_log(
-                conn, run_id, "archive", archived,
-                reason=reason,
+            write(
+                conn, insert_consolidation_log, run_id, "archive", archived,
+                reason=reason, durability=WRITER_LOG_DURABILITY,
             )
 
         return {
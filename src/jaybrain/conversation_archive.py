@@ -247,7 +247,10 @@ def summarize_conversation(conversation: dict) -> str:
         }
         if sys.platform == "win32":
             kwargs["creationflags"] = 0x08000000  # CREATE_NO_WINDOW
-        result = subprocess.run([claude_cmd, "-p", prompt], **kwargs)
+        from .llm import slot
+
+        with slot():  # counts against LLM_MAX_CONCURRENCY with API calls
+            result = subprocess.run([claude_cmd, "-p", prompt], **kwargs)
         if result.returncode == 0 and result.stdout.strip():
             return result.stdout.strip()[:1000]
     except (FileNotFoundError, subprocess.TimeoutExpired, OSError) as e:
@@ -331,13 +334,22 @@ def run_archive() -> dict:
             "message": "No new conversations to archive",
         }
 
-    # Parse and summarize
-    summaries = []
+    # Parse, then summarize concurrently. Each summary is a separate
+    # `claude -p` process holding a shared LLM slot, so concurrent runs and
+    # API callers together stay within LLM_MAX_CONCURRENCY.
+    from .llm import map_concurrent
+
+    parsed_items = []
     for path in new_conversations:
         parsed = parse_conversation(path)
-        if not parsed.get("turns"):
-            continue
-        summary = summarize_conversation(parsed)
+        if parsed.get("turns"):
+            parsed_items.append((path, parsed))
+
+    summary_texts = map_concurrent(
+        summarize_conversation, [parsed for _, parsed in parsed_items],
+    )
+    summaries = []
+    for (path, parsed), summary in zip(parsed_items, summary_texts):
         summaries.append({
             "session_id": parsed["session_id"],
             "project_dir": parsed.get("project_dir", ""),
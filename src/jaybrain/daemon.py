@@ -32,6 +32,8 @@ from .config import (
     NETWORK_DECAY_NUDGE_HOUR,
     ensure_data_dirs,
 )
+from . import perf
+from .db import attach_ops
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +45,7 @@ def _get_raw_conn() -> sqlite3.Connection:
     conn.execute("PRAGMA busy_timeout=30000")
     conn.execute("PRAGMA synchronous=NORMAL")
     conn.row_factory = sqlite3.Row
+    attach_ops(conn, DB_PATH)  # daemon_execution_log lives in jaybrain_ops.db
     return conn
 
 
@@ -54,9 +57,15 @@ def _ensure_daemon_table(conn: sqlite3.Connection) -> None:
             started_at TEXT,
             last_heartbeat TEXT,
             modules TEXT NOT NULL DEFAULT '[]',
-            status TEXT NOT NULL DEFAULT 'stopped'
+            status TEXT NOT NULL DEFAULT 'stopped',
+            companions TEXT NOT NULL DEFAULT '{}'
         );
     """)
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(daemon_state)").fetchall()}
+    if "companions" not in cols:
+        conn.execute(
+            "ALTER TABLE daemon_state ADD COLUMN companions TEXT NOT NULL DEFAULT '{}'"
+        )
     conn.commit()
 
 
@@ -137,6 +146,7 @@ class DaemonManager:
             # Update the execution log with result
             end_time = datetime.now(timezone.utc)
             duration_ms = int((end_time - start_time).total_seconds() * 1000)
+            perf.record("daemon", module_name, (end_time - start_time).total_seconds() * 1000)
             summary = ""
             telegram_sent = 0
             if isinstance(result, dict):
@@ -184,6 +194,20 @@ class DaemonManager:
         except Exception:
             pass
 
+    def _companion_stats(self) -> str:
+        """JSON stats of companion threads (file watcher, writer) for daemon_status."""
+        from . import writer
+
+        companions = {}
+        if self._file_watcher:
+            try:
+                companions["file_watcher"] = self._file_watcher.stats()
+            except Exception:
+                logger.debug("File watcher stats failed", exc_info=True)
+        if writer.enabled():
+            companions["writer"] = writer.stats()
+        return json.dumps(companions)
+
     def _write_heartbeat(self) -> None:
         """Update daemon_state with current heartbeat.
 
@@ -215,13 +239,15 @@ class DaemonManager:
                     return
 
             conn.execute(
-                """INSERT INTO daemon_state (id, pid, started_at, last_heartbeat, modules, status)
-                VALUES (1, ?, ?, ?, ?, 'running')
+                """INSERT INTO daemon_state
+                (id, pid, started_at, last_heartbeat, modules, status, companions)
+                VALUES (1, ?, ?, ?, ?, 'running', ?)
                 ON CONFLICT(id) DO UPDATE SET
                     last_heartbeat = excluded.last_heartbeat,
                     modules = excluded.modules,
-                    status = 'running'""",
-                (self._pid, now, now, module_names),
+                    status = 'running',
+                    companions = excluded.companions""",
+                (self._pid, now, now, module_names, self._companion_stats()),
             )
             conn.commit()
         except Exception as e:
@@ -454,7 +480,8 @@ def get_daemon_status() -> dict:
         alive = _is_pid_alive(pid) if pid else False
 
         status = row["status"] if alive else "stopped"
-        return {
+        companions = json.loads(row["companions"]) if row["companions"] else {}
+        result = {
             "status": status,
             "pid": pid,
             "started_at": row["started_at"],
@@ -462,6 +489,22 @@ def get_daemon_status() -> dict:
             "modules": json.loads(row["modules"]) if row["modules"] else [],
             "process_alive": alive,
         }
+        if "file_watcher" in companions:
+            # As of the last heartbeat: queue depth, dropped events, batches
+            result["file_watcher"] = companions["file_watcher"]
+        if "writer" in companions:
+            # Write coordinator: queue depth, batch sizes, commit latency
+            result["writer"] = companions["writer"]
+        try:
+            from .maintenance import maintenance_status
+
+            # WAL size, free pages and time spent per database
+            maint = maintenance_status(conn)
+            if maint:
+                result["db_maintenance"] = maint
+        except sqlite3.OperationalError:
+            pass  # ops schema not initialized yet
+        return result
     finally:
         conn.close()
 
@@ -807,6 +850,34 @@ def build_daemon() -> DaemonManager:
     except Exception:
         logger.error("Failed to register scratch_cleanup module", exc_info=True)
 
+    # Phase: ops log retention + WAL checkpoint (daily)
+    try:
+        from .db import run_ops_maintenance
+        from .config import OPS_MAINTENANCE_HOUR
+
+        dm.register_module(
+            "ops_log_maintenance",
+            run_ops_maintenance,
+            CronTrigger(hour=OPS_MAINTENANCE_HOUR, minute=15),
+            "Daily retention prune and WAL checkpoint of jaybrain_ops.db",
+        )
+    except Exception:
+        logger.error("Failed to register ops_log_maintenance module", exc_info=True)
+
+    # Phase: incremental DB maintenance (checkpoints, optimize, vacuum slices)
+    try:
+        from .maintenance import run_db_maintenance
+        from .config import MAINT_INTERVAL_MINUTES
+
+        dm.register_module(
+            "db_maintenance",
+            run_db_maintenance,
+            IntervalTrigger(minutes=MAINT_INTERVAL_MINUTES),
+            "WAL checkpoints, PRAGMA optimize, incremental vacuum, rotating quick_check",
+        )
+    except Exception:
+        logger.error("Failed to register db_maintenance module", exc_info=True)
+
     # Start SignalForge HTTP feed as a background thread (not a scheduled job)
     try:
         from .signalforge_feed import start_feed_server
@@ -824,7 +895,8 @@ def build_daemon() -> DaemonManager:
         "trash_auto_cleanup", "trash_sweep", "git_shadow",
         "feedly_monitor", "news_feed_poll",
         "signalforge_fetch", "signalforge_cleanup", "signalforge_clustering",
-        "signalforge_synthesis", "scratch_cleanup",
+        "signalforge_synthesis", "scratch_cleanup", "ops_log_maintenance",
+        "db_maintenance",
     }
     registered = set(dm.modules)
     missing = expected_modules - registered
@@ -18,10 +18,13 @@ import os
 import re
 import sqlite3
 import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime, date, timedelta, timezone
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from typing import Optional
+from typing import Any, Callable, Optional
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -32,58 +35,27 @@ NETWORKING_SPREADSHEET_ID = os.environ.get("NETWORKING_SPREADSHEET_ID", "")
 NETWORKING_SHEET = "Networking"
 PIPELINE_SHEET = "Pipeline"
 
-# Use centralized scopes from config
-from .config import OAUTH_SCOPES
-
 logger = logging.getLogger("jaybrain.daily_briefing")
 
 # ---------------------------------------------------------------------------
-# Google Auth (reuses the same OAuth token file as gdocs.py)
+# Google Auth (shared with gdocs.py via google_clients)
 # ---------------------------------------------------------------------------
 
 
 def _get_google_credentials():
     """Load OAuth credentials for all Google API access.
 
-    Reuses the existing OAuth token from gdocs integration.
-    Supports Sheets, Gmail, Docs, and Drive via centralized scopes.
+    Reuses the existing OAuth token from gdocs integration (shared,
+    process-wide, via google_clients). Supports Sheets, Gmail, Docs, and
+    Drive via centralized scopes.
 
     Validates that the cached token has all required scopes (Mistake #014).
     In daemon context we cannot trigger re-auth, so on mismatch we return
     None with a clear warning so the error is visible in logs.
     """
-    try:
-        from google.auth.transport.requests import Request
-        from google.oauth2.credentials import Credentials
-
-        from .config import OAUTH_TOKEN_PATH
-
-        if not OAUTH_TOKEN_PATH.exists():
-            logger.warning("No OAuth token found at %s", OAUTH_TOKEN_PATH)
-            return None
+    from .google_clients import get_credentials
 
-        creds = Credentials.from_authorized_user_file(
-            str(OAUTH_TOKEN_PATH), OAUTH_SCOPES,
-        )
-
-        # Validate scopes match — if config added new scopes since
-        # the token was issued, reject it (Mistake #014 prevention).
-        # In daemon context we can't run OAuth flow, so fail loudly.
-        if creds and creds.scopes and set(OAUTH_SCOPES) - set(creds.scopes):
-            missing = set(OAUTH_SCOPES) - set(creds.scopes)
-            logger.error(
-                "OAuth token missing scopes %s — delete %s and re-auth via gdocs",
-                missing, OAUTH_TOKEN_PATH,
-            )
-            return None
-
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-
-        return creds if creds and creds.valid else None
-    except Exception as e:
-        logger.error("Failed to load Google credentials: %s", e, exc_info=True)
-        return None
+    return get_credentials(interactive=False)
 
 
 # ---------------------------------------------------------------------------
@@ -325,11 +297,9 @@ def collect_upcoming_deadlines(conn: sqlite3.Connection) -> list[dict]:
 def collect_networking_tracker(creds) -> dict:
     """Read the networking tracker from Google Sheets."""
     try:
-        from googleapiclient.discovery import build
+        from .google_clients import get_service
 
-        service = build(
-            "sheets", "v4", credentials=creds, cache_discovery=False,
-        )
+        service = get_service("sheets", "v4", creds)
         result = service.spreadsheets().values().get(
             spreadsheetId=NETWORKING_SPREADSHEET_ID,
             range=f"{NETWORKING_SHEET}!A1:Z100",
@@ -364,11 +334,9 @@ def collect_networking_tracker(creds) -> dict:
 def collect_pipeline_tracker(creds) -> list[dict]:
     """Read the job pipeline tracker from Google Sheets (supplements DB data)."""
     try:
-        from googleapiclient.discovery import build
+        from .google_clients import get_service
 
-        service = build(
-            "sheets", "v4", credentials=creds, cache_discovery=False,
-        )
+        service = get_service("sheets", "v4", creds)
         result = service.spreadsheets().values().get(
             spreadsheetId=NETWORKING_SPREADSHEET_ID,
             range=f"{PIPELINE_SHEET}!A1:Z100",
@@ -473,11 +441,9 @@ def collect_homelab() -> dict:
 def collect_calendar(creds) -> dict:
     """Collect today's calendar events from Google Calendar."""
     try:
-        from googleapiclient.discovery import build
+        from .google_clients import get_service
 
-        service = build(
-            "calendar", "v3", credentials=creds, cache_discovery=False,
-        )
+        service = get_service("calendar", "v3", creds)
 
         # Today's events: midnight to midnight in local time
         now = datetime.now()
@@ -616,6 +582,305 @@ def collect_signalforge_synthesis(conn: sqlite3.Connection) -> dict:
         return {"available": False, "error": str(e)}
 
 
+# ---------------------------------------------------------------------------
+# Collection Pass (parallel, cached, shared by email + Telegram briefings)
+# ---------------------------------------------------------------------------
+
+# Shape each section takes when its collector is unavailable or times out,
+# so the renderers can always produce a partial briefing.
+_SECTION_FALLBACKS: dict[str, Any] = {
+    "tasks": {"tasks": [], "overdue_count": 0},
+    "pipeline": {"pipeline": {}, "active_apps": []},
+    "forge": {
+        "total_concepts": 0, "due_count": 0, "avg_mastery": 0.0,
+        "mastery_distribution": {}, "current_streak": 0,
+        "total_reviews": 0, "subjects": [],
+    },
+    "deadlines": [],
+    "networking": {"items": [], "action_needed": []},
+    "sheets_pipeline": [],
+    "calendar": {"events": [], "count": 0},
+    "homelab": {},
+    "time_allocation": {"domains": [], "total_actual": 0.0, "total_target": 0.0},
+    "news": {"general": [], "tech": [], "general_total": 0, "tech_total": 0},
+    "domains": None,
+    "network": None,
+    "signalforge": {"available": False},
+}
+
+_EMAIL_SECTIONS = [
+    "tasks", "pipeline", "forge", "deadlines", "networking", "sheets_pipeline",
+    "calendar", "homelab", "news", "domains", "signalforge",
+]
+_TELEGRAM_SECTIONS = [
+    "tasks", "pipeline", "forge", "deadlines", "calendar", "homelab",
+    "time_allocation", "domains", "network", "signalforge",
+]
+
+_section_cache: dict[str, tuple[float, Any]] = {}
+_inflight: dict[str, "_Collection"] = {}
+_collect_lock = threading.RLock()  # done-callbacks may fire inline under it
+
+
+class _SectionUnavailable(Exception):
+    """A collector's prerequisite (database, Google credentials) is missing."""
+
+
+class _Collection:
+    """One run of a section collector, possibly awaited by several passes."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.future: Optional[Future] = None
+        self.submitted = time.monotonic()
+        self.started: Optional[float] = None  # monotonic; set once a worker picks it up
+        self.started_at = ""
+        self.finished: Optional[float] = None
+
+    def run(self, func: Callable[[], Any]) -> Any:
+        self.started = time.monotonic()
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        return func()
+
+
+def _section_fallback(name: str, error: str) -> Any:
+    data = _SECTION_FALLBACKS[name]
+    if isinstance(data, dict):
+        return {**data, "error": error}
+    return list(data) if isinstance(data, list) else data
+
+
+def _collector_timeout(name: str) -> float:
+    from .config import BRIEFING_COLLECTOR_TIMEOUT, BRIEFING_COLLECTOR_TIMEOUTS
+
+    return BRIEFING_COLLECTOR_TIMEOUTS.get(name, BRIEFING_COLLECTOR_TIMEOUT)
+
+
+def _collector_specs() -> dict[str, Callable[[], Any]]:
+    """Map section name -> zero-arg callable that collects it.
+
+    Collectors are looked up at call time so they can be patched, and
+    every DB collector opens its own connection (sqlite3 connections
+    must not cross threads). Google credentials are loaded once per
+    pass, by whichever Google collector gets there first.
+    """
+    creds_lock = threading.Lock()
+    creds_box: list = []
+
+    def google_creds():
+        with creds_lock:
+            if not creds_box:
+                creds_box.append(_get_google_credentials())
+        if creds_box[0] is None:
+            raise _SectionUnavailable("No Google credentials")
+        return creds_box[0]
+
+    def with_db(func):
+        def run():
+            conn = _get_db_connection()
+            if conn is None:
+                raise _SectionUnavailable("Database unavailable")
+            try:
+                return func(conn)
+            finally:
+                conn.close()
+        return run
+
+    def domains():
+        from .life_domains import get_domain_overview
+        return get_domain_overview()
+
+    def network():
+        from .network_decay import get_network_health
+        return get_network_health()
+
+    return {
+        "tasks": with_db(collect_tasks),
+        "pipeline": with_db(collect_job_pipeline),
+        "forge": with_db(collect_forge_stats),
+        "deadlines": with_db(collect_upcoming_deadlines),
+        "signalforge": with_db(collect_signalforge_synthesis),
+        "networking": lambda: collect_networking_tracker(google_creds()),
+        "sheets_pipeline": lambda: collect_pipeline_tracker(google_creds()),
+        "calendar": lambda: collect_calendar(google_creds()),
+        "homelab": collect_homelab,
+        "time_allocation": collect_time_allocation,
+        "news": collect_news,
+        "domains": domains,
+        "network": network,
+    }
+
+
+def _finish_collection(collection: _Collection, future: Future) -> None:
+    """Done-callback: cache successful results and release the in-flight slot."""
+    collection.finished = time.monotonic()
+    data = None
+    ok = not future.cancelled() and future.exception() is None
+    if ok:
+        data = future.result()
+        # Collectors report their own failures as an "error" key; don't
+        # pin those in the cache so the next pass retries.
+        ok = not (isinstance(data, dict) and data.get("error"))
+    with _collect_lock:
+        if _inflight.get(collection.name) is collection:
+            del _inflight[collection.name]
+        if ok:
+            _section_cache[collection.name] = (collection.finished, data)
+
+
+def _log_collector_timings(rows: list[tuple]) -> None:
+    """Record one daemon_execution_log row per collector run (best effort)."""
+    if not rows:
+        return
+    from .config import DB_PATH
+    from .db import attach_ops
+
+    try:
+        conn = sqlite3.connect(str(DB_PATH), timeout=5)
+        try:
+            attach_ops(conn, DB_PATH)
+            conn.executemany(
+                """INSERT INTO daemon_execution_log
+                   (module_name, started_at, finished_at, status,
+                    error_message, duration_ms)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                rows,
+            )
+            conn.commit()
+        finally:
+            conn.close()
+    except Exception as e:
+        logger.debug("Could not log collector timings: %s", e)
+
+
+def clear_section_cache() -> None:
+    """Drop cached sections and forget in-flight runs (the next pass collects fresh)."""
+    with _collect_lock:
+        _section_cache.clear()
+        _inflight.clear()
+
+
+def collect_sections(
+    names: list[str], refresh: bool = False,
+) -> tuple[dict[str, Any], dict]:
+    """Collect briefing sections concurrently, reusing cached results.
+
+    Sections cached within BRIEFING_CACHE_TTL_SECONDS are returned as-is;
+    sections another pass is already collecting are awaited rather than
+    collected twice. The rest run in a bounded thread pool. A collector
+    that exceeds its timeout (measured from when it started running, or
+    from submission while it is still queued behind busy workers) or
+    raises is replaced by its fallback shape with an "error" key, so the
+    briefing renders whatever did arrive.
+
+    Returns (sections, report) where report lists cached, timed-out and
+    failed sections plus per-collector durations in milliseconds.
+    """
+    from .config import BRIEFING_CACHE_TTL_SECONDS, BRIEFING_COLLECTOR_WORKERS
+
+    unknown = set(names) - set(_SECTION_FALLBACKS)
+    if unknown:
+        raise ValueError(f"Unknown briefing sections: {sorted(unknown)}")
+
+    sections: dict[str, Any] = {}
+    report: dict = {"cached": [], "timed_out": [], "failed": [], "timings_ms": {}}
+    errors: dict[str, str] = {}
+    waiting: dict[str, _Collection] = {}
+    owned: list[_Collection] = []
+
+    now = time.monotonic()
+    with _collect_lock:
+        for name in names:
+            cached = _section_cache.get(name)
+            if cached and not refresh and now - cached[0] < BRIEFING_CACHE_TTL_SECONDS:
+                sections[name] = cached[1]
+                report["cached"].append(name)
+            elif name in _inflight:
+                waiting[name] = _inflight[name]
+            else:
+                collection = _Collection(name)
+                _inflight[name] = collection
+                waiting[name] = collection
+                owned.append(collection)
+
+        if owned:
+            specs = _collector_specs()
+            executor = ThreadPoolExecutor(
+                max_workers=max(1, min(BRIEFING_COLLECTOR_WORKERS, len(owned))),
+                thread_name_prefix="briefing",
+            )
+            for collection in owned:
+                collection.future = executor.submit(collection.run, specs[collection.name])
+                collection.future.add_done_callback(
+                    lambda f, c=collection: _finish_collection(c, f)
+                )
+            # Don't block on stragglers: a timed-out collector keeps its
+            # worker thread until it returns, but the briefing moves on.
+            executor.shutdown(wait=False)
+
+    pending = {c.future: c for c in waiting.values()}
+
+    def timed_out(collection: _Collection) -> None:
+        name = collection.name
+        timeout = _collector_timeout(name)
+        logger.warning("Briefing collector %s timed out after %ss", name, timeout)
+        errors[name] = f"Timed out after {timeout}s"
+        sections[name] = _section_fallback(name, errors[name])
+        report["timed_out"].append(name)
+
+    while pending:
+        done, _ = wait(list(pending), timeout=0.25, return_when=FIRST_COMPLETED)
+        for future in done:
+            collection = pending.pop(future)
+            name = collection.name
+            if future.cancelled():
+                # An overlapping pass timed it out while it was still queued
+                timed_out(collection)
+                continue
+            exc = future.exception()
+            if exc is None:
+                sections[name] = future.result()
+                continue
+            if not isinstance(exc, _SectionUnavailable):
+                logger.error("Briefing collector %s failed: %s", name, exc)
+                report["failed"].append(name)
+            errors[name] = str(exc)
+            sections[name] = _section_fallback(name, errors[name])
+        now = time.monotonic()
+        for future, collection in list(pending.items()):
+            began = collection.submitted if collection.started is None else collection.started
+            if now - began > _collector_timeout(collection.name):
+                # Still queued when workers are stuck on hung collectors:
+                # drop it so it never takes a worker after the fallback
+                future.cancel()
+                del pending[future]
+                timed_out(collection)
+
+    log_rows = []
+    for collection in owned:
+        name = collection.name
+        end = collection.finished or time.monotonic()
+        duration_ms = int((end - (collection.started or end)) * 1000)
+        report["timings_ms"][name] = duration_ms
+        data = sections.get(name)
+        error = errors.get(name) or (data.get("error") if isinstance(data, dict) else None)
+        if name in report["timed_out"]:
+            status = "timeout"
+        else:
+            status = "error" if error else "success"
+        log_rows.append((
+            f"daily_briefing.{name}",
+            collection.started_at or datetime.now(timezone.utc).isoformat(),
+            datetime.now(timezone.utc).isoformat(),
+            status,
+            str(error)[:500] if error else "",
+            duration_ms,
+        ))
+    _log_collector_timings(log_rows)
+
+    return sections, report
+
+
 # ---------------------------------------------------------------------------
 # HTML Email Builder
 # ---------------------------------------------------------------------------
@@ -1458,9 +1723,9 @@ def send_email(subject: str, html_body: str, to: str, creds=None) -> dict | bool
         return False
 
     try:
-        from googleapiclient.discovery import build
+        from .google_clients import get_service
 
-        service = build("gmail", "v1", credentials=creds, cache_discovery=False)
+        service = get_service("gmail", "v1", creds)
 
         # Strip HTML tags for the plain-text fallback
         plain_text = re.sub(r"<[^>]+>", "", html_body).strip() or subject
@@ -1497,47 +1762,19 @@ def run_briefing() -> dict:
     """
     logger.info("Starting JayBrain Daily Briefing")
 
-    # --- Collect data (each section handles its own errors) ---
-    conn = _get_db_connection()
-
-    if conn:
-        tasks_data = collect_tasks(conn)
-        pipeline_data = collect_job_pipeline(conn)
-        forge_data = collect_forge_stats(conn)
-        deadlines = collect_upcoming_deadlines(conn)
-    else:
-        tasks_data = {"tasks": [], "overdue_count": 0, "error": "Database unavailable"}
-        pipeline_data = {"pipeline": {}, "active_apps": [], "error": "Database unavailable"}
-        forge_data = {
-            "total_concepts": 0, "due_count": 0, "avg_mastery": 0.0,
-            "mastery_distribution": {}, "current_streak": 0,
-            "total_reviews": 0, "subjects": [], "error": "Database unavailable",
-        }
-        deadlines = []
-
-    # Google credentials (shared across Sheets reads, Calendar, and Gmail send)
-    google_creds = _get_google_credentials()
-    networking_data = collect_networking_tracker(google_creds) if google_creds else {"items": [], "action_needed": [], "error": "No Google credentials"}
-    sheets_pipeline = collect_pipeline_tracker(google_creds) if google_creds else []
-
-    # New sections: calendar, homelab, news
-    calendar_data = collect_calendar(google_creds) if google_creds else {"events": [], "count": 0, "error": "No Google credentials"}
-    homelab_data = collect_homelab()
-    news_data = collect_news()
-
-    # Life domains goal data
-    domains_data = None
-    try:
-        from .life_domains import get_domain_overview
-        domains_data = get_domain_overview()
-    except Exception as e:
-        logger.debug("Life domains data unavailable: %s", e)
-
-    # SignalForge synthesis (today's intelligence briefing)
-    signalforge_data = collect_signalforge_synthesis(conn) if conn else {"available": False}
-
-    if conn:
-        conn.close()
+    # --- Collect data (concurrently; failed or slow sections fall back) ---
+    sections, collection = collect_sections(_EMAIL_SECTIONS)
+    tasks_data = sections["tasks"]
+    pipeline_data = sections["pipeline"]
+    forge_data = sections["forge"]
+    deadlines = sections["deadlines"]
+    networking_data = sections["networking"]
+    sheets_pipeline = sections["sheets_pipeline"]
+    calendar_data = sections["calendar"]
+    homelab_data = sections["homelab"]
+    news_data = sections["news"]
+    domains_data = sections["domains"]
+    signalforge_data = sections["signalforge"]
 
     # --- Build email ---
     today_str = date.today().strftime("%b %d, %Y")
@@ -1558,7 +1795,7 @@ def run_briefing() -> dict:
     )
 
     # --- Send via Gmail API ---
-    success = send_email(subject, html, RECIPIENT_EMAIL, creds=google_creds)
+    success = send_email(subject, html, RECIPIENT_EMAIL)
 
     if success:
         logger.info("Daily briefing sent successfully")
@@ -1578,9 +1815,14 @@ def run_briefing() -> dict:
                 "news_tech": len(news_data.get("tech", [])),
                 "signalforge_available": signalforge_data.get("available", False),
             },
+            "collection": collection,
         }
     else:
-        return {"status": "failed", "error": "Email send failed. Check logs."}
+        return {
+            "status": "failed",
+            "error": "Email send failed. Check logs.",
+            "collection": collection,
+        }
 
 
 # ---------------------------------------------------------------------------
@@ -1761,57 +2003,20 @@ def run_telegram_briefing() -> dict:
     """
     logger.info("Starting Telegram daily briefing")
 
-    conn = _get_db_connection()
-
-    if conn:
-        tasks_data = collect_tasks(conn)
-        pipeline_data = collect_job_pipeline(conn)
-        forge_data = collect_forge_stats(conn)
-        deadlines = collect_upcoming_deadlines(conn)
-    else:
-        tasks_data = {"tasks": [], "overdue_count": 0, "error": "Database unavailable"}
-        pipeline_data = {"pipeline": {}, "active_apps": []}
-        forge_data = {"total_concepts": 0, "due_count": 0, "avg_mastery": 0.0,
-                      "mastery_distribution": {}, "current_streak": 0,
-                      "total_reviews": 0, "subjects": []}
-        deadlines = []
-
-    google_creds = _get_google_credentials()
-    calendar_data = collect_calendar(google_creds) if google_creds else None
-    homelab_data = collect_homelab()
-    time_data = collect_time_allocation()
-
-    domains_data = None
-    try:
-        from .life_domains import get_domain_overview
-        domains_data = get_domain_overview()
-    except Exception as e:
-        logger.debug("Life domains data unavailable: %s", e)
-
-    network_data = None
-    try:
-        from .network_decay import get_network_health
-        network_data = get_network_health()
-    except Exception as e:
-        logger.debug("Network decay data unavailable: %s", e)
-
-    # SignalForge synthesis (today's intelligence briefing)
-    signalforge_data = collect_signalforge_synthesis(conn) if conn else {"available": False}
-
-    if conn:
-        conn.close()
+    # Shares cached sections with an email briefing run in this process
+    sections, _ = collect_sections(_TELEGRAM_SECTIONS)
 
     message = format_telegram_briefing(
-        tasks_data=tasks_data,
-        pipeline_data=pipeline_data,
-        forge_data=forge_data,
-        deadlines=deadlines,
-        calendar_data=calendar_data,
-        homelab_data=homelab_data,
-        domains_data=domains_data,
-        time_data=time_data,
-        network_data=network_data,
-        signalforge_data=signalforge_data,
+        tasks_data=sections["tasks"],
+        pipeline_data=sections["pipeline"],
+        forge_data=sections["forge"],
+        deadlines=sections["deadlines"],
+        calendar_data=sections["calendar"],
+        homelab_data=sections["homelab"],
+        domains_data=sections["domains"],
+        time_data=sections["time_allocation"],
+        network_data=sections["network"],
+        signalforge_data=sections["signalforge"],
     )
 
     try:
@@ -2,16 +2,29 @@
 
 from __future__ import annotations
 
+import importlib.util
 import json
+import logging
+import os
 import sqlite3
 import struct
 import sys
-from datetime import datetime, timezone
+import zlib
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
 from typing import Optional
 
-import sqlite_vec
+from .config import (
+    DB_PATH,
+    EMBEDDING_DIM,
+    OPS_DB_FILENAME,
+    OPS_LOG_RETENTION_DAYS,
+    OPS_MIGRATION_CHUNK_ROWS,
+    ensure_data_dirs,
+)
 
-from .config import DB_PATH, EMBEDDING_DIM, ensure_data_dirs
+logger = logging.getLogger(__name__)
 
 # Column allowlists for each updatable table (excludes id, created_at).
 _UPDATABLE_COLUMNS: dict[str, frozenset[str]] = {
@@ -69,7 +82,7 @@ _UPDATABLE_COLUMNS: dict[str, frozenset[str]] = {
     "signalforge_synthesis": frozenset({
         "title", "content", "cluster_ids", "cluster_count",
         "article_count", "word_count", "model_used",
-        "input_tokens", "output_tokens",
+        "input_tokens", "output_tokens", "reused_clusters", "tokens_saved",
         "gdoc_id", "gdoc_url", "updated_at",
     }),
     "incidents": frozenset({
@@ -128,29 +141,125 @@ def fts5_safe_query(query: str) -> str:
     return " ".join(safe_words)
 
 
-def get_connection() -> sqlite3.Connection:
-    """Get a database connection with sqlite-vec loaded."""
+@lru_cache(maxsize=1)
+def _vec_extension_path() -> str:
+    """Path of the sqlite-vec loadable extension.
+
+    Resolved from the package location instead of importing sqlite_vec,
+    whose __init__ pulls in numpy (~150 ms) just to offer numpy helpers
+    we never use. Falls back to the package's own loader if the layout
+    ever changes.
+    """
+    spec = importlib.util.find_spec("sqlite_vec")
+    if spec is not None and spec.submodule_search_locations:
+        base = os.path.join(list(spec.submodule_search_locations)[0], "vec0")
+        suffixes = ("", ".so", ".dylib", ".dll")
+        if any(os.path.exists(base + ext) for ext in suffixes):
+            return base
+    import sqlite_vec
+
+    return sqlite_vec.loadable_path()
+
+
+def get_connection(factory: Optional[type] = None) -> sqlite3.Connection:
+    """Get a database connection with sqlite-vec loaded.
+
+    ``factory`` overrides the sqlite3.Connection subclass (the write
+    coordinator passes its own).
+    """
+    from . import config as _cfg  # live PERF_ENABLED, set from env by init()
+
     ensure_data_dirs()
-    conn = sqlite3.connect(str(DB_PATH), timeout=30)
+    if factory is None and _cfg.PERF_ENABLED:
+        from .perf import TimedConnection
+
+        factory = TimedConnection
+    if factory is not None:
+        conn = sqlite3.connect(str(DB_PATH), timeout=30, factory=factory)
+    else:
+        conn = sqlite3.connect(str(DB_PATH), timeout=30)
     conn.enable_load_extension(True)
-    sqlite_vec.load(conn)
+    conn.load_extension(_vec_extension_path())
     conn.enable_load_extension(False)
     conn.row_factory = sqlite3.Row
+    # Only takes effect on a new file (before WAL writes the header); older
+    # databases switch on their next full VACUUM (forge.run_maintenance).
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
     conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("PRAGMA foreign_keys=ON")
     conn.execute("PRAGMA busy_timeout=30000")
     conn.execute("PRAGMA synchronous=NORMAL")
     conn.execute("PRAGMA temp_store=MEMORY")
+    attach_ops(conn)
     return conn
 
 
+def ops_db_path(db_path: Optional[Path] = None) -> Path:
+    """Path of the operational-log database that sits next to ``db_path``."""
+    return Path(db_path or DB_PATH).with_name(OPS_DB_FILENAME)
+
+
+def attach_ops(conn: sqlite3.Connection, db_path: Optional[Path] = None) -> None:
+    """Attach jaybrain_ops.db as schema "ops" on ``conn``.
+
+    The high-churn logs in OPS_TABLES live there, with their own WAL, so
+    log writes don't queue behind (or block) writes to the core tables.
+    Unqualified table names resolve main first, then ops, so queries need
+    no prefix; only DDL must say ``ops.``. Raw sqlite3 connections that
+    touch the logs pass their own DB_PATH.
+    """
+    conn.execute("ATTACH DATABASE ? AS ops", (str(ops_db_path(db_path)),))
+    conn.execute("PRAGMA ops.auto_vacuum=INCREMENTAL")
+    conn.execute("PRAGMA ops.journal_mode=WAL")
+    conn.execute("PRAGMA ops.synchronous=NORMAL")
+
+
+# Highest migration in _run_migrations. Bump together with each new migration.
+SCHEMA_VERSION = 35
+
+
+def _schema_fingerprint() -> int:
+    """CRC of SCHEMA_SQL, stored in PRAGMA user_version after a full init.
+
+    Catches tables added to SCHEMA_SQL without a migration, which the
+    schema_version check alone would miss.
+    """
+    return zlib.crc32(SCHEMA_SQL.encode()) & 0x7FFFFFFF
+
+
+def _ops_schema_fingerprint() -> int:
+    """CRC of OPS_SCHEMA_SQL, stored in PRAGMA ops.user_version."""
+    return zlib.crc32(OPS_SCHEMA_SQL.encode()) & 0x7FFFFFFF
+
+
+def _schema_is_current(conn: sqlite3.Connection) -> bool:
+    """True if the database already has this build's schema (no DDL needed)."""
+    if conn.execute("PRAGMA user_version").fetchone()[0] != _schema_fingerprint():
+        return False
+    if conn.execute("PRAGMA ops.user_version").fetchone()[0] != _ops_schema_fingerprint():
+        return False
+    return _get_schema_version(conn) >= SCHEMA_VERSION
+
+
 def init_db() -> None:
-    """Initialize the database schema and run migrations."""
+    """Initialize the database schema and run migrations.
+
+    Fast path: when the stored fingerprint and schema_version show the
+    schema is current, no DDL runs at all (two cheap reads instead of the
+    full SCHEMA_SQL script plus migration probes). This runs on every MCP
+    server start.
+    """
     conn = get_connection()
     try:
+        if _schema_is_current(conn):
+            return
         conn.executescript(SCHEMA_SQL)
+        conn.executescript(OPS_SCHEMA_SQL)
         conn.commit()
         _run_migrations(conn)
+        conn.execute(f"PRAGMA user_version = {_schema_fingerprint()}")
+        conn.execute(f"PRAGMA ops.user_version = {_ops_schema_fingerprint()}")
+        conn.commit()
     finally:
         conn.close()
 
@@ -176,6 +285,12 @@ def _set_schema_version(
     )
 
 
+CLAUDE_SESSIONS_INDEXES_SQL = """
+CREATE INDEX IF NOT EXISTS idx_claude_sessions_heartbeat ON claude_sessions(last_heartbeat);
+CREATE INDEX IF NOT EXISTS idx_claude_sessions_started ON claude_sessions(started_at);
+"""
+
+
 def _run_migrations(conn: sqlite3.Connection) -> None:
     """Apply schema migrations for existing databases.
 
@@ -898,6 +1013,263 @@ def _run_migrations(conn: sqlite3.Connection) -> None:
         _set_schema_version(conn, 25, "Add fact_history table for temporal fact tracking")
         conn.commit()
 
+    # --- Migration 26: Trigram FTS over graph entity names/aliases/descriptions ---
+    if current < 26:
+        try:
+            conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS graph_entities_fts USING fts5(
+                    name,
+                    aliases,
+                    description,
+                    content=graph_entities,
+                    content_rowid=rowid,
+                    tokenize='trigram'
+                );
+
+                CREATE TRIGGER IF NOT EXISTS graph_entities_ai AFTER INSERT ON graph_entities BEGIN
+                    INSERT INTO graph_entities_fts(rowid, name, aliases, description)
+                    VALUES (new.rowid, new.name, new.aliases, new.description);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS graph_entities_ad AFTER DELETE ON graph_entities BEGIN
+                    INSERT INTO graph_entities_fts(graph_entities_fts, rowid, name, aliases, description)
+                    VALUES ('delete', old.rowid, old.name, old.aliases, old.description);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS graph_entities_au
+                AFTER UPDATE OF name, aliases, description ON graph_entities BEGIN
+                    INSERT INTO graph_entities_fts(graph_entities_fts, rowid, name, aliases, description)
+                    VALUES ('delete', old.rowid, old.name, old.aliases, old.description);
+                    INSERT INTO graph_entities_fts(rowid, name, aliases, description)
+                    VALUES (new.rowid, new.name, new.aliases, new.description);
+                END;
+
+                INSERT INTO graph_entities_fts(graph_entities_fts) VALUES ('rebuild');
+            """)
+        except sqlite3.OperationalError as e:
+            # The trigram tokenizer needs SQLite >= 3.34. Entity search
+            # falls back to LIKE scans when the index is missing.
+            logger.warning("Skipping graph_entities_fts (trigram unavailable): %s", e)
+        _set_schema_version(conn, 26, "Add trigram FTS5 index over graph entities")
+        conn.commit()
+
+    # --- Migration 27: GramCracker response latency + token usage ---
+    if current < 27:
+        tg_cols = {
+            row[1] for row in conn.execute("PRAGMA table_info(telegram_messages)").fetchall()
+        }
+        for col in (
+            "input_tokens", "output_tokens", "cache_read_tokens",
+            "cache_write_tokens", "first_message_ms", "response_ms", "tool_calls",
+        ):
+            if tg_cols and col not in tg_cols:
+                conn.execute(f"ALTER TABLE telegram_messages ADD COLUMN {col} INTEGER DEFAULT NULL")
+
+        _set_schema_version(conn, 27, "Add telegram_messages latency and token usage columns")
+        conn.commit()
+
+    # --- Migration 28: Memoized SignalForge cluster summaries ---
+    if current < 28:
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS signalforge_cluster_summaries (
+                membership_hash TEXT PRIMARY KEY,
+                cluster_id TEXT NOT NULL,
+                label TEXT NOT NULL DEFAULT '',
+                summary TEXT NOT NULL,
+                model_used TEXT NOT NULL DEFAULT '',
+                prompt_version TEXT NOT NULL DEFAULT '',
+                input_tokens INTEGER NOT NULL DEFAULT 0,
+                output_tokens INTEGER NOT NULL DEFAULT 0,
+                reuse_count INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL,
+                last_used_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_signalforge_cs_last_used
+                ON signalforge_cluster_summaries(last_used_at);
+        """)
+        sy_cols = {
+            row[1] for row in conn.execute("PRAGMA table_info(signalforge_synthesis)").fetchall()
+        }
+        if sy_cols and "reused_clusters" not in sy_cols:
+            conn.execute(
+                "ALTER TABLE signalforge_synthesis "
+                "ADD COLUMN reused_clusters INTEGER NOT NULL DEFAULT 0"
+            )
+        if sy_cols and "tokens_saved" not in sy_cols:
+            conn.execute(
+                "ALTER TABLE signalforge_synthesis "
+                "ADD COLUMN tokens_saved INTEGER NOT NULL DEFAULT 0"
+            )
+
+        _set_schema_version(conn, 28, "Add memoized SignalForge cluster summaries")
+        conn.commit()
+
+    # --- Migration 29: git_shadow_log run outcomes + latency ---
+    if current < 29:
+        # main. only: once moved to ops (migration 32) the table is already current
+        gs_cols = {
+            row[1] for row in conn.execute("PRAGMA main.table_info(git_shadow_log)").fetchall()
+        }
+        if gs_cols and "status" not in gs_cols:
+            conn.execute(
+                "ALTER TABLE git_shadow_log "
+                "ADD COLUMN status TEXT NOT NULL DEFAULT 'snapshot'"
+            )
+        if gs_cols and "duration_ms" not in gs_cols:
+            conn.execute("ALTER TABLE git_shadow_log ADD COLUMN duration_ms INTEGER DEFAULT NULL")
+        if gs_cols:
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_git_shadow_status_ts "
+                "ON git_shadow_log(status, timestamp)"
+            )
+
+        _set_schema_version(conn, 29, "Add git_shadow_log status and duration columns")
+        conn.commit()
+
+    # --- Migration 30: coalesced directory deletions + daemon companion stats ---
+    if current < 30:
+        fd_cols = {
+            row[1] for row in conn.execute("PRAGMA main.table_info(file_deletion_log)").fetchall()
+        }
+        if fd_cols and "child_count" not in fd_cols:
+            conn.execute(
+                "ALTER TABLE file_deletion_log ADD COLUMN child_count INTEGER NOT NULL DEFAULT 0"
+            )
+        ds_cols = {
+            row[1] for row in conn.execute("PRAGMA table_info(daemon_state)").fetchall()
+        }
+        if ds_cols and "companions" not in ds_cols:
+            conn.execute(
+                "ALTER TABLE daemon_state ADD COLUMN companions TEXT NOT NULL DEFAULT '{}'"
+            )
+
+        _set_schema_version(conn, 30, "Add file_deletion_log child_count and daemon_state companions")
+        conn.commit()
+
+    # --- Migration 31: hourly latency rollups for opt-in perf instrumentation ---
+    if current < 31:
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS perf_rollups (
+                period TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                name TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                total_ms REAL NOT NULL DEFAULT 0,
+                max_ms REAL NOT NULL DEFAULT 0,
+                buckets TEXT NOT NULL DEFAULT '[]',
+                PRIMARY KEY (period, kind, name)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_perf_rollups_kind_period
+                ON perf_rollups(kind, period);
+        """)
+        _set_schema_version(conn, 31, "Add perf_rollups latency histogram table")
+        conn.commit()
+
+    # --- Migration 32: move high-churn logs to the attached ops database ---
+    if current < 32:
+        for table in OPS_TABLES:
+            moved = _move_table_to_ops(conn, table)
+            if moved:
+                logger.info("Moved %d rows of %s to %s", moved, table, OPS_DB_FILENAME)
+        _set_schema_version(conn, 32, "Move operational logs to jaybrain_ops.db")
+        conn.commit()
+
+    # --- Migration 33: indexes for scans found by benchmarks/query_plans.py ---
+    if current < 33:
+        conn.executescript("""
+            CREATE INDEX IF NOT EXISTS idx_news_feed_articles_knowledge
+                ON news_feed_articles(knowledge_id);
+            CREATE INDEX IF NOT EXISTS idx_forge_reviews_subject_date
+                ON forge_reviews(subject_id, reviewed_at);
+            CREATE INDEX IF NOT EXISTS idx_sessions_started_at
+                ON sessions(started_at);
+        """)
+        # claude_sessions belongs to scripts/session_hook.py, which creates
+        # the same indexes for databases it sets up later
+        if conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'claude_sessions'"
+        ).fetchone():
+            conn.executescript(CLAUDE_SESSIONS_INDEXES_SQL)
+        _set_schema_version(conn, 33, "Add indexes for full scans in hot queries")
+        conn.commit()
+
+    # --- Migration 34: FTS rebuild state, update triggers on indexed columns ---
+    if current < 34:
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS fts_rebuild_state (
+                fts_table TEXT PRIMARY KEY,
+                copied_upto INTEGER NOT NULL DEFAULT 0,
+                detail TEXT NOT NULL DEFAULT 'full',
+                started_at TEXT NOT NULL
+            );
+        """)
+        for fts, (table, _) in FTS_TABLES.items():
+            external = fts_is_external(conn, fts)
+            if external is None:
+                continue
+            if external:
+                conn.executescript(_drop_triggers_sql(table) + fts_trigger_sql(fts))
+            else:
+                # A standalone index stores a second copy of every text column
+                conn.commit()
+                rebuild_fts_table(conn, fts)
+        _set_schema_version(conn, 34, "FTS rebuild state; FTS update triggers on indexed columns")
+        conn.commit()
+
+    # --- Migration 35: graph entity index update trigger on indexed columns ---
+    if current < 35:
+        if fts_is_external(conn, "graph_entities_fts"):
+            conn.executescript(
+                _drop_triggers_sql("graph_entities") + fts_trigger_sql("graph_entities_fts")
+            )
+        _set_schema_version(conn, 35, "graph_entities_fts update trigger on indexed columns")
+        conn.commit()
+
+
+def _move_table_to_ops(conn: sqlite3.Connection, table: str) -> int:
+    """Move a log table's rows from main to ops in chunks, then drop it.
+
+    Each chunk is copied and deleted in one commit, so an interrupted run
+    resumes where it stopped. Ids are kept unless they would collide with
+    rows already written to ops (integer ids are then reassigned).
+    """
+    if not conn.execute(
+        "SELECT 1 FROM main.sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone():
+        return 0
+    ops_cols = {row[1] for row in conn.execute(f"PRAGMA ops.table_info({table})")}
+    main_info = conn.execute(f"PRAGMA main.table_info({table})").fetchall()
+    cols = [row[1] for row in main_info if row[1] in ops_cols]
+    integer_id = any(row[1] == "id" and row[2].upper() == "INTEGER" for row in main_info)
+    if integer_id and conn.execute(
+        f"SELECT 1 FROM main.{table} m JOIN ops.{table} o ON o.id = m.id LIMIT 1"  # nosec B608
+    ).fetchone():
+        cols.remove("id")
+    col_list = ", ".join(cols)
+
+    moved = 0
+    chunk_rows = OPS_MIGRATION_CHUNK_ROWS
+    while True:
+        lo, hi = conn.execute(
+            f"SELECT MIN(rowid), MAX(rowid) FROM "
+            f"(SELECT rowid FROM main.{table} ORDER BY rowid LIMIT ?)",  # nosec B608
+            (chunk_rows,),
+        ).fetchone()
+        if lo is None:
+            break
+        conn.execute(
+            f"INSERT OR IGNORE INTO ops.{table} ({col_list}) "
+            f"SELECT {col_list} FROM main.{table} WHERE rowid BETWEEN ? AND ?",  # nosec B608
+            (lo, hi),
+        )
+        moved += conn.execute(
+            f"DELETE FROM main.{table} WHERE rowid BETWEEN ? AND ?", (lo, hi)  # nosec B608
+        ).rowcount
+        conn.commit()
+    conn.execute(f"DROP TABLE main.{table}")
+    conn.commit()
+    return moved
+
 
 _SCHEMA_SQL_TEMPLATE = """
 -- Memories table
@@ -939,7 +1311,7 @@ CREATE TRIGGER IF NOT EXISTS memories_ad AFTER DELETE ON memories BEGIN
     VALUES ('delete', old.rowid, old.content, old.tags);
 END;
 
-CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE ON memories BEGIN
+CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE OF content, tags ON memories BEGIN
     INSERT INTO memories_fts(memories_fts, rowid, content, tags)
     VALUES ('delete', old.rowid, old.content, old.tags);
     INSERT INTO memories_fts(rowid, content, tags)
@@ -1016,7 +1388,7 @@ CREATE TRIGGER IF NOT EXISTS knowledge_ad AFTER DELETE ON knowledge BEGIN
     VALUES ('delete', old.rowid, old.title, old.content, old.tags);
 END;
 
-CREATE TRIGGER IF NOT EXISTS knowledge_au AFTER UPDATE ON knowledge BEGIN
+CREATE TRIGGER IF NOT EXISTS knowledge_au AFTER UPDATE OF title, content, tags ON knowledge BEGIN
     INSERT INTO knowledge_fts(knowledge_fts, rowid, title, content, tags)
     VALUES ('delete', old.rowid, old.title, old.content, old.tags);
     INSERT INTO knowledge_fts(rowid, title, content, tags)
@@ -1078,7 +1450,7 @@ CREATE TRIGGER IF NOT EXISTS forge_concepts_ad AFTER DELETE ON forge_concepts BE
     VALUES ('delete', old.rowid, old.term, old.definition, old.notes, old.tags);
 END;
 
-CREATE TRIGGER IF NOT EXISTS forge_concepts_au AFTER UPDATE ON forge_concepts BEGIN
+CREATE TRIGGER IF NOT EXISTS forge_concepts_au AFTER UPDATE OF term, definition, notes, tags ON forge_concepts BEGIN
     INSERT INTO forge_concepts_fts(forge_concepts_fts, rowid, term, definition, notes, tags)
     VALUES ('delete', old.rowid, old.term, old.definition, old.notes, old.tags);
     INSERT INTO forge_concepts_fts(rowid, term, definition, notes, tags)
@@ -1180,7 +1552,7 @@ CREATE TRIGGER IF NOT EXISTS job_postings_ad AFTER DELETE ON job_postings BEGIN
     VALUES ('delete', old.rowid, old.title, old.company, old.description, old.required_skills, old.preferred_skills);
 END;
 
-CREATE TRIGGER IF NOT EXISTS job_postings_au AFTER UPDATE ON job_postings BEGIN
+CREATE TRIGGER IF NOT EXISTS job_postings_au AFTER UPDATE OF title, company, description, required_skills, preferred_skills ON job_postings BEGIN
     INSERT INTO job_postings_fts(job_postings_fts, rowid, title, company, description, required_skills, preferred_skills)
     VALUES ('delete', old.rowid, old.title, old.company, old.description, old.required_skills, old.preferred_skills);
     INSERT INTO job_postings_fts(rowid, title, company, description, required_skills, preferred_skills)
@@ -1407,6 +1779,405 @@ CREATE TABLE IF NOT EXISTS schema_version (
 SCHEMA_SQL = _SCHEMA_SQL_TEMPLATE.replace("__EMBEDDING_DIM__", str(EMBEDDING_DIM))
 
 
+# External-content FTS5 indexes: FTS table -> (source table, indexed columns).
+# The source table keeps the only copy of the text; triggers named
+# <source>_ai/_ad/_au feed the index.
+FTS_TABLES: dict[str, tuple[str, tuple[str, ...]]] = {
+    "memories_fts": ("memories", ("content", "tags")),
+    "knowledge_fts": ("knowledge", ("title", "content", "tags")),
+    "forge_concepts_fts": ("forge_concepts", ("term", "definition", "notes", "tags")),
+    "job_postings_fts": (
+        "job_postings",
+        ("title", "company", "description", "required_skills", "preferred_skills"),
+    ),
+    "incidents_fts": (
+        "incidents", ("title", "summary", "root_cause", "impact", "fix_applied", "tags"),
+    ),
+    # Missing where SQLite predates the trigram tokenizer (< 3.34)
+    "graph_entities_fts": ("graph_entities", ("name", "aliases", "description")),
+}
+FTS_TOKENIZERS = {"graph_entities_fts": "trigram"}  # default: unicode61
+FTS_DETAILS = ("full", "column", "none")
+
+
+def fts_create_sql(fts: str, name: Optional[str] = None, detail: str = "full") -> str:
+    """CREATE VIRTUAL TABLE for an FTS_TABLES index (optionally under another name)."""
+    if detail not in FTS_DETAILS:
+        raise ValueError(f"Unknown FTS5 detail '{detail}'. Valid: {', '.join(FTS_DETAILS)}")
+    table, cols = FTS_TABLES[fts]
+    tokenizer = FTS_TOKENIZERS.get(fts)
+    if tokenizer == "trigram" and detail != "full":
+        # substring queries are phrase queries, which need detail=full
+        raise ValueError(f"{fts} uses the trigram tokenizer, which needs detail=full")
+    options = "" if detail == "full" else f", detail={detail}"
+    if tokenizer:
+        options += f", tokenize='{tokenizer}'"
+    return (
+        f"CREATE VIRTUAL TABLE {name or fts} USING fts5("
+        f"{', '.join(cols)}, content={table}, content_rowid=rowid{options})"
+    )
+
+
+def fts_trigger_sql(
+    fts: str, target: Optional[str] = None, prefix: Optional[str] = None, when: str = "",
+) -> str:
+    """Insert/delete/update triggers keeping ``target`` (default ``fts``) in sync.
+
+    The update trigger only fires when an indexed column is assigned, so
+    access counters and status changes don't re-tokenize the row's text.
+    ``when`` is an extra condition on the row's rowid, given as ``{row}.rowid``.
+    """
+    table, cols = FTS_TABLES[fts]
+    target = target or fts
+    prefix = prefix or table
+    col_list = ", ".join(cols)
+
+    def values(row: str) -> str:
+        return ", ".join(f"{row}.{c}" for c in cols)
+
+    def cond(row: str) -> str:
+        return f" WHEN {when.format(row=row)}" if when else ""
+
+    return f"""
+CREATE TRIGGER IF NOT EXISTS {prefix}_ai AFTER INSERT ON {table}{cond("new")} BEGIN
+    INSERT INTO {target}(rowid, {col_list}) VALUES (new.rowid, {values("new")});
+END;
+CREATE TRIGGER IF NOT EXISTS {prefix}_ad AFTER DELETE ON {table}{cond("old")} BEGIN
+    INSERT INTO {target}({target}, rowid, {col_list})
+    VALUES ('delete', old.rowid, {values("old")});
+END;
+CREATE TRIGGER IF NOT EXISTS {prefix}_au AFTER UPDATE OF {col_list} ON {table}{cond("old")} BEGIN
+    INSERT INTO {target}({target}, rowid, {col_list})
+    VALUES ('delete', old.rowid, {values("old")});
+    INSERT INTO {target}(rowid, {col_list}) VALUES (new.rowid, {values("new")});
+END;
+"""  # nosec B608
+
+
+def _drop_triggers_sql(prefix: str) -> str:
+    return "".join(f"DROP TRIGGER IF EXISTS {prefix}_{kind};\n" for kind in ("ai", "ad", "au"))
+
+
+def fts_is_external(conn: sqlite3.Connection, fts: str) -> Optional[bool]:
+    """Whether ``fts`` reads its text from its source table (None if it doesn't exist)."""
+    row = conn.execute(
+        "SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+    ).fetchone()
+    if row is None:
+        return None
+    compact = "".join(c for c in row[0].lower() if c not in " \t\n'\"")
+    return f"content={FTS_TABLES[fts][0]}," in compact
+
+
+def rebuild_fts_table(
+    conn: sqlite3.Connection, fts: str, detail: str = "full", chunk_rows: int = 2000,
+) -> int:
+    """Rebuild an FTS index online as external-content with the given detail.
+
+    Builds <fts>_rebuild next to the live index, indexing source rows in
+    rowid order, ``chunk_rows`` per commit, so writers only wait for one
+    chunk at a time and searches keep using the old index. Progress is in
+    fts_rebuild_state, and <fts>_rb_* triggers mirror writes to rows
+    already copied; both persist until the last commit, which drops the
+    old index and renames the new one into place. A rebuild interrupted
+    part way is finished by resume_fts_rebuilds(); calling this again
+    discards it and starts over. Returns the number of rows indexed.
+    """
+    staging, rb_prefix = f"{fts}_rebuild", f"{fts}_rb"
+    isolation = conn.isolation_level
+    conn.isolation_level = None  # chunk transactions are explicit
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        _discard_fts_rebuild(conn, fts)
+        conn.execute(fts_create_sql(fts, staging, detail))
+        conn.execute(
+            "INSERT INTO fts_rebuild_state (fts_table, copied_upto, detail, started_at) "
+            "VALUES (?, 0, ?, ?)",
+            (fts, detail, now_iso()),
+        )
+        for statement in fts_trigger_sql(
+            fts, staging, rb_prefix,
+            when=f"{{row}}.rowid <= (SELECT copied_upto FROM fts_rebuild_state "
+                 f"WHERE fts_table = '{fts}')",  # nosec B608
+        ).split("END;")[:-1]:
+            conn.execute(statement + "END;")
+        conn.execute("COMMIT")
+        return _copy_fts_chunks(conn, fts, chunk_rows)
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.isolation_level = isolation
+
+
+def resume_fts_rebuilds(conn: sqlite3.Connection, chunk_rows: int = 2000) -> dict[str, int]:
+    """Finish rebuilds left part way in fts_rebuild_state (e.g. by a crash).
+
+    Until then the staging table and its triggers double the write cost of
+    the source table. Progress is read under each chunk's write lock, so
+    this is safe alongside a rebuild still running in another process.
+    Leftovers that can't be resumed (unknown table, missing staging index)
+    are discarded. Returns rows indexed per resumed index.
+    """
+    resumed = {}
+    isolation = conn.isolation_level
+    conn.isolation_level = None
+    try:
+        for (fts,) in conn.execute("SELECT fts_table FROM fts_rebuild_state").fetchall():
+            conn.execute("BEGIN IMMEDIATE")
+            state = conn.execute(
+                "SELECT 1 FROM fts_rebuild_state WHERE fts_table = ?", (fts,),
+            ).fetchone()
+            if state is None:  # finished meanwhile
+                conn.execute("COMMIT")
+                continue
+            if fts not in FTS_TABLES:
+                logger.warning("Dropping rebuild state for unknown FTS table %s", fts)
+                conn.execute("DELETE FROM fts_rebuild_state WHERE fts_table = ?", (fts,))
+                conn.execute("COMMIT")
+                continue
+            if conn.execute(
+                "SELECT 1 FROM main.sqlite_master WHERE type = 'table' AND name = ?",
+                (f"{fts}_rebuild",),
+            ).fetchone() is None:
+                logger.warning("Discarding FTS rebuild of %s: staging index missing", fts)
+                _discard_fts_rebuild(conn, fts)
+                conn.execute("COMMIT")
+                continue
+            conn.execute("COMMIT")
+            logger.info("Resuming interrupted FTS rebuild of %s", fts)
+            resumed[fts] = _copy_fts_chunks(conn, fts, chunk_rows)
+        return resumed
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.isolation_level = isolation
+
+
+def _discard_fts_rebuild(conn: sqlite3.Connection, fts: str) -> None:
+    """Drop a rebuild's staging index, triggers and progress row."""
+    for statement in _drop_triggers_sql(f"{fts}_rb").splitlines():
+        conn.execute(statement)
+    conn.execute(f"DROP TABLE IF EXISTS {fts}_rebuild")
+    conn.execute("DELETE FROM fts_rebuild_state WHERE fts_table = ?", (fts,))
+
+
+def _copy_fts_chunks(conn: sqlite3.Connection, fts: str, chunk_rows: int) -> int:
+    """Index the rest of a started rebuild into <fts>_rebuild, then swap it in.
+
+    Runs with isolation_level None. Returns the number of rows this call
+    indexed; stops early if another connection finished the rebuild.
+    """
+    table, cols = FTS_TABLES[fts]
+    staging, rb_prefix = f"{fts}_rebuild", f"{fts}_rb"
+    col_list = ", ".join(cols)
+    indexed = 0
+    while True:
+        conn.execute("BEGIN IMMEDIATE")
+        state = conn.execute(
+            "SELECT copied_upto FROM fts_rebuild_state WHERE fts_table = ?", (fts,),
+        ).fetchone()
+        if state is None:
+            conn.execute("COMMIT")
+            return indexed
+        copied = state[0]
+        end = conn.execute(
+            f"SELECT MAX(rowid) FROM (SELECT rowid FROM {table} WHERE rowid > ? "
+            f"ORDER BY rowid LIMIT ?)",  # nosec B608
+            (copied, chunk_rows),
+        ).fetchone()[0]
+        if end is None:
+            # Caught up: swap the new index in within this transaction
+            for statement in (
+                _drop_triggers_sql(rb_prefix) + _drop_triggers_sql(table)
+            ).splitlines():
+                conn.execute(statement)
+            conn.execute(f"DROP TABLE IF EXISTS {fts}")
+            conn.execute(f"ALTER TABLE {staging} RENAME TO {fts}")
+            for statement in fts_trigger_sql(fts).split("END;")[:-1]:
+                conn.execute(statement + "END;")
+            conn.execute("DELETE FROM fts_rebuild_state WHERE fts_table = ?", (fts,))
+            conn.execute("COMMIT")
+            return indexed
+        indexed += conn.execute(
+            f"INSERT INTO {staging}(rowid, {col_list}) "
+            f"SELECT rowid, {col_list} FROM {table} WHERE rowid > ? AND rowid <= ?",  # nosec B608
+            (copied, end),
+        ).rowcount
+        conn.execute(
+            "UPDATE fts_rebuild_state SET copied_upto = ? WHERE fts_table = ?", (end, fts),
+        )
+        conn.execute("COMMIT")
+
+
+# Operational logs in jaybrain_ops.db (see attach_ops), with the column
+# each one's retention is measured on.
+OPS_TABLES: dict[str, str] = {
+    "session_activity_log": "timestamp",
+    "daemon_execution_log": "started_at",
+    "telegram_send_log": "timestamp",
+    "file_deletion_log": "timestamp",
+    "git_shadow_log": "timestamp",
+    "heartbeat_log": "checked_at",
+    "watchdog_log": "timestamp",
+    "db_maintenance_log": "ran_at",
+}
+
+OPS_SCHEMA_SQL = """
+-- Claude Code hook activity stream (scripts/session_hook.py)
+CREATE TABLE IF NOT EXISTS ops.session_activity_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    tool_name TEXT NOT NULL DEFAULT '',
+    tool_input_summary TEXT NOT NULL DEFAULT '',
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ops.idx_sal_session ON session_activity_log(session_id);
+CREATE INDEX IF NOT EXISTS ops.idx_sal_timestamp ON session_activity_log(timestamp);
+
+-- Daemon module runs
+CREATE TABLE IF NOT EXISTS ops.daemon_execution_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    module_name TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    status TEXT NOT NULL DEFAULT 'running',
+    result_summary TEXT NOT NULL DEFAULT '',
+    error_message TEXT NOT NULL DEFAULT '',
+    telegram_sent INTEGER NOT NULL DEFAULT 0,
+    duration_ms INTEGER
+);
+CREATE INDEX IF NOT EXISTS ops.idx_daemon_exec_module ON daemon_execution_log(module_name);
+CREATE INDEX IF NOT EXISTS ops.idx_daemon_exec_date ON daemon_execution_log(started_at);
+
+-- Outgoing Telegram messages
+CREATE TABLE IF NOT EXISTS ops.telegram_send_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    caller TEXT NOT NULL DEFAULT 'unknown',
+    chat_id TEXT NOT NULL DEFAULT '',
+    message_preview TEXT NOT NULL DEFAULT '',
+    chunks_sent INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'unknown',
+    error_message TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS ops.idx_telegram_send_date ON telegram_send_log(timestamp);
+CREATE INDEX IF NOT EXISTS ops.idx_telegram_send_caller ON telegram_send_log(caller);
+
+-- File watcher deletions
+CREATE TABLE IF NOT EXISTS ops.file_deletion_log (
+    id TEXT PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    event_type TEXT NOT NULL DEFAULT 'file_deleted',
+    file_size INTEGER,
+    source_context TEXT NOT NULL DEFAULT '',
+    pid INTEGER,
+    child_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ops.idx_file_deletion_timestamp ON file_deletion_log(timestamp);
+CREATE INDEX IF NOT EXISTS ops.idx_file_deletion_path ON file_deletion_log(file_path);
+
+-- GitShadow working tree snapshots
+CREATE TABLE IF NOT EXISTS ops.git_shadow_log (
+    id TEXT PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    stash_hash TEXT NOT NULL,
+    changed_files TEXT NOT NULL DEFAULT '[]',
+    repo_path TEXT NOT NULL,
+    branch TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT 'snapshot',
+    duration_ms INTEGER DEFAULT NULL
+);
+CREATE INDEX IF NOT EXISTS ops.idx_git_shadow_timestamp ON git_shadow_log(timestamp);
+CREATE INDEX IF NOT EXISTS ops.idx_git_shadow_repo ON git_shadow_log(repo_path);
+CREATE INDEX IF NOT EXISTS ops.idx_git_shadow_status_ts ON git_shadow_log(status, timestamp);
+
+-- Heartbeat checks
+CREATE TABLE IF NOT EXISTS ops.heartbeat_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    check_name TEXT NOT NULL,
+    triggered INTEGER NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '',
+    notified INTEGER NOT NULL DEFAULT 0,
+    checked_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ops.idx_heartbeat_log_check ON heartbeat_log(check_name);
+CREATE INDEX IF NOT EXISTS ops.idx_heartbeat_log_date ON heartbeat_log(checked_at);
+
+-- Daemon watchdog events (scripts/daemon_watchdog.py)
+CREATE TABLE IF NOT EXISTS ops.watchdog_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    daemon_pid INTEGER,
+    heartbeat_age_seconds REAL,
+    action_taken TEXT NOT NULL DEFAULT '',
+    restart_pid INTEGER,
+    error_message TEXT NOT NULL DEFAULT '',
+    telegram_sent INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ops.idx_watchdog_log_ts ON watchdog_log(timestamp);
+
+-- Daemon db_maintenance runs, one row per database per run (maintenance.py)
+CREATE TABLE IF NOT EXISTS ops.db_maintenance_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ran_at TEXT NOT NULL,
+    schema_name TEXT NOT NULL,
+    wal_bytes_before INTEGER NOT NULL DEFAULT 0,
+    wal_bytes_after INTEGER NOT NULL DEFAULT 0,
+    checkpoint_mode TEXT NOT NULL DEFAULT '',
+    checkpoint_busy INTEGER NOT NULL DEFAULT 0,
+    page_count INTEGER NOT NULL DEFAULT 0,
+    freelist_before INTEGER NOT NULL DEFAULT 0,
+    freelist_after INTEGER NOT NULL DEFAULT 0,
+    optimized INTEGER NOT NULL DEFAULT 0,
+    quick_checked TEXT NOT NULL DEFAULT '[]',
+    quick_check_result TEXT NOT NULL DEFAULT 'ok',
+    quick_check_cursor INTEGER NOT NULL DEFAULT 0,
+    duration_ms INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ops.idx_db_maintenance_ran ON db_maintenance_log(schema_name, ran_at);
+"""
+
+
+def run_ops_maintenance() -> dict:
+    """Apply per-table retention to the ops logs and checkpoint their WAL.
+
+    Runs against jaybrain_ops.db only, so it never takes the write lock on
+    the core tables.
+    """
+    cutoff_now = datetime.now(timezone.utc)
+    conn = get_connection()
+    try:
+        pruned = {}
+        for table, column in OPS_TABLES.items():
+            days = OPS_LOG_RETENTION_DAYS.get(table)
+            if not days:
+                continue
+            cutoff = (cutoff_now - timedelta(days=days)).isoformat()
+            pruned[table] = conn.execute(
+                f"DELETE FROM ops.{table} WHERE {column} < ?", (cutoff,)  # nosec B608
+            ).rowcount
+            conn.commit()
+        busy, wal_pages, checkpointed = conn.execute(
+            "PRAGMA ops.wal_checkpoint(TRUNCATE)"
+        ).fetchone()
+    finally:
+        conn.close()
+    path = ops_db_path()
+    return {
+        "pruned": pruned,
+        "checkpoint": {"busy": bool(busy), "wal_pages": wal_pages, "checkpointed": checkpointed},
+        "ops_db_size_bytes": path.stat().st_size if path.exists() else 0,
+    }
+
+
 # --- CRUD Helpers ---
 
 def now_iso() -> str:
@@ -1470,6 +2241,28 @@ def get_memories_batch(
     return {row["id"]: row for row in rows}
 
 
+def get_memories_for_ranking(
+    conn: sqlite3.Connection, ids: list[str]
+) -> dict[str, sqlite3.Row]:
+    """Fetch just the columns recall ranks on, without content. Returns {id: row}.
+
+    Timestamps come back as Unix epoch floats (created_ts, accessed_ts;
+    accessed_ts NULL if never accessed). julianday() understands the
+    stored ISO offsets and reads naive values as UTC, like compute_decay.
+    """
+    if not ids:
+        return {}
+    placeholders = ",".join("?" * len(ids))
+    rows = conn.execute(
+        f"""SELECT id, category, tags, importance, access_count,
+               (julianday(created_at) - 2440587.5) * 86400.0 AS created_ts,
+               (julianday(last_accessed) - 2440587.5) * 86400.0 AS accessed_ts
+        FROM memories WHERE id IN ({placeholders})""",  # nosec B608
+        ids,
+    ).fetchall()
+    return {row["id"]: row for row in rows}
+
+
 def update_memory_access(conn: sqlite3.Connection, memory_id: str) -> None:
     """Increment access count and update last_accessed timestamp."""
     conn.execute(
@@ -1480,6 +2273,19 @@ def update_memory_access(conn: sqlite3.Connection, memory_id: str) -> None:
     conn.commit()
 
 
+def update_memories_access(conn: sqlite3.Connection, memory_ids: list[str]) -> None:
+    """update_memory_access for many memories in one transaction."""
+    if not memory_ids:
+        return
+    now = now_iso()
+    conn.executemany(
+        """UPDATE memories SET access_count = access_count + 1,
+        last_accessed = ? WHERE id = ?""",
+        [(now, memory_id) for memory_id in memory_ids],
+    )
+    conn.commit()
+
+
 def search_memories_fts(
     conn: sqlite3.Connection, query: str, limit: int = 20
 ) -> list[tuple[str, float]]:
@@ -2459,6 +3265,24 @@ def update_job_board(conn: sqlite3.Connection, board_id: str, **fields) -> bool:
     return cursor.rowcount > 0
 
 
+def record_job_board_fetches(
+    conn: sqlite3.Connection, results: list[tuple[str, Optional[str]]]
+) -> None:
+    """Stamp last_checked for fetched boards in one transaction.
+
+    results: (board_id, new_content_hash) pairs; a None hash leaves the
+    stored content_hash unchanged.
+    """
+    now = now_iso()
+    conn.executemany(
+        """UPDATE job_boards SET last_checked = ?,
+        content_hash = COALESCE(?, content_hash), updated_at = ?
+        WHERE id = ?""",
+        [(now, content_hash, now, board_id) for board_id, content_hash in results],
+    )
+    conn.commit()
+
+
 # --- News Feed Source CRUD ---
 
 
@@ -2715,17 +3539,20 @@ def insert_signalforge_synthesis(
     output_tokens: int,
     gdoc_id: str = "",
     gdoc_url: str = "",
+    reused_clusters: int = 0,
+    tokens_saved: int = 0,
 ) -> None:
     now = now_iso()
     conn.execute(
         """INSERT INTO signalforge_synthesis
         (id, synthesis_date, title, content, cluster_ids, cluster_count,
          article_count, word_count, model_used, input_tokens, output_tokens,
-         gdoc_id, gdoc_url, created_at, updated_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+         reused_clusters, tokens_saved, gdoc_id, gdoc_url, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
         (synthesis_id, synthesis_date, title, content, cluster_ids,
          cluster_count, article_count, word_count, model_used,
-         input_tokens, output_tokens, gdoc_id, gdoc_url, now, now),
+         input_tokens, output_tokens, reused_clusters, tokens_saved,
+         gdoc_id, gdoc_url, now, now),
     )
     conn.commit()
 
@@ -2774,6 +3601,74 @@ def update_signalforge_synthesis(
     return cursor.rowcount > 0
 
 
+def get_signalforge_cluster_summaries(
+    conn: sqlite3.Connection, membership_hashes: list[str]
+) -> dict[str, sqlite3.Row]:
+    """Memoized cluster summaries for the given membership hashes, keyed by hash."""
+    if not membership_hashes:
+        return {}
+    placeholders = ",".join("?" * len(membership_hashes))
+    rows = conn.execute(
+        f"SELECT * FROM signalforge_cluster_summaries "  # nosec B608
+        f"WHERE membership_hash IN ({placeholders})",
+        list(membership_hashes),
+    ).fetchall()
+    return {r["membership_hash"]: r for r in rows}
+
+
+def upsert_signalforge_cluster_summary(
+    conn: sqlite3.Connection,
+    membership_hash: str,
+    cluster_id: str,
+    label: str,
+    summary: str,
+    model_used: str,
+    prompt_version: str,
+    input_tokens: int,
+    output_tokens: int,
+) -> None:
+    now = now_iso()
+    conn.execute(
+        """INSERT INTO signalforge_cluster_summaries
+        (membership_hash, cluster_id, label, summary, model_used, prompt_version,
+         input_tokens, output_tokens, reuse_count, created_at, last_used_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, ?, ?)
+        ON CONFLICT(membership_hash) DO UPDATE SET
+            cluster_id = excluded.cluster_id,
+            label = excluded.label,
+            summary = excluded.summary,
+            input_tokens = excluded.input_tokens,
+            output_tokens = excluded.output_tokens,
+            last_used_at = excluded.last_used_at""",
+        (membership_hash, cluster_id, label, summary, model_used, prompt_version,
+         input_tokens, output_tokens, now, now),
+    )
+    conn.commit()
+
+
+def mark_signalforge_cluster_summaries_reused(
+    conn: sqlite3.Connection, membership_hashes: list[str]
+) -> None:
+    conn.executemany(
+        "UPDATE signalforge_cluster_summaries "
+        "SET reuse_count = reuse_count + 1, last_used_at = ? WHERE membership_hash = ?",
+        [(now_iso(), h) for h in membership_hashes],
+    )
+    conn.commit()
+
+
+def prune_signalforge_cluster_summaries(
+    conn: sqlite3.Connection, older_than: str
+) -> int:
+    """Delete memoized summaries not used since older_than (ISO timestamp)."""
+    cursor = conn.execute(
+        "DELETE FROM signalforge_cluster_summaries WHERE last_used_at < ?",
+        (older_than,),
+    )
+    conn.commit()
+    return cursor.rowcount
+
+
 # --- Job Posting CRUD ---
 
 def insert_job_posting(
@@ -3061,6 +3956,22 @@ def get_consolidation_log(
 
 # --- Graph Entity CRUD ---
 
+# Bumped by every write that can change graph topology (new edge, endpoint
+# change, entity delete). graph.py compares it against the version its
+# in-process adjacency cache was built from.
+_graph_topology_version = 0
+
+
+def _bump_graph_topology_version() -> None:
+    global _graph_topology_version
+    _graph_topology_version += 1
+
+
+def get_graph_topology_version() -> int:
+    """Return the in-process graph topology version counter."""
+    return _graph_topology_version
+
+
 def insert_graph_entity(
     conn: sqlite3.Connection,
     entity_id: str,
@@ -3123,14 +4034,67 @@ def get_graph_entity_by_name(
     ).fetchone()
 
 
+# Trigram FTS column weights for (name, aliases, description).
+_GRAPH_FTS_WEIGHTS = (10.0, 5.0, 1.0)
+
+
+def _fts5_phrase(text: str) -> str:
+    """Quote text as a single FTS5 phrase (substring match under trigram)."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _search_graph_entities_fts(
+    conn: sqlite3.Connection,
+    match: str,
+    entity_type: Optional[str],
+    limit: int,
+) -> list[sqlite3.Row]:
+    """Run a MATCH against graph_entities_fts, best-ranked first."""
+    params: list = [match]
+    type_clause = ""
+    if entity_type:
+        type_clause = "AND g.entity_type = ?"
+        params.append(entity_type)
+    params.append(limit)
+    w_name, w_aliases, w_desc = _GRAPH_FTS_WEIGHTS
+    return conn.execute(
+        f"""SELECT g.* FROM graph_entities_fts f
+        JOIN graph_entities g ON g.rowid = f.rowid
+        WHERE graph_entities_fts MATCH ? {type_clause}
+        ORDER BY bm25(graph_entities_fts, {w_name}, {w_aliases}, {w_desc}), g.updated_at DESC
+        LIMIT ?""",  # nosec B608
+        params,
+    ).fetchall()
+
+
 def search_graph_entities(
     conn: sqlite3.Connection,
     query: str,
     entity_type: Optional[str] = None,
     limit: int = 20,
+    include_description: bool = False,
 ) -> list[sqlite3.Row]:
-    conditions = ["(LOWER(name) LIKE LOWER(?) OR LOWER(aliases) LIKE LOWER(?))"]
-    params: list = [f"%{query}%", f"%{query}%"]
+    """Case-insensitive substring search over entity names and aliases.
+
+    Served from the trigram FTS index and ordered by bm25 (name hits rank
+    above alias hits). Queries shorter than a trigram, or databases without
+    the index, fall back to a LIKE scan ordered by recency.
+    """
+    query = query.strip()
+    columns = ["name", "aliases"] + (["description"] if include_description else [])
+    if len(query) >= 3:
+        try:
+            return _search_graph_entities_fts(
+                conn,
+                "{" + " ".join(columns) + "} : " + _fts5_phrase(query),
+                entity_type, limit,
+            )
+        except sqlite3.OperationalError:
+            pass
+
+    like = " OR ".join(f"LOWER({c}) LIKE LOWER(?)" for c in columns)
+    conditions = [f"({like})"]
+    params: list = [f"%{query}%"] * len(columns)
     if entity_type:
         conditions.append("entity_type = ?")
         params.append(entity_type)
@@ -3142,6 +4106,62 @@ def search_graph_entities(
     ).fetchall()
 
 
+def search_graph_entities_fuzzy(
+    conn: sqlite3.Connection,
+    query: str,
+    entity_type: Optional[str] = None,
+    limit: int = 20,
+) -> list[sqlite3.Row]:
+    """Candidate entities sharing any trigram with the query.
+
+    Returns bm25-ranked candidates for the caller to score; empty if the
+    query is shorter than a trigram or the index is unavailable.
+    """
+    text = query.strip().lower()
+    grams = sorted({text[i:i + 3] for i in range(len(text) - 2)})
+    if not grams:
+        return []
+    match = "{name aliases} : (" + " OR ".join(_fts5_phrase(g) for g in grams) + ")"
+    try:
+        return _search_graph_entities_fts(conn, match, entity_type, limit)
+    except sqlite3.OperationalError:
+        return []
+
+
+def find_graph_entities_by_alias(
+    conn: sqlite3.Connection,
+    alias: str,
+    entity_type: Optional[str] = None,
+) -> list[sqlite3.Row]:
+    """Find entities whose alias list contains ``alias`` (case-insensitive)."""
+    alias = alias.strip()
+    if not alias:
+        return []
+    candidates: Optional[list[sqlite3.Row]] = None
+    if len(alias) >= 3:
+        try:
+            candidates = _search_graph_entities_fts(
+                conn, f"aliases : {_fts5_phrase(alias)}", entity_type, 50,
+            )
+        except sqlite3.OperationalError:
+            candidates = None
+    if candidates is None:
+        params: list = [f"%{alias}%"]
+        type_clause = ""
+        if entity_type:
+            type_clause = " AND entity_type = ?"
+            params.append(entity_type)
+        candidates = conn.execute(
+            f"SELECT * FROM graph_entities WHERE LOWER(aliases) LIKE LOWER(?){type_clause}",  # nosec B608
+            params,
+        ).fetchall()
+    wanted = alias.lower()
+    return [
+        row for row in candidates
+        if any(str(a).lower() == wanted for a in json.loads(row["aliases"]))
+    ]
+
+
 def list_graph_entities(
     conn: sqlite3.Connection,
     entity_type: Optional[str] = None,
@@ -3158,9 +4178,27 @@ def list_graph_entities(
     ).fetchall()
 
 
+def get_graph_entities_batch(
+    conn: sqlite3.Connection, entity_ids: list[str]
+) -> dict[str, sqlite3.Row]:
+    """Fetch multiple entities in a single query. Returns {id: row} dict.
+
+    Ids are bound as one JSON array so large neighborhoods don't run into
+    SQLite's host-parameter limit.
+    """
+    if not entity_ids:
+        return {}
+    rows = conn.execute(
+        "SELECT * FROM graph_entities WHERE id IN (SELECT value FROM json_each(?))",
+        (json.dumps(list(entity_ids)),),
+    ).fetchall()
+    return {row["id"]: row for row in rows}
+
+
 def delete_graph_entity(conn: sqlite3.Connection, entity_id: str) -> bool:
     cursor = conn.execute("DELETE FROM graph_entities WHERE id = ?", (entity_id,))
     conn.commit()
+    _bump_graph_topology_version()
     return cursor.rowcount > 0
 
 
@@ -3189,6 +4227,7 @@ def insert_graph_relationship(
          valid_from, valid_until),
     )
     conn.commit()
+    _bump_graph_topology_version()
 
 
 def update_graph_relationship(conn: sqlite3.Connection, rel_id: str, **fields) -> bool:
@@ -3205,6 +4244,8 @@ def update_graph_relationship(conn: sqlite3.Connection, rel_id: str, **fields) -
         f"UPDATE graph_relationships SET {set_clause} WHERE id = ?", values  # nosec B608
     )
     conn.commit()
+    if "source_entity_id" in fields or "target_entity_id" in fields:
+        _bump_graph_topology_version()
     return cursor.rowcount > 0
 
 
@@ -3247,6 +4288,92 @@ def get_entity_relationships(
     ).fetchall()
 
 
+def get_graph_relationships_batch(
+    conn: sqlite3.Connection, rel_ids: list[str]
+) -> list[sqlite3.Row]:
+    """Fetch multiple relationships in a single query."""
+    if not rel_ids:
+        return []
+    return conn.execute(
+        """SELECT * FROM graph_relationships
+        WHERE id IN (SELECT value FROM json_each(?))
+        ORDER BY rowid""",
+        (json.dumps(list(rel_ids)),),
+    ).fetchall()
+
+
+def get_graph_edge_list(conn: sqlite3.Connection) -> list[sqlite3.Row]:
+    """Return (id, source_entity_id, target_entity_id) for every relationship.
+
+    Used to build the in-memory adjacency cache; touches only the columns
+    needed for topology.
+    """
+    return conn.execute(
+        "SELECT id, source_entity_id, target_entity_id FROM graph_relationships"
+    ).fetchall()
+
+
+def get_graph_edge_fingerprint(conn: sqlite3.Connection) -> tuple[int, int]:
+    """Cheap (row count, max rowid) fingerprint of graph_relationships.
+
+    Lets a long-lived process notice edges added or removed by another
+    process without rereading the whole table.
+    """
+    row = conn.execute(
+        "SELECT COUNT(*), COALESCE(MAX(rowid), 0) FROM graph_relationships"
+    ).fetchone()
+    return row[0], row[1]
+
+
+_GRAPH_NEIGHBORHOOD_CTE = """
+WITH RECURSIVE walk(entity_id, depth) AS (
+    SELECT ?, 0
+    UNION
+    SELECT CASE WHEN r.source_entity_id = w.entity_id
+                THEN r.target_entity_id ELSE r.source_entity_id END,
+           w.depth + 1
+    FROM walk w
+    JOIN graph_relationships r
+      ON r.source_entity_id = w.entity_id OR r.target_entity_id = w.entity_id
+    WHERE w.depth < ?
+),
+nodes(entity_id, depth) AS (
+    SELECT entity_id, MIN(depth) FROM walk GROUP BY entity_id
+)
+"""
+
+
+def get_graph_neighborhood(
+    conn: sqlite3.Connection,
+    entity_id: str,
+    depth: int,
+) -> tuple[list[sqlite3.Row], list[sqlite3.Row]]:
+    """Traverse the graph around an entity with a recursive CTE.
+
+    Edges are followed in both directions. Returns (entity_rows, rel_rows):
+    entity rows carry an extra ``depth`` column (hops from the center) and
+    are ordered by depth then name; relationship rows are every edge
+    touching an entity closer than ``depth`` hops, i.e. the edges a BFS to
+    that depth would have expanded.
+    """
+    entity_rows = conn.execute(
+        _GRAPH_NEIGHBORHOOD_CTE
+        + """SELECT g.*, n.depth AS depth
+        FROM nodes n JOIN graph_entities g ON g.id = n.entity_id
+        ORDER BY n.depth, g.name""",  # nosec B608
+        (entity_id, depth),
+    ).fetchall()
+    rel_rows = conn.execute(
+        _GRAPH_NEIGHBORHOOD_CTE
+        + """SELECT r.* FROM graph_relationships r
+        WHERE r.source_entity_id IN (SELECT entity_id FROM nodes WHERE depth < ?)
+           OR r.target_entity_id IN (SELECT entity_id FROM nodes WHERE depth < ?)
+        ORDER BY r.rowid""",  # nosec B608
+        (entity_id, depth, depth, depth),
+    ).fetchall()
+    return entity_rows, rel_rows
+
+
 # --- Task Queue CRUD ---
 
 def get_queue_tasks(conn: sqlite3.Connection) -> list[sqlite3.Row]:
@@ -3340,20 +4467,40 @@ def reindex_queue(conn: sqlite3.Connection) -> None:
 
 # --- GramCracker (Telegram) CRUD ---
 
+_TELEGRAM_METRIC_COLUMNS = (
+    "input_tokens", "output_tokens", "cache_read_tokens",
+    "cache_write_tokens", "first_message_ms", "response_ms", "tool_calls",
+)
+
+
 def insert_telegram_message(
     conn: sqlite3.Connection,
     role: str,
     content: str,
     token_count: int = 0,
     telegram_message_id: Optional[int] = None,
+    **metrics: Optional[int],
 ) -> int:
-    """Insert a Telegram message. Returns the row ID."""
+    """Insert a Telegram message. Returns the row ID.
+
+    metrics optionally records per-response API usage and latency:
+    input_tokens, output_tokens, cache_read_tokens, cache_write_tokens,
+    first_message_ms, response_ms, tool_calls.
+    """
+    unknown = set(metrics) - set(_TELEGRAM_METRIC_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown telegram message metrics: {sorted(unknown)}")
     now = now_iso()
+    cols = ["telegram_message_id", "role", "content", "token_count", "created_at"]
+    vals: list = [telegram_message_id, role, content, token_count, now]
+    for col in _TELEGRAM_METRIC_COLUMNS:
+        if col in metrics:
+            cols.append(col)
+            vals.append(metrics[col])
     cursor = conn.execute(
-        """INSERT INTO telegram_messages
-        (telegram_message_id, role, content, token_count, created_at)
-        VALUES (?, ?, ?, ?, ?)""",
-        (telegram_message_id, role, content, token_count, now),
+        f"""INSERT INTO telegram_messages ({", ".join(cols)})
+        VALUES ({", ".join("?" * len(cols))})""",  # nosec B608
+        vals,
     )
     conn.commit()
     return cursor.lastrowid
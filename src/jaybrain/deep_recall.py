@@ -11,11 +11,12 @@ import json
 import logging
 from datetime import datetime, timezone
 
-from .config import SEARCH_CANDIDATES, DEFAULT_SEARCH_LIMIT
+from .config import SEARCH_CANDIDATES, DEFAULT_SEARCH_LIMIT, WRITER_LOG_DURABILITY
 from .db import (
     fts5_safe_query,
     get_connection,
     get_memories_batch,
+    get_memories_for_ranking,
     get_knowledge,
     search_memories_fts,
     search_memories_vec,
@@ -24,12 +25,13 @@ from .db import (
     search_graph_entities,
     get_entity_relationships,
     get_graph_entity,
-    update_memory_access,
+    update_memories_access,
 )
 from .graph import _format_entity
 from .knowledge import _parse_knowledge_row
-from .memory import _parse_memory_row, compute_decay
+from .memory import _decay_for_rows, _parse_memory_row
 from .search import embed_text, hybrid_search
+from .writer import write
 
 logger = logging.getLogger(__name__)
 
@@ -96,32 +98,30 @@ def deep_recall(query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> dict:
         now = datetime.now(timezone.utc)
 
         if mem_merged:
-            candidate_ids = [mid for mid, _ in mem_merged]
-            rows_by_id = get_memories_batch(conn, candidate_ids)
-
-            for mem_id, search_score in mem_merged:
-                if len(memories_out) >= limit:
-                    break
-                row = rows_by_id.get(mem_id)
+            # Decay on lightweight rows; full rows only for the ones returned
+            ranking_rows = get_memories_for_ranking(conn, [mid for mid, _ in mem_merged])
+            picked = [
+                (ranking_rows[mid], score) for mid, score in mem_merged if mid in ranking_rows
+            ][:limit]
+            decays = _decay_for_rows([row for row, _ in picked], now) if picked else []
+            rows_by_id = get_memories_batch(conn, [row["id"] for row, _ in picked])
+
+            for (rank_row, search_score), decay in zip(picked, decays):
+                row = rows_by_id.get(rank_row["id"])
                 if row is None:
                     continue
-                memory = _parse_memory_row(row)
-                decay = compute_decay(
-                    memory.created_at, memory.importance,
-                    memory.access_count, memory.last_accessed, now,
-                )
-                final_score = search_score * decay
                 memories_out.append({
-                    "id": memory.id,
-                    "content": memory.content,
-                    "category": memory.category.value,
-                    "tags": memory.tags,
-                    "importance": memory.importance,
-                    "score": round(final_score, 4),
-                    "created_at": memory.created_at.isoformat(),
+                    "id": row["id"],
+                    "content": row["content"],
+                    "category": row["category"],
+                    "tags": json.loads(row["tags"]),
+                    "importance": row["importance"],
+                    "score": round(search_score * float(decay), 4),
+                    "created_at": datetime.fromisoformat(row["created_at"]).isoformat(),
                 })
-                seen_memory_ids.add(memory.id)
-                update_memory_access(conn, mem_id)
+                seen_memory_ids.add(row["id"])
+            write(conn, update_memories_access, [m["id"] for m in memories_out],
+                  durability=WRITER_LOG_DURABILITY)
 
         # Step 5: Build knowledge section
         knowledge_out = []
@@ -172,7 +172,8 @@ def deep_recall(query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> dict:
                     "linked_from": "graph_entity",
                 })
                 seen_memory_ids.add(mid)
-                update_memory_access(conn, mid)
+            write(conn, update_memories_access, list(linked_rows),
+                  durability=WRITER_LOG_DURABILITY)
 
         # Step 8: Fetch relationships for found entities
         connections_out = []
@@ -1,17 +1,25 @@
 """File deletion watcher -- logs file deletions to SQLite via watchdog.
 
 Runs as a background thread inside the daemon. Watches configured paths
-and records deletion events to the file_deletion_log table.
+and records deletion events to the file_deletion_log table. Events are
+queued and written in batches by a single writer thread; a deleted
+directory tree is recorded as one row with a child count.
 """
 
 from __future__ import annotations
 
 import logging
 import os
+import queue
+import re
 import sqlite3
+import sys
+import threading
+import time
 import uuid
-from datetime import datetime, timezone
-from fnmatch import fnmatch
+from datetime import datetime, timedelta, timezone
+from fnmatch import translate
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -20,10 +28,15 @@ from watchdog.observers import Observer
 
 from .config import (
     DB_PATH,
+    FILE_WATCHER_BATCH_SIZE,
     FILE_WATCHER_ENABLED,
+    FILE_WATCHER_FLUSH_INTERVAL,
+    FILE_WATCHER_FOLD_WINDOW,
     FILE_WATCHER_IGNORE_PATTERNS,
     FILE_WATCHER_PATHS,
+    FILE_WATCHER_QUEUE_MAX,
 )
+from .db import attach_ops
 
 logger = logging.getLogger(__name__)
 
@@ -60,29 +73,256 @@ def _get_conn() -> sqlite3.Connection:
     conn = sqlite3.connect(str(DB_PATH), timeout=10)
     conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("PRAGMA busy_timeout=10000")
+    attach_ops(conn, DB_PATH)  # file_deletion_log lives in jaybrain_ops.db
     return conn
 
 
+@lru_cache(maxsize=16)
+def _ignore_regex(extra_patterns: tuple[str, ...] = ()) -> re.Pattern:
+    """All ignore patterns compiled into one regex (same semantics as fnmatch)."""
+    patterns = _DEFAULT_IGNORE_PATTERNS + list(extra_patterns)
+    # fnmatch is case-insensitive on Windows (normcase), case-sensitive elsewhere
+    flags = re.IGNORECASE if sys.platform == "win32" else 0
+    return re.compile("|".join(f"(?:{translate(p)})" for p in patterns), flags)
+
+
 def _should_ignore(file_path: str, extra_patterns: list[str] | None = None) -> bool:
     """Check if a file path matches any ignore pattern."""
-    all_patterns = _DEFAULT_IGNORE_PATTERNS + (extra_patterns or [])
     normalized = file_path.replace("\\", "/")
-    for pattern in all_patterns:
-        if fnmatch(normalized, pattern):
-            return True
-    return False
+    return _ignore_regex(tuple(extra_patterns or ())).match(normalized) is not None
+
+
+def _fold_written_children(conn: sqlite3.Connection, rows: list[tuple]) -> tuple[list[tuple], int]:
+    """Fold rows already written for entries under each deleted directory into it.
+
+    rm -rf sends a large tree's children in earlier batches than the
+    directory itself. Rows this process wrote for paths below a dir_deleted
+    row, within FILE_WATCHER_FOLD_WINDOW seconds before it, are deleted and
+    counted in its child_count (with their own child counts, for
+    subdirectories summarized earlier). Returns (rows, rows folded).
+    """
+    pid = os.getpid()
+    folded = 0
+    out = []
+    for ts, path, name, event_type, children in rows:
+        if event_type == "dir_deleted":
+            prefix = path.rstrip(os.sep) + os.sep
+            since = datetime.fromisoformat(ts) - timedelta(seconds=FILE_WATCHER_FOLD_WINDOW)
+            # [prefix, prefix with its separator bumped) is every path below it
+            params = (prefix, prefix[:-1] + chr(ord(os.sep) + 1), pid, since.isoformat())
+            below = "file_path >= ? AND file_path < ? AND pid = ? AND timestamp >= ?"
+            count, nested = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(child_count), 0) "
+                f"FROM ops.file_deletion_log WHERE {below}",  # nosec B608
+                params,
+            ).fetchone()
+            if count:
+                conn.execute(f"DELETE FROM ops.file_deletion_log WHERE {below}", params)  # nosec B608
+                children += count + nested
+                folded += count
+        out.append((ts, path, name, event_type, children))
+    return out, folded
+
+
+def _insert_rows(conn: sqlite3.Connection, rows: list[tuple]) -> None:
+    """Insert (timestamp, file_path, filename, event_type, child_count) rows in one transaction."""
+    pid = os.getpid()
+    conn.executemany(
+        """INSERT INTO file_deletion_log
+        (id, timestamp, file_path, filename, event_type, child_count, pid)
+        VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        [
+            (uuid.uuid4().hex[:12], ts, path, name, event_type, children, pid)
+            for ts, path, name, event_type, children in rows
+        ],
+    )
+    conn.commit()
+
+
+def _coalesce(events: list[tuple[str, str, bool]]) -> list[tuple]:
+    """Collapse deletions under a deleted directory into one summary row.
+
+    events are (timestamp, path, is_directory) in arrival order. A deleted
+    directory whose parent was not also deleted becomes a single dir_deleted
+    row carrying the number of deleted entries below it (the children usually
+    arrive first, e.g. from rm -rf). Everything else is kept as-is.
+    """
+    deleted_dirs = {path for _, path, is_dir in events if is_dir}
+
+    def _top_deleted_dir(path: str) -> str | None:
+        top = None
+        parent = os.path.dirname(path)
+        while parent and parent != path:
+            if parent in deleted_dirs:
+                top = parent
+            path, parent = parent, os.path.dirname(parent)
+        return top
+
+    child_counts: dict[str, int] = {}
+    kept: list[tuple[str, str, bool]] = []
+    for ts, path, is_dir in events:
+        top = _top_deleted_dir(path) if deleted_dirs else None
+        if top is not None:
+            child_counts[top] = child_counts.get(top, 0) + 1
+        else:
+            kept.append((ts, path, is_dir))
+
+    return [
+        (ts, path, Path(path).name, "dir_deleted" if is_dir else "file_deleted",
+         child_counts.get(path, 0) if is_dir else 0)
+        for ts, path, is_dir in kept
+    ]
+
+
+class DeletionWriter:
+    """Drains deletion events from a bounded queue into SQLite in batches.
+
+    Watchdog callbacks only enqueue; one writer thread flushes whenever
+    FILE_WATCHER_BATCH_SIZE events are pending or FILE_WATCHER_FLUSH_INTERVAL
+    seconds have passed since the first pending event, coalescing directory
+    deletions (including children written by earlier batches) and
+    committing each batch in a single transaction. When the
+    queue is full, new events are dropped and counted rather than blocking
+    the observer.
+    """
+
+    _STOP = object()
+
+    def __init__(self):
+        self._queue: queue.Queue = queue.Queue(maxsize=FILE_WATCHER_QUEUE_MAX)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._received = 0
+        self._dropped = 0
+        self._written = 0
+        self._coalesced = 0
+        self._batches = 0
+        self._write_errors = 0
+        self._last_flush_at: Optional[str] = None
+        self._last_flush_ms: Optional[int] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="file-watcher-writer", daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        """Flush pending events and stop the writer thread."""
+        if self._thread is None:
+            return
+        while True:
+            try:
+                self._queue.put(self._STOP, timeout=timeout)
+                break
+            except queue.Full:
+                if not self._thread.is_alive():
+                    break
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def submit(self, file_path: str, is_directory: bool) -> bool:
+        """Queue a deletion event. Returns False if it was dropped."""
+        event = (datetime.now(timezone.utc).isoformat(), file_path, is_directory)
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            return False
+        with self._lock:
+            self._received += 1
+        return True
+
+    def _next_batch(self) -> tuple[list, bool]:
+        """Block for the next batch of events. Returns (events, stop_requested)."""
+        first = self._queue.get()
+        if first is self._STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + FILE_WATCHER_FLUSH_INTERVAL
+        while len(batch) < FILE_WATCHER_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is self._STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        conn = None
+        stop = False
+        while not stop:
+            batch, stop = self._next_batch()
+            if not batch:
+                continue
+            started = time.monotonic()
+            rows = _coalesce(batch)
+            try:
+                if conn is None:
+                    conn = _get_conn()
+                rows, folded = _fold_written_children(conn, rows)
+                _insert_rows(conn, rows)
+            except Exception:
+                logger.debug("Failed to write deletion batch", exc_info=True)
+                with self._lock:
+                    self._write_errors += 1
+                if conn is not None:
+                    conn.close()
+                    conn = None
+                continue
+            with self._lock:
+                self._written += len(rows)
+                self._coalesced += len(batch) - len(rows) + folded
+                self._batches += 1
+                self._last_flush_at = datetime.now(timezone.utc).isoformat()
+                self._last_flush_ms = int((time.monotonic() - started) * 1000)
+        if conn is not None:
+            conn.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "queue_max": self._queue.maxsize,
+                "received": self._received,
+                "dropped": self._dropped,
+                "rows_written": self._written,
+                "coalesced": self._coalesced,
+                "batches": self._batches,
+                "write_errors": self._write_errors,
+                "last_flush_at": self._last_flush_at,
+                "last_flush_ms": self._last_flush_ms,
+            }
 
 
 class DeletionHandler(FileSystemEventHandler):
     """Handles file/directory deletion events."""
 
-    def __init__(self, extra_ignore_patterns: list[str] | None = None):
+    def __init__(
+        self,
+        extra_ignore_patterns: list[str] | None = None,
+        writer: DeletionWriter | None = None,
+    ):
         super().__init__()
         self._extra_patterns = extra_ignore_patterns or []
+        self._ignore = _ignore_regex(tuple(self._extra_patterns))
+        self._writer = writer
+        self.ignored = 0
 
     def on_deleted(self, event):
         file_path = event.src_path
-        if _should_ignore(file_path, self._extra_patterns):
+        if self._ignore.match(file_path.replace("\\", "/")):
+            self.ignored += 1
+            return
+
+        if self._writer is not None:
+            self._writer.submit(str(Path(file_path)), event.is_directory)
             return
 
         try:
@@ -98,48 +338,43 @@ class DeletionHandler(FileSystemEventHandler):
     def _log_deletion(
         self, file_path: str, filename: str, event_type: str
     ) -> None:
+        """Write a single deletion row immediately (no writer thread)."""
         now = datetime.now(timezone.utc).isoformat()
         try:
             conn = _get_conn()
-            conn.execute(
-                """INSERT INTO file_deletion_log
-                (id, timestamp, file_path, filename, event_type, pid)
-                VALUES (?, ?, ?, ?, ?, ?)""",
-                (
-                    uuid.uuid4().hex[:12],
-                    now,
-                    file_path,
-                    filename,
-                    event_type,
-                    os.getpid(),
-                ),
-            )
-            conn.commit()
-            conn.close()
+            try:
+                _insert_rows(conn, [(now, file_path, filename, event_type, 0)])
+            finally:
+                conn.close()
         except Exception:
             logger.debug("Failed to write deletion log", exc_info=True)
 
 
 class FileWatcherThread:
-    """Manages the watchdog observer in a background thread."""
+    """Manages the watchdog observer and its batched writer thread."""
 
     def __init__(self):
         self._observer: Optional[Observer] = None
+        self._writer: Optional[DeletionWriter] = None
+        self._handler: Optional[DeletionHandler] = None
 
     def start(self) -> None:
         if not FILE_WATCHER_ENABLED:
             logger.info("File watcher disabled via config")
             return
 
-        handler = DeletionHandler(
-            extra_ignore_patterns=FILE_WATCHER_IGNORE_PATTERNS
+        self._writer = DeletionWriter()
+        self._writer.start()
+        self._handler = DeletionHandler(
+            extra_ignore_patterns=FILE_WATCHER_IGNORE_PATTERNS,
+            writer=self._writer,
         )
         self._observer = Observer()
 
         for watch_path in FILE_WATCHER_PATHS:
             p = Path(watch_path)
             if p.exists() and p.is_dir():
-                self._observer.schedule(handler, str(p), recursive=True)
+                self._observer.schedule(self._handler, str(p), recursive=True)
                 logger.info("File watcher watching: %s", p)
             else:
                 logger.warning("File watcher path does not exist: %s", p)
@@ -154,11 +389,23 @@ class FileWatcherThread:
             self._observer.join(timeout=5)
             self._observer = None
             logger.info("File watcher stopped")
+        if self._writer:
+            self._writer.stop()  # flushes whatever is still queued
+            self._writer = None
 
     @property
     def is_running(self) -> bool:
         return self._observer is not None and self._observer.is_alive()
 
+    def stats(self) -> dict:
+        """Queue/writer counters for daemon_status."""
+        stats = {"running": self.is_running}
+        if self._writer:
+            stats.update(self._writer.stats())
+        if self._handler:
+            stats["ignored"] = self._handler.ignored
+        return stats
+
 
 def query_deletions(
     path: str | None = None,
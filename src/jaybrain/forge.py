@@ -1257,9 +1257,15 @@ def reembed_concepts(subject_id: str = "", dry_run: bool = False) -> dict:
         except ImportError:
             return {"error": "Embedding model not available (search module import failed)"}
 
+        from .tool_exec import cancel_requested
+
         processed = 0
         failed = 0
+        cancelled = False
         for r in missing:
+            if cancel_requested():
+                cancelled = True
+                break
             try:
                 embedding = embed_text(f"{r['term']} {r['definition']}")
                 conn.execute(
@@ -1274,13 +1280,16 @@ def reembed_concepts(subject_id: str = "", dry_run: bool = False) -> dict:
         if processed > 0:
             conn.commit()
 
-        return {
+        result = {
             "total_concepts": len(rows),
             "missing_before": len(missing),
             "processed": processed,
             "failed": failed,
             "skipped": len(has_embedding),
         }
+        if cancelled:
+            result["cancelled"] = True
+        return result
     finally:
         conn.close()
 
@@ -1419,9 +1428,11 @@ def get_weak_areas(subject_id: str = "", limit: int = 10) -> dict:
 # --- Database Maintenance ---
 
 def run_maintenance(vacuum: bool = True, analyze: bool = True) -> dict:
-    """Run database maintenance: integrity check, VACUUM, and ANALYZE.
+    """Run database maintenance: integrity check, space reclaim, and ANALYZE.
 
-    Returns dict with results of each operation.
+    Space is reclaimed with incremental_vacuum slices (see maintenance.py);
+    only a database that predates auto_vacuum=INCREMENTAL gets one full
+    VACUUM to convert it. Returns dict with results of each operation.
     """
     conn = get_connection()
     results = {}
@@ -1438,20 +1449,17 @@ def run_maintenance(vacuum: bool = True, analyze: bool = True) -> dict:
 
         conn.close()
 
-        # VACUUM must run outside a transaction on its own connection
         if vacuum:
-            import sqlite3 as _sqlite3
-            from .config import DB_PATH
-            vconn = _sqlite3.connect(str(DB_PATH), timeout=30)
-            try:
-                vconn.execute("VACUUM")
-                results["vacuum"] = "completed"
-            finally:
-                vconn.close()
+            from .maintenance import reclaim_free_pages
+            results["vacuum"] = reclaim_free_pages()
 
-        # Report DB size
+        # Report DB size (logs live in jaybrain_ops.db, pruned by ops_log_maintenance)
         from .config import DB_PATH
+        from .db import ops_db_path
         results["db_size_bytes"] = DB_PATH.stat().st_size
+        ops_path = ops_db_path(DB_PATH)
+        if ops_path.exists():
+            results["ops_db_size_bytes"] = ops_path.stat().st_size
 
         return results
     except Exception as e:
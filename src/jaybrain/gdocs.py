@@ -8,9 +8,7 @@ to produce professional documents alongside local markdown files.
 from __future__ import annotations
 
 import logging
-import os
 import re
-import sys
 from dataclasses import dataclass, field
 from typing import Optional
 
@@ -23,81 +21,32 @@ def _get_credentials():
     Uses OAuth 2.0 flow with the user's personal Google account so that
     created documents count against the user's storage quota (not the
     service account's zero-byte quota). A refresh token is cached after
-    the first authorization.
+    the first authorization, and the loaded credentials are shared
+    process-wide via google_clients (refreshed only when they expire).
 
     Returns Google credentials or None if unavailable.
     """
-    try:
-        from google.auth.transport.requests import Request
-        from google.oauth2.credentials import Credentials
-        from google_auth_oauthlib.flow import InstalledAppFlow
-
-        from .config import OAUTH_CLIENT_PATH, OAUTH_SCOPES, OAUTH_TOKEN_PATH
+    from .google_clients import get_credentials
 
-        scopes = OAUTH_SCOPES
-
-        creds = None
-
-        # Load cached token if it exists
-        if OAUTH_TOKEN_PATH.exists():
-            creds = Credentials.from_authorized_user_file(
-                str(OAUTH_TOKEN_PATH), scopes,
-            )
-            # Validate scopes match -- if config added new scopes since
-            # the token was issued, force re-authorization (Mistake #014)
-            if creds and creds.scopes and set(scopes) - set(creds.scopes):
-                missing = set(scopes) - set(creds.scopes)
-                logger.warning(
-                    "OAuth token missing scopes %s — forcing re-auth",
-                    missing,
-                )
-                creds = None
-
-        # Refresh or run auth flow
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        elif not creds or not creds.valid:
-            if not OAUTH_CLIENT_PATH.exists():
-                logger.warning("OAuth client file not found: %s", OAUTH_CLIENT_PATH)
-                return None
-            flow = InstalledAppFlow.from_client_secrets_file(
-                str(OAUTH_CLIENT_PATH), scopes,
-            )
-            creds = flow.run_local_server(port=0)
-
-        # Cache the token for future use (owner-only permissions)
-        OAUTH_TOKEN_PATH.parent.mkdir(parents=True, exist_ok=True)
-        OAUTH_TOKEN_PATH.write_text(creds.to_json())
-        if sys.platform != "win32":
-            os.chmod(OAUTH_TOKEN_PATH, 0o600)
-
-        return creds
-    except ImportError:
-        logger.warning(
-            "google-auth-oauthlib not installed; Google Docs integration unavailable"
-        )
-        return None
-    except Exception as e:
-        logger.error("Failed to load Google credentials: %s", e)
-        return None
+    return get_credentials(interactive=True)
 
 
 def _get_docs_service(creds):
-    """Build a Google Docs API service client."""
-    from googleapiclient.discovery import build
-    return build("docs", "v1", credentials=creds, cache_discovery=False)
+    """Get the (cached) Google Docs API service client."""
+    from .google_clients import get_service
+    return get_service("docs", "v1", creds)
 
 
 def _get_drive_service(creds):
-    """Build a Google Drive API service client."""
-    from googleapiclient.discovery import build
-    return build("drive", "v3", credentials=creds, cache_discovery=False)
+    """Get the (cached) Google Drive API service client."""
+    from .google_clients import get_service
+    return get_service("drive", "v3", creds)
 
 
 def _get_sheets_service(creds):
-    """Build a Google Sheets API service client."""
-    from googleapiclient.discovery import build
-    return build("sheets", "v4", credentials=creds, cache_discovery=False)
+    """Get the (cached) Google Sheets API service client."""
+    from .google_clients import get_service
+    return get_service("sheets", "v4", creds)
 
 
 def register_sheet_in_index(
@@ -639,6 +588,102 @@ def find_or_create_folder(
         return {"error": f"Google Drive API error: {e}"}
 
 
+def _drive_quote(value: str) -> str:
+    """Escape a value for use inside a quoted Drive query string."""
+    return value.replace("\\", "\\\\").replace("'", "\\'")
+
+
+def find_or_create_folder_path(
+    path: str,
+    parent_id: str = "",
+) -> dict:
+    """Find or create a nested folder chain such as "Job Search/2026/Acme".
+
+    Every path segment is looked up in a single HTTP batch round trip
+    (instead of one files.list per level); the chain is then walked
+    locally by parent ID and only the missing folders are created.
+
+    Args:
+        path: Slash-separated folder names.
+        parent_id: Optional folder the path starts from. If empty, the first
+            segment matches any folder with that name (like find_or_create_folder).
+
+    Returns:
+        Dict with folder_id and folder_name of the last segment, the
+        normalized path, and created (names of folders created), or error.
+    """
+    from .google_clients import execute_batch
+
+    names = [part.strip() for part in path.split("/") if part.strip()]
+    if not names:
+        return {"error": "Folder path is empty."}
+
+    creds = _get_credentials()
+    if creds is None:
+        return {"error": "Google credentials not available."}
+
+    try:
+        drive = _get_drive_service(creds)
+
+        unique_names = list(dict.fromkeys(names))
+        lookups = [
+            drive.files().list(
+                q=" and ".join([
+                    f"name = '{_drive_quote(name)}'",
+                    "mimeType = 'application/vnd.google-apps.folder'",
+                    "trashed = false",
+                ]),
+                spaces="drive",
+                fields="files(id, name, parents)",
+                pageSize=100,
+            )
+            for name in unique_names
+        ]
+        candidates: dict[str, list[dict]] = {}
+        for name, (response, error) in zip(
+            unique_names, execute_batch(drive, "drive", "v3", lookups),
+        ):
+            if error is not None:
+                raise error
+            candidates[name] = response.get("files", [])
+
+        current = parent_id
+        created: list[str] = []
+        for name in names:
+            match = next(
+                (
+                    f for f in candidates[name]
+                    if not current or current in f.get("parents", [])
+                ),
+                None,
+            )
+            if match:
+                current = match["id"]
+                continue
+
+            metadata = {
+                "name": name,
+                "mimeType": "application/vnd.google-apps.folder",
+            }
+            if current:
+                metadata["parents"] = [current]
+            folder = drive.files().create(body=metadata, fields="id, name").execute()
+            current = folder["id"]
+            created.append(name)
+            logger.info("Created folder '%s' (%s)", name, current)
+
+        return {
+            "folder_id": current,
+            "folder_name": names[-1],
+            "path": "/".join(names),
+            "created": created,
+        }
+
+    except Exception as e:
+        logger.error("Failed to find/create folder path '%s': %s", path, e, exc_info=True)
+        return {"error": f"Google Drive API error: {e}"}
+
+
 def move_file_to_folder(
     file_id: str,
     folder_id: str,
@@ -721,6 +766,7 @@ class DocStructure:
     title: str
     elements: list[DocElement] = field(default_factory=list)
     end_index: int = 1
+    revision_id: str = ""  # for batchUpdate requiredRevisionId write control
 
     def find_heading(
         self, text: str, level: int = 0
@@ -781,6 +827,7 @@ def parse_doc_structure(doc_json: dict) -> DocStructure:
         return DocStructure(
             doc_id=doc_json.get("documentId", ""),
             title=doc_json.get("title", ""),
+            revision_id=doc_json.get("revisionId", ""),
         )
 
     for item in body_content:
@@ -848,6 +895,7 @@ def parse_doc_structure(doc_json: dict) -> DocStructure:
         title=doc_json.get("title", ""),
         elements=elements,
         end_index=doc_end,
+        revision_id=doc_json.get("revisionId", ""),
     )
 
 
@@ -937,6 +985,154 @@ def sort_requests_reverse(requests: list[dict]) -> list[dict]:
     return sorted(requests, key=_get_request_max_index, reverse=True)
 
 
+# ---------------------------------------------------------------------------
+# Edit planning (pure functions)
+# ---------------------------------------------------------------------------
+
+EDIT_OPERATIONS = (
+    "replace_text", "insert_after_heading", "replace_section", "append", "delete_section",
+)
+
+
+def _heading_not_found(heading_text: str) -> dict:
+    return {
+        "status": "not_found",
+        "heading_found": False,
+        "message": f"No heading matching '{heading_text}' found",
+    }
+
+
+def plan_doc_edit(
+    structure: Optional[DocStructure], operation: dict,
+) -> tuple[list[dict], dict]:
+    """Translate one edit operation into batchUpdate requests.
+
+    operation is a dict shaped like the gdoc_edit tool arguments:
+    {"operation": ..., "find", "replace", "heading", "heading_level",
+    "content"}. Every index comes from the given structure snapshot, so
+    several plans can be sent together in one batchUpdate. replace_text
+    needs no structure (pass None).
+
+    Pure function -- no API calls. Returns (requests, result).
+    """
+    op = operation.get("operation", "")
+    if op not in EDIT_OPERATIONS:
+        raise ValueError(
+            f"Unknown operation: {op}. Use: {', '.join(EDIT_OPERATIONS)}"
+        )
+
+    if op == "replace_text":
+        find = operation.get("find", "")
+        if not find:
+            raise ValueError("find parameter required for replace_text")
+        request = build_replace_text_request(find, operation.get("replace", ""))
+        return [request], {"status": "ok", "occurrences_changed": 0}
+
+    content = operation.get("content", "")
+    if op == "append":
+        if not content.startswith("\n"):
+            content = "\n" + content
+        request = build_insert_text_request(structure.end_index - 1, content)
+        return [request], {"status": "ok", "characters_inserted": len(content)}
+
+    heading_text = operation.get("heading", "")
+    heading = structure.find_heading(heading_text, operation.get("heading_level", 0))
+    if not heading:
+        return [], _heading_not_found(heading_text)
+
+    if op == "insert_after_heading":
+        if not content.endswith("\n"):
+            content += "\n"
+        return [build_insert_text_request(heading.end_index, content)], {
+            "status": "ok",
+            "heading_found": True,
+            "heading_text": heading.text.strip(),
+            "characters_inserted": len(content),
+        }
+
+    if op == "replace_section":
+        body_start = heading.end_index
+        body_end = heading.section_end_index
+        requests: list[dict] = []
+        chars_deleted = 0
+        if body_end > body_start:
+            requests.append(build_delete_range_request(body_start, body_end))
+            chars_deleted = body_end - body_start
+        if content:
+            if not content.endswith("\n"):
+                content += "\n"
+            requests.append(build_insert_text_request(body_start, content))
+        return requests, {
+            "status": "ok",
+            "heading_found": True,
+            "heading_text": heading.text.strip(),
+            "characters_deleted": chars_deleted,
+            "characters_inserted": len(content) if content else 0,
+        }
+
+    # delete_section
+    chars_deleted = heading.section_end_index - heading.start_index
+    if chars_deleted <= 0:
+        return [], {"status": "ok", "heading_found": True, "characters_deleted": 0}
+    return [build_delete_range_request(heading.start_index, heading.section_end_index)], {
+        "status": "ok",
+        "heading_found": True,
+        "heading_text": heading.text.strip(),
+        "characters_deleted": chars_deleted,
+    }
+
+
+def _request_span(request: dict) -> Optional[tuple[int, int]]:
+    """(start, end) touched by an index-based request; None for replaceAllText."""
+    if "insertText" in request:
+        index = request["insertText"]["location"]["index"]
+        return index, index
+    if "deleteContentRange" in request:
+        rng = request["deleteContentRange"]["range"]
+        return rng["startIndex"], rng["endIndex"]
+    return None
+
+
+def _spans_conflict(a: tuple[int, int], b: tuple[int, int]) -> bool:
+    if a[0] == a[1] and b[0] == b[1]:
+        return a[0] == b[0]  # two inserts at one index: order is ambiguous
+    if a[0] == a[1]:
+        return b[0] < a[0] < b[1]
+    if b[0] == b[1]:
+        return a[0] < b[0] < a[1]
+    return a[0] < b[1] and b[0] < a[1]
+
+
+def _combine_plans(plans: list[list[dict]]) -> list[tuple[int, dict]]:
+    """Merge per-operation requests into one safely ordered batch.
+
+    Requests from different operations must not touch overlapping ranges
+    (ValueError otherwise). The merged list runs in reverse document order
+    so no request shifts the indexes of a later one; at equal indexes an
+    insert goes before a delete ending there. replaceAllText runs last.
+    Returns (operation_index, request) pairs.
+    """
+    spans = [
+        (i, span)
+        for i, requests in enumerate(plans)
+        for span in map(_request_span, requests)
+        if span is not None
+    ]
+    for x, (i, a) in enumerate(spans):
+        for j, b in spans[x + 1:]:
+            if i != j and _spans_conflict(a, b):
+                raise ValueError(
+                    f"Edit operations {i} and {j} touch overlapping document ranges"
+                )
+
+    tagged = [(i, r) for i, requests in enumerate(plans) for r in requests]
+    return sorted(
+        tagged,
+        key=lambda item: (_get_request_max_index(item[1]), "insertText" in item[1]),
+        reverse=True,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Public editing API
 # ---------------------------------------------------------------------------
@@ -956,59 +1152,88 @@ def get_doc_structure(doc_id: str) -> DocStructure:
     return parse_doc_structure(doc)
 
 
-def replace_text(doc_id: str, find: str, replace: str) -> dict:
-    """Replace all occurrences of text in a Google Doc.
+def _is_revision_conflict(error: Exception) -> bool:
+    status = getattr(getattr(error, "resp", None), "status", None)
+    return status in (400, 409) and "revision" in str(error).lower()
 
-    Uses ReplaceAllTextRequest which handles its own index management.
+
+def apply_doc_edits(doc_id: str, operations: list[dict]) -> dict:
+    """Apply several edit operations to a Google Doc in one batchUpdate.
+
+    The document is fetched once, every operation is planned against that
+    snapshot, and the combined requests go out as a single batchUpdate
+    guarded by requiredRevisionId -- an edit made by someone else between
+    the read and the write is rejected instead of landing at stale
+    indexes. On such a conflict the batch is re-planned once against a
+    fresh snapshot. Batches of only replace_text skip the read entirely.
+
+    Returns {"status": "ok", "results": [per-operation result], "requests": n},
+    or a dict with an error key.
     """
     creds = _get_credentials()
     if creds is None:
         return {"error": "Google credentials not available"}
 
+    needs_structure = any(op.get("operation") != "replace_text" for op in operations)
     try:
-        docs_service = _get_docs_service(creds)
-        result = docs_service.documents().batchUpdate(
-            documentId=doc_id,
-            body={"requests": [build_replace_text_request(find, replace)]},
-        ).execute()
-
-        changed = 0
-        for reply in result.get("replies", []):
-            changed += reply.get("replaceAllText", {}).get(
-                "occurrencesChanged", 0
-            )
-        return {"status": "ok", "occurrences_changed": changed}
+        for attempt in range(2):
+            structure = get_doc_structure(doc_id) if needs_structure else None
+            plans: list[list[dict]] = []
+            results: list[dict] = []
+            for op in operations:
+                requests, result = plan_doc_edit(structure, op)
+                plans.append(requests)
+                results.append(result)
+            combined = _combine_plans(plans)
+            if not combined:
+                return {"status": "ok", "results": results, "requests": 0}
+
+            body: dict = {"requests": [request for _, request in combined]}
+            if structure is not None and structure.revision_id:
+                body["writeControl"] = {"requiredRevisionId": structure.revision_id}
+            try:
+                response = _get_docs_service(creds).documents().batchUpdate(
+                    documentId=doc_id, body=body,
+                ).execute()
+            except Exception as e:
+                if attempt == 0 and _is_revision_conflict(e):
+                    logger.info("Doc %s changed during edit; re-planning", doc_id)
+                    continue
+                raise
+
+            for (i, request), reply in zip(combined, response.get("replies", [])):
+                if "replaceAllText" in request:
+                    results[i]["occurrences_changed"] += reply.get(
+                        "replaceAllText", {}
+                    ).get("occurrencesChanged", 0)
+            return {"status": "ok", "results": results, "requests": len(combined)}
+    except ValueError as e:
+        return {"error": str(e)}
     except Exception as e:
-        logger.error("replace_text failed: %s", e)
+        logger.error("apply_doc_edits failed: %s", e)
         return {"error": str(e)}
 
 
-def append_to_doc(doc_id: str, content: str) -> dict:
-    """Append text content to the end of a Google Doc."""
-    creds = _get_credentials()
-    if creds is None:
-        return {"error": "Google credentials not available"}
+def _apply_single_edit(doc_id: str, operation: dict) -> dict:
+    result = apply_doc_edits(doc_id, [operation])
+    if "error" in result:
+        return result
+    return result["results"][0]
 
-    try:
-        structure = get_doc_structure(doc_id)
-        insert_at = structure.end_index - 1
 
-        if not content.startswith("\n"):
-            content = "\n" + content
+def replace_text(doc_id: str, find: str, replace: str) -> dict:
+    """Replace all occurrences of text in a Google Doc.
 
-        docs_service = _get_docs_service(creds)
-        docs_service.documents().batchUpdate(
-            documentId=doc_id,
-            body={"requests": [build_insert_text_request(insert_at, content)]},
-        ).execute()
+    Uses ReplaceAllTextRequest which handles its own index management.
+    """
+    return _apply_single_edit(
+        doc_id, {"operation": "replace_text", "find": find, "replace": replace},
+    )
 
-        return {
-            "status": "ok",
-            "characters_inserted": len(content),
-        }
-    except Exception as e:
-        logger.error("append_to_doc failed: %s", e)
-        return {"error": str(e)}
+
+def append_to_doc(doc_id: str, content: str) -> dict:
+    """Append text content to the end of a Google Doc."""
+    return _apply_single_edit(doc_id, {"operation": "append", "content": content})
 
 
 def insert_after_heading(
@@ -1022,41 +1247,12 @@ def insert_after_heading(
     Finds the heading by text (case-insensitive substring match), then
     inserts content immediately after the heading paragraph.
     """
-    creds = _get_credentials()
-    if creds is None:
-        return {"error": "Google credentials not available"}
-
-    try:
-        structure = get_doc_structure(doc_id)
-        heading = structure.find_heading(heading_text, heading_level)
-        if not heading:
-            return {
-                "status": "not_found",
-                "heading_found": False,
-                "message": f"No heading matching '{heading_text}' found",
-            }
-
-        insert_at = heading.end_index
-        if not content.endswith("\n"):
-            content += "\n"
-
-        docs_service = _get_docs_service(creds)
-        docs_service.documents().batchUpdate(
-            documentId=doc_id,
-            body={
-                "requests": [build_insert_text_request(insert_at, content)]
-            },
-        ).execute()
-
-        return {
-            "status": "ok",
-            "heading_found": True,
-            "heading_text": heading.text.strip(),
-            "characters_inserted": len(content),
-        }
-    except Exception as e:
-        logger.error("insert_after_heading failed: %s", e)
-        return {"error": str(e)}
+    return _apply_single_edit(doc_id, {
+        "operation": "insert_after_heading",
+        "heading": heading_text,
+        "heading_level": heading_level,
+        "content": content,
+    })
 
 
 def replace_section(
@@ -1070,51 +1266,12 @@ def replace_section(
     Finds the heading, deletes body content between it and the next
     same-or-higher-level heading, then inserts new_content.
     """
-    creds = _get_credentials()
-    if creds is None:
-        return {"error": "Google credentials not available"}
-
-    try:
-        structure = get_doc_structure(doc_id)
-        heading = structure.find_heading(heading_text, heading_level)
-        if not heading:
-            return {
-                "status": "not_found",
-                "heading_found": False,
-                "message": f"No heading matching '{heading_text}' found",
-            }
-
-        body_start = heading.end_index
-        body_end = heading.section_end_index
-
-        requests: list[dict] = []
-        chars_deleted = 0
-        if body_end > body_start:
-            requests.append(build_delete_range_request(body_start, body_end))
-            chars_deleted = body_end - body_start
-
-        if new_content:
-            if not new_content.endswith("\n"):
-                new_content += "\n"
-            requests.append(build_insert_text_request(body_start, new_content))
-
-        if requests:
-            docs_service = _get_docs_service(creds)
-            docs_service.documents().batchUpdate(
-                documentId=doc_id,
-                body={"requests": requests},
-            ).execute()
-
-        return {
-            "status": "ok",
-            "heading_found": True,
-            "heading_text": heading.text.strip(),
-            "characters_deleted": chars_deleted,
-            "characters_inserted": len(new_content) if new_content else 0,
-        }
-    except Exception as e:
-        logger.error("replace_section failed: %s", e)
-        return {"error": str(e)}
+    return _apply_single_edit(doc_id, {
+        "operation": "replace_section",
+        "heading": heading_text,
+        "heading_level": heading_level,
+        "content": new_content,
+    })
 
 
 def delete_section(
@@ -1123,47 +1280,8 @@ def delete_section(
     heading_level: int = 0,
 ) -> dict:
     """Delete a heading and all its content until the next same-level heading."""
-    creds = _get_credentials()
-    if creds is None:
-        return {"error": "Google credentials not available"}
-
-    try:
-        structure = get_doc_structure(doc_id)
-        heading = structure.find_heading(heading_text, heading_level)
-        if not heading:
-            return {
-                "status": "not_found",
-                "heading_found": False,
-                "message": f"No heading matching '{heading_text}' found",
-            }
-
-        delete_start = heading.start_index
-        delete_end = heading.section_end_index
-        chars_deleted = delete_end - delete_start
-
-        if chars_deleted <= 0:
-            return {
-                "status": "ok",
-                "heading_found": True,
-                "characters_deleted": 0,
-            }
-
-        docs_service = _get_docs_service(creds)
-        docs_service.documents().batchUpdate(
-            documentId=doc_id,
-            body={
-                "requests": [
-                    build_delete_range_request(delete_start, delete_end)
-                ]
-            },
-        ).execute()
-
-        return {
-            "status": "ok",
-            "heading_found": True,
-            "heading_text": heading.text.strip(),
-            "characters_deleted": chars_deleted,
-        }
-    except Exception as e:
-        logger.error("delete_section failed: %s", e)
-        return {"error": str(e)}
+    return _apply_single_edit(doc_id, {
+        "operation": "delete_section",
+        "heading": heading_text,
+        "heading_level": heading_level,
+    })
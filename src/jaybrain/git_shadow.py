@@ -7,20 +7,28 @@ Runs as a daemon module via IntervalTrigger.
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import os
 import sqlite3
 import subprocess
 import sys
+import threading
+import time
 import uuid
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 from .config import (
     DB_PATH,
     GIT_SHADOW_ENABLED,
     GIT_SHADOW_REPO_PATHS,
+    GIT_SHADOW_SKIP_LOG_DAYS,
+    GIT_SHADOW_WORKERS,
 )
+from .db import attach_ops
 
 logger = logging.getLogger(__name__)
 
@@ -30,21 +38,84 @@ def _get_conn() -> sqlite3.Connection:
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("PRAGMA busy_timeout=10000")
+    attach_ops(conn, DB_PATH)  # git_shadow_log lives in jaybrain_ops.db
     return conn
 
 
-def _git_cmd(args: list[str], cwd: str) -> tuple[int, str]:
+def _git_cmd(args: list[str], cwd: str, strip: bool = True) -> tuple[int, str]:
     """Run a git command and return (returncode, stdout)."""
     try:
-        kwargs = {"capture_output": True, "text": True, "timeout": 30, "cwd": cwd}
+        kwargs = {
+            "capture_output": True, "text": True, "timeout": 30, "cwd": cwd,
+            "encoding": "utf-8", "errors": "surrogateescape",
+        }
         if sys.platform == "win32":
             kwargs["creationflags"] = 0x08000000  # CREATE_NO_WINDOW
         result = subprocess.run(["git"] + args, **kwargs)
-        return result.returncode, result.stdout.strip()
+        return result.returncode, result.stdout.strip() if strip else result.stdout
     except Exception as e:
         return -1, str(e)
 
 
+# Last change fingerprint per repo; unchanged repos skip the stash sequence.
+_fingerprints: dict[str, str] = {}
+_fingerprints_lock = threading.Lock()
+
+
+def _parse_porcelain_v2(output: str) -> tuple[str, list[str], list[str]]:
+    """Parse `git status --porcelain=v2 -z --branch` output.
+
+    Returns (branch, changed tracked files, untracked files). Renames list
+    both the new and the original path.
+    """
+    branch = ""
+    changed: list[str] = []
+    untracked: list[str] = []
+    records = output.split("\0")
+    i = 0
+    while i < len(records):
+        rec = records[i]
+        i += 1
+        if not rec:
+            continue
+        kind = rec[0]
+        if rec.startswith("# branch.head "):
+            branch = rec[len("# branch.head "):]
+        elif kind == "1":
+            changed.append(rec.split(" ", 8)[8])
+        elif kind == "2":
+            changed.append(rec.split(" ", 9)[9])
+            if i < len(records):
+                changed.append(records[i])  # original path of the rename
+                i += 1
+        elif kind == "u":
+            changed.append(rec.split(" ", 10)[10])
+        elif kind == "?":
+            untracked.append(rec[2:])
+    if branch == "(detached)":
+        branch = "HEAD"  # what `rev-parse --abbrev-ref HEAD` reports
+    return branch, changed, untracked
+
+
+def _fingerprint(repo_path: str, porcelain: str, paths: list[str]) -> str:
+    """Hash of the porcelain status and the dirty files' size/mtime.
+
+    Porcelain v2 records carry the HEAD and index blob hashes, so staging
+    and commits change it, but a further edit to an already-modified file
+    does not — hence the stat of every listed path is mixed in. The index
+    file's own mtime is left out: `git stash create` rewrites it.
+    """
+    h = hashlib.sha256()
+    for path in paths:
+        try:
+            st = os.stat(os.path.join(repo_path, path))
+            h.update(f"{path}\0{st.st_mtime_ns}\0{st.st_size}\0".encode("utf-8", "surrogateescape"))
+        except OSError:
+            h.update(f"{path}\0-\0".encode("utf-8", "surrogateescape"))
+    h.update(porcelain.encode("utf-8", "surrogateescape"))
+    return h.hexdigest()
+
+
 def _snapshot_repo(repo_path: str) -> dict:
     """Create a stash snapshot for one repo. Returns result dict.
 
@@ -52,57 +123,71 @@ def _snapshot_repo(repo_path: str) -> dict:
     without modifying the working tree or stash list. Untracked files are listed
     in the log but not included in the stash object (they're on disk and not at
     risk of being lost between commits).
+
+    One `git status --porcelain=v2` call provides the branch, changed and
+    untracked files. If the repo's fingerprint matches the last state that
+    was snapshotted and logged (or found clean / untracked-only), the repo
+    is skipped as "unchanged" without running `git stash create`. A failed
+    stash or log write leaves the fingerprint alone so the next run retries.
     """
-    # Check for tracked changes (staged + unstaged)
-    rc, diff_stat = _git_cmd(["diff", "--stat"], repo_path)
-    rc2, diff_staged = _git_cmd(["diff", "--cached", "--stat"], repo_path)
-    rc3, untracked = _git_cmd(
-        ["ls-files", "--others", "--exclude-standard"], repo_path
+    started = time.monotonic()
+
+    def _done(result: dict) -> dict:
+        result["duration_ms"] = int((time.monotonic() - started) * 1000)
+        return result
+
+    # --no-optional-locks: never take index.lock from a background job
+    rc, porcelain = _git_cmd(
+        ["--no-optional-locks", "status", "--porcelain=v2", "-z", "--branch",
+         "--untracked-files=all"],
+        repo_path,
+        strip=False,
     )
-
-    has_tracked_changes = bool(diff_stat or diff_staged)
-    has_any_changes = has_tracked_changes or bool(untracked)
-
-    if not has_any_changes:
-        return {"repo": repo_path, "status": "clean", "skipped": True}
-
-    if not has_tracked_changes:
+    if rc != 0:
+        return _done({"repo": repo_path, "status": "error", "skipped": True,
+                      "error": porcelain[:200]})
+
+    branch, changed, untracked = _parse_porcelain_v2(porcelain)
+    fingerprint = _fingerprint(repo_path, porcelain, changed + untracked)
+    with _fingerprints_lock:
+        unchanged = _fingerprints.get(repo_path) == fingerprint
+    if unchanged:
+        return _done({"repo": repo_path, "status": "unchanged", "skipped": True})
+
+    def _remember() -> None:
+        with _fingerprints_lock:
+            _fingerprints[repo_path] = fingerprint
+
+    if not changed and not untracked:
+        _remember()
+        return _done({"repo": repo_path, "status": "clean", "skipped": True})
+
+    if not changed:
         # Only untracked files exist — git stash create won't produce a hash.
         # Log the untracked files for awareness but skip stash creation.
-        untracked_files = [f for f in untracked.split("\n") if f.strip()]
-        return {
+        _remember()
+        return _done({
             "repo": repo_path,
             "status": "untracked_only",
             "skipped": True,
-            "untracked_files": len(untracked_files),
-        }
-
-    # Get current branch
-    _, branch = _git_cmd(["rev-parse", "--abbrev-ref", "HEAD"], repo_path)
+            "untracked_files": len(untracked),
+        })
 
     # Create stash object (does NOT modify working tree or stash list)
     rc, stash_hash = _git_cmd(["stash", "create"], repo_path)
 
     if rc != 0 or not stash_hash:
-        return {"repo": repo_path, "status": "no_stash", "skipped": True}
-
-    # Get changed tracked files list
-    _, changed_output = _git_cmd(["diff", "--name-only", "HEAD"], repo_path)
-    changed_files = [f for f in changed_output.split("\n") if f.strip()]
-
-    # Include staged changes
-    _, staged_output = _git_cmd(["diff", "--cached", "--name-only"], repo_path)
-    staged_files = [f for f in staged_output.split("\n") if f.strip()]
-    changed_files.extend(staged_files)
+        return _done({"repo": repo_path, "status": "no_stash", "skipped": True})
 
     # Note untracked files in the log (not in stash, but useful for context)
-    if untracked:
-        changed_files.extend(
-            [f"[untracked] {f}" for f in untracked.split("\n") if f.strip()]
-        )
-
-    # Deduplicate
-    changed_files = sorted(set(changed_files))
+    changed_files = sorted(set(changed) | {f"[untracked] {f}" for f in untracked})
+    result = _done({
+        "repo": repo_path,
+        "status": "snapshot",
+        "stash_hash": stash_hash[:12],
+        "branch": branch,
+        "changed_files": len(changed_files),
+    })
 
     # Log to DB
     now = datetime.now(timezone.utc).isoformat()
@@ -110,8 +195,9 @@ def _snapshot_repo(repo_path: str) -> dict:
         conn = _get_conn()
         conn.execute(
             """INSERT INTO git_shadow_log
-            (id, timestamp, stash_hash, changed_files, repo_path, branch)
-            VALUES (?, ?, ?, ?, ?, ?)""",
+            (id, timestamp, stash_hash, changed_files, repo_path, branch,
+             status, duration_ms)
+            VALUES (?, ?, ?, ?, ?, ?, 'snapshot', ?)""",
             (
                 uuid.uuid4().hex[:12],
                 now,
@@ -119,28 +205,58 @@ def _snapshot_repo(repo_path: str) -> dict:
                 json.dumps(changed_files),
                 repo_path,
                 branch or "unknown",
+                result["duration_ms"],
             ),
         )
         conn.commit()
         conn.close()
+        _remember()
     except Exception:
         logger.debug("Failed to log git shadow", exc_info=True)
 
-    return {
-        "repo": repo_path,
-        "status": "snapshot",
-        "stash_hash": stash_hash[:12],
-        "branch": branch,
-        "changed_files": len(changed_files),
-    }
+    return result
+
+
+def _log_skipped(results: list[dict]) -> None:
+    """Record non-snapshot outcomes (with latency) and prune old ones."""
+    skipped = [r for r in results if r.get("status") != "snapshot"]
+    if not skipped:
+        return
+    now = datetime.now(timezone.utc)
+    cutoff = (now - timedelta(days=GIT_SHADOW_SKIP_LOG_DAYS)).isoformat()
+    try:
+        conn = _get_conn()
+        try:
+            conn.executemany(
+                """INSERT INTO git_shadow_log
+                (id, timestamp, stash_hash, changed_files, repo_path, branch,
+                 status, duration_ms)
+                VALUES (?, ?, '', '[]', ?, '', ?, ?)""",
+                [
+                    (uuid.uuid4().hex[:12], now.isoformat(), r["repo"],
+                     r["status"], r.get("duration_ms"))
+                    for r in skipped
+                ],
+            )
+            conn.execute(
+                "DELETE FROM git_shadow_log WHERE status != 'snapshot' AND timestamp < ?",
+                (cutoff,),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+    except Exception:
+        logger.debug("Failed to log git shadow skips", exc_info=True)
 
 
 def run_git_shadow() -> dict:
-    """Daemon entry point: snapshot all configured repos."""
+    """Daemon entry point: snapshot all configured repos in parallel."""
     if not GIT_SHADOW_ENABLED:
         return {"status": "disabled"}
 
-    results = []
+    started = time.monotonic()
+    results: list[dict] = []
+    repos = []
     for repo_path in GIT_SHADOW_REPO_PATHS:
         p = Path(repo_path)
         if not (p / ".git").exists():
@@ -148,14 +264,27 @@ def run_git_shadow() -> dict:
                 {"repo": repo_path, "status": "not_a_repo", "skipped": True}
             )
             continue
-        result = _snapshot_repo(str(p))
-        results.append(result)
+        repos.append(str(p))
+
+    if len(repos) > 1:
+        with ThreadPoolExecutor(
+            max_workers=min(GIT_SHADOW_WORKERS, len(repos)),
+            thread_name_prefix="git-shadow",
+        ) as pool:
+            results.extend(pool.map(_snapshot_repo, repos))
+    else:
+        results.extend(_snapshot_repo(r) for r in repos)
+
+    _log_skipped(results)
 
     snapshots = sum(1 for r in results if r.get("status") == "snapshot")
     return {
         "status": "ok",
         "repos_checked": len(results),
         "snapshots_created": snapshots,
+        "skipped": len(results) - snapshots,
+        "unchanged": sum(1 for r in results if r.get("status") == "unchanged"),
+        "duration_ms": int((time.monotonic() - started) * 1000),
         "details": results,
     }
 
@@ -165,12 +294,19 @@ def query_shadow_history(
     file: str | None = None,
     since: str | None = None,
     limit: int = 20,
+    include_skipped: bool = False,
 ) -> list[dict]:
-    """Query git shadow log."""
+    """Query git shadow log.
+
+    Only snapshots are returned unless include_skipped is set, in which case
+    the per-run skip records (unchanged/clean/...) with latency are included.
+    """
     conn = _get_conn()
     try:
         query = "SELECT * FROM git_shadow_log WHERE 1=1"
         params: list = []
+        if not include_skipped:
+            query += " AND status = 'snapshot'"
         if repo:
             query += " AND repo_path LIKE ?"
             params.append(f"%{repo}%")
@@ -200,6 +336,8 @@ def restore_file(shadow_id: str, file_path: str) -> dict:
         ).fetchone()
         if not row:
             return {"error": f"Shadow ID {shadow_id} not found"}
+        if not row["stash_hash"]:
+            return {"error": f"Shadow ID {shadow_id} is a skip record, not a snapshot"}
 
         stash_hash = row["stash_hash"]
         repo_path = row["repo_path"]
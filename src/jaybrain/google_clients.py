@@ -0,0 +1,239 @@
+"""Shared Google API clients for JayBrain.
+
+Every Google integration (Docs/Drive/Sheets in gdocs, Sheets/Calendar/Gmail
+in the daily briefing) goes through this module so that:
+
+- OAuth credentials are loaded from the token file once per process and
+  only refreshed when they actually expire.
+- Discovery-based service objects are built once per thread and reused.
+  They are cached per thread because the underlying httplib2 transport is
+  not thread-safe, and the briefing collectors run in a thread pool.
+- Independent Drive/Sheets calls can be sent as one HTTP batch request.
+- GOOGLE_API_ENDPOINT (env JAYBRAIN_GOOGLE_API_ENDPOINT) redirects every
+  client, batch requests included, to another host such as a local fake
+  Google API server in tests.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import threading
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Google caps HTTP batch requests at 100 calls.
+MAX_BATCH_SIZE = 100
+
+_creds = None
+_creds_lock = threading.Lock()
+_generation = 0  # bumped by reset_clients() to invalidate per-thread caches
+_local = threading.local()
+_discovery_docs: dict[tuple[str, str], dict] = {}
+
+
+# ---------------------------------------------------------------------------
+# Credentials
+# ---------------------------------------------------------------------------
+
+
+def _save_token(creds) -> None:
+    """Persist credentials to the token file (owner-only permissions)."""
+    from .config import OAUTH_TOKEN_PATH
+
+    OAUTH_TOKEN_PATH.parent.mkdir(parents=True, exist_ok=True)
+    OAUTH_TOKEN_PATH.write_text(creds.to_json())
+    if sys.platform != "win32":
+        os.chmod(OAUTH_TOKEN_PATH, 0o600)
+
+
+def _load_credentials(interactive: bool):
+    """Load credentials from the token file, refreshing or re-authorizing.
+
+    Validates that the cached token has all required scopes (Mistake #014).
+    Only interactive callers may run the browser OAuth flow; in daemon
+    context a missing or under-scoped token returns None with a clear log.
+    """
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+
+    from .config import OAUTH_CLIENT_PATH, OAUTH_SCOPES, OAUTH_TOKEN_PATH
+
+    creds = None
+    if OAUTH_TOKEN_PATH.exists():
+        # Load with the scopes recorded in the token file: passing
+        # OAUTH_SCOPES here would overwrite them and hide a mismatch.
+        creds = Credentials.from_authorized_user_file(str(OAUTH_TOKEN_PATH))
+        if creds and creds.scopes and set(OAUTH_SCOPES) - set(creds.scopes):
+            missing = set(OAUTH_SCOPES) - set(creds.scopes)
+            if not interactive:
+                logger.error(
+                    "OAuth token missing scopes %s — delete %s and re-auth via gdocs",
+                    missing, OAUTH_TOKEN_PATH,
+                )
+                return None
+            logger.warning("OAuth token missing scopes %s — forcing re-auth", missing)
+            creds = None
+    elif not interactive:
+        logger.warning("No OAuth token found at %s", OAUTH_TOKEN_PATH)
+        return None
+
+    if creds and creds.expired and creds.refresh_token:
+        creds.refresh(Request())
+        _save_token(creds)
+    elif not creds or not creds.valid:
+        if not interactive:
+            return None
+        if not OAUTH_CLIENT_PATH.exists():
+            logger.warning("OAuth client file not found: %s", OAUTH_CLIENT_PATH)
+            return None
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
+        flow = InstalledAppFlow.from_client_secrets_file(
+            str(OAUTH_CLIENT_PATH), OAUTH_SCOPES,
+        )
+        creds = flow.run_local_server(port=0)
+        _save_token(creds)
+
+    return creds if creds and creds.valid else None
+
+
+def get_credentials(interactive: bool = False):
+    """Return cached OAuth credentials, refreshing them only on expiry.
+
+    Args:
+        interactive: Allow the browser OAuth flow when no usable token
+            exists. Leave False in daemon/background context.
+
+    Returns Google credentials or None if unavailable.
+    """
+    global _creds
+    with _creds_lock:
+        creds = _creds
+        if creds is not None and creds.valid:
+            return creds
+        try:
+            if creds is not None and creds.refresh_token:
+                from google.auth.transport.requests import Request
+
+                try:
+                    creds.refresh(Request())
+                    _save_token(creds)
+                    return creds
+                except Exception as e:
+                    logger.warning("Cached Google token refresh failed, reloading: %s", e)
+            _creds = _load_credentials(interactive)
+            return _creds
+        except ImportError:
+            logger.warning(
+                "google-auth not installed; Google API integrations unavailable"
+            )
+            return None
+        except Exception as e:
+            logger.error("Failed to load Google credentials: %s", e, exc_info=True)
+            return None
+
+
+def set_credentials(creds) -> None:
+    """Install credentials directly (e.g. fake credentials in tests)."""
+    global _creds
+    with _creds_lock:
+        _creds = creds
+
+
+def reset_clients() -> None:
+    """Forget cached credentials and every thread's cached services."""
+    global _creds, _generation
+    with _creds_lock:
+        _creds = None
+        _generation += 1
+
+
+# ---------------------------------------------------------------------------
+# Service objects
+# ---------------------------------------------------------------------------
+
+
+def _discovery_doc(api: str, version: str) -> dict:
+    """Static discovery document bundled with google-api-python-client."""
+    key = (api, version)
+    if key not in _discovery_docs:
+        from googleapiclient.discovery_cache import get_static_doc
+
+        content = get_static_doc(api, version)
+        _discovery_docs[key] = json.loads(content) if content else {}
+    return _discovery_docs[key]
+
+
+def _endpoint_root() -> str:
+    from .config import GOOGLE_API_ENDPOINT
+
+    return GOOGLE_API_ENDPOINT.rstrip("/") + "/" if GOOGLE_API_ENDPOINT else ""
+
+
+def get_service(api: str, version: str, creds=None):
+    """Return a cached service client for this thread, building it once.
+
+    The cache entry is tied to the credentials object it was built with,
+    so installing new credentials transparently rebuilds the client.
+    Credentials refreshed in place keep working with existing clients.
+    """
+    if creds is None:
+        creds = get_credentials()
+    root = _endpoint_root()
+    services = getattr(_local, "services", None)
+    if services is None or getattr(_local, "generation", None) != _generation:
+        services = _local.services = {}
+        _local.generation = _generation
+
+    key = (api, version, root)
+    cached = services.get(key)
+    if cached is not None and cached[0] is creds:
+        return cached[1]
+
+    from googleapiclient.discovery import build
+
+    kwargs: dict[str, Any] = {}
+    if root:
+        service_path = _discovery_doc(api, version).get("servicePath", "")
+        kwargs["client_options"] = {"api_endpoint": root + service_path}
+    service = build(api, version, credentials=creds, cache_discovery=False, **kwargs)
+    services[key] = (creds, service)
+    return service
+
+
+def new_batch(service, api: str, version: str, callback: Optional[Callable] = None):
+    """Create a BatchHttpRequest for a service, honouring GOOGLE_API_ENDPOINT."""
+    root = _endpoint_root()
+    if not root:
+        return service.new_batch_http_request(callback=callback)
+
+    from googleapiclient.http import BatchHttpRequest
+
+    batch_path = _discovery_doc(api, version).get("batchPath", "batch")
+    return BatchHttpRequest(callback=callback, batch_uri=root + batch_path)
+
+
+def execute_batch(
+    service, api: str, version: str, requests: list,
+) -> list[tuple[Any, Optional[Exception]]]:
+    """Execute independent API requests as HTTP batch round trips.
+
+    Requests are chunked at MAX_BATCH_SIZE. Returns one (response,
+    exception) pair per request, in the order given; a failed call sets
+    exception instead of raising so callers can handle calls individually.
+    """
+    results: list[tuple[Any, Optional[Exception]]] = [(None, None)] * len(requests)
+
+    def _collect(request_id, response, exception):
+        results[int(request_id)] = (response, exception)
+
+    for offset in range(0, len(requests), MAX_BATCH_SIZE):
+        batch = new_batch(service, api, version, callback=_collect)
+        for i, request in enumerate(requests[offset:offset + MAX_BATCH_SIZE], offset):
+            batch.add(request, request_id=str(i))
+        batch.execute()
+    return results
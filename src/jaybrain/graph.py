@@ -4,22 +4,39 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
 import uuid
+from collections import deque
 from typing import Optional
 
-from .config import GRAPH_DEFAULT_DEPTH, GRAPH_MAX_DEPTH
+import numpy as np
+
+from .config import (
+    GRAPH_ADJACENCY_CACHE,
+    GRAPH_DEFAULT_DEPTH,
+    GRAPH_FUZZY_MIN_SIMILARITY,
+    GRAPH_MAX_DEPTH,
+    GRAPH_PATH_MAX_DEPTH,
+)
 from .db import (
     get_connection,
     insert_graph_entity,
     update_graph_entity,
     get_graph_entity,
     get_graph_entity_by_name,
+    get_graph_entities_batch,
+    find_graph_entities_by_alias,
     search_graph_entities,
+    search_graph_entities_fuzzy,
     list_graph_entities,
     insert_graph_relationship,
     update_graph_relationship,
     get_graph_relationship_by_triple,
-    get_entity_relationships,
+    get_graph_relationships_batch,
+    get_graph_edge_list,
+    get_graph_edge_fingerprint,
+    get_graph_neighborhood,
+    get_graph_topology_version,
 )
 
 logger = logging.getLogger(__name__)
@@ -62,6 +79,146 @@ def _format_relationship(row) -> dict:
     return result
 
 
+class _Adjacency:
+    """Undirected CSR adjacency over graph_relationships.
+
+    Entity ids are mapped to dense ints; ``offsets[i]:offsets[i + 1]`` slices
+    ``neighbors`` (and the parallel ``edges``, indexes into ``rel_ids``) for
+    entity ``i``. Each relationship appears once per direction.
+    """
+
+    def __init__(self, edge_rows: list, key: tuple) -> None:
+        self.key = key
+        self.index: dict[str, int] = {}
+        self.ids: list[str] = []
+        self.rel_ids: list[str] = []
+        heads: list[int] = []
+        tails: list[int] = []
+        for row in edge_rows:
+            src = self._intern(row["source_entity_id"])
+            dst = self._intern(row["target_entity_id"])
+            heads.append(src)
+            tails.append(dst)
+            self.rel_ids.append(row["id"])
+
+        n_edges = len(self.rel_ids)
+        head_arr = np.array(heads + tails, dtype=np.int64)
+        tail_arr = np.array(tails + heads, dtype=np.int64)
+        edge_arr = np.tile(np.arange(n_edges, dtype=np.int64), 2)
+        order = np.argsort(head_arr, kind="stable")
+
+        offsets = np.zeros(len(self.ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(head_arr, minlength=len(self.ids)), out=offsets[1:])
+
+        # Plain lists: traversal is per-node Python code, where list indexing
+        # beats numpy scalar access.
+        self.offsets: list[int] = offsets.tolist()
+        self.neighbors: list[int] = tail_arr[order].tolist()
+        self.edges: list[int] = edge_arr[order].tolist()
+
+    def _intern(self, entity_id: str) -> int:
+        idx = self.index.get(entity_id)
+        if idx is None:
+            idx = len(self.ids)
+            self.index[entity_id] = idx
+            self.ids.append(entity_id)
+        return idx
+
+    def neighborhood(self, entity_id: str, depth: int) -> tuple[dict[str, int], list[str]]:
+        """BFS to ``depth`` hops. Returns ({entity_id: depth}, relationship ids)."""
+        start = self.index.get(entity_id)
+        if start is None:
+            return {entity_id: 0}, []
+        depth_of = {start: 0}
+        edge_set: set[int] = set()
+        frontier = [start]
+        for level in range(1, depth + 1):
+            next_frontier = []
+            for u in frontier:
+                lo, hi = self.offsets[u], self.offsets[u + 1]
+                edge_set.update(self.edges[lo:hi])
+                for v in self.neighbors[lo:hi]:
+                    if v not in depth_of:
+                        depth_of[v] = level
+                        next_frontier.append(v)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return (
+            {self.ids[i]: d for i, d in depth_of.items()},
+            [self.rel_ids[e] for e in sorted(edge_set)],
+        )
+
+    def shortest_path(
+        self, source_id: str, target_id: str, max_depth: int,
+    ) -> Optional[tuple[list[str], list[str]]]:
+        """Fewest-hop path, ignoring edge direction.
+
+        Returns (entity ids, relationship ids) along the path, or None if the
+        target is unreachable within ``max_depth`` hops.
+        """
+        if source_id == target_id:
+            return [source_id], []
+        start = self.index.get(source_id)
+        goal = self.index.get(target_id)
+        if start is None or goal is None:
+            return None
+        parent: dict[int, tuple[int, int]] = {start: (-1, -1)}
+        queue = deque([(start, 0)])
+        while queue:
+            u, hops = queue.popleft()
+            if hops >= max_depth:
+                continue
+            lo, hi = self.offsets[u], self.offsets[u + 1]
+            for v, e in zip(self.neighbors[lo:hi], self.edges[lo:hi]):
+                if v in parent:
+                    continue
+                parent[v] = (u, e)
+                if v == goal:
+                    nodes, rels = [v], []
+                    while parent[v][0] != -1:
+                        v, e = parent[v]
+                        nodes.append(v)
+                        rels.append(e)
+                    nodes.reverse()
+                    rels.reverse()
+                    return [self.ids[i] for i in nodes], [self.rel_ids[i] for i in rels]
+                queue.append((v, hops + 1))
+        return None
+
+
+_adjacency: Optional[_Adjacency] = None
+_adjacency_lock = threading.Lock()
+
+
+def _get_adjacency(conn) -> _Adjacency:
+    """Return an adjacency view that reflects the current graph.
+
+    With GRAPH_ADJACENCY_CACHE enabled the view is kept in-process and rebuilt
+    only when the topology version (bumped by this process's writes) or the
+    edge fingerprint (catches other processes' writes) changes. Otherwise a
+    throwaway view is built per call.
+    """
+    global _adjacency
+    db_file = conn.execute("PRAGMA database_list").fetchone()["file"]
+    key = (db_file, get_graph_topology_version(), get_graph_edge_fingerprint(conn))
+    with _adjacency_lock:
+        if GRAPH_ADJACENCY_CACHE and _adjacency is not None and _adjacency.key == key:
+            return _adjacency
+        adjacency = _Adjacency(get_graph_edge_list(conn), key)
+        if GRAPH_ADJACENCY_CACHE:
+            _adjacency = adjacency
+        return adjacency
+
+
+def _resolve_entity(conn, entity: str, entity_type: Optional[str] = None):
+    """Look up an entity by name (optionally typed), falling back to ID."""
+    row = get_graph_entity_by_name(conn, entity, entity_type)
+    if not row:
+        row = get_graph_entity(conn, entity)
+    return row
+
+
 def add_entity(
     name: str,
     entity_type: str,
@@ -70,10 +227,20 @@ def add_entity(
     source_memory_ids: Optional[list[str]] = None,
     properties: Optional[dict] = None,
 ) -> dict:
-    """Add or update an entity node. Merges if same name+type exists."""
+    """Add or update an entity node.
+
+    Merges if an entity of the same type exists with this name, or lists
+    this name among its aliases.
+    """
     conn = get_connection()
     try:
         existing = get_graph_entity_by_name(conn, name, entity_type)
+        matched_alias = False
+        if not existing:
+            alias_hits = find_graph_entities_by_alias(conn, name, entity_type)
+            if alias_hits:
+                existing = alias_hits[0]
+                matched_alias = True
         if existing:
             old_memory_ids = json.loads(existing["memory_ids"])
             old_aliases = json.loads(existing["aliases"])
@@ -92,7 +259,10 @@ def add_entity(
                 properties=new_props,
             )
             row = get_graph_entity(conn, existing["id"])
-            return {"status": "updated", "entity": _format_entity(row)}
+            result = {"status": "updated", "entity": _format_entity(row)}
+            if matched_alias:
+                result["matched_alias"] = name
+            return result
 
         entity_id = _generate_id()
         insert_graph_entity(
@@ -191,64 +361,142 @@ def query_neighborhood(
     depth: int = GRAPH_DEFAULT_DEPTH,
     entity_type: Optional[str] = None,
 ) -> dict:
-    """Get an entity and its N-depth neighborhood via BFS traversal."""
-    depth = min(depth, GRAPH_MAX_DEPTH)
+    """Get an entity and its N-depth neighborhood.
+
+    Traversal runs over the in-process adjacency cache when enabled,
+    otherwise as a single recursive CTE. Either way the result is the same:
+    every entity within ``depth`` hops (each tagged with its hop count) and
+    every relationship touching an entity closer than ``depth`` hops.
+    """
+    depth = max(0, min(depth, GRAPH_MAX_DEPTH))
     conn = get_connection()
     try:
-        center = get_graph_entity_by_name(conn, entity_name, entity_type)
-        if not center:
-            center = get_graph_entity(conn, entity_name)
+        center = _resolve_entity(conn, entity_name, entity_type)
         if not center:
             return {"error": f"Entity not found: {entity_name}"}
 
         center_id = center["id"]
-        visited_entities: dict[str, dict] = {center_id: _format_entity(center)}
-        all_relationships: list[dict] = []
-        frontier: set[str] = {center_id}
-
-        for _ in range(depth):
-            next_frontier: set[str] = set()
-            for eid in frontier:
-                rels = get_entity_relationships(conn, eid, direction="both")
-                for rel in rels:
-                    rel_dict = _format_relationship(rel)
-                    if not any(r["id"] == rel_dict["id"] for r in all_relationships):
-                        all_relationships.append(rel_dict)
-
-                    neighbor_id = (
-                        rel["target_entity_id"]
-                        if rel["source_entity_id"] == eid
-                        else rel["source_entity_id"]
-                    )
-                    if neighbor_id not in visited_entities:
-                        neighbor_row = get_graph_entity(conn, neighbor_id)
-                        if neighbor_row:
-                            visited_entities[neighbor_id] = _format_entity(neighbor_row)
-                            next_frontier.add(neighbor_id)
-            frontier = next_frontier
+        if GRAPH_ADJACENCY_CACHE:
+            depths, rel_ids = _get_adjacency(conn).neighborhood(center_id, depth)
+            entity_rows = get_graph_entities_batch(conn, list(depths))
+            entities = sorted(
+                (
+                    {**_format_entity(row), "depth": depths[eid]}
+                    for eid, row in entity_rows.items()
+                ),
+                key=lambda e: (e["depth"], e["name"]),
+            )
+            rel_rows = get_graph_relationships_batch(conn, rel_ids)
+        else:
+            entity_rows, rel_rows = get_graph_neighborhood(conn, center_id, depth)
+            entities = [
+                {**_format_entity(row), "depth": row["depth"]} for row in entity_rows
+            ]
+        relationships = [_format_relationship(row) for row in rel_rows]
 
         return {
             "center": _format_entity(center),
-            "entities": list(visited_entities.values()),
-            "relationships": all_relationships,
+            "entities": entities,
+            "relationships": relationships,
             "depth": depth,
-            "entity_count": len(visited_entities),
-            "relationship_count": len(all_relationships),
+            "entity_count": len(entities),
+            "relationship_count": len(relationships),
+        }
+    finally:
+        conn.close()
+
+
+def find_path(
+    source_entity: str,
+    target_entity: str,
+    max_depth: int = GRAPH_PATH_MAX_DEPTH,
+) -> dict:
+    """Find the shortest path between two entities, ignoring edge direction.
+
+    Entities are resolved by name or ID. Returns the ordered entities and
+    the relationships connecting them, or ``found: False`` if no path exists
+    within ``max_depth`` hops.
+    """
+    max_depth = max(0, min(max_depth, GRAPH_PATH_MAX_DEPTH))
+    conn = get_connection()
+    try:
+        source_row = _resolve_entity(conn, source_entity)
+        if not source_row:
+            return {"error": f"Source entity not found: {source_entity}"}
+        target_row = _resolve_entity(conn, target_entity)
+        if not target_row:
+            return {"error": f"Target entity not found: {target_entity}"}
+
+        result = {
+            "source": source_row["name"],
+            "target": target_row["name"],
+            "max_depth": max_depth,
+        }
+        found = _get_adjacency(conn).shortest_path(
+            source_row["id"], target_row["id"], max_depth,
+        )
+        if found is None:
+            return {**result, "found": False, "hops": None, "path": [], "relationships": []}
+
+        entity_ids, rel_ids = found
+        entity_rows = get_graph_entities_batch(conn, entity_ids)
+        rel_rows = {row["id"]: row for row in get_graph_relationships_batch(conn, rel_ids)}
+        return {
+            **result,
+            "found": True,
+            "hops": len(rel_ids),
+            "path": [_format_entity(entity_rows[eid]) for eid in entity_ids],
+            "relationships": [_format_relationship(rel_rows[rid]) for rid in rel_ids],
         }
     finally:
         conn.close()
 
 
+def _trigrams(text: str) -> set[str]:
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _fuzzy_score(query_grams: set[str], row) -> float:
+    """Best trigram Jaccard similarity between the query and name/aliases."""
+    best = 0.0
+    for candidate in [row["name"], *json.loads(row["aliases"])]:
+        grams = _trigrams(str(candidate))
+        if grams:
+            best = max(best, len(query_grams & grams) / len(query_grams | grams))
+    return best
+
+
 def search_entities(
     query: str,
     entity_type: Optional[str] = None,
     limit: int = 20,
+    fuzzy: bool = False,
 ) -> list[dict]:
-    """Search entities by name substring."""
+    """Search entities by name or alias substring, best match first.
+
+    With fuzzy=True, remaining slots are filled with near-misses (typos,
+    partial words) scored by trigram similarity; those results carry a
+    "similarity" field.
+    """
     conn = get_connection()
     try:
         rows = search_graph_entities(conn, query, entity_type, limit)
-        return [_format_entity(row) for row in rows]
+        results = [_format_entity(row) for row in rows]
+        if fuzzy and len(results) < limit:
+            query_grams = _trigrams(query.strip())
+            seen = {r["id"] for r in results}
+            scored = []
+            for row in search_graph_entities_fuzzy(conn, query, entity_type, limit * 5):
+                if row["id"] in seen:
+                    continue
+                score = _fuzzy_score(query_grams, row)
+                if score >= GRAPH_FUZZY_MIN_SIMILARITY:
+                    scored.append((score, row))
+            scored.sort(key=lambda pair: pair[0], reverse=True)
+            for score, row in scored[: limit - len(results)]:
+                results.append({**_format_entity(row), "similarity": round(score, 3)})
+        return results
     finally:
         conn.close()
 
@@ -14,9 +14,11 @@ from typing import Optional
 from .config import (
     HEARTBEAT_APP_STALE_DAYS,
     HEARTBEAT_FORGE_DUE_THRESHOLD,
+    WRITER_LOG_DURABILITY,
     ensure_data_dirs,
 )
 from .db import get_connection, now_iso
+from .writer import write
 
 logger = logging.getLogger(__name__)
 
@@ -51,21 +53,25 @@ def _was_recently_notified(check_name: str) -> bool:
         conn.close()
 
 
+def _insert_check_log(conn, check_name: str, triggered: bool, message: str, notified: bool) -> None:
+    conn.execute(
+        """INSERT INTO heartbeat_log
+        (check_name, triggered, message, notified, checked_at)
+        VALUES (?, ?, ?, ?, ?)""",
+        (check_name, int(triggered), message, int(notified), now_iso()),
+    )
+    conn.commit()
+
+
 def _log_check(check_name: str, triggered: bool, message: str, notified: bool) -> None:
     """Record a heartbeat check to the log."""
-    conn = get_connection()
     try:
-        conn.execute(
-            """INSERT INTO heartbeat_log
-            (check_name, triggered, message, notified, checked_at)
-            VALUES (?, ?, ?, ?, ?)""",
-            (check_name, int(triggered), message, int(notified), now_iso()),
+        write(
+            None, _insert_check_log, check_name, triggered, message, notified,
+            durability=WRITER_LOG_DURABILITY,
         )
-        conn.commit()
     except Exception as e:
         logger.error("Failed to log heartbeat check: %s", e)
-    finally:
-        conn.close()
 
 
 def dispatch_notification(check_name: str, message: str) -> bool:
@@ -12,6 +12,7 @@ import json
 import logging
 import re
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Optional
 
@@ -21,6 +22,7 @@ from .db import (
     insert_job_board,
     list_job_boards,
     now_iso,
+    record_job_board_fetches,
     update_job_board,
 )
 from .models import JobBoard
@@ -75,6 +77,45 @@ def get_boards(active_only: bool = True) -> list[JobBoard]:
         conn.close()
 
 
+def _fetch_board_content(board: JobBoard, max_pages: int, render: str) -> dict:
+    """Fetch and combine a board's pages. Network only -- no DB access."""
+    from .scraping import fetch_pages
+
+    pages = fetch_pages(board.url, max_pages=max_pages, render=render)
+
+    # Combine all page text for Claude to parse
+    combined_text = ""
+    total_length = 0
+    any_rendered = False
+    for page in pages:
+        if page["rendered"]:
+            any_rendered = True
+        combined_text += page["text"] + "\n\n"
+        total_length += page["text_length"]
+
+    # First page metadata is most useful
+    metadata = pages[0]["metadata"] if pages else {}
+
+    return {
+        "board_id": board.id,
+        "board_name": board.name,
+        "url": board.url,
+        "content": combined_text.strip(),
+        "content_length": total_length,
+        "pages_fetched": len(pages),
+        "js_rendered": any_rendered,
+        "metadata": metadata,
+        "timings": [
+            {
+                "page_url": p.get("page_url"),
+                "fetch_ms": p.get("fetch_ms"),
+                "render_ms": p.get("render_ms"),
+            }
+            for p in pages
+        ],
+    }
+
+
 def fetch_board(
     board_id: str,
     max_pages: int = 0,
@@ -88,47 +129,25 @@ def fetch_board(
     render modes: "auto" (detect SPA), "always" (force Playwright), "never" (plain HTTP).
     max_pages: how many pagination pages to follow (0 = config default).
     """
-    from .scraping import fetch_pages
-
     conn = get_connection()
     try:
         row = get_job_board(conn, board_id)
-        if not row:
-            raise ValueError(f"Job board not found: {board_id}")
-
-        board = _parse_board_row(row)
-
-        pages = fetch_pages(board.url, max_pages=max_pages, render=render)
-
-        # Combine all page text for Claude to parse
-        combined_text = ""
-        total_length = 0
-        any_rendered = False
-        for page in pages:
-            if page["rendered"]:
-                any_rendered = True
-            combined_text += page["text"] + "\n\n"
-            total_length += page["text_length"]
+    finally:
+        conn.close()
+    if not row:
+        raise ValueError(f"Job board not found: {board_id}")
 
-        # First page metadata is most useful
-        metadata = pages[0]["metadata"] if pages else {}
+    result = _fetch_board_content(_parse_board_row(row), max_pages, render)
 
-        # Update last_checked
+    # Update last_checked
+    conn = get_connection()
+    try:
         update_job_board(conn, board_id, last_checked=now_iso())
-
-        return {
-            "board_id": board.id,
-            "board_name": board.name,
-            "url": board.url,
-            "content": combined_text.strip(),
-            "content_length": total_length,
-            "pages_fetched": len(pages),
-            "js_rendered": any_rendered,
-            "metadata": metadata,
-        }
     finally:
         conn.close()
 
+    return result
+
 
 # ---------------------------------------------------------------------------
 # Auto-fetch: daemon-driven change detection
@@ -147,39 +166,57 @@ def auto_fetch_boards() -> dict:
     2. Hash the content and compare against the stored content_hash.
     3. If changed, send a Telegram notification and update the hash.
 
+    Boards are fetched in parallel (JOB_BOARD_FETCH_WORKERS, with the
+    scraping module's per-domain limit), and all hashes and last_checked
+    stamps are written in one transaction at the end.
+
     Returns a summary dict with counts of checked/changed/errored boards.
     """
-    boards = get_boards(active_only=True)
-    if not boards:
+    from .config import JOB_BOARD_FETCH_WORKERS
+
+    conn = get_connection()
+    try:
+        rows = list_job_boards(conn, active_only=True)
+    finally:
+        conn.close()
+    if not rows:
         return {"checked": 0, "changed": 0, "errors": 0, "message": "No active boards"}
 
+    boards = [_parse_board_row(r) for r in rows]
+    old_hashes = {r["id"]: r["content_hash"] or "" for r in rows}
+
     checked = 0
     changed = 0
     errors = 0
     changed_boards: list[str] = []
+    fetched: list[tuple[str, Optional[str]]] = []
 
-    for board in boards:
-        try:
-            result = fetch_board(board.id, max_pages=1, render="auto")
-            content = result.get("content", "")
-            new_hash = _content_hash(content)
-
-            conn = get_connection()
+    workers = max(1, min(JOB_BOARD_FETCH_WORKERS, len(boards)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job-board") as pool:
+        futures = [pool.submit(_fetch_board_content, b, 1, "auto") for b in boards]
+        for board, future in zip(boards, futures):
             try:
-                row = get_job_board(conn, board.id)
-                old_hash = row["content_hash"] if row and row["content_hash"] else ""
-
-                if new_hash != old_hash:
-                    update_job_board(conn, board.id, content_hash=new_hash)
-                    changed += 1
-                    changed_boards.append(f"{board.name} ({board.url})")
-            finally:
-                conn.close()
-
+                result = future.result()
+            except Exception as e:
+                logger.error("Auto-fetch failed for board %s (%s): %s", board.name, board.id, e)
+                errors += 1
+                continue
+
+            new_hash = _content_hash(result.get("content", ""))
+            if new_hash != old_hashes.get(board.id, ""):
+                fetched.append((board.id, new_hash))
+                changed += 1
+                changed_boards.append(f"{board.name} ({board.url})")
+            else:
+                fetched.append((board.id, None))
             checked += 1
-        except Exception as e:
-            logger.error("Auto-fetch failed for board %s (%s): %s", board.name, board.id, e)
-            errors += 1
+
+    if fetched:
+        conn = get_connection()
+        try:
+            record_job_board_fetches(conn, fetched)
+        finally:
+            conn.close()
 
     # Notify on changes
     if changed_boards:
@@ -0,0 +1,320 @@
+"""Shared Anthropic Messages API call layer for JayBrain.
+
+SignalForge synthesis, the GramCracker Telegram bot and other LLM callers
+go through this module so that:
+
+- One Anthropic client is shared per process (the SDK client is
+  thread-safe and pools its HTTP connections).
+- In-flight requests are bounded process-wide by LLM_MAX_CONCURRENCY, so
+  concurrent callers cannot stampede the API into rate limits.
+- 429 (rate limited), 529 (overloaded), other 5xx and connection errors
+  are retried with exponential backoff and jitter, honouring retry-after.
+  The SDK's own retries are disabled so there is a single retry policy.
+- Static system prompts can carry a prompt-cache breakpoint.
+- Non-urgent fan-out work can go through the Message Batches API instead.
+- ANTHROPIC_BASE_URL (env JAYBRAIN_ANTHROPIC_BASE_URL) points the client at
+  another host, such as a local mock Anthropic server in tests.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+_client = None
+_client_key: Optional[tuple[str, str]] = None
+_client_lock = threading.Lock()
+_slots: Optional[threading.BoundedSemaphore] = None
+_slots_size = 0
+
+
+# ---------------------------------------------------------------------------
+# Client + concurrency limit
+# ---------------------------------------------------------------------------
+
+
+def get_client():
+    """Return the shared Anthropic client, raising RuntimeError if no API key.
+
+    The client is rebuilt if the API key or base URL changes.
+    """
+    global _client, _client_key
+    from . import config as _cfg  # live reference, not frozen import-time copy
+
+    if not _cfg.ANTHROPIC_API_KEY:
+        raise RuntimeError("ANTHROPIC_API_KEY not set")
+    key = (_cfg.ANTHROPIC_API_KEY, _cfg.ANTHROPIC_BASE_URL)
+    with _client_lock:
+        if _client is None or _client_key != key:
+            import anthropic
+
+            kwargs: dict[str, Any] = {"api_key": _cfg.ANTHROPIC_API_KEY, "max_retries": 0}
+            if _cfg.ANTHROPIC_BASE_URL:
+                kwargs["base_url"] = _cfg.ANTHROPIC_BASE_URL
+            _client = anthropic.Anthropic(**kwargs)
+            _client_key = key
+        return _client
+
+
+def reset_client() -> None:
+    """Forget the shared client and concurrency limiter (e.g. after config changes)."""
+    global _client, _client_key, _slots
+    with _client_lock:
+        _client = None
+        _client_key = None
+        _slots = None
+
+
+def _get_slots() -> threading.BoundedSemaphore:
+    global _slots, _slots_size
+    from .config import LLM_MAX_CONCURRENCY
+
+    with _client_lock:
+        if _slots is None or _slots_size != LLM_MAX_CONCURRENCY:
+            _slots = threading.BoundedSemaphore(max(1, LLM_MAX_CONCURRENCY))
+            _slots_size = LLM_MAX_CONCURRENCY
+        return _slots
+
+
+@contextmanager
+def _slot() -> Iterator[None]:
+    slots = _get_slots()
+    slots.acquire()
+    try:
+        yield
+    finally:
+        slots.release()
+
+
+def slot():
+    """Hold one of the LLM_MAX_CONCURRENCY shared slots.
+
+    create() takes one per request; wrap other LLM work (e.g. a `claude -p`
+    subprocess) in this so it counts against the same limit.
+    """
+    return _slot()
+
+
+# ---------------------------------------------------------------------------
+# Retry policy
+# ---------------------------------------------------------------------------
+
+
+def _retry_delay(exc: Exception, attempt: int) -> Optional[float]:
+    """Seconds to wait before retrying after exc, or None if not retryable."""
+    import anthropic
+
+    from .config import LLM_RETRY_BASE_DELAY, LLM_RETRY_MAX_DELAY
+
+    if isinstance(exc, anthropic.APIConnectionError):  # includes timeouts
+        retry_after = None
+    elif isinstance(exc, anthropic.APIStatusError):
+        status = exc.status_code
+        if status not in (408, 409, 429) and status < 500:
+            return None
+        retry_after = exc.response.headers.get("retry-after")
+    else:
+        return None
+
+    if retry_after is not None:
+        try:
+            return min(max(float(retry_after), 0.0), LLM_RETRY_MAX_DELAY)
+        except ValueError:
+            pass
+    delay = LLM_RETRY_BASE_DELAY * (2 ** attempt)
+    return min(delay + random.uniform(0, delay / 2), LLM_RETRY_MAX_DELAY)
+
+
+def _with_retries(fn: Callable[[], Any], what: str) -> Any:
+    from .config import LLM_MAX_RETRIES
+
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except Exception as e:
+            delay = _retry_delay(e, attempt) if attempt < LLM_MAX_RETRIES else None
+            if delay is None:
+                raise
+            attempt += 1
+            logger.warning(
+                "%s failed (%s), retry %d/%d in %.1fs",
+                what, e, attempt, LLM_MAX_RETRIES, delay,
+            )
+            time.sleep(delay)
+
+
+# ---------------------------------------------------------------------------
+# Calls
+# ---------------------------------------------------------------------------
+
+
+def cached_system(text: str) -> list[dict]:
+    """System prompt as a content block with a prompt-cache breakpoint."""
+    return [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+
+
+def create(client=None, **kwargs):
+    """messages.create() under the concurrency limit, with retries."""
+    client = client or get_client()
+    with _slot():
+        return _with_retries(lambda: client.messages.create(**kwargs), "Claude request")
+
+
+@contextmanager
+def stream(client=None, **kwargs):
+    """messages.stream() under the concurrency limit.
+
+    Opening the stream is retried; once events have started arriving a
+    failure is raised to the caller, who may already have shown output.
+    """
+    client = client or get_client()
+    with _slot():
+        def _open():
+            manager = client.messages.stream(**kwargs)
+            return manager, manager.__enter__()
+
+        manager, message_stream = _with_retries(_open, "Claude stream")
+        try:
+            yield message_stream
+        finally:
+            manager.__exit__(None, None, None)
+
+
+def _usage_count(usage, field: str) -> int:
+    value = getattr(usage, field, 0)
+    return value if isinstance(value, int) else 0
+
+
+def _result(message, model: str) -> dict:
+    usage = getattr(message, "usage", None)
+    return {
+        "text": message.content[0].text if message.content else "",
+        "input_tokens": _usage_count(usage, "input_tokens"),
+        "output_tokens": _usage_count(usage, "output_tokens"),
+        "cache_read_tokens": _usage_count(usage, "cache_read_input_tokens"),
+        "cache_write_tokens": _usage_count(usage, "cache_creation_input_tokens"),
+        "model": model,
+    }
+
+
+def _params(system: str, prompt: str, max_tokens: int, model: str, cache_system: bool) -> dict:
+    return {
+        "model": model,
+        "max_tokens": max_tokens,
+        "system": cached_system(system) if cache_system else system,
+        "messages": [{"role": "user", "content": prompt}],
+    }
+
+
+def complete(
+    system: str,
+    prompt: str,
+    max_tokens: int,
+    model: str,
+    cache_system: bool = True,
+    client=None,
+) -> dict:
+    """Single-turn completion.
+
+    Returns {text, input_tokens, output_tokens, cache_read_tokens,
+    cache_write_tokens, model}.
+    """
+    message = create(client=client, **_params(system, prompt, max_tokens, model, cache_system))
+    return _result(message, model)
+
+
+def map_concurrent(fn: Callable[[Any], Any], items: list, max_workers: Optional[int] = None) -> list:
+    """Apply fn to items on a thread pool, returning results in input order.
+
+    Defaults to LLM_MAX_CONCURRENCY workers; API calls made by fn are also
+    bounded by the shared limit regardless of how many pools are running.
+    """
+    from .config import LLM_MAX_CONCURRENCY
+
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    workers = min(max_workers or LLM_MAX_CONCURRENCY, len(items))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm") as pool:
+        return list(pool.map(fn, items))
+
+
+# ---------------------------------------------------------------------------
+# Message Batches
+# ---------------------------------------------------------------------------
+
+
+def complete_batch(
+    requests: list[dict],
+    client=None,
+    poll_interval: Optional[float] = None,
+    timeout: Optional[float] = None,
+) -> list[dict]:
+    """Run single-turn completions through the Message Batches API.
+
+    Batches cost half as much but may take minutes to hours, so this is
+    for non-urgent work only. Each request is a dict of complete()'s
+    arguments: {system, prompt, max_tokens, model, cache_system?}.
+
+    Blocks until the batch ends, polling every LLM_BATCH_POLL_INTERVAL
+    seconds. Returns one result per request, in order: the same dict as
+    complete(), or {"error": ...} for a request that did not succeed.
+    Raises TimeoutError (after cancelling the batch) if it has not ended
+    within LLM_BATCH_TIMEOUT seconds.
+    """
+    from .config import LLM_BATCH_POLL_INTERVAL, LLM_BATCH_TIMEOUT
+
+    if not requests:
+        return []
+    client = client or get_client()
+    poll_interval = LLM_BATCH_POLL_INTERVAL if poll_interval is None else poll_interval
+    timeout = LLM_BATCH_TIMEOUT if timeout is None else timeout
+
+    batch_requests = [
+        {
+            "custom_id": f"req-{i}",
+            "params": _params(
+                r["system"], r["prompt"], r["max_tokens"], r["model"],
+                r.get("cache_system", True),
+            ),
+        }
+        for i, r in enumerate(requests)
+    ]
+    with _slot():
+        batch = _with_retries(
+            lambda: client.messages.batches.create(requests=batch_requests),
+            "Claude batch create",
+        )
+    logger.info("Submitted message batch %s (%d requests)", batch.id, len(requests))
+
+    deadline = time.monotonic() + timeout
+    while batch.processing_status != "ended":
+        if time.monotonic() >= deadline:
+            try:
+                client.messages.batches.cancel(batch.id)
+            except Exception as e:
+                logger.warning("Failed to cancel message batch %s: %s", batch.id, e)
+            raise TimeoutError(f"Message batch {batch.id} did not finish within {timeout}s")
+        time.sleep(poll_interval)
+        batch = _with_retries(
+            lambda: client.messages.batches.retrieve(batch.id), "Claude batch poll",
+        )
+
+    results: list[dict] = [{"error": "missing from batch results"} for _ in requests]
+    for entry in _with_retries(
+        lambda: list(client.messages.batches.results(batch.id)), "Claude batch results",
+    ):
+        i = int(entry.custom_id.split("-", 1)[1])
+        if entry.result.type == "succeeded":
+            results[i] = _result(entry.result.message, requests[i]["model"])
+        else:
+            error = getattr(entry.result, "error", None)
+            results[i] = {"error": f"{entry.result.type}: {error}" if error else entry.result.type}
+    return results
@@ -0,0 +1,326 @@
+"""Incremental database maintenance for jaybrain.db and jaybrain_ops.db.
+
+Runs as the daemon's db_maintenance module every MAINT_INTERVAL_MINUTES.
+Each run does a little work per database instead of one blocking VACUUM:
+
+- WAL checkpoint sized by the -wal file: nothing below
+  MAINT_WAL_PASSIVE_BYTES, PASSIVE above it, TRUNCATE above
+  MAINT_WAL_TRUNCATE_BYTES (waiting at most MAINT_CHECKPOINT_BUSY_MS).
+- PRAGMA optimize every MAINT_OPTIMIZE_INTERVAL_HOURS.
+- incremental_vacuum in MAINT_VACUUM_SLICE_PAGES slices, one commit each,
+  when the database uses auto_vacuum=INCREMENTAL.
+- quick_check of the next MAINT_QUICK_CHECK_TABLES tables in rotation.
+
+rebuild_fts re-creates the FTS5 indexes online (on demand, not per run),
+e.g. to apply a FTS_DETAIL change.
+
+Every run writes one ops.db_maintenance_log row per database (WAL size,
+free pages, time spent), summarized by daemon_status.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+from .config import (
+    FTS_DETAIL,
+    FTS_REBUILD_CHUNK_ROWS,
+    MAINT_CHECKPOINT_BUSY_MS,
+    MAINT_OPTIMIZE_INTERVAL_HOURS,
+    MAINT_QUICK_CHECK_TABLES,
+    MAINT_VACUUM_MAX_SLICES,
+    MAINT_VACUUM_SLICE_PAGES,
+    MAINT_WAL_PASSIVE_BYTES,
+    MAINT_WAL_TRUNCATE_BYTES,
+)
+from .db import (
+    FTS_TABLES,
+    fts_is_external,
+    get_connection,
+    now_iso,
+    ops_db_path,
+    rebuild_fts_table,
+    resume_fts_rebuilds,
+)
+
+logger = logging.getLogger(__name__)
+
+SCHEMAS = ("main", "ops")
+_AUTO_VACUUM_INCREMENTAL = 2
+
+
+def _db_file(schema: str) -> Path:
+    from . import db
+
+    return db.DB_PATH if schema == "main" else ops_db_path()
+
+
+def _wal_bytes(schema: str) -> int:
+    wal = Path(str(_db_file(schema)) + "-wal")
+    try:
+        return wal.stat().st_size
+    except OSError:
+        return 0
+
+
+def _pragma(conn: sqlite3.Connection, schema: str, name: str) -> int:
+    return conn.execute(f"PRAGMA {schema}.{name}").fetchone()[0]
+
+
+def checkpoint(conn: sqlite3.Connection, schema: str) -> dict:
+    """Checkpoint the WAL if it has grown past the configured thresholds."""
+    wal = _wal_bytes(schema)
+    if wal >= MAINT_WAL_TRUNCATE_BYTES:
+        mode = "TRUNCATE"
+    elif wal >= MAINT_WAL_PASSIVE_BYTES:
+        mode = "PASSIVE"
+    else:
+        return {"mode": "", "busy": False, "wal_bytes_before": wal, "wal_bytes_after": wal}
+    # TRUNCATE waits for readers via the busy handler; keep that short
+    conn.execute(f"PRAGMA busy_timeout={MAINT_CHECKPOINT_BUSY_MS}")
+    try:
+        busy, _, _ = conn.execute(f"PRAGMA {schema}.wal_checkpoint({mode})").fetchone()
+    finally:
+        conn.execute("PRAGMA busy_timeout=30000")
+    return {
+        "mode": mode,
+        "busy": bool(busy),
+        "wal_bytes_before": wal,
+        "wal_bytes_after": _wal_bytes(schema),
+    }
+
+
+def incremental_vacuum(
+    conn: sqlite3.Connection, schema: str, max_slices: Optional[int] = MAINT_VACUUM_MAX_SLICES,
+) -> int:
+    """Return free pages to the OS in small committed slices.
+
+    No-op unless the database uses auto_vacuum=INCREMENTAL. ``max_slices``
+    None reclaims everything. Returns pages reclaimed.
+    """
+    if _pragma(conn, schema, "auto_vacuum") != _AUTO_VACUUM_INCREMENTAL:
+        return 0
+    before = free = _pragma(conn, schema, "freelist_count")
+    slices = 0
+    while free and (max_slices is None or slices < max_slices):
+        # executescript steps the pragma to completion (execute frees one page)
+        conn.executescript(f"PRAGMA {schema}.incremental_vacuum({MAINT_VACUUM_SLICE_PAGES})")
+        free = _pragma(conn, schema, "freelist_count")
+        slices += 1
+    return before - free
+
+
+def reclaim_free_pages() -> dict:
+    """Reclaim all free pages in both databases (forge_maintenance's vacuum).
+
+    A database created before auto_vacuum=INCREMENTAL gets one full VACUUM,
+    which also converts it; after that, reclaiming is incremental and never
+    rewrites the whole file.
+    """
+    conn = get_connection()
+    try:
+        out = {}
+        for schema in SCHEMAS:
+            if _pragma(conn, schema, "auto_vacuum") == _AUTO_VACUUM_INCREMENTAL:
+                out[schema] = {"mode": "incremental", "pages": incremental_vacuum(conn, schema, None)}
+            else:
+                conn.execute(f"PRAGMA {schema}.auto_vacuum=INCREMENTAL")
+                conn.execute(f"VACUUM {schema}")
+                out[schema] = {"mode": "converted_to_incremental"}
+        if out["main"]["mode"] != "incremental":
+            # VACUUM may renumber rowids the external-content FTS indexes point at
+            out["main"]["fts_rebuilt"] = sorted(_rebuild_fts(conn, _existing_fts(conn), None))
+        return out
+    finally:
+        conn.close()
+
+
+def _fts_bytes(conn: sqlite3.Connection, fts: str) -> Optional[int]:
+    """Bytes used by an FTS index's shadow tables (None without dbstat)."""
+    try:
+        return conn.execute(
+            "SELECT COALESCE(SUM(pgsize), 0) FROM dbstat('main') WHERE name LIKE ?",
+            (f"{fts}_%",),
+        ).fetchone()[0]
+    except sqlite3.OperationalError:
+        return None
+
+
+def _existing_fts(conn: sqlite3.Connection) -> list[str]:
+    """FTS_TABLES present in this database (graph_entities_fts needs trigram support)."""
+    return [fts for fts in FTS_TABLES if fts_is_external(conn, fts) is not None]
+
+
+def _rebuild_fts(conn: sqlite3.Connection, tables: list[str], detail: Optional[str]) -> dict:
+    out = {}
+    for fts in tables:
+        start = time.perf_counter()
+        level = detail or FTS_DETAIL.get(fts, "full")
+        before = _fts_bytes(conn, fts)
+        rows = rebuild_fts_table(conn, fts, level, FTS_REBUILD_CHUNK_ROWS)
+        out[fts] = {
+            "rows": rows,
+            "detail": level,
+            "bytes_before": before,
+            "bytes_after": _fts_bytes(conn, fts),
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+        logger.info("Rebuilt %s (%d rows, detail=%s)", fts, rows, level)
+    return out
+
+
+def rebuild_fts(table: Optional[str] = None, detail: Optional[str] = None) -> dict:
+    """Rebuild one FTS index (or all) online, chunked so writers aren't blocked.
+
+    ``detail`` overrides FTS_DETAIL for this rebuild. Searches keep working
+    against the old index until the new one is swapped in.
+    """
+    if table is not None and table not in FTS_TABLES:
+        raise ValueError(f"Unknown FTS table '{table}'. Valid: {', '.join(FTS_TABLES)}")
+    conn = get_connection()
+    try:
+        return _rebuild_fts(conn, [table] if table else _existing_fts(conn), detail)
+    finally:
+        conn.close()
+
+
+def _tables(conn: sqlite3.Connection, schema: str) -> list[str]:
+    return [
+        row[0] for row in conn.execute(
+            f"SELECT name FROM {schema}.sqlite_master WHERE type = 'table' "
+            "AND name NOT LIKE 'sqlite_%' AND sql NOT LIKE 'CREATE VIRTUAL%' ORDER BY name"  # nosec B608
+        )
+    ]
+
+
+def quick_check_next(conn: sqlite3.Connection, schema: str, cursor: int) -> tuple[list[str], str, int]:
+    """quick_check the next tables in rotation. Returns (tables, result, next cursor)."""
+    tables = _tables(conn, schema)
+    if not tables:
+        return [], "ok", 0
+    start = cursor % len(tables)
+    count = min(MAINT_QUICK_CHECK_TABLES, len(tables))
+    picked = [tables[(start + i) % len(tables)] for i in range(count)]
+    problems = []
+    for table in picked:
+        quoted = table.replace("'", "''")
+        rows = [r[0] for r in conn.execute(f"PRAGMA {schema}.quick_check('{quoted}')")]
+        if rows != ["ok"]:
+            problems.extend(f"{table}: {r}" for r in rows)
+    return picked, "; ".join(problems)[:1000] or "ok", (start + count) % len(tables)
+
+
+def _last_run(conn: sqlite3.Connection, schema: str) -> Optional[sqlite3.Row]:
+    return conn.execute(
+        "SELECT * FROM ops.db_maintenance_log WHERE schema_name = ? ORDER BY id DESC LIMIT 1",
+        (schema,),
+    ).fetchone()
+
+
+def _optimize_due(conn: sqlite3.Connection, schema: str) -> bool:
+    cutoff = (
+        datetime.now(timezone.utc) - timedelta(hours=MAINT_OPTIMIZE_INTERVAL_HOURS)
+    ).isoformat()
+    row = conn.execute(
+        "SELECT 1 FROM ops.db_maintenance_log "
+        "WHERE schema_name = ? AND optimized = 1 AND ran_at > ? LIMIT 1",
+        (schema, cutoff),
+    ).fetchone()
+    return row is None
+
+
+def _maintain(conn: sqlite3.Connection, schema: str) -> dict:
+    start = time.perf_counter()
+    last = _last_run(conn, schema)
+    ckpt = checkpoint(conn, schema)
+    freelist_before = _pragma(conn, schema, "freelist_count")
+    vacuumed = incremental_vacuum(conn, schema)
+    optimized = _optimize_due(conn, schema)
+    if optimized:
+        conn.execute(f"PRAGMA {schema}.optimize").fetchall()
+    checked, check_result, cursor = quick_check_next(
+        conn, schema, last["quick_check_cursor"] if last else 0,
+    )
+    if check_result != "ok":
+        logger.error("quick_check found problems in %s: %s", schema, check_result)
+
+    result = {
+        "checkpoint": ckpt,
+        "page_count": _pragma(conn, schema, "page_count"),
+        "freelist_before": freelist_before,
+        "freelist_after": _pragma(conn, schema, "freelist_count"),
+        "pages_vacuumed": vacuumed,
+        "optimized": optimized,
+        "quick_checked": checked,
+        "quick_check_result": check_result,
+        "duration_ms": int((time.perf_counter() - start) * 1000),
+    }
+    conn.execute(
+        """INSERT INTO ops.db_maintenance_log
+        (ran_at, schema_name, wal_bytes_before, wal_bytes_after, checkpoint_mode,
+         checkpoint_busy, page_count, freelist_before, freelist_after, optimized,
+         quick_checked, quick_check_result, quick_check_cursor, duration_ms)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        (now_iso(), schema, ckpt["wal_bytes_before"], ckpt["wal_bytes_after"],
+         ckpt["mode"], int(ckpt["busy"]), result["page_count"], freelist_before,
+         result["freelist_after"], int(optimized), json.dumps(checked),
+         check_result, cursor, result["duration_ms"]),
+    )
+    conn.commit()
+    return result
+
+
+def run_db_maintenance() -> dict:
+    """One maintenance pass over both databases (daemon module entry point).
+
+    Also finishes any FTS rebuild left part way (see resume_fts_rebuilds).
+    """
+    conn = get_connection()
+    try:
+        resumed = resume_fts_rebuilds(conn, FTS_REBUILD_CHUNK_ROWS)
+        out = {schema: _maintain(conn, schema) for schema in SCHEMAS}
+        if resumed:
+            out["main"]["fts_resumed"] = resumed
+        return out
+    finally:
+        conn.close()
+
+
+def maintenance_status(conn: sqlite3.Connection, hours: float = 24.0) -> dict:
+    """Latest run and trend over the last ``hours`` per database, for daemon_status."""
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
+    out = {}
+    for schema in SCHEMAS:
+        last = _last_run(conn, schema)
+        if last is None:
+            continue
+        trend = conn.execute(
+            """SELECT COUNT(*) AS runs, MAX(wal_bytes_before) AS max_wal_bytes,
+                      AVG(wal_bytes_before) AS avg_wal_bytes,
+                      MAX(freelist_before) AS max_free_pages,
+                      SUM(duration_ms) AS total_ms, MAX(duration_ms) AS max_ms,
+                      SUM(checkpoint_busy) AS busy_checkpoints,
+                      SUM(quick_check_result != 'ok') AS quick_check_failures
+               FROM ops.db_maintenance_log WHERE schema_name = ? AND ran_at > ?""",
+            (schema, cutoff),
+        ).fetchone()
+        out[schema] = {
+            "last_run": last["ran_at"],
+            "wal_bytes": last["wal_bytes_after"],
+            "checkpoint_mode": last["checkpoint_mode"],
+            "page_count": last["page_count"],
+            "free_pages": last["freelist_after"],
+            "duration_ms": last["duration_ms"],
+            "quick_check_result": last["quick_check_result"],
+            f"last_{int(hours)}h": {
+                k: (round(trend[k]) if isinstance(trend[k], float) else trend[k] or 0)
+                for k in trend.keys()
+            },
+        }
+    return out
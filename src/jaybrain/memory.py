@@ -9,6 +9,8 @@ import uuid
 from datetime import datetime, timezone
 from typing import Optional
 
+import numpy as np
+
 from .config import (
     MEMORIES_DIR,
     DECAY_HALF_LIFE_DAYS,
@@ -17,6 +19,7 @@ from .config import (
     MIN_DECAY,
     DEFAULT_SEARCH_LIMIT,
     SEARCH_CANDIDATES,
+    WRITER_LOG_DURABILITY,
 )
 from .db import (
     fts5_safe_query,
@@ -25,13 +28,16 @@ from .db import (
     delete_memory,
     get_memory,
     get_memories_batch,
+    get_memories_for_ranking,
     update_memory_access,
+    update_memories_access,
     search_memories_fts,
     search_memories_vec,
     get_all_memories,
 )
 from .models import Memory, MemoryCategory, MemorySearchResult
 from .search import embed_text, hybrid_search
+from .writer import write
 
 logger = logging.getLogger(__name__)
 
@@ -130,6 +136,37 @@ def compute_decay(
     return max(MIN_DECAY, final)
 
 
+def compute_decay_batch(
+    created_ts: np.ndarray,
+    importance: np.ndarray,
+    access_count: np.ndarray,
+    accessed_ts: np.ndarray,
+    now_ts: float,
+) -> np.ndarray:
+    """Vectorized compute_decay over all candidates at once.
+
+    Times are Unix epoch seconds; NaN in ``accessed_ts`` means never
+    accessed. Matches compute_decay element for element.
+    """
+    effective_half_life = np.minimum(
+        DECAY_HALF_LIFE_DAYS + access_count * DECAY_ACCESS_HALF_LIFE_BONUS,
+        DECAY_MAX_HALF_LIFE,
+    )
+    last_touch = np.fmax(created_ts, accessed_ts)  # fmax ignores the NaNs
+    days_since_touch = np.maximum(0.0, (now_ts - last_touch) / 86400)
+    raw_decay = 0.5 ** (days_since_touch / effective_half_life)
+    return np.maximum(MIN_DECAY, raw_decay * (0.5 + 0.5 * importance))
+
+
+def _decay_for_rows(rows: list[sqlite3.Row], now: datetime) -> np.ndarray:
+    """compute_decay_batch over get_memories_for_ranking rows (NULL -> NaN)."""
+    cols = np.array(
+        [(r["created_ts"], r["importance"], r["access_count"], r["accessed_ts"]) for r in rows],
+        dtype=np.float64,
+    ).reshape(-1, 4)
+    return compute_decay_batch(cols[:, 0], cols[:, 1], cols[:, 2], cols[:, 3], now.timestamp())
+
+
 def remember(
     content: str,
     category: str = "semantic",
@@ -153,7 +190,8 @@ def remember(
     # Insert into database
     conn = get_connection()
     try:
-        insert_memory(conn, memory_id, content, category, tags, importance, embedding, session_id)
+        write(conn, insert_memory, memory_id, content, category, tags, importance,
+              embedding, session_id)
         row = get_memory(conn, memory_id)
     finally:
         conn.close()
@@ -210,51 +248,52 @@ def recall(
                 for row in rows
             ]
 
-        # Batch fetch all candidate memories in one query
+        # Rank on lightweight rows; build full models only for the top results
         candidate_ids = [mem_id for mem_id, _ in merged]
-        rows_by_id = get_memories_batch(conn, candidate_ids)
+        ranking_rows = get_memories_for_ranking(conn, candidate_ids)
 
         # Build lookup dicts for individual scores
         vec_scores = {vid: vd for vid, vd in vec_results}
         kw_scores = {kid: ks for kid, ks in fts_results}
 
-        # Apply decay and filters
-        results = []
-        now = datetime.now(timezone.utc)
+        # Apply filters
+        kept = []
+        search_scores = []
         for mem_id, search_score in merged:
-            row = rows_by_id.get(mem_id)
+            row = ranking_rows.get(mem_id)
             if row is None:
                 continue
-
-            memory = _parse_memory_row(row)
-
-            # Filter by category if specified
-            if category and memory.category.value != category:
+            if category and row["category"] != category:
                 continue
-
-            # Filter by tags if specified
-            if tags and not any(t in memory.tags for t in tags):
+            if tags and not any(t in json.loads(row["tags"]) for t in tags):
                 continue
+            kept.append(row)
+            search_scores.append(search_score)
+        if not kept:
+            return []
 
-            # Apply decay (importance is factored into decay now)
-            decay = compute_decay(
-                memory.created_at, memory.importance,
-                memory.access_count, memory.last_accessed, now,
-            )
-            final_score = search_score * decay
+        # Apply decay (importance is factored into decay now)
+        final_scores = np.array(search_scores) * _decay_for_rows(kept, datetime.now(timezone.utc))
+        top = np.argsort(-np.round(final_scores, 4), kind="stable")[:limit]
+        rows_by_id = get_memories_batch(conn, [kept[i]["id"] for i in top])
 
+        results = []
+        for i in top:
+            row = rows_by_id.get(kept[i]["id"])
+            if row is None:
+                continue
             results.append(MemorySearchResult(
-                memory=memory,
-                score=round(final_score, 4),
-                vector_score=round(vec_scores.get(mem_id, 0.0), 4),
-                keyword_score=round(kw_scores.get(mem_id, 0.0), 4),
+                memory=_parse_memory_row(row),
+                score=round(float(final_scores[i]), 4),
+                vector_score=round(vec_scores.get(row["id"], 0.0), 4),
+                keyword_score=round(kw_scores.get(row["id"], 0.0), 4),
             ))
 
-            # Update access count
-            update_memory_access(conn, mem_id)
+        # Update access count for every matching candidate
+        write(conn, update_memories_access, [row["id"] for row in kept],
+              durability=WRITER_LOG_DURABILITY)
 
-        results.sort(key=lambda r: r.score, reverse=True)
-        return results[:limit]
+        return results
     finally:
         conn.close()
 
@@ -272,7 +311,7 @@ def reinforce(memory_id: str) -> Optional[Memory]:
     """Boost a memory's importance by incrementing access count."""
     conn = get_connection()
     try:
-        update_memory_access(conn, memory_id)
+        write(conn, update_memory_access, memory_id)
         row = get_memory(conn, memory_id)
         if row is None:
             return None
@@ -35,6 +35,8 @@ from .db import (
     now_iso,
     update_news_feed_source,
 )
+from .tool_exec import check_cancelled
+from .writer import write
 
 logger = logging.getLogger(__name__)
 
@@ -574,8 +576,9 @@ def _poll_single(conn, source_row) -> dict:
                 tags=tags,
                 source=source_name,
             )
-            _mark_seen(
+            write(
                 conn,
+                _mark_seen,
                 source_id,
                 aid,
                 k.id,
@@ -642,6 +645,7 @@ def run_news_feed_poll() -> dict:
     total_new = 0
 
     for source_row in sources:
+        check_cancelled()
         conn = get_connection()
         try:
             result = _poll_single(conn, source_row)
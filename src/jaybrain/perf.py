@@ -0,0 +1,386 @@
+"""Opt-in latency instrumentation for JayBrain.
+
+Enabled with env JAYBRAIN_PERF=1 (config.PERF_ENABLED). When off, every
+hook is a single attribute check. When on, it records per-name latency
+histograms for:
+
+- "tool": MCP tool calls (tool_exec lanes)
+- "daemon": daemon module runs
+- "sql": SQLite statements, keyed by normalized SQL text
+- "embed": embedding inference calls
+- "lock": first write of a transaction (includes busy/lock wait), commits,
+  and SQLITE_BUSY errors
+
+Samples are aggregated in memory into log-scale buckets and flushed every
+PERF_FLUSH_INTERVAL seconds into perf_rollups, one row per (UTC hour, kind,
+name). report() turns rollups back into p50/p95/p99, top-N slowest queries
+and week-over-week regressions.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("tool", "daemon", "sql", "embed", "lock")
+
+# Bucket i holds samples <= _BOUNDS[i] ms; the last bucket is overflow.
+# Bounds grow by sqrt(2) from 0.05 ms to ~150 s (percentile error < ~20%).
+_BOUNDS = [0.05 * 2 ** (i / 2) for i in range(44)]
+_NBUCKETS = len(_BOUNDS) + 1
+
+_agg: dict[tuple[str, str, str], dict] = {}  # (period, kind, name) -> stats
+_agg_lock = threading.Lock()
+_local = threading.local()
+_flusher: Optional[threading.Thread] = None
+
+
+def enabled() -> bool:
+    from . import config as _cfg  # live reference, not frozen import-time copy
+
+    return _cfg.PERF_ENABLED
+
+
+# ---------------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------------
+
+
+def _bucket(ms: float) -> int:
+    if ms <= _BOUNDS[0]:
+        return 0
+    i = math.ceil(2 * math.log2(ms / _BOUNDS[0]) - 1e-9)
+    return min(i, _NBUCKETS - 1)
+
+
+def _period(ts: Optional[float] = None) -> str:
+    return datetime.fromtimestamp(ts or time.time(), timezone.utc).strftime("%Y-%m-%dT%H")
+
+
+def record(kind: str, name: str, ms: float) -> None:
+    """Add one latency sample. No-op unless instrumentation is enabled."""
+    if not enabled() or getattr(_local, "suspended", False):
+        return
+    key = (_period(), kind, name)
+    with _agg_lock:
+        stats = _agg.get(key)
+        if stats is None:
+            stats = _agg[key] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "buckets": [0] * _NBUCKETS}
+        stats["count"] += 1
+        stats["total_ms"] += ms
+        stats["max_ms"] = max(stats["max_ms"], ms)
+        stats["buckets"][_bucket(ms)] += 1
+    _ensure_flusher()
+
+
+@contextmanager
+def timer(kind: str, name: str) -> Iterator[None]:
+    """Time the enclosed block as one sample."""
+    if not enabled():
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(kind, name, (time.perf_counter() - start) * 1000)
+
+
+@lru_cache(maxsize=2048)
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace so one statement shape maps to one histogram."""
+    return " ".join(sql.split())[:200]
+
+
+class TimedConnection(sqlite3.Connection):
+    """sqlite3 connection that times each statement.
+
+    Used as get_connection()'s factory when instrumentation is on. The
+    sqlite3 trace callback reports statement text but not durations, so
+    execute/executemany/executescript/commit are timed here instead.
+    """
+
+    def _timed(self, method, sql: str, *args):
+        start = time.perf_counter()
+        acquiring = not self.in_transaction
+        try:
+            return method(sql, *args)
+        except sqlite3.OperationalError as e:
+            if "locked" in str(e) or "busy" in str(e):
+                record("lock", "busy_error", (time.perf_counter() - start) * 1000)
+            raise
+        finally:
+            ms = (time.perf_counter() - start) * 1000
+            record("sql", normalize_sql(sql), ms)
+            if acquiring and self.in_transaction:
+                record("lock", "write_begin", ms)
+
+    def execute(self, sql, *args):
+        return self._timed(super().execute, sql, *args)
+
+    def executemany(self, sql, *args):
+        return self._timed(super().executemany, sql, *args)
+
+    def executescript(self, sql):
+        return self._timed(super().executescript, sql)
+
+    def commit(self):
+        start = time.perf_counter()
+        try:
+            return super().commit()
+        finally:
+            record("lock", "commit", (time.perf_counter() - start) * 1000)
+
+
+# ---------------------------------------------------------------------------
+# Rollups
+# ---------------------------------------------------------------------------
+
+
+def _merge(into: dict, stats: dict) -> None:
+    into["count"] += stats["count"]
+    into["total_ms"] += stats["total_ms"]
+    into["max_ms"] = max(into["max_ms"], stats["max_ms"])
+    buckets = stats["buckets"]
+    for i in range(min(len(buckets), _NBUCKETS)):
+        into["buckets"][i] += buckets[i]
+
+
+def _empty() -> dict:
+    return {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "buckets": [0] * _NBUCKETS}
+
+
+def flush() -> int:
+    """Write in-memory aggregates to perf_rollups. Returns rows written."""
+    from .config import PERF_ROLLUP_RETENTION_DAYS
+    from .db import get_connection
+
+    with _agg_lock:
+        pending = dict(_agg)
+        _agg.clear()
+    if not pending:
+        return 0
+
+    _local.suspended = True  # don't instrument our own writes
+    try:
+        conn = get_connection()
+        try:
+            for (period, kind, name), stats in pending.items():
+                row = conn.execute(
+                    "SELECT count, total_ms, max_ms, buckets FROM perf_rollups "
+                    "WHERE period = ? AND kind = ? AND name = ?",
+                    (period, kind, name),
+                ).fetchone()
+                if row is not None:
+                    _merge(stats, {
+                        "count": row["count"], "total_ms": row["total_ms"],
+                        "max_ms": row["max_ms"], "buckets": json.loads(row["buckets"]),
+                    })
+                conn.execute(
+                    "INSERT OR REPLACE INTO perf_rollups "
+                    "(period, kind, name, count, total_ms, max_ms, buckets) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (period, kind, name, stats["count"], stats["total_ms"],
+                     stats["max_ms"], json.dumps(stats["buckets"])),
+                )
+            cutoff = _period(time.time() - PERF_ROLLUP_RETENTION_DAYS * 86400)
+            conn.execute("DELETE FROM perf_rollups WHERE period < ?", (cutoff,))
+            conn.commit()
+        finally:
+            conn.close()
+    except Exception as e:
+        logger.warning("perf flush failed, dropping %d aggregates: %s", len(pending), e)
+        return 0
+    finally:
+        _local.suspended = False
+    return len(pending)
+
+
+def _flush_loop() -> None:
+    from . import config as _cfg
+
+    while True:
+        time.sleep(_cfg.PERF_FLUSH_INTERVAL)
+        if _agg:
+            flush()
+
+
+def _ensure_flusher() -> None:
+    global _flusher
+    if _flusher is not None:
+        return
+    with _agg_lock:
+        if _flusher is not None:
+            return
+        _flusher = threading.Thread(target=_flush_loop, name="perf-flush", daemon=True)
+        _flusher.start()
+    atexit.register(flush)
+
+
+def snapshot(kind: str = "") -> dict[str, dict]:
+    """Unflushed aggregates merged across periods, keyed by name.
+
+    Keys are "kind:name", or just name when ``kind`` is given.
+    """
+    out: dict[str, dict] = {}
+    with _agg_lock:
+        for (_, k, name), stats in _agg.items():
+            if kind and k != kind:
+                continue
+            key = name if kind else f"{k}:{name}"
+            _merge(out.setdefault(key, _empty()), stats)
+    return out
+
+
+def reset() -> None:
+    """Drop unflushed samples (tests, or after toggling instrumentation)."""
+    with _agg_lock:
+        _agg.clear()
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+
+def percentile(buckets: list[int], q: float) -> Optional[float]:
+    """Estimate the q-th quantile (0-1) in ms from histogram buckets."""
+    total = sum(buckets)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for i, n in enumerate(buckets):
+        seen += n
+        if seen >= rank and n:
+            if i == 0:
+                return round(_BOUNDS[0], 3)
+            if i >= len(_BOUNDS):
+                return round(_BOUNDS[-1], 3)
+            # Geometric midpoint of (lower, upper]
+            return round(math.sqrt(_BOUNDS[i - 1] * _BOUNDS[i]), 3)
+    return round(_BOUNDS[-1], 3)
+
+
+def _describe(name: str, stats: dict) -> dict:
+    b = stats["buckets"]
+    return {
+        "name": name,
+        "count": stats["count"],
+        "avg_ms": round(stats["total_ms"] / stats["count"], 3) if stats["count"] else 0.0,
+        "p50_ms": percentile(b, 0.50),
+        "p95_ms": percentile(b, 0.95),
+        "p99_ms": percentile(b, 0.99),
+        "max_ms": round(stats["max_ms"], 3),
+        "total_ms": round(stats["total_ms"], 1),
+    }
+
+
+def _load(conn: sqlite3.Connection, start: float, end: float, kind: Optional[str] = None) -> dict:
+    """Merged stats per (kind, name) for rollup hours in [start, end)."""
+    sql = "SELECT kind, name, count, total_ms, max_ms, buckets FROM perf_rollups WHERE period >= ? AND period < ?"
+    params: list = [_period(start), _period(end)]
+    if kind:
+        sql += " AND kind = ?"
+        params.append(kind)
+    merged: dict[tuple[str, str], dict] = {}
+    for row in conn.execute(sql, params):
+        _merge(merged.setdefault((row["kind"], row["name"]), _empty()), {
+            "count": row["count"], "total_ms": row["total_ms"],
+            "max_ms": row["max_ms"], "buckets": json.loads(row["buckets"]),
+        })
+    return merged
+
+
+def report(kind: str = "", days: float = 1.0, top: Optional[int] = None) -> dict:
+    """Latency report over the last `days`, flushing pending samples first.
+
+    Returns per-kind totals and top names by total time, the slowest SQL
+    statements by p95, and names whose p95 regressed against the same
+    window one week earlier.
+    """
+    from .config import PERF_REGRESSION_MIN_COUNT, PERF_REGRESSION_RATIO, PERF_TOP_N
+    from .db import get_connection
+
+    if kind and kind not in KINDS:
+        raise ValueError(f"Unknown kind '{kind}'. Valid: {', '.join(KINDS)}")
+    top = top or PERF_TOP_N
+    flush()
+    now = time.time() + 3600  # include the current, partial hour
+    span = days * 86400
+    conn = get_connection()
+    try:
+        current = _load(conn, now - span, now, kind or None)
+        previous = _load(conn, now - span - 7 * 86400, now - 7 * 86400, kind or None)
+    finally:
+        conn.close()
+
+    kinds: dict[str, dict] = {}
+    for (k, name), stats in current.items():
+        entry = kinds.setdefault(k, {"all": _empty(), "names": []})
+        _merge(entry["all"], stats)
+        entry["names"].append(_describe(name, stats))
+    by_kind = {}
+    for k, entry in sorted(kinds.items()):
+        overall = _describe(k, entry["all"])
+        overall.pop("name")
+        by_kind[k] = {
+            **overall,
+            "distinct": len(entry["names"]),
+            "top": sorted(entry["names"], key=lambda d: d["total_ms"], reverse=True)[:top],
+        }
+
+    slowest_sql = sorted(
+        (d for d in kinds.get("sql", {}).get("names", []) if d["count"]),
+        key=lambda d: (d["p95_ms"] or 0, d["total_ms"]),
+        reverse=True,
+    )[:top]
+
+    regressions = []
+    for key, stats in current.items():
+        before = previous.get(key)
+        if not before or min(stats["count"], before["count"]) < PERF_REGRESSION_MIN_COUNT:
+            continue
+        p95_now = percentile(stats["buckets"], 0.95)
+        p95_before = percentile(before["buckets"], 0.95)
+        if p95_now and p95_before and p95_now >= p95_before * PERF_REGRESSION_RATIO:
+            regressions.append({
+                "kind": key[0], "name": key[1],
+                "p95_ms": p95_now, "p95_last_week_ms": p95_before,
+                "ratio": round(p95_now / p95_before, 2),
+                "count": stats["count"], "count_last_week": before["count"],
+            })
+    regressions.sort(key=lambda r: r["ratio"], reverse=True)
+
+    return {
+        "enabled": enabled(),
+        "window_days": days,
+        "kinds": by_kind,
+        "slowest_queries": slowest_sql,
+        "regressions": regressions[:top],
+    }
+
+
+def summary() -> dict:
+    """Compact p50/p95/p99 per kind for the last day (for the stats tool)."""
+    full = report(days=1.0, top=3)
+    return {
+        "enabled": full["enabled"],
+        "kinds": {
+            k: {key: v[key] for key in ("count", "p50_ms", "p95_ms", "p99_ms")}
+            | {"slowest": [t["name"] for t in v["top"]]}
+            for k, v in full["kinds"].items()
+        },
+        "regressions": len(full["regressions"]),
+    }
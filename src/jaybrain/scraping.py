@@ -4,19 +4,41 @@ Inspired by ddub227/web-scraper patterns: SPA heuristic detection,
 structured metadata extraction, pagination discovery, and graceful
 Playwright fallback for JS-rendered pages.
 
+Plain fetches share one keep-alive requests.Session with retries; renders
+go through a persistent headless Chromium whose contexts are pooled and
+reaped when idle.
+
 Playwright is optional -- install with: pip install playwright && playwright install chromium
 """
 
 from __future__ import annotations
 
 import logging
+import queue
 import re
-from typing import Optional
-from urllib.parse import urljoin, urlparse
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
 
 from bs4 import BeautifulSoup, Tag
 
-from .config import SCRAPE_TIMEOUT, SCRAPE_USER_AGENT, SCRAPE_MAX_PAGES, validate_url
+from .config import (
+    SCRAPE_BLOCK_RESOURCES,
+    SCRAPE_BROWSER_IDLE_SECONDS,
+    SCRAPE_MAX_PAGES,
+    SCRAPE_MAX_RETRIES,
+    SCRAPE_PER_DOMAIN_CONCURRENCY,
+    SCRAPE_POOL_MAXSIZE,
+    SCRAPE_PREFETCH_PAGES,
+    SCRAPE_RETRY_AFTER_MAX,
+    SCRAPE_RETRY_BACKOFF,
+    SCRAPE_TIMEOUT,
+    SCRAPE_USER_AGENT,
+    validate_url,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -186,7 +208,7 @@ def discover_next_page(html: str, current_url: str) -> Optional[str]:
     return None
 
 
-def fetch_page(url: str, render: str = "auto") -> dict:
+def fetch_page(url: str, render: str = "auto", block_resources: Optional[bool] = None) -> dict:
     """Fetch a single page and return raw HTML + status info.
 
     render modes:
@@ -194,32 +216,48 @@ def fetch_page(url: str, render: str = "auto") -> dict:
         "always" -- always use Playwright
         "never"  -- plain HTTP only
 
-    Returns dict with keys: html, url, rendered (bool), status_code.
-    """
-    import requests
+    block_resources: skip images/fonts/media while rendering (None = use
+    SCRAPE_BLOCK_RESOURCES). Has no effect on plain HTTP fetches.
 
+    Returns dict with keys: html, url, rendered (bool), status_code,
+    fetch_ms (plain HTTP time, None if skipped) and render_ms (Playwright
+    time, None if not rendered).
+    """
     validate_url(url)
 
-    headers = {"User-Agent": SCRAPE_USER_AGENT}
+    if block_resources is None:
+        block_resources = SCRAPE_BLOCK_RESOURCES
+    with _domain_slot(url):
+        return _fetch_page(url, render, block_resources)
+
+
+def _fetch_page(url: str, render: str, block_resources: bool) -> dict:
     rendered = False
+    render_ms = None
 
     if render == "always":
-        html = _render_with_playwright(url)
+        html, render_ms = _timed_render(url, block_resources)
         if html is not None:
-            return {"html": html, "url": url, "rendered": True, "status_code": 200}
+            return {
+                "html": html, "url": url, "rendered": True, "status_code": 200,
+                "fetch_ms": None, "render_ms": render_ms,
+            }
         # Playwright unavailable, fall through to plain fetch
         logger.warning("Playwright unavailable, falling back to plain HTTP for %s", url)
 
-    # Plain HTTP fetch
-    response = requests.get(url, timeout=SCRAPE_TIMEOUT, headers=headers)
+    # Plain HTTP fetch over the shared keep-alive session
+    started = time.monotonic()
+    response = get_session().get(url, timeout=SCRAPE_TIMEOUT)
     response.raise_for_status()
     html = response.text
     status_code = response.status_code
+    fetch_ms = int((time.monotonic() - started) * 1000)
+    _record("fetch", fetch_ms)
 
     # Auto-detect SPA and re-render if needed
     if render == "auto" and should_render(html):
         logger.info("SPA detected for %s, attempting Playwright render", url)
-        rendered_html = _render_with_playwright(url)
+        rendered_html, render_ms = _timed_render(url, block_resources)
         if rendered_html is not None:
             html = rendered_html
             rendered = True
@@ -229,9 +267,35 @@ def fetch_page(url: str, render: str = "auto") -> dict:
         "url": url,
         "rendered": rendered,
         "status_code": status_code,
+        "fetch_ms": fetch_ms,
+        "render_ms": render_ms,
     }
 
 
+def _predict_next_urls(current_url: str, next_url: str, count: int) -> list[str]:
+    """Predict the pages after next_url when pagination is a ?page=N counter.
+
+    Only applies when next_url is current_url with its page parameter
+    incremented by one (a missing parameter counts as page 1) and nothing
+    else changed. Returns up to count URLs, or [] if not predictable.
+    """
+    cur, nxt = urlparse(current_url), urlparse(next_url)
+    if count <= 0 or cur[:3] != nxt[:3]:
+        return []
+    cur_q, nxt_q = dict(parse_qsl(cur.query)), dict(parse_qsl(nxt.query))
+    page = nxt_q.get("page", "")
+    if not page.isdigit() or cur_q.get("page", "1") != str(int(page) - 1):
+        return []
+    if {k: v for k, v in cur_q.items() if k != "page"} != \
+       {k: v for k, v in nxt_q.items() if k != "page"}:
+        return []
+    urls = []
+    for n in range(int(page) + 1, int(page) + 1 + count):
+        query = urlencode([(k, str(n) if k == "page" else v) for k, v in parse_qsl(nxt.query)])
+        urls.append(urlunparse(nxt._replace(query=query)))
+    return urls
+
+
 def fetch_pages(
     url: str,
     max_pages: int = 0,
@@ -241,6 +305,12 @@ def fetch_pages(
 
     max_pages=0 means use the SCRAPE_MAX_PAGES config default.
     Returns a list of page results, each with text, metadata, and page_url.
+
+    When the next-page link is a predictable ?page=N counter, up to
+    SCRAPE_PREFETCH_PAGES further pages are fetched speculatively in
+    parallel. A prefetched page is only used if the previous page really
+    links to it; otherwise it is discarded and pagination continues
+    serially, so results match a strictly serial crawl.
     """
     if max_pages <= 0:
         max_pages = SCRAPE_MAX_PAGES
@@ -248,60 +318,383 @@ def fetch_pages(
     pages = []
     current_url = url
     visited = set()
+    prefetched: dict[str, Future] = {}
+    pool: Optional[ThreadPoolExecutor] = None
 
-    for page_num in range(1, max_pages + 1):
-        if current_url in visited:
-            break
-        visited.add(current_url)
+    def _get(page_url: str) -> dict:
+        future = prefetched.pop(page_url, None)
+        if future is not None:
+            return future.result()
+        return fetch_page(page_url, render=render)
 
-        try:
-            result = fetch_page(current_url, render=render)
-        except Exception as e:
-            logger.error("Failed to fetch page %d (%s): %s", page_num, current_url, e)
-            break
-
-        html = result["html"]
-        text = extract_clean_text(html)
-        metadata = extract_metadata(html, current_url)
-
-        pages.append({
-            "page_num": page_num,
-            "page_url": current_url,
-            "rendered": result["rendered"],
-            "text": text,
-            "text_length": len(text),
-            "metadata": metadata,
-        })
-
-        # Try to find next page
-        next_url = discover_next_page(html, current_url)
-        if not next_url:
-            break
-        current_url = next_url
+    try:
+        for page_num in range(1, max_pages + 1):
+            if current_url in visited:
+                break
+            visited.add(current_url)
+
+            try:
+                result = _get(current_url)
+            except Exception as e:
+                logger.error("Failed to fetch page %d (%s): %s", page_num, current_url, e)
+                break
+
+            html = result["html"]
+            text = extract_clean_text(html)
+            metadata = extract_metadata(html, current_url)
+
+            pages.append({
+                "page_num": page_num,
+                "page_url": current_url,
+                "rendered": result["rendered"],
+                "prefetched": result.get("prefetched", False),
+                "fetch_ms": result["fetch_ms"],
+                "render_ms": result["render_ms"],
+                "text": text,
+                "text_length": len(text),
+                "metadata": metadata,
+            })
+
+            # Try to find next page
+            next_url = discover_next_page(html, current_url)
+            if not next_url:
+                break
+
+            remaining = max_pages - page_num
+            if remaining > 1 and next_url not in prefetched:
+                # Speculative fetches that the crawl did not follow are dropped
+                for stale in prefetched.values():
+                    stale.cancel()
+                prefetched.clear()
+                predicted = _predict_next_urls(
+                    current_url, next_url, min(SCRAPE_PREFETCH_PAGES, remaining - 1),
+                )
+                if predicted:
+                    if pool is None:
+                        pool = ThreadPoolExecutor(
+                            max_workers=SCRAPE_PREFETCH_PAGES + 1,
+                            thread_name_prefix="scrape-prefetch",
+                        )
+                    for page_url in [next_url] + predicted:
+                        prefetched[page_url] = pool.submit(_prefetch, page_url, render)
+            current_url = next_url
+    finally:
+        if pool is not None:
+            for future in prefetched.values():
+                future.cancel()
+            pool.shutdown(wait=False)
 
     return pages
 
 
-def _render_with_playwright(url: str) -> Optional[str]:
-    """Render a page with Playwright (Chromium). Returns HTML or None if unavailable."""
-    try:
-        from playwright.sync_api import sync_playwright
-    except ImportError:
-        logger.debug("Playwright not installed -- skip JS rendering")
-        return None
+def _prefetch(url: str, render: str) -> dict:
+    result = fetch_page(url, render=render)
+    result["prefetched"] = True
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Per-domain concurrency
+# ---------------------------------------------------------------------------
+
+_domain_slots: dict[str, threading.BoundedSemaphore] = {}
+_domain_slots_lock = threading.Lock()
+
+
+@contextmanager
+def _domain_slot(url: str) -> Iterator[None]:
+    """Bound simultaneous fetches to one host at SCRAPE_PER_DOMAIN_CONCURRENCY."""
+    host = (urlparse(url).hostname or "").lower()
+    with _domain_slots_lock:
+        slots = _domain_slots.get(host)
+        if slots is None:
+            slots = _domain_slots[host] = threading.BoundedSemaphore(
+                max(1, SCRAPE_PER_DOMAIN_CONCURRENCY)
+            )
+    with slots:
+        yield
+
+
+def _timed_render(url: str, block_resources: bool) -> tuple[Optional[str], Optional[int]]:
+    started = time.monotonic()
+    html = _render_with_playwright(url, block_resources=block_resources)
+    if html is None:
+        return None, None
+    render_ms = int((time.monotonic() - started) * 1000)
+    _record("render", render_ms)
+    return html, render_ms
 
+
+def _render_with_playwright(url: str, block_resources: bool = False) -> Optional[str]:
+    """Render a page with the pooled headless Chromium. Returns HTML or None if unavailable."""
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            try:
-                page = browser.new_page(
-                    user_agent=SCRAPE_USER_AGENT,
-                )
-                page.goto(url, timeout=SCRAPE_TIMEOUT * 1000, wait_until="networkidle")
-                html = page.content()
-                return html
-            finally:
-                browser.close()
+        return _browser_pool.render(url, block_resources)
     except Exception as e:
         logger.warning("Playwright rendering failed for %s: %s", url, e)
         return None
+
+
+# ---------------------------------------------------------------------------
+# Shared HTTP session
+# ---------------------------------------------------------------------------
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _retry_policy():
+    """urllib3 Retry for plain fetches, waiting at most SCRAPE_RETRY_AFTER_MAX on Retry-After.
+
+    urllib3 caps Retry-After at six hours (older releases not at all), and a
+    fetch holds its per-domain slot while it sleeps, so one 429 asking for a
+    long pause would stall every fetch to that host.
+    """
+    from urllib3.util.retry import Retry
+
+    class BoundedRetry(Retry):
+        def parse_retry_after(self, retry_after: str) -> float:
+            return min(super().parse_retry_after(retry_after), SCRAPE_RETRY_AFTER_MAX)
+
+    return BoundedRetry(
+        total=SCRAPE_MAX_RETRIES,
+        backoff_factor=SCRAPE_RETRY_BACKOFF,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,  # hand the last response to raise_for_status()
+    )
+
+
+def get_session():
+    """Return the process-wide requests.Session used for plain fetches.
+
+    Connections are kept alive and pooled per host, transient failures
+    (connection errors, 429, 5xx) are retried with backoff (Retry-After is
+    honoured up to SCRAPE_RETRY_AFTER_MAX seconds), and gzip/deflate
+    responses are accepted. requests sessions are safe to share between
+    threads for simple GETs like these.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            adapter = HTTPAdapter(
+                max_retries=_retry_policy(),
+                pool_connections=SCRAPE_POOL_MAXSIZE,
+                pool_maxsize=SCRAPE_POOL_MAXSIZE,
+            )
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({
+                "User-Agent": SCRAPE_USER_AGENT,
+                "Accept": "text/html,application/xhtml+xml,*/*;q=0.8",
+                "Accept-Encoding": "gzip, deflate",
+            })
+            _session = session
+        return _session
+
+
+def reset_session() -> None:
+    """Close and forget the shared session (e.g. after config changes)."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+# ---------------------------------------------------------------------------
+# Persistent headless browser pool
+# ---------------------------------------------------------------------------
+
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+
+class _BrowserPool:
+    """One long-lived headless Chromium with reusable browser contexts.
+
+    Playwright's sync API objects must stay on the thread that created them,
+    so a dedicated render thread owns the driver, the browser and the
+    contexts; callers hand it URLs and wait for the HTML. Contexts are
+    pooled per resource-blocking mode and reused across renders (cookies
+    cleared in between). Contexts idle for SCRAPE_BROWSER_IDLE_SECONDS are
+    closed, and once none are left the browser and the render thread shut
+    down too; the next render starts them again.
+    """
+
+    _STOP = object()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        # Owned by the render thread
+        self._playwright = None
+        self._browser = None
+        self._contexts: dict[bool, list] = {}  # block_resources -> [context, last_used]
+
+    def render(self, url: str, block_resources: bool) -> Optional[str]:
+        done = Future()
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="scrape-render", daemon=True,
+                )
+                self._thread.start()
+            self._queue.put((url, block_resources, done))
+        # Generous bound: browser launch + navigation + queueing behind others
+        return done.result(timeout=SCRAPE_TIMEOUT * 4)
+
+    def close(self) -> None:
+        """Close the browser and stop the render thread."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            self._queue.put(self._STOP)
+            thread.join(timeout=SCRAPE_TIMEOUT)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                job = self._queue.get(timeout=max(SCRAPE_BROWSER_IDLE_SECONDS / 4, 0.05))
+            except queue.Empty:
+                self._reap()
+                with self._lock:
+                    # Nothing left to keep warm and nothing queued: exit
+                    if self._browser is None and self._queue.empty():
+                        if self._thread is threading.current_thread():
+                            self._thread = None
+                        return
+                continue
+            if job is self._STOP:
+                self._shutdown()
+                return
+            url, block_resources, done = job
+            if done.set_running_or_notify_cancel():
+                try:
+                    done.set_result(self._render(url, block_resources))
+                except BaseException as e:
+                    done.set_exception(e)
+            self._reap()
+
+    def _context(self, block_resources: bool):
+        if self._browser is None:
+            try:
+                from playwright.sync_api import sync_playwright
+            except ImportError:
+                logger.debug("Playwright not installed -- skip JS rendering")
+                return None
+            self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(headless=True)
+            _record("browser_launch")
+
+        entry = self._contexts.get(block_resources)
+        if entry is not None:
+            entry[1] = time.monotonic()
+            _record("context_reuse")
+            return entry[0]
+
+        context = self._browser.new_context(user_agent=SCRAPE_USER_AGENT)
+        if block_resources:
+            context.route("**/*", _block_heavy_resources)
+        self._contexts[block_resources] = [context, time.monotonic()]
+        return context
+
+    def _render(self, url: str, block_resources: bool) -> Optional[str]:
+        try:
+            context = self._context(block_resources)
+        except Exception:
+            self._shutdown()  # failed launch: start from scratch next time
+            raise
+        if context is None:
+            return None
+        page = context.new_page()
+        try:
+            page.goto(url, timeout=SCRAPE_TIMEOUT * 1000, wait_until="networkidle")
+            return page.content()
+        finally:
+            try:
+                page.close()
+                context.clear_cookies()
+            except Exception:
+                # A context that cannot be cleaned up is not reused
+                self._close_context(block_resources)
+
+    def _close_context(self, key: bool) -> None:
+        entry = self._contexts.pop(key, None)
+        if entry is not None:
+            try:
+                entry[0].close()
+            except Exception:
+                logger.debug("Failed to close browser context", exc_info=True)
+
+    def _reap(self) -> None:
+        now = time.monotonic()
+        for key, (_, last_used) in list(self._contexts.items()):
+            if now - last_used >= SCRAPE_BROWSER_IDLE_SECONDS:
+                self._close_context(key)
+        if self._browser is not None and not self._contexts:
+            self._shutdown()
+
+    def _shutdown(self) -> None:
+        for key in list(self._contexts):
+            self._close_context(key)
+        for obj, method in ((self._browser, "close"), (self._playwright, "stop")):
+            if obj is not None:
+                try:
+                    getattr(obj, method)()
+                except Exception:
+                    logger.debug("Failed to %s Playwright", method, exc_info=True)
+        self._browser = None
+        self._playwright = None
+
+
+def _block_heavy_resources(route) -> None:
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+_browser_pool = _BrowserPool()
+
+
+def close_browser_pool() -> None:
+    """Shut down the pooled Chromium (e.g. at process exit)."""
+    _browser_pool.close()
+
+
+# ---------------------------------------------------------------------------
+# Latency stats
+# ---------------------------------------------------------------------------
+
+_stats_lock = threading.Lock()
+_stats: dict[str, dict] = {}
+
+
+def _record(kind: str, ms: Optional[int] = None) -> None:
+    with _stats_lock:
+        entry = _stats.setdefault(kind, {"count": 0, "total_ms": 0, "max_ms": 0})
+        entry["count"] += 1
+        if ms is not None:
+            entry["total_ms"] += ms
+            entry["max_ms"] = max(entry["max_ms"], ms)
+
+
+def scrape_stats() -> dict:
+    """Per-process counts and latency for fetches, renders and the browser pool."""
+    with _stats_lock:
+        return {
+            kind: {
+                "count": e["count"],
+                **(
+                    {"avg_ms": round(e["total_ms"] / e["count"], 1), "max_ms": e["max_ms"]}
+                    if kind in ("fetch", "render") else {}
+                ),
+            }
+            for kind, e in _stats.items()
+        }
@@ -19,6 +19,7 @@ from .config import (
     KEYWORD_WEIGHT,
     SEARCH_CANDIDATES,
 )
+from . import perf
 
 logger = logging.getLogger(__name__)
 
@@ -103,6 +104,11 @@ def embed_text(text: str) -> list[float]:
     Uses ONNX Runtime + tokenizers for fast inference.
     Returns a list of 384 floats (all-MiniLM-L6-v2 dimensions).
     """
+    with perf.timer("embed", "embed_text"):
+        return _embed_text(text)
+
+
+def _embed_text(text: str) -> list[float]:
     tokenizer = _load_tokenizer()
     session = _load_ort_session()
 
@@ -3,11 +3,9 @@
 from __future__ import annotations
 
 import asyncio
-import functools
 import json
 import logging
 import sys
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
@@ -15,6 +13,7 @@ from fastmcp import FastMCP
 
 from .config import ensure_data_dirs
 from .db import init_db, get_connection, get_stats
+from .tool_exec import offload, start_job
 
 # Configure logging to stderr (stdout is reserved for MCP JSON-RPC)
 logging.basicConfig(
@@ -38,27 +37,36 @@ mcp = FastMCP(
     ),
 )
 
-# Dedicated single-thread executor for browser automation.
-# Playwright's sync API cannot run inside an asyncio event loop (which FastMCP
-# uses). By routing all Playwright calls through a dedicated worker thread that
-# has no event loop, the sync API works correctly. A single thread ensures
-# Playwright objects (browser, context, page) stay thread-safe.
-_browser_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pw")
 
+def tool(lane: str = "db"):
+    """Register a sync MCP tool that runs on a tool_exec lane.
+
+    lane: "cpu" (embedding), "io" (network) or "db" (everything else).
+    Keeps blocking work off the event loop and applies the tool's timeout
+    (config.TOOL_TIMEOUTS, else TOOL_TIMEOUT).
+    """
+    def decorate(fn):
+        return mcp.tool()(offload(lane)(fn))
+    return decorate
 
-async def _run_browser(fn, *args, **kwargs):
-    """Run a sync browser function in the dedicated Playwright thread."""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(
-        _browser_thread, functools.partial(fn, *args, **kwargs),
-    )
+
+# Browser automation runs on per-handle Playwright worker threads.
+# Playwright's sync API cannot run inside an asyncio event loop (which FastMCP
+# uses), and its objects must stay on the thread that created them. Each
+# browser handle therefore gets its own worker thread with no event loop
+# (see browser.submit); different handles run in parallel.
+async def _run_browser(fn, *args, handle: str = "", **kwargs):
+    """Run a sync browser function on the handle's Playwright thread."""
+    from .browser import submit
+
+    return await asyncio.wrap_future(submit(handle, fn, *args, **kwargs))
 
 
 # =============================================================================
 # Memory Tools (3)
 # =============================================================================
 
-@mcp.tool()
+@tool("cpu")
 def remember(
     content: str,
     category: str = "semantic",
@@ -87,7 +95,7 @@ def remember(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool("cpu")
 def recall(
     query: str,
     category: str | None = None,
@@ -121,7 +129,7 @@ def recall(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool("cpu")
 def deep_recall(query: str, limit: int = 10) -> str:
     """Deep search across ALL of JayBrain's memory systems in one call.
 
@@ -143,7 +151,7 @@ def deep_recall(query: str, limit: int = 10) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def forget(memory_id: str) -> str:
     """Delete a specific memory by ID."""
     from .memory import forget as _forget
@@ -162,7 +170,7 @@ def forget(memory_id: str) -> str:
 # Profile Tools (2)
 # =============================================================================
 
-@mcp.tool()
+@tool()
 def profile_get() -> str:
     """Read the full user profile (name, preferences, projects, tools, notes)."""
     from .profile import get_profile
@@ -175,7 +183,7 @@ def profile_get() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def profile_update(section: str, key: str, value: str) -> str:
     """Update a specific field in the user profile.
 
@@ -196,7 +204,7 @@ def profile_update(section: str, key: str, value: str) -> str:
 # Task Tools (3)
 # =============================================================================
 
-@mcp.tool()
+@tool()
 def task_create(
     title: str,
     description: str = "",
@@ -226,7 +234,7 @@ def task_create(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def task_update(
     task_id: str,
     status: str | None = None,
@@ -302,7 +310,7 @@ def task_update(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def task_list(
     status: str | None = None,
     project: str | None = None,
@@ -340,7 +348,7 @@ def task_list(
 # Task Queue Tools (7)
 # =============================================================================
 
-@mcp.tool()
+@tool()
 def queue_next() -> str:
     """Returns the next task in the queue (lowest queue_position that's not done/cancelled).
 
@@ -356,7 +364,7 @@ def queue_next() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def queue_push(task_id: str, position: int | None = None) -> str:
     """Add a task to the queue.
 
@@ -373,7 +381,7 @@ def queue_push(task_id: str, position: int | None = None) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def queue_pop() -> str:
     """Mark the current top task as in_progress and return it.
 
@@ -390,7 +398,7 @@ def queue_pop() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def queue_reorder(task_ids: list[str]) -> str:
     """Reorder the queue by providing task IDs in the desired order.
 
@@ -407,7 +415,7 @@ def queue_reorder(task_ids: list[str]) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def queue_view() -> str:
     """Show the full task queue in order.
 
@@ -424,7 +432,7 @@ def queue_view() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def queue_defer(task_id: str) -> str:
     """Move a task to the end of the queue (when going on a tangent).
 
@@ -440,7 +448,7 @@ def queue_defer(task_id: str) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def queue_bump(task_id: str) -> str:
     """Move a task to position 1 (urgent).
 
@@ -461,7 +469,7 @@ def queue_bump(task_id: str) -> str:
 # Session Tools (4)
 # =============================================================================
 
-@mcp.tool()
+@tool()
 def session_start(title: str = "") -> str:
     """Start a new session. Returns previous session handoff for context continuity.
 
@@ -477,7 +485,7 @@ def session_start(title: str = "") -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def session_end(
     summary: str,
     decisions_made: list[str] | None = None,
@@ -503,7 +511,7 @@ def session_end(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def session_handoff() -> str:
     """Get the last session's context for continuity.
 
@@ -521,7 +529,7 @@ def session_handoff() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def session_checkpoint(
     summary: str,
     decisions_made: list[str] | None = None,
@@ -554,7 +562,7 @@ def session_checkpoint(
 # Knowledge Tools (3)
 # =============================================================================
 
-@mcp.tool()
+@tool("cpu")
 def knowledge_store(
     title: str,
     content: str,
@@ -581,7 +589,7 @@ def knowledge_store(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool("cpu")
 def knowledge_search(
     query: str,
     category: str | None = None,
@@ -610,7 +618,7 @@ def knowledge_search(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool("cpu")
 def knowledge_update(
     knowledge_id: str,
     title: str | None = None,
@@ -649,7 +657,7 @@ def knowledge_update(
 # SynapseForge Tools (7)
 # =============================================================================
 
-@mcp.tool()
+@tool("cpu")
 def forge_add(
     term: str,
     definition: str,
@@ -689,7 +697,7 @@ def forge_add(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def forge_review(
     concept_id: str,
     outcome: str,
@@ -729,7 +737,7 @@ def forge_review(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def forge_study(
     category: str | None = None,
     limit: int = 10,
@@ -750,7 +758,7 @@ def forge_study(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool("cpu")
 def forge_search(
     query: str,
     category: str | None = None,
@@ -768,7 +776,7 @@ def forge_search(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool("cpu")
 def forge_update(
     concept_id: str,
     term: str | None = None,
@@ -816,7 +824,7 @@ def forge_update(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def forge_stats() -> str:
     """Get SynapseForge learning statistics: totals, distributions, streaks, mastery."""
     from .forge import get_forge_stats
@@ -829,7 +837,7 @@ def forge_stats() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def forge_explain(concept_id: str) -> str:
     """Get full concept details with review history."""
     from .forge import get_concept_detail
@@ -848,7 +856,7 @@ def forge_explain(concept_id: str) -> str:
 # SynapseForge v2 Tools (7)
 # =============================================================================
 
-@mcp.tool()
+@tool()
 def forge_subject_create(
     name: str,
     short_name: str,
@@ -874,7 +882,7 @@ def forge_subject_create(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def forge_subject_list() -> str:
     """List all learning subjects with concept and objective counts."""
     from .forge import get_subjects
@@ -887,7 +895,7 @@ def forge_subject_list() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def forge_objective_add(
     subject_id: str,
     code: str,
@@ -910,7 +918,7 @@ def forge_objective_add(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def forge_readiness(subject_id: str) -> str:
     """Get exam readiness score with domain breakdown and recommendations.
 
@@ -927,7 +935,7 @@ def forge_readiness(subject_id: str) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def forge_knowledge_map(subject_id: str) -> str:
     """Generate a markdown knowledge map for a subject.
 
@@ -944,7 +952,7 @@ def forge_knowledge_map(subject_id: str) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def forge_calibration(subject_id: str = "") -> str:
     """Get calibration analytics: how well confidence predicts actual performance.
 
@@ -961,7 +969,7 @@ def forge_calibration(subject_id: str = "") -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def forge_errors(
     subject_id: str = "",
     concept_id: str = "",
@@ -985,20 +993,27 @@ def forge_errors(
 # SynapseForge v2 Tools - Extended (3)
 # =============================================================================
 
-@mcp.tool()
+@tool("cpu")
 def forge_reembed(
     subject_id: str = "",
     dry_run: bool = False,
+    background: bool = False,
 ) -> str:
     """Regenerate missing embeddings for forge concepts.
 
     Finds concepts without vector embeddings and generates them.
     Pass dry_run=True to see counts without modifying anything.
     Optionally filter by subject_id.
+    background: Return a job_id at once and poll it with job_status.
     """
     from .forge import reembed_concepts
 
     try:
+        if background:
+            return json.dumps(start_job(
+                "forge_reembed", "cpu", reembed_concepts,
+                subject_id=subject_id, dry_run=dry_run,
+            ))
         result = reembed_concepts(subject_id=subject_id, dry_run=dry_run)
         return json.dumps(result)
     except Exception as e:
@@ -1006,7 +1021,7 @@ def forge_reembed(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def forge_weak_areas(
     subject_id: str = "",
     limit: int = 10,
@@ -1027,15 +1042,17 @@ def forge_weak_areas(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def forge_maintenance(
     vacuum: bool = True,
     analyze: bool = True,
 ) -> str:
-    """Run database maintenance: integrity check, VACUUM, and ANALYZE.
+    """Run database maintenance: integrity check, space reclaim, and ANALYZE.
 
     - integrity_check: verifies the database is not corrupted
-    - VACUUM: reclaims space from deleted records
+    - vacuum: reclaims space from deleted records with incremental_vacuum
+      (a database from before auto_vacuum=INCREMENTAL gets one full VACUUM
+      to convert it; later runs never rewrite the whole file)
     - ANALYZE: updates query planner statistics for optimal performance
     Returns results of each operation and current DB size.
     """
@@ -1049,7 +1066,25 @@ def forge_maintenance(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
+def fts_rebuild(table: str = "", detail: str = "") -> str:
+    """Rebuild full-text search indexes online, in small committed chunks.
+
+    table: One FTS table (e.g. knowledge_fts). Empty = all of them.
+    detail: full, column or none. Empty = FTS_DETAIL from config, else full.
+    "column" makes the index much smaller but phrase searches stop working.
+    Returns rows indexed, index size before/after and time per table.
+    """
+    from .maintenance import rebuild_fts
+
+    try:
+        return json.dumps(rebuild_fts(table=table or None, detail=detail or None))
+    except Exception as e:
+        logger.error("fts_rebuild failed: %s", e, exc_info=True)
+        return json.dumps({"error": str(e)})
+
+
+@tool("io")
 def forge_backup(local_only: bool = False) -> str:
     """Run a full SynapseForge backup.
 
@@ -1081,22 +1116,49 @@ def forge_backup(local_only: bool = False) -> str:
 # System Tools (3)
 # =============================================================================
 
-@mcp.tool()
+@tool()
 def stats() -> str:
-    """Get JayBrain system statistics: memory/task/session/knowledge counts and storage."""
+    """Get JayBrain system statistics: memory/task/session/knowledge counts and storage.
+
+    With perf instrumentation on (JAYBRAIN_PERF=1), also includes last-day
+    p50/p95/p99 latency per kind.
+    """
+    from . import perf
+
     try:
         conn = get_connection()
         try:
             s = get_stats(conn)
         finally:
             conn.close()
+        if perf.enabled():
+            s["perf"] = perf.summary()
         return json.dumps(s)
     except Exception as e:
         logger.error("stats failed: %s", e, exc_info=True)
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
+def perf_report(kind: str = "", days: float = 1.0, top: int = 10) -> str:
+    """Latency report from opt-in instrumentation (enable with JAYBRAIN_PERF=1).
+
+    kind: tool, daemon, sql, embed or lock. Empty = all kinds.
+    days: Window to report on, ending now.
+    top: How many names / slowest queries to list.
+    Returns p50/p95/p99 per kind and name, slowest SQL statements, and
+    p95 regressions against the same window last week.
+    """
+    from .perf import report
+
+    try:
+        return json.dumps(report(kind=kind, days=days, top=top))
+    except Exception as e:
+        logger.error("perf_report failed: %s", e, exc_info=True)
+        return json.dumps({"error": str(e)})
+
+
+@tool()
 def context_pack() -> str:
     """Get full startup context: profile + last session handoff + active tasks + recent decisions.
 
@@ -1194,7 +1256,7 @@ def context_pack() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool("io")
 def daily_briefing_send() -> str:
     """Send the daily briefing email on demand.
 
@@ -1212,7 +1274,7 @@ def daily_briefing_send() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def memory_reinforce(memory_id: str) -> str:
     """Boost a memory's importance by incrementing its access count.
 
@@ -1235,10 +1297,53 @@ def memory_reinforce(memory_id: str) -> str:
 
 
 # =============================================================================
-# Job Board Tools (3)
+# Background Job Tools (2)
 # =============================================================================
+# Registered directly (not via tool()): they only read in-memory job state,
+# so they must answer even when every lane is busy.
 
 @mcp.tool()
+def job_status(job_id: str = "") -> str:
+    """Poll a background job started with background=True.
+
+    job_id: Job to inspect. Leave empty to list recent jobs and lane load.
+    Status: queued, running, done (see result), error, cancelling, cancelled.
+    """
+    from .tool_exec import get_job, lane_stats, list_jobs
+
+    try:
+        if not job_id:
+            return json.dumps({"jobs": list_jobs(), "lanes": lane_stats()})
+        job = get_job(job_id)
+        if job is None:
+            return json.dumps({"error": f"Job not found: {job_id}"})
+        return json.dumps(job, default=str)
+    except Exception as e:
+        logger.error("job_status failed: %s", e, exc_info=True)
+        return json.dumps({"error": str(e)})
+
+
+@mcp.tool()
+def job_cancel(job_id: str) -> str:
+    """Cancel a background job. Queued jobs are dropped; running jobs stop at their next checkpoint."""
+    from .tool_exec import cancel_job
+
+    try:
+        job = cancel_job(job_id)
+        if job is None:
+            return json.dumps({"error": f"Job not found: {job_id}"})
+        job.pop("result", None)
+        return json.dumps(job)
+    except Exception as e:
+        logger.error("job_cancel failed: %s", e, exc_info=True)
+        return json.dumps({"error": str(e)})
+
+
+# =============================================================================
+# Job Board Tools (3)
+# =============================================================================
+
+@tool()
 def job_board_add(
     name: str,
     url: str,
@@ -1265,7 +1370,7 @@ def job_board_add(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def job_board_list(active_only: bool = True) -> str:
     """List all registered job boards with last-checked dates."""
     from .job_boards import get_boards
@@ -1290,7 +1395,7 @@ def job_board_list(active_only: bool = True) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool("io")
 def job_board_fetch(
     board_id: str,
     max_pages: int = 0,
@@ -1319,7 +1424,7 @@ def job_board_fetch(
 # Job Posting Tools (3)
 # =============================================================================
 
-@mcp.tool()
+@tool()
 def job_add(
     title: str,
     company: str,
@@ -1361,7 +1466,7 @@ def job_add(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def job_search(
     query: str | None = None,
     company: str | None = None,
@@ -1399,7 +1504,7 @@ def job_search(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def job_get(job_id: str) -> str:
     """Get full job posting details including description."""
     from .jobs import get_job
@@ -1434,7 +1539,7 @@ def job_get(job_id: str) -> str:
 # Application Tools (3)
 # =============================================================================
 
-@mcp.tool()
+@tool()
 def app_create(
     job_id: str,
     status: str = "discovered",
@@ -1460,7 +1565,7 @@ def app_create(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def app_update(
     application_id: str,
     status: str | None = None,
@@ -1511,7 +1616,7 @@ def app_update(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def app_list(
     status: str | None = None,
     limit: int = 50,
@@ -1534,7 +1639,7 @@ def app_list(
 # Resume & Skills Tools (3)
 # =============================================================================
 
-@mcp.tool()
+@tool()
 def resume_get_template() -> str:
     """Read the resume template with all HTML comment markers.
 
@@ -1551,7 +1656,7 @@ def resume_get_template() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def resume_analyze_fit(job_id: str) -> str:
     """Compare JJ's skills against a job posting.
 
@@ -1568,7 +1673,7 @@ def resume_analyze_fit(job_id: str) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def resume_save_tailored(company: str, role: str, content: str) -> str:
     """Save a tailored resume as markdown and create a Google Doc.
 
@@ -1590,7 +1695,7 @@ def resume_save_tailored(company: str, role: str, content: str) -> str:
 # Google Docs Tools (1) + Google Drive Folder Tools (2)
 # =============================================================================
 
-@mcp.tool()
+@tool("io")
 def gdoc_create(
     title: str,
     content: str,
@@ -1624,7 +1729,7 @@ def gdoc_create(
 # Email Tools (1)
 # =============================================================================
 
-@mcp.tool()
+@tool("io")
 def send_email(
     to: str = "",
     subject: str = "",
@@ -1663,10 +1768,11 @@ def send_email(
 # Google Drive Folder Tools (2)
 # =============================================================================
 
-@mcp.tool()
+@tool("io")
 def gdrive_find_or_create_folder(
     name: str,
     parent_id: str = "",
+    nested: bool = False,
 ) -> str:
     """Find a Google Drive folder by name, or create it if it doesn't exist.
 
@@ -1674,22 +1780,28 @@ def gdrive_find_or_create_folder(
     Returns the folder ID without creating duplicates if the folder already exists.
 
     Args:
-        name: Folder name to find or create.
+        name: Folder name to find or create. With nested=True, a slash-separated
+            path like "Job Search/2026/Acme" (all levels resolved in one batch lookup).
         parent_id: Optional parent folder ID. If empty, operates in Drive root.
+        nested: Treat name as a folder path and create any missing levels.
 
-    Returns folder_id, folder_name, and whether it was newly created.
+    Returns folder_id, folder_name, and whether it was newly created
+    (for nested paths, the list of folder names created).
     """
-    from .gdocs import find_or_create_folder
+    from .gdocs import find_or_create_folder, find_or_create_folder_path
 
     try:
-        result = find_or_create_folder(name, parent_id)
+        if nested:
+            result = find_or_create_folder_path(name, parent_id)
+        else:
+            result = find_or_create_folder(name, parent_id)
         return json.dumps(result)
     except Exception as e:
         logger.error("gdrive_find_or_create_folder failed: %s", e, exc_info=True)
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool("io")
 def gdrive_move_to_folder(
     file_id: str,
     folder_id: str,
@@ -1715,7 +1827,7 @@ def gdrive_move_to_folder(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool("io")
 def gdoc_read_structure(doc_id: str) -> str:
     """Read a Google Doc's structure -- headings, sections, and their positions.
 
@@ -1754,7 +1866,7 @@ def gdoc_read_structure(doc_id: str) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool("io")
 def gdoc_edit(
     doc_id: str,
     operation: str,
@@ -1763,6 +1875,7 @@ def gdoc_edit(
     heading: str = "",
     heading_level: int = 0,
     content: str = "",
+    operations: list[dict] | None = None,
 ) -> str:
     """Edit an existing Google Doc.
 
@@ -1772,19 +1885,24 @@ def gdoc_edit(
     - "replace_section": Replace all content under a heading (keeps heading). Requires heading + content.
     - "append": Append content to end of document. Requires content.
     - "delete_section": Delete a heading and its content. Requires heading.
+    - "batch": Apply several of the above in one atomic update. Requires operations.
 
     Args:
         doc_id: Google Doc ID.
-        operation: One of: replace_text, insert_after_heading, replace_section, append, delete_section.
+        operation: One of: replace_text, insert_after_heading, replace_section, append, delete_section, batch.
         find: Text to find (for replace_text).
         replace: Replacement text (for replace_text).
         heading: Heading text to target (substring match, for heading-based ops).
         heading_level: Optional heading level filter (1-6, 0 = any).
         content: Content to insert/replace (for insert/replace/append ops).
+        operations: For batch -- list of dicts with the same keys as this tool
+            (operation, find, replace, heading, heading_level, content). All are
+            applied against one read of the document; overlapping edits are rejected.
 
-    Returns operation result with status and details.
+    Returns operation result with status and details (per-operation results for batch).
     """
     from .gdocs import (
+        apply_doc_edits as _apply_doc_edits,
         replace_text as _replace_text,
         insert_after_heading as _insert_after_heading,
         replace_section as _replace_section,
@@ -1793,7 +1911,11 @@ def gdoc_edit(
     )
 
     try:
-        if operation == "replace_text":
+        if operation == "batch":
+            if not operations:
+                return json.dumps({"error": "operations list required for batch"})
+            result = _apply_doc_edits(doc_id, operations)
+        elif operation == "replace_text":
             if not find:
                 return json.dumps({"error": "find parameter required for replace_text"})
             result = _replace_text(doc_id, find, replace)
@@ -1816,7 +1938,7 @@ def gdoc_edit(
         else:
             return json.dumps({
                 "error": f"Unknown operation: {operation}. "
-                "Use: replace_text, insert_after_heading, replace_section, append, delete_section"
+                "Use: replace_text, insert_after_heading, replace_section, append, delete_section, batch"
             })
         return json.dumps(result)
     except Exception as e:
@@ -1828,7 +1950,7 @@ def gdoc_edit(
 # Cover Letter & Interview Tools (3)
 # =============================================================================
 
-@mcp.tool()
+@tool()
 def cover_letter_save(company: str, role: str, content: str) -> str:
     """Save a cover letter as markdown and create a Google Doc.
 
@@ -1846,7 +1968,7 @@ def cover_letter_save(company: str, role: str, content: str) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def interview_prep_add(
     application_id: str,
     prep_type: str = "general",
@@ -1872,7 +1994,7 @@ def interview_prep_add(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def interview_prep_get(application_id: str) -> str:
     """Get full interview context: job, application, all prep, profile, resume excerpt.
 
@@ -1892,7 +2014,7 @@ def interview_prep_get(application_id: str) -> str:
 # Memory Consolidation Tools (5)
 # =============================================================================
 
-@mcp.tool()
+@tool("cpu")
 def memory_find_clusters(
     min_similarity: float = 0.80,
     max_age_days: int | None = None,
@@ -1920,7 +2042,7 @@ def memory_find_clusters(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool("cpu")
 def memory_find_duplicates(
     threshold: float = 0.92,
     category: str | None = None,
@@ -1946,7 +2068,7 @@ def memory_find_duplicates(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool("cpu")
 def memory_merge(
     memory_ids: list[str],
     merged_content: str,
@@ -1972,7 +2094,7 @@ def memory_merge(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def memory_archive(
     memory_ids: list[str],
     reason: str = "manual_archive",
@@ -1992,7 +2114,7 @@ def memory_archive(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def memory_consolidation_stats() -> str:
     """Get consolidation history: archive counts, merge logs, and action breakdown."""
     from .consolidation import get_consolidation_stats
@@ -2006,10 +2128,10 @@ def memory_consolidation_stats() -> str:
 
 
 # =============================================================================
-# Knowledge Graph Tools (5)
+# Knowledge Graph Tools (6)
 # =============================================================================
 
-@mcp.tool()
+@tool()
 def graph_add_entity(
     name: str,
     entity_type: str,
@@ -2036,7 +2158,7 @@ def graph_add_entity(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def graph_add_relationship(
     source_entity: str,
     target_entity: str,
@@ -2069,7 +2191,7 @@ def graph_add_relationship(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def graph_query(
     entity_name: str,
     depth: int = 1,
@@ -2077,8 +2199,9 @@ def graph_query(
 ) -> str:
     """Get an entity and its N-depth neighborhood via BFS traversal.
 
-    Returns the center entity, all connected entities within depth hops,
-    and all relationships between them. Max depth: 3.
+    Returns the center entity, all connected entities within depth hops
+    (each with its hop count as "depth"), and all relationships between
+    them. Max depth: 6.
     """
     from .graph import query_neighborhood
 
@@ -2090,24 +2213,51 @@ def graph_query(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
+def graph_path(
+    source_entity: str,
+    target_entity: str,
+    max_depth: int = 8,
+) -> str:
+    """Find the shortest path between two entities in the knowledge graph.
+
+    Entities can be referenced by ID or name. Edge direction is ignored.
+    Returns the ordered entities and connecting relationships, or
+    found=false if they are not connected within max_depth hops (max 8).
+    """
+    from .graph import find_path
+
+    try:
+        result = find_path(source_entity, target_entity, max_depth)
+        return json.dumps(result)
+    except Exception as e:
+        logger.error("graph_path failed: %s", e, exc_info=True)
+        return json.dumps({"error": str(e)})
+
+
+@tool()
 def graph_search(
     query: str,
     entity_type: str | None = None,
     limit: int = 20,
+    fuzzy: bool = False,
 ) -> str:
-    """Search entities by name substring."""
+    """Search entities by name or alias substring, best match first.
+
+    fuzzy=True also returns near-misses (typos, partial words) ranked by
+    trigram similarity.
+    """
     from .graph import search_entities
 
     try:
-        results = search_entities(query, entity_type, limit)
+        results = search_entities(query, entity_type, limit, fuzzy)
         return json.dumps({"count": len(results), "entities": results})
     except Exception as e:
         logger.error("graph_search failed: %s", e, exc_info=True)
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def graph_list(
     entity_type: str | None = None,
     limit: int = 100,
@@ -2128,7 +2278,7 @@ def graph_list(
 # =============================================================================
 
 
-@mcp.tool()
+@tool()
 def fact_track(
     entity_name: str,
     attribute: str,
@@ -2176,7 +2326,7 @@ def fact_track(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def fact_history(
     entity_name: str | None = None,
     attribute: str | None = None,
@@ -2224,7 +2374,7 @@ def fact_history(
 # Network Decay (4)
 # =============================================================================
 
-@mcp.tool()
+@tool()
 def contact_add(
     name: str,
     contact_type: str = "professional",
@@ -2251,7 +2401,7 @@ def contact_add(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def contact_log(name: str, note: str = "") -> str:
     """Log an interaction with a contact (resets their decay timer).
 
@@ -2268,7 +2418,7 @@ def contact_log(name: str, note: str = "") -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def contact_list(stale_only: bool = False) -> str:
     """List tracked contacts with decay status.
 
@@ -2288,7 +2438,7 @@ def contact_list(stale_only: bool = False) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def network_health() -> str:
     """Get a summary of professional network health.
 
@@ -2309,7 +2459,7 @@ def network_health() -> str:
 # Homelab Tools (7)
 # =============================================================================
 
-@mcp.tool()
+@tool()
 def homelab_status() -> str:
     """Quick stats, skills, SOC readiness, recent entries from the homelab journal.
 
@@ -2326,7 +2476,7 @@ def homelab_status() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def homelab_journal_create(date: str, content: str) -> str:
     """Create a journal entry file and update JOURNAL_INDEX.md.
 
@@ -2347,7 +2497,7 @@ def homelab_journal_create(date: str, content: str) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def homelab_journal_list(limit: int = 10) -> str:
     """List recent journal entries from JOURNAL_INDEX.md."""
     from .homelab import list_journal_entries
@@ -2360,7 +2510,7 @@ def homelab_journal_list(limit: int = 10) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def homelab_tools_list(status: str | None = None) -> str:
     """Read HOMELAB_TOOLS_INVENTORY.csv, optionally filtered by status.
 
@@ -2376,7 +2526,7 @@ def homelab_tools_list(status: str | None = None) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def homelab_tools_add(
     tool: str,
     creator: str,
@@ -2397,7 +2547,7 @@ def homelab_tools_add(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def homelab_nexus_read() -> str:
     """Read the full LAB_NEXUS.md infrastructure overview.
 
@@ -2413,7 +2563,7 @@ def homelab_nexus_read() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def homelab_codex_read() -> str:
     """Read the LABSCRIBE_CODEX.md formatting rules.
 
@@ -2438,7 +2588,7 @@ def homelab_codex_read() -> str:
 # Pulse: Cross-Session Awareness Tools (3)
 # =============================================================================
 
-@mcp.tool()
+@tool()
 def pulse_active(stale_minutes: int = 60) -> str:
     """List all active Claude Code sessions and what they're doing.
 
@@ -2457,7 +2607,7 @@ def pulse_active(stale_minutes: int = 60) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def pulse_activity(session_id: str | None = None, limit: int = 20) -> str:
     """Get recent activity stream across all sessions or a specific one.
 
@@ -2474,7 +2624,7 @@ def pulse_activity(session_id: str | None = None, limit: int = 20) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def pulse_session(session_id: str) -> str:
     """Get full details on a specific session: tool usage breakdown, recent activity.
 
@@ -2490,7 +2640,7 @@ def pulse_session(session_id: str) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def pulse_context(
     session_id: str,
     snippet: str = "",
@@ -2530,7 +2680,7 @@ def pulse_context(
 # Time Allocation Tools (2)
 # =============================================================================
 
-@mcp.tool()
+@tool()
 def time_allocation_report(days_back: int = 7) -> str:
     """Weekly time allocation report: actual hours per domain vs targets.
 
@@ -2551,7 +2701,7 @@ def time_allocation_report(days_back: int = 7) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def time_allocation_daily(days_back: int = 7) -> str:
     """Daily breakdown of hours by domain.
 
@@ -2574,7 +2724,7 @@ def time_allocation_daily(days_back: int = 7) -> str:
 # GramCracker (Telegram Bot) Tools (2)
 # =============================================================================
 
-@mcp.tool()
+@tool("io")
 def telegram_send(message: str) -> str:
     """Send a message to JJ via Telegram. Works even if GramCracker bot is stopped.
 
@@ -2591,7 +2741,7 @@ def telegram_send(message: str) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool("io")
 def telegram_status() -> str:
     """Check if the GramCracker Telegram bot is running.
 
@@ -2617,18 +2767,20 @@ async def browser_launch(
     headless: bool = True,
     url: str = "",
     stealth: bool = False,
+    handle: str = "",
 ) -> str:
     """Launch a Chromium browser instance.
 
     headless: True for background operation, False for visible window.
     url: Optional URL to navigate to immediately after launch.
     stealth: Use Patchright anti-bot mode to bypass detection (requires: pip install patchright).
+    handle: Browser session name; each handle has its own browser and refs.
     Requires: pip install jaybrain[render] && playwright install chromium
     """
     from .browser import launch_browser
 
     try:
-        result = await _run_browser(launch_browser, headless=headless, url=url, stealth=stealth)
+        result = await _run_browser(launch_browser, headless=headless, url=url, stealth=stealth, handle=handle)
         return json.dumps(result)
     except Exception as e:
         logger.error("browser_launch failed: %s", e, exc_info=True)
@@ -2636,15 +2788,16 @@ async def browser_launch(
 
 
 @mcp.tool()
-async def browser_navigate(url: str) -> str:
+async def browser_navigate(url: str, handle: str = "") -> str:
     """Navigate the browser to a URL.
 
     Waits for DOM content to load before returning.
+    handle: Browser session name; each handle has its own browser and refs.
     """
     from .browser import navigate
 
     try:
-        result = await _run_browser(navigate, url)
+        result = await _run_browser(navigate, url, handle=handle)
         return json.dumps(result)
     except Exception as e:
         logger.error("browser_navigate failed: %s", e, exc_info=True)
@@ -2652,17 +2805,30 @@ async def browser_navigate(url: str) -> str:
 
 
 @mcp.tool()
-async def browser_snapshot() -> str:
+async def browser_snapshot(
+    full: bool = False,
+    viewport: bool = False,
+    roles: list[str] | None = None,
+    handle: str = "",
+) -> str:
     """Get the page's accessibility tree with numbered element refs.
 
     Returns a text representation of the page structure. Interactive
     elements (links, buttons, inputs) get [ref] numbers you can pass
-    to browser_click() or browser_type().
+    to browser_click() or browser_type(). Refs stay the same across
+    snapshots of the same page.
+
+    After the first snapshot of a page, only changes since the previous
+    snapshot are returned (+ added, - removed, ~ changed).
+    full: True to get the whole tree instead of a diff.
+    viewport: True to only include nodes visible in the viewport.
+    roles: Only include these roles (e.g. ["button", "link"]).
+    handle: Browser session name; each handle has its own browser and refs.
     """
     from .browser import snapshot
 
     try:
-        result = await _run_browser(snapshot)
+        result = await _run_browser(snapshot, full=full, viewport=viewport, roles=roles, handle=handle)
         return json.dumps(result)
     except Exception as e:
         logger.error("browser_snapshot failed: %s", e, exc_info=True)
@@ -2670,17 +2836,18 @@ async def browser_snapshot() -> str:
 
 
 @mcp.tool()
-async def browser_screenshot(full_page: bool = False) -> str:
+async def browser_screenshot(full_page: bool = False, handle: str = "") -> str:
     """Take a screenshot of the current page.
 
     Returns the file path to the saved PNG image.
     Use the Read tool on the returned path to view the screenshot.
     full_page: True to capture the entire scrollable page.
+    handle: Browser session name; each handle has its own browser and refs.
     """
     from .browser import take_screenshot
 
     try:
-        result = await _run_browser(take_screenshot, full_page=full_page)
+        result = await _run_browser(take_screenshot, full_page=full_page, handle=handle)
         return json.dumps(result)
     except Exception as e:
         logger.error("browser_screenshot failed: %s", e, exc_info=True)
@@ -2691,17 +2858,19 @@ async def browser_screenshot(full_page: bool = False) -> str:
 async def browser_click(
     ref: int | None = None,
     selector: str | None = None,
+    handle: str = "",
 ) -> str:
     """Click an element on the page.
 
     ref: Element number from browser_snapshot() output (e.g. 3 for [3]).
     selector: CSS selector as fallback (e.g. '#submit-btn').
     Provide one of ref or selector.
+    handle: Browser session name; each handle has its own browser and refs.
     """
     from .browser import click
 
     try:
-        result = await _run_browser(click, ref=ref, selector=selector)
+        result = await _run_browser(click, ref=ref, selector=selector, handle=handle)
         return json.dumps(result)
     except Exception as e:
         logger.error("browser_click failed: %s", e, exc_info=True)
@@ -2714,6 +2883,7 @@ async def browser_type(
     ref: int | None = None,
     selector: str | None = None,
     clear: bool = True,
+    handle: str = "",
 ) -> str:
     """Type text into an input field.
 
@@ -2721,11 +2891,12 @@ async def browser_type(
     ref: Element number from browser_snapshot() (e.g. 5 for [5]).
     selector: CSS selector as fallback.
     clear: If True (default), clears the field first. False to append.
+    handle: Browser session name; each handle has its own browser and refs.
     """
     from .browser import type_text
 
     try:
-        result = await _run_browser(type_text, text, ref=ref, selector=selector, clear=clear)
+        result = await _run_browser(type_text, text, ref=ref, selector=selector, clear=clear, handle=handle)
         return json.dumps(result)
     except Exception as e:
         logger.error("browser_type failed: %s", e, exc_info=True)
@@ -2733,17 +2904,18 @@ async def browser_type(
 
 
 @mcp.tool()
-async def browser_press_key(key: str) -> str:
+async def browser_press_key(key: str, handle: str = "") -> str:
     """Press a keyboard key.
 
     Common keys: Enter, Tab, Escape, Backspace, ArrowDown, ArrowUp,
     Space, Delete, Home, End, PageDown, PageUp.
     Modifiers: Control+a, Shift+Tab, Alt+F4.
+    handle: Browser session name; each handle has its own browser and refs.
     """
     from .browser import press_key
 
     try:
-        result = await _run_browser(press_key, key)
+        result = await _run_browser(press_key, key, handle=handle)
         return json.dumps(result)
     except Exception as e:
         logger.error("browser_press_key failed: %s", e, exc_info=True)
@@ -2751,33 +2923,49 @@ async def browser_press_key(key: str) -> str:
 
 
 @mcp.tool()
-async def browser_close() -> str:
-    """Close the browser and release all resources."""
-    from .browser import close_browser
+async def browser_close(handle: str = "") -> str:
+    """Close the browser and release all resources.
+
+    handle: Browser session name; each handle has its own browser and refs.
+    """
+    from .browser import release_handle
 
     try:
-        result = await _run_browser(close_browser)
+        result = await asyncio.to_thread(release_handle, handle)
         return json.dumps(result)
     except Exception as e:
         logger.error("browser_close failed: %s", e, exc_info=True)
         return json.dumps({"error": str(e)})
 
 
+@mcp.tool()
+async def browser_handles() -> str:
+    """List live browser handles (isolated sessions) and pool capacity."""
+    from .browser import list_handles
+
+    try:
+        return json.dumps(list_handles())
+    except Exception as e:
+        logger.error("browser_handles failed: %s", e, exc_info=True)
+        return json.dumps({"error": str(e)})
+
+
 # =============================================================================
 # Browser Session & Advanced Tools (6)
 # =============================================================================
 
 @mcp.tool()
-async def browser_session_save(name: str) -> str:
+async def browser_session_save(name: str, handle: str = "") -> str:
     """Save the current browser session (cookies + localStorage) to a named file.
 
     Use this to persist login state so you can restore it later
     without re-authenticating.
+    handle: Browser session name; each handle has its own browser and refs.
     """
     from .browser import session_save
 
     try:
-        result = await _run_browser(session_save, name)
+        result = await _run_browser(session_save, name, handle=handle)
         return json.dumps(result)
     except Exception as e:
         logger.error("browser_session_save failed: %s", e, exc_info=True)
@@ -2790,6 +2978,7 @@ async def browser_session_load(
     headless: bool | None = None,
     url: str = "",
     stealth: bool | None = None,
+    handle: str = "",
 ) -> str:
     """Launch browser with a previously saved session (restores cookies + localStorage).
 
@@ -2797,11 +2986,12 @@ async def browser_session_load(
     headless: Override headless mode (None keeps previous setting).
     url: Optional URL to navigate to after loading.
     stealth: Use Patchright anti-bot mode (None keeps previous setting).
+    handle: Browser session name; each handle has its own browser and refs.
     """
     from .browser import session_load
 
     try:
-        result = await _run_browser(session_load, name, headless=headless, url=url, stealth=stealth)
+        result = await _run_browser(session_load, name, headless=headless, url=url, stealth=stealth, handle=handle)
         return json.dumps(result)
     except Exception as e:
         logger.error("browser_session_load failed: %s", e, exc_info=True)
@@ -2827,6 +3017,7 @@ async def browser_fill_from_bw(
     field: str = "password",
     ref: int | None = None,
     selector: str | None = None,
+    handle: str = "",
 ) -> str:
     """Securely fill a form field with a credential from Bitwarden CLI.
 
@@ -2838,11 +3029,12 @@ async def browser_fill_from_bw(
     ref: Element number from browser_snapshot().
     selector: CSS selector as fallback.
     Requires: bw CLI installed and vault unlocked (BW_SESSION set).
+    handle: Browser session name; each handle has its own browser and refs.
     """
     from .browser import fill_from_bw
 
     try:
-        result = await _run_browser(fill_from_bw, item_name, field, ref=ref, selector=selector)
+        result = await _run_browser(fill_from_bw, item_name, field, ref=ref, selector=selector, handle=handle)
         return json.dumps(result)
     except Exception as e:
         logger.error("browser_fill_from_bw failed: %s", e, exc_info=True)
@@ -2856,11 +3048,13 @@ async def browser_select_option(
     value: str | None = None,
     label: str | None = None,
     index: int | None = None,
+    handle: str = "",
 ) -> str:
     """Select an option from a dropdown (<select> element).
 
     ref/selector: Identify the dropdown.
     Then provide ONE of: value (option value attr), label (visible text), or index (0-based).
+    handle: Browser session name; each handle has its own browser and refs.
     """
     from .browser import select_option
 
@@ -2869,6 +3063,7 @@ async def browser_select_option(
             select_option,
             ref=ref, selector=selector,
             value=value, label=label, index=index,
+            handle=handle,
         )
         return json.dumps(result)
     except Exception as e:
@@ -2882,6 +3077,7 @@ async def browser_wait(
     text: str | None = None,
     state: str = "visible",
     timeout: int = 10000,
+    handle: str = "",
 ) -> str:
     """Wait for an element or text to appear/disappear on the page.
 
@@ -2889,6 +3085,7 @@ async def browser_wait(
     text: Text content to wait for.
     state: 'visible' (default), 'hidden', 'attached', 'detached'.
     timeout: Max wait time in milliseconds (default 10000).
+    handle: Browser session name; each handle has its own browser and refs.
     """
     from .browser import wait_for
 
@@ -2897,6 +3094,7 @@ async def browser_wait(
             wait_for,
             selector=selector, text=text,
             state=state, timeout=timeout,
+            handle=handle,
         )
         return json.dumps(result)
     except Exception as e:
@@ -2908,16 +3106,18 @@ async def browser_wait(
 async def browser_hover(
     ref: int | None = None,
     selector: str | None = None,
+    handle: str = "",
 ) -> str:
     """Hover over an element (useful for revealing dropdown menus or tooltips).
 
     ref: Element number from browser_snapshot().
     selector: CSS selector as fallback.
+    handle: Browser session name; each handle has its own browser and refs.
     """
     from .browser import hover
 
     try:
-        result = await _run_browser(hover, ref=ref, selector=selector)
+        result = await _run_browser(hover, ref=ref, selector=selector, handle=handle)
         return json.dumps(result)
     except Exception as e:
         logger.error("browser_hover failed: %s", e, exc_info=True)
@@ -2929,17 +3129,18 @@ async def browser_hover(
 # =============================================================================
 
 @mcp.tool()
-async def browser_evaluate(name: str) -> str:
+async def browser_evaluate(name: str, handle: str = "") -> str:
     """Evaluate a named JavaScript expression from the safe allowlist.
 
     Allowed names: title, url, text, html, ready_state, scroll_y,
     scroll_height, viewport_height, selected_text, forms_count,
     links_count, cookies_enabled.
+    handle: Browser session name; each handle has its own browser and refs.
     """
     from .browser import evaluate_js
 
     try:
-        result = await _run_browser(evaluate_js, name)
+        result = await _run_browser(evaluate_js, name, handle=handle)
         return json.dumps(result)
     except Exception as e:
         logger.error("browser_evaluate failed: %s", e, exc_info=True)
@@ -2947,12 +3148,15 @@ async def browser_evaluate(name: str) -> str:
 
 
 @mcp.tool()
-async def browser_go_back() -> str:
-    """Navigate back in browser history (like clicking the back button)."""
+async def browser_go_back(handle: str = "") -> str:
+    """Navigate back in browser history (like clicking the back button).
+
+    handle: Browser session name; each handle has its own browser and refs.
+    """
     from .browser import go_back
 
     try:
-        result = await _run_browser(go_back)
+        result = await _run_browser(go_back, handle=handle)
         return json.dumps(result)
     except Exception as e:
         logger.error("browser_go_back failed: %s", e, exc_info=True)
@@ -2960,12 +3164,15 @@ async def browser_go_back() -> str:
 
 
 @mcp.tool()
-async def browser_go_forward() -> str:
-    """Navigate forward in browser history."""
+async def browser_go_forward(handle: str = "") -> str:
+    """Navigate forward in browser history.
+
+    handle: Browser session name; each handle has its own browser and refs.
+    """
     from .browser import go_forward
 
     try:
-        result = await _run_browser(go_forward)
+        result = await _run_browser(go_forward, handle=handle)
         return json.dumps(result)
     except Exception as e:
         logger.error("browser_go_forward failed: %s", e, exc_info=True)
@@ -2973,15 +3180,16 @@ async def browser_go_forward() -> str:
 
 
 @mcp.tool()
-async def browser_tab_list() -> str:
+async def browser_tab_list(handle: str = "") -> str:
     """List all open browser tabs with URLs and titles.
 
     Shows which tab is currently active.
+    handle: Browser session name; each handle has its own browser and refs.
     """
     from .browser import tab_list
 
     try:
-        result = await _run_browser(tab_list)
+        result = await _run_browser(tab_list, handle=handle)
         return json.dumps(result)
     except Exception as e:
         logger.error("browser_tab_list failed: %s", e, exc_info=True)
@@ -2989,15 +3197,16 @@ async def browser_tab_list() -> str:
 
 
 @mcp.tool()
-async def browser_tab_new(url: str = "") -> str:
+async def browser_tab_new(url: str = "", handle: str = "") -> str:
     """Open a new browser tab, optionally navigating to a URL.
 
     The new tab becomes the active tab.
+    handle: Browser session name; each handle has its own browser and refs.
     """
     from .browser import tab_new
 
     try:
-        result = await _run_browser(tab_new, url=url)
+        result = await _run_browser(tab_new, url=url, handle=handle)
         return json.dumps(result)
     except Exception as e:
         logger.error("browser_tab_new failed: %s", e, exc_info=True)
@@ -3005,12 +3214,15 @@ async def browser_tab_new(url: str = "") -> str:
 
 
 @mcp.tool()
-async def browser_tab_switch(index: int) -> str:
-    """Switch to a tab by index (use browser_tab_list to see indexes)."""
+async def browser_tab_switch(index: int, handle: str = "") -> str:
+    """Switch to a tab by index (use browser_tab_list to see indexes).
+
+    handle: Browser session name; each handle has its own browser and refs.
+    """
     from .browser import tab_switch
 
     try:
-        result = await _run_browser(tab_switch, index)
+        result = await _run_browser(tab_switch, index, handle=handle)
         return json.dumps(result)
     except Exception as e:
         logger.error("browser_tab_switch failed: %s", e, exc_info=True)
@@ -3018,15 +3230,16 @@ async def browser_tab_switch(index: int) -> str:
 
 
 @mcp.tool()
-async def browser_tab_close(index: int | None = None) -> str:
+async def browser_tab_close(index: int | None = None, handle: str = "") -> str:
     """Close a tab by index, or close the current tab if no index given.
 
     Automatically switches to the last remaining tab after closing.
+    handle: Browser session name; each handle has its own browser and refs.
     """
     from .browser import tab_close
 
     try:
-        result = await _run_browser(tab_close, index=index)
+        result = await _run_browser(tab_close, index=index, handle=handle)
         return json.dumps(result)
     except Exception as e:
         logger.error("browser_tab_close failed: %s", e, exc_info=True)
@@ -3042,6 +3255,7 @@ async def browser_launch_cdp(
     port: int = 9222,
     url: str = "",
     headless: bool = False,
+    handle: str = "",
 ) -> str:
     """Launch Chrome with CDP remote debugging for cross-process use.
 
@@ -3052,11 +3266,12 @@ async def browser_launch_cdp(
     port: Remote debugging port (default 9222).
     url: Optional URL to open immediately.
     headless: Run in headless mode (default False for user interaction).
+    handle: Browser session name; each handle has its own browser and refs.
     """
     from .browser import launch_with_cdp
 
     try:
-        result = await _run_browser(launch_with_cdp, port=port, url=url, headless=headless)
+        result = await _run_browser(launch_with_cdp, port=port, url=url, headless=headless, handle=handle)
         return json.dumps(result)
     except Exception as e:
         logger.error("browser_launch_cdp failed: %s", e, exc_info=True)
@@ -3064,7 +3279,7 @@ async def browser_launch_cdp(
 
 
 @mcp.tool()
-async def browser_connect_cdp(endpoint: str = "") -> str:
+async def browser_connect_cdp(endpoint: str = "", handle: str = "") -> str:
     """Reconnect to an already-running Chrome browser via CDP.
 
     Call this after browser_launch_cdp() to reconnect from a new process,
@@ -3072,11 +3287,12 @@ async def browser_connect_cdp(endpoint: str = "") -> str:
     If no endpoint is given, reads the saved endpoint from the last launch.
 
     endpoint: CDP HTTP endpoint (e.g. 'http://127.0.0.1:9222'). Leave empty for auto-detect.
+    handle: Browser session name; each handle has its own browser and refs.
     """
     from .browser import connect_to_cdp
 
     try:
-        result = await _run_browser(connect_to_cdp, endpoint=endpoint)
+        result = await _run_browser(connect_to_cdp, endpoint=endpoint, handle=handle)
         return json.dumps(result)
     except Exception as e:
         logger.error("browser_connect_cdp failed: %s", e, exc_info=True)
@@ -3084,16 +3300,17 @@ async def browser_connect_cdp(endpoint: str = "") -> str:
 
 
 @mcp.tool()
-async def browser_disconnect_cdp() -> str:
+async def browser_disconnect_cdp(handle: str = "") -> str:
     """Disconnect from the CDP browser WITHOUT closing it.
 
     The browser keeps running so the user can interact manually.
     Call browser_connect_cdp() to reconnect later.
+    handle: Browser session name; each handle has its own browser and refs.
     """
     from .browser import disconnect_cdp
 
     try:
-        result = await _run_browser(disconnect_cdp)
+        result = await _run_browser(disconnect_cdp, handle=handle)
         return json.dumps(result)
     except Exception as e:
         logger.error("browser_disconnect_cdp failed: %s", e, exc_info=True)
@@ -3104,24 +3321,32 @@ async def browser_disconnect_cdp() -> str:
 # Daemon Tools (2)
 # =============================================================================
 
-@mcp.tool()
+@tool()
 def daemon_status() -> str:
     """Check the JayBrain daemon status.
 
     Returns current state (running/stopped), PID, last heartbeat,
-    and registered modules.
-    """
+    registered modules, and file watcher queue stats (depth, dropped
+    events, batches written) as of the last heartbeat. With the write
+    coordinator on (JAYBRAIN_WRITER=1), also reports writer queue depth,
+    batch sizes and commit latency for the daemon ("writer") and for this
+    server process ("server_writer"). "db_maintenance" reports WAL size,
+    free pages and maintenance time per database (last run and 24h trend).
+    """
+    from . import writer
     from .daemon import get_daemon_status
 
     try:
         status = get_daemon_status()
+        if writer.enabled():
+            status["server_writer"] = writer.stats()
         return json.dumps(status)
     except Exception as e:
         logger.error("daemon_status failed: %s", e, exc_info=True)
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def daemon_control(action: str) -> str:
     """Control the JayBrain daemon.
 
@@ -3142,7 +3367,7 @@ def daemon_control(action: str) -> str:
 # =============================================================================
 
 
-@mcp.tool()
+@tool()
 def file_deletions(
     path: str | None = None,
     since: str | None = None,
@@ -3169,7 +3394,7 @@ def file_deletions(
 # =============================================================================
 
 
-@mcp.tool()
+@tool()
 def git_shadow_history(
     repo: str | None = None,
     file: str | None = None,
@@ -3195,7 +3420,7 @@ def git_shadow_history(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def git_shadow_restore(shadow_id: str, file_path: str) -> str:
     """Extract a specific file version from a git shadow snapshot.
 
@@ -3218,7 +3443,7 @@ def git_shadow_restore(shadow_id: str, file_path: str) -> str:
 # Conversation Archive Tools (2)
 # =============================================================================
 
-@mcp.tool()
+@tool("io")
 def conversation_archive_run() -> str:
     """Manually trigger a conversation archive run.
 
@@ -3235,7 +3460,7 @@ def conversation_archive_run() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def conversation_archive_status() -> str:
     """Check conversation archive status -- recent runs and stats."""
     from .conversation_archive import get_archive_status
@@ -3252,7 +3477,7 @@ def conversation_archive_status() -> str:
 # Life Domains Tools (6)
 # =============================================================================
 
-@mcp.tool()
+@tool()
 def domains_overview() -> str:
     """Get an overview of all life domains with goals and progress."""
     from .life_domains import get_domain_overview
@@ -3265,7 +3490,7 @@ def domains_overview() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def domains_goal_detail(goal_id: str) -> str:
     """Get detailed information about a specific goal.
 
@@ -3281,7 +3506,7 @@ def domains_goal_detail(goal_id: str) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def domains_update_progress(goal_id: str, progress: float, note: str = "") -> str:
     """Update progress on a goal.
 
@@ -3299,7 +3524,7 @@ def domains_update_progress(goal_id: str, progress: float, note: str = "") -> st
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool("io")
 def domains_sync() -> str:
     """Manually sync Life Domains from the Google Doc.
 
@@ -3316,7 +3541,7 @@ def domains_sync() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def domains_conflicts() -> str:
     """Check for conflicts in goal scheduling and time allocation."""
     from .life_domains import detect_conflicts
@@ -3329,7 +3554,7 @@ def domains_conflicts() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def domains_priority_stack() -> str:
     """Get the current priority stack -- what to focus on right now.
 
@@ -3349,7 +3574,7 @@ def domains_priority_stack() -> str:
 # Heartbeat Tools (2)
 # =============================================================================
 
-@mcp.tool()
+@tool()
 def heartbeat_status() -> str:
     """Check heartbeat notification status -- recent checks and alerts."""
     from .heartbeat import get_heartbeat_status
@@ -3362,7 +3587,7 @@ def heartbeat_status() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool("io")
 def heartbeat_test(check_name: str) -> str:
     """Manually trigger a specific heartbeat check for testing.
 
@@ -3383,7 +3608,7 @@ def heartbeat_test(check_name: str) -> str:
 # Onboarding Tools (3)
 # =============================================================================
 
-@mcp.tool()
+@tool()
 def onboarding_start() -> str:
     """Start the onboarding intake questionnaire for a new user."""
     from .onboarding import start_onboarding
@@ -3396,7 +3621,7 @@ def onboarding_start() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def onboarding_answer(step: int, response: str) -> str:
     """Submit an answer for an onboarding step.
 
@@ -3413,7 +3638,7 @@ def onboarding_answer(step: int, response: str) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def onboarding_progress() -> str:
     """Check onboarding progress -- current step and completion status."""
     from .onboarding import get_progress
@@ -3430,7 +3655,7 @@ def onboarding_progress() -> str:
 # Event Discovery Tools (2)
 # =============================================================================
 
-@mcp.tool()
+@tool("io")
 def event_discover() -> str:
     """Manually trigger event discovery for local cybersecurity/networking events.
 
@@ -3447,7 +3672,7 @@ def event_discover() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def event_list(status: str = "new", limit: int = 20) -> str:
     """List discovered events.
 
@@ -3469,7 +3694,7 @@ def event_list(status: str = "new", limit: int = 20) -> str:
 # =============================================================================
 
 
-@mcp.tool()
+@tool("io")
 def feedly_fetch() -> str:
     """Manually trigger a Feedly AI Feed poll.
 
@@ -3487,7 +3712,7 @@ def feedly_fetch() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def feedly_status() -> str:
     """Check Feedly feed monitoring status.
 
@@ -3504,7 +3729,7 @@ def feedly_status() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool("cpu")
 def feedly_search(query: str, limit: int = 10) -> str:
     """Search Feedly feed articles in the knowledge base.
 
@@ -3536,7 +3761,7 @@ def feedly_search(query: str, limit: int = 10) -> str:
 # News Feed Tools (5)
 # =============================================================================
 
-@mcp.tool()
+@tool()
 def news_feed_add_source(
     name: str, url: str, source_type: str = "rss", tags: list[str] | None = None
 ) -> str:
@@ -3555,7 +3780,7 @@ def news_feed_add_source(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def news_feed_remove_source(source_id: str) -> str:
     """Remove a news feed source and its article dedup records.
 
@@ -3573,7 +3798,7 @@ def news_feed_remove_source(source_id: str) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def news_feed_list_sources(active_only: bool = True) -> str:
     """List all registered news feed sources with poll status.
 
@@ -3589,16 +3814,23 @@ def news_feed_list_sources(active_only: bool = True) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
-def news_feed_poll(source_id: str = "") -> str:
+@tool("io")
+def news_feed_poll(source_id: str = "", background: bool = False) -> str:
     """Manually trigger a news feed poll.
 
     source_id: Poll a specific source. Leave empty to poll all active sources.
+    background: Return a job_id at once and poll it with job_status.
     Fetches new articles, deduplicates, stores to knowledge base.
     """
     from .news_feeds import poll_source, run_news_feed_poll
 
     try:
+        if background:
+            if source_id:
+                job = start_job("news_feed_poll", "io", poll_source, source_id)
+            else:
+                job = start_job("news_feed_poll", "io", run_news_feed_poll)
+            return json.dumps(job)
         if source_id:
             result = poll_source(source_id)
         else:
@@ -3609,7 +3841,7 @@ def news_feed_poll(source_id: str = "") -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def news_feed_status() -> str:
     """Dashboard for news feed ingestion.
 
@@ -3630,7 +3862,7 @@ def news_feed_status() -> str:
 # SignalForge Tools (3)
 # =============================================================================
 
-@mcp.tool()
+@tool()
 def signalforge_status() -> str:
     """Get SignalForge dashboard: fetch progress, storage stats, expiring articles.
 
@@ -3647,7 +3879,7 @@ def signalforge_status() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool("io")
 def signalforge_fetch(knowledge_id: str) -> str:
     """Manually fetch full article text for a specific article.
 
@@ -3665,7 +3897,7 @@ def signalforge_fetch(knowledge_id: str) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def signalforge_read(knowledge_id: str) -> str:
     """Read full article text from SignalForge file store.
 
@@ -3693,7 +3925,7 @@ def signalforge_read(knowledge_id: str) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def signalforge_clusters(limit: int = 20, min_significance: float = 0.0) -> str:
     """List story clusters ranked by significance.
 
@@ -3717,7 +3949,7 @@ def signalforge_clusters(limit: int = 20, min_significance: float = 0.0) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def signalforge_cluster_detail(cluster_id: str) -> str:
     """Get full details for a story cluster including all articles.
 
@@ -3739,17 +3971,22 @@ def signalforge_cluster_detail(cluster_id: str) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
-def signalforge_synthesize(force: bool = False) -> str:
+@tool("io")
+def signalforge_synthesize(force: bool = False, background: bool = False) -> str:
     """Manually trigger daily SignalForge synthesis.
 
     Synthesizes top story clusters into a daily intelligence article using Claude.
     Publishes to Google Docs. Skips if today's synthesis already exists unless force=True.
     force: Re-synthesize even if today's article exists.
+    background: Return a job_id at once and poll it with job_status.
     """
     from .signalforge import run_signalforge_synthesis
 
     try:
+        if background:
+            return json.dumps(start_job(
+                "signalforge_synthesize", "io", run_signalforge_synthesis, force=force,
+            ))
         result = run_signalforge_synthesis(force=force)
         return json.dumps(result, indent=2)
     except Exception as e:
@@ -3757,7 +3994,7 @@ def signalforge_synthesize(force: bool = False) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def signalforge_synthesis_status() -> str:
     """Get SignalForge synthesis dashboard.
 
@@ -3773,7 +4010,7 @@ def signalforge_synthesis_status() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def signalforge_feed_start() -> str:
     """Start the SignalForge HTTP feed server on localhost.
 
@@ -3789,7 +4026,7 @@ def signalforge_feed_start() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def signalforge_feed_stop() -> str:
     """Stop the SignalForge HTTP feed server."""
     from .signalforge_feed import stop_feed_server
@@ -3806,7 +4043,7 @@ def signalforge_feed_stop() -> str:
 # Personality Tools (1)
 # =============================================================================
 
-@mcp.tool()
+@tool()
 def personality_config(
     style: str = "",
     energy_level: float = -1.0,
@@ -3840,7 +4077,7 @@ def personality_config(
 # Trash / Soft-Delete Recycle Bin
 # =============================================================================
 
-@mcp.tool()
+@tool()
 def trash_scan(auto_only: bool = False) -> str:
     """Scan project directories for trashable files.
 
@@ -3863,7 +4100,7 @@ def trash_scan(auto_only: bool = False) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def trash_delete(filepath: str, reason: str = "") -> str:
     """Move a file or directory to the trash (soft-delete).
 
@@ -3882,7 +4119,7 @@ def trash_delete(filepath: str, reason: str = "") -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def trash_auto_cleanup() -> str:
     """Run the full auto-cleanup pipeline.
 
@@ -3900,7 +4137,7 @@ def trash_auto_cleanup() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def trash_restore(entry_id: str) -> str:
     """Restore a trashed file to its original location.
 
@@ -3917,7 +4154,7 @@ def trash_restore(entry_id: str) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def trash_list(category: str = "", limit: int = 50) -> str:
     """List files currently in the trash.
 
@@ -3938,7 +4175,7 @@ def trash_list(category: str = "", limit: int = 50) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def trash_sweep() -> str:
     """Permanently delete expired trash entries.
 
@@ -3960,7 +4197,7 @@ def trash_sweep() -> str:
 # =============================================================================
 
 
-@mcp.tool()
+@tool()
 def cram_add(
     topic: str,
     description: str = "",
@@ -3984,7 +4221,7 @@ def cram_add(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def cram_list(sort_by: str = "understanding") -> str:
     """List all cram topics with understanding levels.
 
@@ -4000,7 +4237,7 @@ def cram_list(sort_by: str = "understanding") -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def cram_study(limit: int = 10) -> str:
     """Get prioritized cram study queue (weakest understanding first).
 
@@ -4016,7 +4253,7 @@ def cram_study(limit: int = 10) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def cram_review(
     topic_id: str,
     was_correct: bool,
@@ -4040,7 +4277,7 @@ def cram_review(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def cram_remove(topic_id: str) -> str:
     """Remove a cram topic (graduated or added by mistake)."""
     from .cram import remove_topic
@@ -4053,7 +4290,7 @@ def cram_remove(topic_id: str) -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def cram_stats() -> str:
     """Get cram dashboard: topic counts, accuracy, understanding distribution."""
     from .cram import get_stats
@@ -4071,7 +4308,7 @@ def cram_stats() -> str:
 # =============================================================================
 
 
-@mcp.tool()
+@tool()
 def incident_log(
     title: str,
     summary: str,
@@ -4124,7 +4361,7 @@ def incident_log(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def incident_search(
     query: str | None = None,
     severity: str | None = None,
@@ -4155,7 +4392,7 @@ def incident_search(
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def incident_metrics() -> str:
     """Get incident dashboard: counts by severity/type/status, recurrence rate,
     avg time-to-detect/resolve, action item completion rate, top tags, recent 5."""
@@ -4169,7 +4406,7 @@ def incident_metrics() -> str:
         return json.dumps({"error": str(e)})
 
 
-@mcp.tool()
+@tool()
 def action_item_track(
     item_id: str | None = None,
     status: str | None = None,
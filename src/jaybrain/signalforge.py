@@ -8,6 +8,7 @@ Tier 1 of the three-tier article lifecycle:
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import random
@@ -34,6 +35,7 @@ from .config import (
     SIGNALFORGE_FETCH_DELAY_BASE,
     SIGNALFORGE_FETCH_DELAY_JITTER,
     SIGNALFORGE_MAX_ARTICLE_CHARS,
+    SIGNALFORGE_SUMMARY_CACHE_DAYS,
     SIGNALFORGE_SYNTHESIS_EXCERPT_CHARS,
     SIGNALFORGE_SYNTHESIS_MAX_CLUSTERS,
     SIGNALFORGE_SYNTHESIS_MAX_TOKENS_COMBINE,
@@ -48,6 +50,7 @@ from .db import (
     get_connection,
     get_signalforge_article_by_knowledge_id,
     get_signalforge_cluster,
+    get_signalforge_cluster_summaries,
     get_signalforge_synthesis_by_date,
     init_db,
     insert_cluster_article,
@@ -58,10 +61,14 @@ from .db import (
     list_signalforge_expired,
     list_signalforge_pending,
     list_signalforge_syntheses,
+    mark_signalforge_cluster_summaries_reused,
     now_iso,
+    prune_signalforge_cluster_summaries,
     update_signalforge_article,
     update_signalforge_synthesis,
+    upsert_signalforge_cluster_summary,
 )
+from .tool_exec import check_cancelled
 
 logger = logging.getLogger(__name__)
 
@@ -979,16 +986,16 @@ def get_clustering_status() -> dict:
 
 
 def _get_anthropic_client():
-    """Return an Anthropic client, raising RuntimeError if no API key."""
+    """Return the shared Anthropic client, raising RuntimeError if no API key."""
     from . import config as _cfg  # live reference, not frozen import-time copy
 
     if not _cfg.ANTHROPIC_API_KEY:
         raise RuntimeError(
             "ANTHROPIC_API_KEY not set. Cannot run SignalForge synthesis."
         )
-    import anthropic
+    from .llm import get_client
 
-    return anthropic.Anthropic(api_key=_cfg.ANTHROPIC_API_KEY)
+    return get_client()
 
 
 def _call_claude(
@@ -997,21 +1004,20 @@ def _call_claude(
     max_tokens: int,
     model: str = "",
 ) -> dict:
-    """Call Claude API and return {text, input_tokens, output_tokens, model}."""
-    client = _get_anthropic_client()
-    used_model = model or SIGNALFORGE_SYNTHESIS_MODEL
-    response = client.messages.create(
-        model=used_model,
-        max_tokens=max_tokens,
-        system=system_prompt,
-        messages=[{"role": "user", "content": user_prompt}],
+    """Call Claude API and return {text, input_tokens, output_tokens, model}.
+
+    Goes through the shared llm layer (concurrency limit, 429/529 retries)
+    with a prompt-cache breakpoint on the static system prompt.
+    """
+    from .llm import complete
+
+    return complete(
+        system_prompt,
+        user_prompt,
+        max_tokens,
+        model or SIGNALFORGE_SYNTHESIS_MODEL,
+        client=_get_anthropic_client(),
     )
-    return {
-        "text": response.content[0].text,
-        "input_tokens": response.usage.input_tokens,
-        "output_tokens": response.usage.output_tokens,
-        "model": used_model,
-    }
 
 
 CLUSTER_SYNTHESIS_SYSTEM = (
@@ -1095,8 +1101,8 @@ def _gather_cluster_data(
 ) -> Optional[dict]:
     """Gather cluster metadata + article data for synthesis.
 
-    Returns {cluster_id, label, significance, articles: [{title, source, text}]}
-    or None if cluster not found.
+    Returns {cluster_id, label, significance, article_count, knowledge_ids,
+    articles: [{title, source, text}]} or None if cluster not found.
     """
     cluster = get_signalforge_cluster(conn, cluster_id)
     if not cluster:
@@ -1142,48 +1148,113 @@ def _gather_cluster_data(
         "label": cluster["label"],
         "significance": cluster["significance"],
         "article_count": cluster["article_count"],
+        "knowledge_ids": [a["id"] for a in articles_raw],
         "articles": articles,
     }
 
 
-def _synthesize_cluster(cluster_data: dict) -> dict:
-    """Phase 1: Synthesize one cluster into a summary paragraph.
+def _synthesis_prompt_version() -> str:
+    """Short hash of everything besides cluster membership that shapes a summary.
 
-    Returns {text, input_tokens, output_tokens, cluster_id, label} or {error}.
+    Editing the cluster prompts or their token/excerpt limits changes it,
+    which invalidates every memoized summary.
     """
+    h = hashlib.sha256()
+    for part in (
+        CLUSTER_SYNTHESIS_SYSTEM,
+        CLUSTER_SYNTHESIS_USER,
+        str(SIGNALFORGE_SYNTHESIS_MAX_TOKENS_PER_CLUSTER),
+        str(SIGNALFORGE_SYNTHESIS_EXCERPT_CHARS),
+    ):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()[:12]
+
+
+def _cluster_membership_hash(
+    knowledge_ids: list[str], prompt_version: str, model: str,
+) -> str:
+    """Memo key for a cluster summary: its sorted articles + prompt/model version."""
+    key = "\n".join(sorted(knowledge_ids)) + f"\0{prompt_version}\0{model}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _cluster_user_prompt(cluster_data: dict) -> str:
     article_block = "\n\n".join(
         f"### {a['title']} ({a['source']})\n{a['text']}"
         for a in cluster_data["articles"]
     )
-
-    user_prompt = CLUSTER_SYNTHESIS_USER.format(
+    return CLUSTER_SYNTHESIS_USER.format(
         article_count=cluster_data["article_count"],
         label=cluster_data["label"],
         article_block=article_block,
     )
 
+
+def _cluster_result(cluster_data: dict, result: dict) -> dict:
+    if "error" in result:
+        logger.error(
+            "Synthesis failed for cluster %s: %s",
+            cluster_data["cluster_id"], result["error"],
+        )
+        return {"error": result["error"], "cluster_id": cluster_data["cluster_id"]}
+    return {
+        "text": result["text"],
+        "input_tokens": result["input_tokens"],
+        "output_tokens": result["output_tokens"],
+        "cluster_id": cluster_data["cluster_id"],
+        "label": cluster_data["label"],
+    }
+
+
+def _synthesize_cluster(cluster_data: dict) -> dict:
+    """Phase 1: Synthesize one cluster into a summary paragraph.
+
+    Returns {text, input_tokens, output_tokens, cluster_id, label} or {error}.
+    """
     try:
         result = _call_claude(
             CLUSTER_SYNTHESIS_SYSTEM,
-            user_prompt,
+            _cluster_user_prompt(cluster_data),
             SIGNALFORGE_SYNTHESIS_MAX_TOKENS_PER_CLUSTER,
         )
-        return {
-            "text": result["text"],
-            "input_tokens": result["input_tokens"],
-            "output_tokens": result["output_tokens"],
-            "cluster_id": cluster_data["cluster_id"],
-            "label": cluster_data["label"],
-        }
     except Exception as e:
-        logger.error(
-            "Synthesis failed for cluster %s: %s",
-            cluster_data["cluster_id"], e,
+        result = {"error": str(e)}
+    return _cluster_result(cluster_data, result)
+
+
+def _synthesize_clusters(cluster_datas: list[dict], batch: bool = False) -> list[dict]:
+    """Phase 1 for every cluster, returning results in the same order.
+
+    Clusters are synthesized concurrently (bounded by LLM_MAX_CONCURRENCY),
+    or submitted as one Message Batch when batch=True.
+    """
+    from .llm import complete_batch, map_concurrent
+
+    if not batch:
+        return map_concurrent(_synthesize_cluster, cluster_datas)
+
+    try:
+        results = complete_batch(
+            [
+                {
+                    "system": CLUSTER_SYNTHESIS_SYSTEM,
+                    "prompt": _cluster_user_prompt(data),
+                    "max_tokens": SIGNALFORGE_SYNTHESIS_MAX_TOKENS_PER_CLUSTER,
+                    "model": SIGNALFORGE_SYNTHESIS_MODEL,
+                }
+                for data in cluster_datas
+            ],
+            client=_get_anthropic_client(),
         )
-        return {"error": str(e), "cluster_id": cluster_data["cluster_id"]}
+    except Exception as e:
+        results = [{"error": str(e)} for _ in cluster_datas]
+    return [_cluster_result(d, r) for d, r in zip(cluster_datas, results)]
 
 
-def _combine_stories(story_summaries: list[dict], synthesis_date: str) -> dict:
+def _combine_stories(
+    story_summaries: list[dict], synthesis_date: str, batch: bool = False,
+) -> dict:
     """Phase 2: Combine cluster summaries into one cohesive article.
 
     Returns {text, title, input_tokens, output_tokens}.
@@ -1199,11 +1270,26 @@ def _combine_stories(story_summaries: list[dict], synthesis_date: str) -> dict:
         stories_block=stories_block,
     )
 
-    result = _call_claude(
-        COMBINE_SYSTEM,
-        user_prompt,
-        SIGNALFORGE_SYNTHESIS_MAX_TOKENS_COMBINE,
-    )
+    if batch:
+        from .llm import complete_batch
+
+        result = complete_batch(
+            [{
+                "system": COMBINE_SYSTEM,
+                "prompt": user_prompt,
+                "max_tokens": SIGNALFORGE_SYNTHESIS_MAX_TOKENS_COMBINE,
+                "model": SIGNALFORGE_SYNTHESIS_MODEL,
+            }],
+            client=_get_anthropic_client(),
+        )[0]
+        if "error" in result:
+            raise RuntimeError(f"Batch combine failed: {result['error']}")
+    else:
+        result = _call_claude(
+            COMBINE_SYSTEM,
+            user_prompt,
+            SIGNALFORGE_SYNTHESIS_MAX_TOKENS_COMBINE,
+        )
 
     # Extract title from first line of response
     lines = result["text"].strip().split("\n", 1)
@@ -1218,15 +1304,23 @@ def _combine_stories(story_summaries: list[dict], synthesis_date: str) -> dict:
     }
 
 
-def run_signalforge_synthesis(force: bool = False) -> dict:
+def run_signalforge_synthesis(force: bool = False, batch: Optional[bool] = None) -> dict:
     """Daemon/MCP entry point: synthesize top clusters into daily article.
 
     1. Check if today's synthesis exists (skip unless force=True)
     2. Get top clusters by significance
-    3. Phase 1: synthesize each cluster
+    3. Phase 1: synthesize each cluster (concurrently), reusing memoized
+       summaries of clusters whose articles and prompt/model are unchanged
     4. Phase 2: combine into daily article
     5. Store in DB + publish to Google Doc
+
+    batch: Use the Message Batches API for both phases (half price, but may
+        take a long time). Defaults to SIGNALFORGE_SYNTHESIS_USE_BATCH.
     """
+    if batch is None:
+        from . import config as _cfg
+
+        batch = _cfg.SIGNALFORGE_SYNTHESIS_USE_BATCH
     init_db()
     conn = get_connection()
     try:
@@ -1252,35 +1346,89 @@ def run_signalforge_synthesis(force: bool = False) -> dict:
             logger.info("SignalForge synthesis: no clusters above significance threshold")
             return {"status": "no_clusters", "synthesis_date": today}
 
-        # Phase 1: Synthesize each cluster
+        # Phase 1: Synthesize each cluster. Cluster data is read here on
+        # this thread's connection; only the API calls run concurrently.
         story_summaries = []
         total_input = 0
         total_output = 0
         cluster_ids = []
 
+        cluster_datas = []
         for cluster in clusters:
             data = _gather_cluster_data(
                 conn, cluster["id"],
                 excerpt_chars=SIGNALFORGE_SYNTHESIS_EXCERPT_CHARS,
             )
-            if not data:
-                continue
+            if data:
+                cluster_datas.append(data)
 
-            result = _synthesize_cluster(data)
-            if "error" in result:
-                continue
+        prompt_version = _synthesis_prompt_version()
+        hashes = {
+            d["cluster_id"]: _cluster_membership_hash(
+                d["knowledge_ids"], prompt_version, SIGNALFORGE_SYNTHESIS_MODEL,
+            )
+            for d in cluster_datas
+        }
+        memo = get_signalforge_cluster_summaries(conn, list(hashes.values()))
+        fresh = {
+            r["cluster_id"]: r
+            for r in _synthesize_clusters(
+                [d for d in cluster_datas if hashes[d["cluster_id"]] not in memo],
+                batch=batch,
+            )
+        }
+
+        reused_hashes = []
+        tokens_saved = 0
+        for data in cluster_datas:
+            membership_hash = hashes[data["cluster_id"]]
+            cached = memo.get(membership_hash)
+            if cached is not None:
+                result = {
+                    "text": cached["summary"],
+                    "input_tokens": 0,
+                    "output_tokens": 0,
+                    "cluster_id": data["cluster_id"],
+                    "label": data["label"],
+                }
+                reused_hashes.append(membership_hash)
+                tokens_saved += cached["input_tokens"] + cached["output_tokens"]
+            else:
+                result = fresh[data["cluster_id"]]
+                if "error" in result:
+                    continue
+                upsert_signalforge_cluster_summary(
+                    conn,
+                    membership_hash=membership_hash,
+                    cluster_id=data["cluster_id"],
+                    label=data["label"],
+                    summary=result["text"],
+                    model_used=SIGNALFORGE_SYNTHESIS_MODEL,
+                    prompt_version=prompt_version,
+                    input_tokens=result["input_tokens"],
+                    output_tokens=result["output_tokens"],
+                )
 
             story_summaries.append(result)
             total_input += result["input_tokens"]
             total_output += result["output_tokens"]
-            cluster_ids.append(cluster["id"])
+            cluster_ids.append(result["cluster_id"])
+
+        if reused_hashes:
+            mark_signalforge_cluster_summaries_reused(conn, reused_hashes)
+            logger.info(
+                "SignalForge synthesis: reused %d memoized cluster summaries (%d tokens saved)",
+                len(reused_hashes), tokens_saved,
+            )
 
         if not story_summaries:
             logger.warning("SignalForge synthesis: all cluster syntheses failed")
             return {"status": "all_failed", "synthesis_date": today}
 
-        # Phase 2: Combine into daily article
-        combined = _combine_stories(story_summaries, today)
+        # Phase 2: Combine into daily article. Last chance to stop before
+        # another Claude call and the Google Doc publish.
+        check_cancelled()
+        combined = _combine_stories(story_summaries, today, batch=batch)
         total_input += combined["input_tokens"]
         total_output += combined["output_tokens"]
 
@@ -1311,8 +1459,15 @@ def run_signalforge_synthesis(force: bool = False) -> dict:
             model_used=SIGNALFORGE_SYNTHESIS_MODEL,
             input_tokens=total_input,
             output_tokens=total_output,
+            reused_clusters=len(reused_hashes),
+            tokens_saved=tokens_saved,
         )
 
+        cutoff = (
+            datetime.now(timezone.utc) - timedelta(days=SIGNALFORGE_SUMMARY_CACHE_DAYS)
+        ).isoformat()
+        prune_signalforge_cluster_summaries(conn, cutoff)
+
         # Publish to Google Doc
         gdoc_id = ""
         gdoc_url = ""
@@ -1368,6 +1523,8 @@ def run_signalforge_synthesis(force: bool = False) -> dict:
             "word_count": word_count,
             "input_tokens": total_input,
             "output_tokens": total_output,
+            "reused_clusters": len(reused_hashes),
+            "tokens_saved": tokens_saved,
             "gdoc_url": gdoc_url or None,
         }
 
@@ -1378,7 +1535,7 @@ def run_signalforge_synthesis(force: bool = False) -> dict:
 
 
 def get_synthesis_status() -> dict:
-    """Dashboard: today's synthesis, recent syntheses, token usage."""
+    """Dashboard: today's synthesis, recent syntheses, token usage, summary reuse."""
     init_db()
     conn = get_connection()
     try:
@@ -1393,6 +1550,8 @@ def get_synthesis_status() -> dict:
                 "cluster_count": r["cluster_count"],
                 "article_count": r["article_count"],
                 "word_count": r["word_count"],
+                "reused_clusters": r["reused_clusters"],
+                "tokens_saved": r["tokens_saved"],
                 "gdoc_url": r["gdoc_url"] or None,
             }
             for r in recent
@@ -1401,8 +1560,13 @@ def get_synthesis_status() -> dict:
         # Total token usage across all syntheses
         token_row = conn.execute(
             "SELECT SUM(input_tokens) as total_in, SUM(output_tokens) as total_out, "
+            "SUM(tokens_saved) as total_saved, SUM(reused_clusters) as total_reused, "
             "COUNT(*) as count FROM signalforge_synthesis"
         ).fetchone()
+        memo_row = conn.execute(
+            "SELECT COUNT(*) as count, SUM(reuse_count) as reuses "
+            "FROM signalforge_cluster_summaries"
+        ).fetchone()
 
         return {
             "today": {
@@ -1416,6 +1580,12 @@ def get_synthesis_status() -> dict:
                 "total_syntheses": token_row["count"] or 0,
                 "total_input_tokens": token_row["total_in"] or 0,
                 "total_output_tokens": token_row["total_out"] or 0,
+                "total_tokens_saved": token_row["total_saved"] or 0,
+            },
+            "summary_reuse": {
+                "memoized_summaries": memo_row["count"] or 0,
+                "total_reuses": memo_row["reuses"] or 0,
+                "clusters_reused": token_row["total_reused"] or 0,
             },
         }
     finally:
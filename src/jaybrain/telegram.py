@@ -13,6 +13,7 @@ import signal
 import sys
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Optional
 
@@ -29,6 +30,10 @@ from .config import (
     TELEGRAM_POLL_TIMEOUT,
     TELEGRAM_RATE_LIMIT_MAX,
     TELEGRAM_RATE_LIMIT_WINDOW,
+    TELEGRAM_STREAM_EDIT_INTERVAL,
+    TELEGRAM_STREAM_MIN_CHARS,
+    TELEGRAM_SYSTEM_PROMPT_TTL,
+    TELEGRAM_TOOL_WORKERS,
 )
 from .db import (
     get_connection,
@@ -108,6 +113,15 @@ class TelegramAPI:
             text=text,
         )
 
+    def edit_message_text(
+        self, chat_id: int, message_id: int, text: str, markdown: bool = False,
+    ) -> dict:
+        """Replace the text of a message the bot already sent."""
+        kwargs = {"chat_id": chat_id, "message_id": message_id, "text": text}
+        if markdown:
+            kwargs["parse_mode"] = "Markdown"
+        return self._call("editMessageText", **kwargs)
+
     def send_chat_action(self, chat_id: int, action: str = "typing") -> dict:
         """Show typing indicator."""
         return self._call("sendChatAction", chat_id=chat_id, action=action)
@@ -207,7 +221,13 @@ def _split_message(text: str, max_len: int = TELEGRAM_MAX_MESSAGE_LEN) -> list[s
 
 
 def _build_system_prompt() -> str:
-    """Build the Claude system prompt with live JayBrain context."""
+    """Build the Claude system prompt with live JayBrain context.
+
+    Hits the DB (and the embedding model for recent decisions), so callers
+    should go through _get_system_prompt(), which caches the result. The
+    current time is deliberately left out to keep the text cacheable; see
+    _system_blocks().
+    """
     parts = [
         "You are GramCracker, JJ's personal AI assistant on Telegram, "
         "powered by JayBrain's memory system. You have access to JJ's "
@@ -315,10 +335,167 @@ def _build_system_prompt() -> str:
     finally:
         conn.close()
 
+    return "\n\n".join(parts)
+
+
+_system_prompt_cache: dict = {"text": None, "built_at": 0.0}
+_system_prompt_lock = threading.Lock()
+
+
+def invalidate_system_prompt() -> None:
+    """Force the next Claude call to rebuild the live-context system prompt."""
+    with _system_prompt_lock:
+        _system_prompt_cache["text"] = None
+
+
+def _get_system_prompt() -> str:
+    """Return the system prompt, rebuilding it at most every TELEGRAM_SYSTEM_PROMPT_TTL.
+
+    Tools that change what the prompt shows (tasks, memories) invalidate
+    it early via invalidate_system_prompt().
+    """
+    with _system_prompt_lock:
+        text = _system_prompt_cache["text"]
+        if text is not None and time.monotonic() - _system_prompt_cache["built_at"] < TELEGRAM_SYSTEM_PROMPT_TTL:
+            return text
+    text = _build_system_prompt()
+    with _system_prompt_lock:
+        _system_prompt_cache["text"] = text
+        _system_prompt_cache["built_at"] = time.monotonic()
+    return text
+
+
+def _system_blocks() -> list[dict]:
+    """System prompt as content blocks with a prompt-cache breakpoint.
+
+    The cached instructions + live context are a stable prefix (after the
+    tool schemas) and carry the cache_control breakpoint. The current time
+    changes on every call, so it goes in a trailing block after it.
+    """
     now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
-    parts.append(f"\nCurrent time: {now}")
+    return [
+        {"type": "text", "text": _get_system_prompt(), "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": f"Current time: {now}"},
+    ]
 
-    return "\n\n".join(parts)
+
+def _with_history_breakpoint(messages: list[dict]) -> list[dict]:
+    """Copy of messages with a cache breakpoint on the final content block.
+
+    Each tool-loop round resends the whole conversation; marking its end
+    lets the next round read everything before it from the prompt cache.
+    """
+    if not messages:
+        return messages
+    last = messages[-1]
+    content = last["content"]
+    if isinstance(content, str):
+        content = [{"type": "text", "text": content}]
+    else:
+        content = list(content)
+    if not content or not isinstance(content[-1], dict):
+        return messages
+    content[-1] = {**content[-1], "cache_control": {"type": "ephemeral"}}
+    return messages[:-1] + [{**last, "content": content}]
+
+
+class _ResponseStats:
+    """Latency and token usage for one Claude reply, stored on its telegram_messages row."""
+
+    def __init__(self, received_at: float) -> None:
+        self.received_at = received_at
+        self.first_message_at: Optional[float] = None
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cache_read_tokens = 0
+        self.cache_write_tokens = 0
+        self.tool_calls = 0
+
+    def add_usage(self, usage) -> None:
+        """Accumulate one API round's usage block."""
+        if usage is None:
+            return
+        self.input_tokens += getattr(usage, "input_tokens", 0) or 0
+        self.output_tokens += getattr(usage, "output_tokens", 0) or 0
+        self.cache_read_tokens += getattr(usage, "cache_read_input_tokens", 0) or 0
+        self.cache_write_tokens += getattr(usage, "cache_creation_input_tokens", 0) or 0
+
+    def mark_first_message(self) -> None:
+        if self.first_message_at is None:
+            self.first_message_at = time.monotonic()
+
+    def as_metrics(self) -> dict:
+        def _ms(t: Optional[float]) -> Optional[int]:
+            return int((t - self.received_at) * 1000) if t is not None else None
+
+        return {
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cache_read_tokens": self.cache_read_tokens,
+            "cache_write_tokens": self.cache_write_tokens,
+            "first_message_ms": _ms(self.first_message_at),
+            "response_ms": _ms(time.monotonic()),
+            "tool_calls": self.tool_calls,
+        }
+
+
+class _StreamingReply:
+    """Shows a reply in a single Telegram message while Claude is still generating it.
+
+    The first TELEGRAM_STREAM_MIN_CHARS characters are posted as a plain-text
+    draft, which is then edited in place at most every
+    TELEGRAM_STREAM_EDIT_INTERVAL seconds (Telegram rate-limits edits).
+    finish() swaps in the final Markdown text and sends any overflow chunks.
+    """
+
+    def __init__(self, bot: "GramCracker", stats: Optional[_ResponseStats] = None) -> None:
+        self._bot = bot
+        self._stats = stats
+        self.message_id: Optional[int] = None
+        self._shown = ""
+        self._last_edit = 0.0
+
+    def update(self, text: str) -> None:
+        draft = text[:TELEGRAM_MAX_MESSAGE_LEN].rstrip()
+        if len(draft) < TELEGRAM_STREAM_MIN_CHARS or draft == self._shown:
+            return
+        if self.message_id is not None and time.monotonic() - self._last_edit < TELEGRAM_STREAM_EDIT_INTERVAL:
+            return
+        self._show(draft, markdown=False)
+
+    def _show(self, text: str, markdown: bool) -> bool:
+        chat_id = self._bot._chat_id
+        if not chat_id:
+            return False
+        try:
+            if self.message_id is None:
+                self._bot.rate_limiter.wait_if_needed()
+                send = self._bot.api.send_message if markdown else self._bot.api.send_message_plain
+                self.message_id = send(chat_id, text).get("message_id")
+                if self._stats is not None:
+                    self._stats.mark_first_message()
+            else:
+                self._bot.api.edit_message_text(chat_id, self.message_id, text, markdown=markdown)
+        except Exception as e:
+            logger.debug("Streaming update failed: %s", e)
+            return False
+        self._shown = text
+        self._last_edit = time.monotonic()
+        return True
+
+    def finish(self, text: str) -> None:
+        """Deliver the final reply, reusing the draft message when there is one."""
+        if self.message_id is None:
+            self._bot._send(text)
+            if self._stats is not None:
+                self._stats.mark_first_message()
+            return
+        chunks = _split_message(text)
+        # Markdown parse error fallback; an unchanged draft needs no edit
+        if not self._show(chunks[0], markdown=True) and chunks[0] != self._shown:
+            self._show(chunks[0], markdown=False)
+        for chunk in chunks[1:]:
+            self._bot._send_chunk(chunk)
 
 
 def _format_dict(d: dict, indent: int = 0) -> str:
@@ -355,10 +532,13 @@ class GramCracker:
         self.rate_limiter = RateLimiter()
         self._running = False
         self._chat_id: Optional[int] = None
+        self._tool_pool = ThreadPoolExecutor(
+            max_workers=TELEGRAM_TOOL_WORKERS, thread_name_prefix="gramcracker-tool",
+        )
 
-        # Load Anthropic client
-        import anthropic
-        self.claude = anthropic.Anthropic(api_key=_cfg.ANTHROPIC_API_KEY)
+        # Shared Anthropic client (concurrency limit + retries live in .llm)
+        from .llm import get_client
+        self.claude = get_client()
 
         # Load poll offset from DB
         conn = get_connection()
@@ -432,6 +612,7 @@ class GramCracker:
             upsert_telegram_bot_state(conn, pid=0, last_error="")
         finally:
             conn.close()
+        self._tool_pool.shutdown(wait=False)
         logger.info("GramCracker shut down cleanly")
 
     def _send_startup_message(self) -> None:
@@ -458,6 +639,7 @@ class GramCracker:
 
     def _handle_message(self, msg: dict) -> None:
         """Process a single incoming Telegram message."""
+        received_at = time.monotonic()
         user = msg.get("from", {})
         user_id = user.get("id", 0)
         chat_id = msg.get("chat", {}).get("id", 0)
@@ -492,17 +674,15 @@ class GramCracker:
 
         # Check for bot commands
         if text.startswith("/"):
-            response = self._handle_command(text)
-        else:
-            # Show typing indicator
-            try:
-                self.api.send_chat_action(chat_id)
-            except Exception:
-                pass
-            response = self._get_claude_response(text)
+            self._send(self._handle_command(text))
+            return
 
-        # Send response
-        self._send(response)
+        # Show typing indicator
+        try:
+            self.api.send_chat_action(chat_id)
+        except Exception:
+            pass
+        self._get_claude_response(text, received_at=received_at)
 
     def _handle_command(self, text: str) -> str:
         """Process bot commands. Returns response text."""
@@ -604,9 +784,15 @@ class GramCracker:
         finally:
             conn.close()
 
-    def _get_claude_response(self, text: str) -> str:
-        """Build conversation context, call Claude API with tool use, execute tools."""
-        system_prompt = _build_system_prompt()
+    def _get_claude_response(self, text: str, received_at: Optional[float] = None) -> str:
+        """Build conversation context, call Claude API with tool use, execute tools.
+
+        The reply is streamed to the current chat as it is generated and
+        stored with its latency and token usage. Returns the reply text.
+        """
+        stats = _ResponseStats(received_at if received_at is not None else time.monotonic())
+        stream = _StreamingReply(self, stats)
+        system = _system_blocks()
 
         # Load conversation history
         conn = get_connection()
@@ -630,17 +816,20 @@ class GramCracker:
         messages = _fix_message_alternation(messages)
 
         try:
-            reply = self._run_tool_loop(system_prompt, messages)
+            reply = self._run_tool_loop(system, messages, stream=stream, stats=stats)
         except Exception as e:
             logger.error("Claude API error: %s", e)
             reply = f"Claude API error: {e}"
 
+        stream.finish(reply)
+
         # Store the assistant response
         conn = get_connection()
         try:
             insert_telegram_message(
                 conn, "assistant", reply,
                 token_count=_estimate_tokens(reply),
+                **stats.as_metrics(),
             )
             upsert_telegram_bot_state(
                 conn,
@@ -651,9 +840,23 @@ class GramCracker:
 
         return reply
 
-    def _run_tool_loop(self, system_prompt: str, messages: list[dict], max_rounds: int = 5) -> str:
-        """Call Claude with tools, execute any tool calls, loop until text response."""
-        tools = _get_tool_definitions()
+    def _run_tool_loop(
+        self,
+        system: list[dict],
+        messages: list[dict],
+        max_rounds: int = 5,
+        stream: Optional[_StreamingReply] = None,
+        stats: Optional[_ResponseStats] = None,
+    ) -> str:
+        """Call Claude with tools, execute any tool calls, loop until text response.
+
+        Each round is streamed; text deltas go to ``stream`` so the user sees
+        the reply (or the pre-tool preamble) while it is generated.
+        """
+        from .llm import stream as llm_stream
+
+        tools = _cached_tool_definitions()
+        text = ""
 
         for _ in range(max_rounds):
             # Show typing indicator each round
@@ -663,29 +866,43 @@ class GramCracker:
                 except Exception:
                     pass
 
-            response = self.claude.messages.create(
+            with llm_stream(
+                client=self.claude,
                 model=GRAMCRACKER_CLAUDE_MODEL,
                 max_tokens=TELEGRAM_MAX_RESPONSE_TOKENS,
-                system=system_prompt,
-                messages=messages,
+                system=system,
+                messages=_with_history_breakpoint(messages),
                 tools=tools,
-            )
+            ) as response_stream:
+                streamed = ""
+                for delta in response_stream.text_stream:
+                    streamed += delta
+                    if stream is not None:
+                        stream.update(streamed)
+                response = response_stream.get_final_message()
+
+            if stats is not None:
+                stats.add_usage(getattr(response, "usage", None))
 
             # Check if response contains tool use
             tool_uses = [b for b in response.content if b.type == "tool_use"]
             text_blocks = [b for b in response.content if b.type == "text"]
+            text = text_blocks[0].text if text_blocks else ""
 
             if not tool_uses:
                 # Pure text response -- we're done
-                return text_blocks[0].text if text_blocks else ""
+                return text
 
             # Execute tool calls and build tool results
             # First, add the assistant response to messages
             messages.append({"role": "assistant", "content": response.content})
 
+            if stats is not None:
+                stats.tool_calls += len(tool_uses)
+            results = self._execute_tool_calls(tool_uses)
+
             tool_results = []
-            for tool_use in tool_uses:
-                result = _execute_tool(tool_use.name, tool_use.input)
+            for tool_use, result in zip(tool_uses, results):
                 logger.info("Tool %s(%s) -> %s", tool_use.name, tool_use.input, result[:200])
                 tool_results.append({
                     "type": "tool_result",
@@ -696,7 +913,43 @@ class GramCracker:
             messages.append({"role": "user", "content": tool_results})
 
         # If we hit max rounds, extract whatever text we got
-        return text_blocks[0].text if text_blocks else "I ran out of tool-use rounds. Try a simpler request."
+        return text or "I ran out of tool-use rounds. Try a simpler request."
+
+    def _execute_tool_calls(self, tool_uses: list) -> list[str]:
+        """Execute one round's tool calls, running independent reads concurrently.
+
+        Write tools are barriers: everything requested before a write has
+        finished when it runs, and nothing after it starts until it is done,
+        so e.g. forge_review followed by forge_study sees the new review.
+        Results are returned in request order.
+        """
+        results: list[str] = [""] * len(tool_uses)
+        pending: list[int] = []
+
+        def _drain() -> None:
+            if len(pending) == 1:
+                i = pending[0]
+                results[i] = _execute_tool(tool_uses[i].name, tool_uses[i].input)
+            elif pending:
+                futures = [
+                    (i, self._tool_pool.submit(_execute_tool, tool_uses[i].name, tool_uses[i].input))
+                    for i in pending
+                ]
+                for i, future in futures:
+                    results[i] = future.result()
+            pending.clear()
+
+        for i, tool_use in enumerate(tool_uses):
+            if tool_use.name in _WRITE_TOOLS:
+                _drain()
+                results[i] = _execute_tool(tool_use.name, tool_use.input)
+            else:
+                pending.append(i)
+        _drain()
+
+        if any(t.name in _CONTEXT_TOOLS for t in tool_uses):
+            invalidate_system_prompt()
+        return results
 
     def _send(self, text: str) -> None:
         """Split, rate-limit, and send a message to the current chat."""
@@ -704,17 +957,20 @@ class GramCracker:
             logger.warning("No chat_id set, cannot send")
             return
 
-        chunks = _split_message(text)
-        for chunk in chunks:
-            self.rate_limiter.wait_if_needed()
+        for chunk in _split_message(text):
+            self._send_chunk(chunk)
+
+    def _send_chunk(self, chunk: str) -> None:
+        """Rate-limit and send one message-sized chunk to the current chat."""
+        self.rate_limiter.wait_if_needed()
+        try:
+            self.api.send_message(self._chat_id, chunk)
+        except Exception:
+            # Markdown parse error fallback
             try:
-                self.api.send_message(self._chat_id, chunk)
-            except Exception:
-                # Markdown parse error fallback
-                try:
-                    self.api.send_message_plain(self._chat_id, chunk)
-                except Exception as e:
-                    logger.error("Failed to send message: %s", e)
+                self.api.send_message_plain(self._chat_id, chunk)
+            except Exception as e:
+                logger.error("Failed to send message: %s", e)
 
     def _persist_offset(self) -> None:
         """Save the current poll offset to DB."""
@@ -754,6 +1010,30 @@ def _fix_message_alternation(messages: list[dict]) -> list[dict]:
 # Tool definitions for Claude tool use (JayBrain write access)
 # ---------------------------------------------------------------------------
 
+# Tools with side effects. They run one at a time, in order, between
+# concurrently executed batches of read-only tools.
+_WRITE_TOOLS = frozenset({"remember", "task_create", "task_update", "forge_review"})
+
+# Tools whose effects show up in the system prompt's live context.
+_CONTEXT_TOOLS = frozenset({"remember", "task_create", "task_update"})
+
+_tool_definitions: Optional[list[dict]] = None
+
+
+def _cached_tool_definitions() -> list[dict]:
+    """Tool schemas built once, with a prompt-cache breakpoint on the last one.
+
+    Tools come first in the prompt, so the breakpoint caches the whole
+    tool block; the system prompt adds the next breakpoint after it.
+    """
+    global _tool_definitions
+    if _tool_definitions is None:
+        tools = _get_tool_definitions()
+        tools[-1] = {**tools[-1], "cache_control": {"type": "ephemeral"}}
+        _tool_definitions = tools
+    return _tool_definitions
+
+
 def _get_tool_definitions() -> list[dict]:
     """Return tool schemas for the Claude API tool-use parameter."""
     return [
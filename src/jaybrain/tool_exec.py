@@ -0,0 +1,328 @@
+"""Execution lanes, timeouts, cancellation and background jobs for MCP tools.
+
+FastMCP serves every request from one asyncio event loop, while most tools
+in server.py are synchronous and can block for a long time (embedding,
+SQLite writes waiting on busy_timeout, Google/Anthropic/news fetches).
+Tools registered through server.tool() run here instead:
+
+- Each tool is routed to a lane, a bounded thread pool sized for its kind
+  of work (TOOL_LANE_WORKERS): "cpu" for embedding inference, "io" for
+  network calls, "db" for everything else. A burst of slow fetches cannot
+  starve quick memory lookups, and inference is not oversubscribed.
+- Every call has a timeout (TOOL_TIMEOUT, overridden per tool by
+  TOOL_TIMEOUTS). A timed-out or client-cancelled call stops waiting at
+  once: a call still queued is dropped, and a running one is asked to stop
+  at its next check_cancelled() checkpoint (threads cannot be killed).
+- Long operations can run as background jobs: start_job() returns a job id
+  immediately, and get_job()/cancel_job() poll or stop it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+from . import perf
+
+logger = logging.getLogger(__name__)
+
+LANES = ("cpu", "io", "db")
+
+_lanes: dict[str, ThreadPoolExecutor] = {}
+_lane_stats: dict[str, dict[str, int]] = {}
+_lanes_lock = threading.Lock()
+_local = threading.local()
+
+_jobs: dict[str, dict] = {}
+_jobs_lock = threading.Lock()
+
+
+class ToolCancelled(Exception):
+    """Raised by check_cancelled() once the caller has given up on a call."""
+
+
+# ---------------------------------------------------------------------------
+# Lanes
+# ---------------------------------------------------------------------------
+
+
+def _lane(name: str) -> ThreadPoolExecutor:
+    from .config import TOOL_LANE_WORKERS
+
+    if name not in LANES:
+        raise ValueError(f"Unknown tool lane '{name}'. Valid: {', '.join(LANES)}")
+    with _lanes_lock:
+        pool = _lanes.get(name)
+        if pool is None:
+            pool = _lanes[name] = ThreadPoolExecutor(
+                max_workers=max(1, TOOL_LANE_WORKERS.get(name, 1)),
+                thread_name_prefix=f"tool-{name}",
+            )
+            _lane_stats[name] = {
+                "submitted": 0, "running": 0, "completed": 0,
+                "failed": 0, "timed_out": 0, "cancelled": 0,
+            }
+        return pool
+
+
+def _count(lane: str, key: str, delta: int = 1) -> None:
+    with _lanes_lock:
+        stats = _lane_stats.get(lane)
+        if stats is not None:  # None after shutdown_lanes()
+            stats[key] += delta
+
+
+def lane_stats() -> dict:
+    """Per-lane counters plus how many calls are queued or running right now."""
+    from .config import TOOL_LANE_WORKERS
+
+    with _lanes_lock:
+        lanes = {}
+        for name in LANES:
+            stats = dict(_lane_stats.get(name, {}))
+            pool = _lanes.get(name)
+            stats["workers"] = TOOL_LANE_WORKERS.get(name, 1)
+            stats["queued"] = pool._work_queue.qsize() if pool is not None else 0
+            lanes[name] = stats
+        return lanes
+
+
+def shutdown_lanes(wait: bool = False) -> None:
+    """Stop all lane pools (they are recreated on next use)."""
+    with _lanes_lock:
+        pools = list(_lanes.values())
+        _lanes.clear()
+        _lane_stats.clear()
+    for pool in pools:
+        pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def timeout_for(tool_name: str) -> float:
+    from .config import TOOL_TIMEOUT, TOOL_TIMEOUTS
+
+    return float(TOOL_TIMEOUTS.get(tool_name, TOOL_TIMEOUT))
+
+
+# ---------------------------------------------------------------------------
+# Cancellation
+# ---------------------------------------------------------------------------
+
+
+def cancel_requested() -> bool:
+    """True if the call running on this thread was abandoned by its caller.
+
+    Always False outside a tool call (daemon jobs, tests).
+    """
+    event = getattr(_local, "cancel", None)
+    return event is not None and event.is_set()
+
+
+def check_cancelled() -> None:
+    """Raise ToolCancelled if the call running on this thread was abandoned.
+
+    Long loops call this between steps; use cancel_requested() instead to
+    stop early and keep partial results.
+    """
+    if cancel_requested():
+        raise ToolCancelled("Cancelled by caller")
+
+
+def _call(lane: str, cancel: threading.Event, fn: Callable, args: tuple, kwargs: dict) -> Any:
+    if cancel.is_set():
+        raise ToolCancelled("Cancelled before start")
+    _local.cancel = cancel
+    _count(lane, "running")
+    try:
+        result = fn(*args, **kwargs)
+        _count(lane, "completed")
+        return result
+    except ToolCancelled:
+        _count(lane, "cancelled")
+        raise
+    except Exception:
+        _count(lane, "failed")
+        raise
+    finally:
+        _count(lane, "running", -1)
+        _local.cancel = None
+
+
+def submit(lane: str, fn: Callable, *args, **kwargs) -> tuple[Future, threading.Event]:
+    """Queue fn on a lane. Returns (future, cancel event)."""
+    pool = _lane(lane)
+    cancel = threading.Event()
+    _count(lane, "submitted")
+    return pool.submit(_call, lane, cancel, fn, args, kwargs), cancel
+
+
+async def run_in_lane(
+    lane: str, fn: Callable, *args, timeout: Optional[float] = None, **kwargs,
+) -> Any:
+    """Await fn on a lane without blocking the event loop.
+
+    Raises asyncio.TimeoutError after timeout seconds and propagates
+    CancelledError when the request is cancelled; either way the call is
+    dropped if still queued and asked to stop if already running.
+    """
+    future, cancel = submit(lane, fn, *args, **kwargs)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+    except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+        cancel.set()
+        future.cancel()
+        _count(lane, "timed_out" if isinstance(e, asyncio.TimeoutError) else "cancelled")
+        raise
+
+
+def offload(lane: str = "db", name: Optional[str] = None):
+    """Decorator turning a sync tool into an async one that runs on a lane.
+
+    The wrapper keeps the tool's name, docstring and signature, so FastMCP
+    derives the same schema. A timeout returns the usual JSON error body.
+    Async functions are returned unchanged.
+    """
+    def decorate(fn: Callable) -> Callable:
+        if inspect.iscoroutinefunction(fn):
+            return fn
+        tool_name = name or fn.__name__
+        _lane(lane)  # fail fast on a typo'd lane at registration time
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            timeout = timeout_for(tool_name)
+            try:
+                with perf.timer("tool", tool_name):
+                    return await run_in_lane(lane, fn, *args, timeout=timeout, **kwargs)
+            except asyncio.TimeoutError:
+                logger.warning("%s timed out after %gs (lane %s)", tool_name, timeout, lane)
+                return json.dumps({
+                    "error": f"{tool_name} timed out after {timeout:g}s",
+                    "timed_out": True,
+                })
+            except ToolCancelled as e:
+                return json.dumps({"error": str(e), "cancelled": True})
+
+        return wrapper
+    return decorate
+
+
+# ---------------------------------------------------------------------------
+# Background jobs
+# ---------------------------------------------------------------------------
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _job_view(job: dict) -> dict:
+    view = {k: v for k, v in job.items() if not k.startswith("_")}
+    end = job["_finished"] or time.monotonic()
+    view["elapsed_seconds"] = round(end - job["_started"], 1) if job["_started"] else 0.0
+    return view
+
+
+def _prune_jobs() -> None:
+    """Drop expired and excess finished jobs. Caller holds _jobs_lock."""
+    from .config import TOOL_JOB_MAX_FINISHED, TOOL_JOB_RETENTION_SECONDS
+
+    now = time.monotonic()
+    finished = sorted(
+        (j for j in _jobs.values() if j["_finished"] is not None),
+        key=lambda j: j["_finished"],
+    )
+    excess = len(finished) - TOOL_JOB_MAX_FINISHED
+    for i, job in enumerate(finished):
+        if i < excess or now - job["_finished"] > TOOL_JOB_RETENTION_SECONDS:
+            _jobs.pop(job["job_id"], None)
+
+
+def start_job(tool_name: str, lane: str, fn: Callable, *args, **kwargs) -> dict:
+    """Run fn in the background on a lane and return its job record.
+
+    fn should return something JSON-serializable; it is exposed as the
+    job's result once status is "done".
+    """
+    job_id = uuid.uuid4().hex[:12]
+    job = {
+        "job_id": job_id,
+        "tool": tool_name,
+        "lane": lane,
+        "status": "queued",
+        "created_at": _now_iso(),
+        "result": None,
+        "error": None,
+        "_started": None,
+        "_finished": None,
+        "_cancel": None,
+        "_future": None,
+    }
+
+    def _run():
+        job["status"] = "running"
+        job["_started"] = time.monotonic()
+        try:
+            job["result"] = fn(*args, **kwargs)
+            job["status"] = "done"
+        except ToolCancelled:
+            job["status"] = "cancelled"
+        except Exception as e:
+            logger.error("Background job %s (%s) failed: %s", job_id, tool_name, e, exc_info=True)
+            job["status"] = "error"
+            job["error"] = str(e)
+        finally:
+            job["_finished"] = time.monotonic()
+
+    def _dropped(f: Future) -> None:
+        if f.cancelled():
+            job["status"] = "cancelled"
+            job["_finished"] = time.monotonic()
+
+    with _jobs_lock:
+        _prune_jobs()
+        job["_future"], job["_cancel"] = submit(lane, _run)
+        job["_future"].add_done_callback(_dropped)
+        _jobs[job_id] = job
+    logger.info("Started background job %s for %s on lane %s", job_id, tool_name, lane)
+    return _job_view(job)
+
+
+def get_job(job_id: str) -> Optional[dict]:
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        return _job_view(job) if job is not None else None
+
+
+def list_jobs() -> list[dict]:
+    """All retained jobs, newest first (results omitted)."""
+    with _jobs_lock:
+        _prune_jobs()
+        jobs = [_job_view(j) for j in _jobs.values()]
+    for job in jobs:
+        job.pop("result", None)
+    return sorted(jobs, key=lambda j: j["created_at"], reverse=True)
+
+
+def cancel_job(job_id: str) -> Optional[dict]:
+    """Cancel a job: dropped if queued, asked to stop if running."""
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+    if job is None:
+        return None
+    if job["_finished"] is None:
+        job["_cancel"].set()
+        if job["_future"].cancel():
+            job["status"] = "cancelled"
+            job["_finished"] = time.monotonic()
+        else:
+            job["status"] = "cancelling"
+    return _job_view(job)
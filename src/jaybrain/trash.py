@@ -16,12 +16,16 @@ from __future__ import annotations
 import hashlib
 import logging
 import os
+import queue
+import re
 import shutil
 import subprocess
 import sys
+import threading
+import time
 import uuid
 from datetime import datetime, timedelta, timezone
-from fnmatch import fnmatch
+from fnmatch import fnmatch, translate
 from pathlib import Path
 from typing import Optional
 
@@ -72,6 +76,13 @@ def _file_size(path: Path) -> int:
     return total
 
 
+def _entry_size(entry: os.DirEntry) -> int:
+    try:
+        return entry.stat().st_size
+    except OSError:
+        return 0
+
+
 def _find_git_root(path: Path) -> Optional[Path]:
     """Walk up from path to find the nearest .git directory."""
     current = path if path.is_dir() else path.parent
@@ -82,11 +93,18 @@ def _find_git_root(path: Path) -> Optional[Path]:
     return None
 
 
-def _git_run(args: list[str], cwd: str, timeout: int = 5) -> subprocess.CompletedProcess:
-    """Run a git command without flashing a console window on Windows."""
-    kwargs = {"capture_output": True, "cwd": cwd, "timeout": timeout}
+def _no_window_kwargs() -> dict:
     if sys.platform == "win32":
-        kwargs["creationflags"] = 0x08000000  # CREATE_NO_WINDOW
+        return {"creationflags": 0x08000000}  # CREATE_NO_WINDOW
+    return {}
+
+
+_GIT_TIMEOUT = 5  # seconds per git call (per path for check-ignore)
+
+
+def _git_run(args: list[str], cwd: str, timeout: int = _GIT_TIMEOUT) -> subprocess.CompletedProcess:
+    """Run a git command without flashing a console window on Windows."""
+    kwargs = {"capture_output": True, "cwd": cwd, "timeout": timeout, **_no_window_kwargs()}
     return subprocess.run(args, **kwargs)
 
 
@@ -103,17 +121,135 @@ def _is_git_tracked(filepath: Path, git_root: Path) -> bool:
         return False
 
 
-def _is_git_ignored(filepath: Path, git_root: Path) -> bool:
-    """Check if a file is in .gitignore."""
-    try:
-        rel = filepath.relative_to(git_root)
-        result = _git_run(
-            ["git", "check-ignore", "-q", str(rel)],
-            cwd=str(git_root),
-        )
-        return result.returncode == 0
-    except Exception:
-        return False
+class _GitRepo:
+    """Bulk git status lookups for one repository during a scan.
+
+    The tracked set is loaded once with ``git ls-files -z``; ignore checks
+    go through one long-lived ``git check-ignore --stdin`` process instead
+    of a subprocess per file. Its output is drained by a reader thread so
+    each answer is waited for at most _GIT_TIMEOUT seconds (a git stuck on
+    a lock or hook must not stall the scan). Any git failure degrades to
+    "tracked: no, ignored: no", which keeps files out of the auto-trash list.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._prefix = str(root).rstrip(os.sep) + os.sep
+        self._tracked: set[str] = set()
+        self._tracked_dirs: set[str] = set()
+        self._proc: Optional[subprocess.Popen] = None
+        self._chunks: queue.Queue = queue.Queue()
+        self._buf = b""
+        self._failed = False
+        self._load_tracked()
+
+    def _load_tracked(self) -> None:
+        try:
+            result = _git_run(["git", "ls-files", "-z"], cwd=str(self.root), timeout=60)
+        except Exception as e:
+            logger.warning("git ls-files failed in %s: %s", self.root, e)
+            return
+        if result.returncode != 0:
+            return
+        for rel in result.stdout.decode("utf-8", "surrogateescape").split("\0"):
+            if not rel:
+                continue
+            self._tracked.add(rel)
+            parent = rel.rpartition("/")[0]
+            while parent and parent not in self._tracked_dirs:
+                self._tracked_dirs.add(parent)
+                parent = parent.rpartition("/")[0]
+
+    def _rel(self, path: str) -> str:
+        return path[len(self._prefix):].replace(os.sep, "/")
+
+    def is_tracked(self, path: str, is_dir: bool = False) -> bool:
+        """True if the file is tracked (or, for a directory, contains tracked files)."""
+        rel = self._rel(path)
+        return rel in (self._tracked_dirs if is_dir else self._tracked)
+
+    @staticmethod
+    def _pump(stream, chunks: queue.Queue) -> None:
+        """Reader thread: forward check-ignore output; b"" marks the end."""
+        try:
+            while chunk := stream.read1(65536):
+                chunks.put(chunk)
+        except (OSError, ValueError):
+            pass
+        chunks.put(b"")
+
+    def _read_field(self, deadline: float) -> bytes:
+        while b"\0" not in self._buf:
+            try:
+                chunk = self._chunks.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                raise TimeoutError(f"no answer within {_GIT_TIMEOUT}s") from None
+            if not chunk:
+                raise EOFError("git check-ignore exited")
+            self._buf += chunk
+        field, self._buf = self._buf.split(b"\0", 1)
+        return field
+
+    def is_ignored(self, path: str) -> bool:
+        """True if .gitignore rules (not negated) match the path."""
+        if self._failed:
+            return False
+        try:
+            if self._proc is None:
+                self._proc = subprocess.Popen(
+                    ["git", "check-ignore", "--stdin", "-z", "--verbose", "--non-matching"],
+                    cwd=str(self.root),
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    **_no_window_kwargs(),
+                )
+                threading.Thread(
+                    target=self._pump, args=(self._proc.stdout, self._chunks),
+                    name="git-check-ignore", daemon=True,
+                ).start()
+            deadline = time.monotonic() + _GIT_TIMEOUT
+            self._proc.stdin.write(self._rel(path).encode("utf-8", "surrogateescape") + b"\0")
+            self._proc.stdin.flush()
+            # -z --verbose: source, line number, pattern, path; the pattern is
+            # empty for non-matching paths and starts with "!" for negations.
+            _source, _line, pattern, _path = (self._read_field(deadline) for _ in range(4))
+        except (OSError, ValueError, EOFError) as e:
+            logger.warning("git check-ignore failed in %s: %s", self.root, e)
+            self._failed = True
+            if isinstance(e, TimeoutError):
+                self._proc.kill()  # hung: don't wait on it in close()
+            self.close()
+            return False
+        return bool(pattern) and not pattern.startswith(b"!")
+
+    def close(self) -> None:
+        if self._proc is None:
+            return
+        proc, self._proc = self._proc, None
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=5)
+        except Exception:
+            proc.kill()
+
+
+class _PatternSet:
+    """Glob patterns precompiled into single regexes.
+
+    Same semantics as _matches_any_pattern: a pattern matches the path
+    relative to the scan dir, and slash-free patterns also match the
+    bare name.
+    """
+
+    def __init__(self, patterns: list[str]) -> None:
+        flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+        names = [translate(p) for p in patterns if "/" not in p]
+        self._rel = re.compile("|".join(translate(p) for p in patterns) or r"(?!)", flags)
+        self._name = re.compile("|".join(names) or r"(?!)", flags)
+
+    def matches(self, rel: str, name: str) -> bool:
+        return bool(self._rel.match(rel) or self._name.match(name))
 
 
 def _matches_any_pattern(path: Path, patterns: list[str], base_dir: Path) -> bool:
@@ -174,77 +310,116 @@ def scan_files(
 
     Returns a dict with 'auto' (safe to auto-trash) and 'review' (need
     confirmation) lists. Each entry has path, category, size, reason, and
-    git status.
+    git status. Also reports files_scanned and files_per_sec.
+
+    Git status comes from the repository that actually contains each path:
+    a repo found above a scan dir, or any repo discovered while walking
+    (e.g. each project under ~/projects). Each repo's tracked set is
+    loaded once and ignore rules are checked through one git process.
     """
     ensure_data_dirs()
     dirs = scan_dirs or [Path(d) for d in TRASH_SCAN_DIRS]
+    auto_patterns = _PatternSet(TRASH_AUTO_PATTERNS)
+    protected_patterns = _PatternSet(TRASH_PROTECTED_PATTERNS)
+    suspect_patterns = _PatternSet(TRASH_SUSPECT_PATTERNS)
+    trash_dir = str(TRASH_DIR)
 
     auto_items: list[dict] = []
     review_items: list[dict] = []
+    repos: dict[str, _GitRepo] = {}
+    files_scanned = 0
+    started = time.monotonic()
 
-    for scan_dir in dirs:
-        if not scan_dir.exists():
-            continue
+    def _repo_for(root: Path) -> _GitRepo:
+        key = str(root)
+        if key not in repos:
+            repos[key] = _GitRepo(root)
+        return repos[key]
 
-        git_root = _find_git_root(scan_dir)
+    try:
+        for scan_dir in dirs:
+            if not scan_dir.exists():
+                continue
 
-        # Walk the directory tree
-        for dirpath, dirnames, filenames in os.walk(str(scan_dir)):
-            current = Path(dirpath)
+            base = str(scan_dir).rstrip(os.sep) + os.sep
+            git_root = _find_git_root(scan_dir)
+            stack: list[tuple[str, Optional[_GitRepo]]] = [
+                (str(scan_dir), _repo_for(git_root) if git_root else None),
+            ]
+
+            while stack:
+                dirpath, repo = stack.pop()
+                try:
+                    with os.scandir(dirpath) as it:
+                        entries = list(it)
+                except OSError:
+                    continue
 
-            # Skip .git directories entirely
-            if ".git" in current.parts:
-                dirnames.clear()
-                continue
+                for entry in entries:
+                    path = entry.path
+                    name = entry.name
+                    rel = path[len(base):].replace(os.sep, "/")
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
 
-            # Skip the trash directory itself
-            if str(current).startswith(str(TRASH_DIR)):
-                dirnames.clear()
-                continue
+                    if is_dir:
+                        # Skip .git directories and the trash directory itself
+                        if name == ".git" or path.startswith(trash_dir):
+                            continue
 
-            # Check if this directory itself is a trashable item
-            if include_auto and _matches_any_pattern(current, TRASH_AUTO_PATTERNS, scan_dir):
-                if not _matches_any_pattern(current, TRASH_PROTECTED_PATTERNS, scan_dir):
-                    is_tracked = _is_git_tracked(current, git_root) if git_root else False
-                    if not is_tracked:
-                        is_ignored = _is_git_ignored(current, git_root) if git_root else True
-                        if is_ignored:
-                            category = _categorize_file(current)
+                        sub_repo = repo
+                        if os.path.exists(os.path.join(path, ".git")):
+                            sub_repo = _repo_for(Path(path))
+
+                        # Check if this directory itself is a trashable item
+                        if (
+                            include_auto
+                            and auto_patterns.matches(rel, name)
+                            and not protected_patterns.matches(rel, name)
+                            and not (repo and repo.is_tracked(path, is_dir=True))
+                            and (repo.is_ignored(path) if repo else True)
+                        ):
+                            current = Path(path)
                             auto_items.append({
-                                "path": str(current),
-                                "category": category,
+                                "path": path,
+                                "category": _categorize_file(current),
                                 "size": _file_size(current),
-                                "reason": f"Matches auto-trash pattern, git-ignored",
+                                "reason": "Matches auto-trash pattern, git-ignored",
                                 "git_tracked": False,
                                 "git_ignored": True,
                                 "is_dir": True,
                             })
                             # Don't descend into trashable directories
-                            dirnames.clear()
                             continue
 
-            # Check individual files
-            for fname in filenames:
-                fpath = current / fname
+                        stack.append((path, sub_repo))
+                        continue
 
-                # Skip protected files
-                if _matches_any_pattern(fpath, TRASH_PROTECTED_PATTERNS, scan_dir):
-                    continue
+                    # Individual files (including symlinks)
+                    files_scanned += 1
+
+                    # Skip protected files
+                    if protected_patterns.matches(rel, name):
+                        continue
 
-                is_tracked = _is_git_tracked(fpath, git_root) if git_root else False
-                if is_tracked:
-                    continue  # never touch tracked files
+                    if repo and repo.is_tracked(path):
+                        continue  # never touch tracked files
 
-                is_ignored = _is_git_ignored(fpath, git_root) if git_root else False
+                    # Only ask git about files whose ignore status matters
+                    is_auto = include_auto and auto_patterns.matches(rel, name)
+                    is_suspect = include_suspect and suspect_patterns.matches(rel, name)
+                    if not (is_auto or is_suspect):
+                        continue
+                    is_ignored = repo.is_ignored(path) if repo else False
 
-                # Auto-trash: matches pattern + git-ignored
-                if include_auto and is_ignored:
-                    if _matches_any_pattern(fpath, TRASH_AUTO_PATTERNS, scan_dir):
-                        category = _categorize_file(fpath)
+                    # Auto-trash: matches pattern + git-ignored
+                    if is_auto and is_ignored:
                         auto_items.append({
-                            "path": str(fpath),
-                            "category": category,
-                            "size": fpath.stat().st_size if fpath.exists() else 0,
+                            "path": path,
+                            "category": _categorize_file(Path(path)),
+                            "size": _entry_size(entry),
                             "reason": "Matches auto-trash pattern, git-ignored",
                             "git_tracked": False,
                             "git_ignored": True,
@@ -252,20 +427,22 @@ def scan_files(
                         })
                         continue
 
-                # Suspect files: flagged for review
-                if include_suspect:
-                    if _matches_any_pattern(fpath, TRASH_SUSPECT_PATTERNS, scan_dir):
-                        category = _categorize_file(fpath)
+                    # Suspect files: flagged for review
+                    if is_suspect:
                         review_items.append({
-                            "path": str(fpath),
-                            "category": category,
-                            "size": fpath.stat().st_size if fpath.exists() else 0,
+                            "path": path,
+                            "category": _categorize_file(Path(path)),
+                            "size": _entry_size(entry),
                             "reason": "Matches suspect pattern, needs review",
                             "git_tracked": False,
                             "git_ignored": is_ignored,
                             "is_dir": False,
                         })
+    finally:
+        for repo in repos.values():
+            repo.close()
 
+    elapsed = time.monotonic() - started
     return {
         "auto": auto_items,
         "review": review_items,
@@ -274,6 +451,10 @@ def scan_files(
         "auto_total_size": sum(i["size"] for i in auto_items),
         "review_total_size": sum(i["size"] for i in review_items),
         "dirs_scanned": [str(d) for d in dirs],
+        "git_repos": len(repos),
+        "files_scanned": files_scanned,
+        "scan_seconds": round(elapsed, 3),
+        "files_per_sec": round(files_scanned / elapsed) if elapsed > 0 else files_scanned,
     }
 
 
@@ -0,0 +1,383 @@
+"""Optional single-writer coordinator for jaybrain.db.
+
+Enabled with env JAYBRAIN_WRITER=1 (config.WRITER_ENABLED). Every module
+normally commits its own tiny transaction, so under load most of the time
+goes to handing the WAL write lock back and forth. With the coordinator
+on, one background thread per process owns a write connection; callers
+submit write functions to its queue and get futures back. The writer
+drains the queue in short windows (WRITER_BATCH_WINDOW_MS, at most
+WRITER_MAX_BATCH ops) and group-commits each window as one transaction.
+Each op runs inside its own SAVEPOINT, so a failing op is rolled back and
+reported to its own future without affecting the rest of the batch.
+
+Durability is chosen per call:
+
+- "sync": the caller blocks until the batch holding its op has committed
+  (the default; read-your-writes holds afterwards).
+- "async": fire-and-forget for logs and access counters. Errors are
+  logged and counted, never raised to the caller.
+
+Reads are untouched: callers keep reading through their own WAL
+connections. Write functions take the connection as their first argument
+and may call conn.commit()/conn.rollback() as usual; on the writer
+connection those map to a no-op and ROLLBACK TO the op's savepoint.
+
+The coordinator is per process. Hooks and other short-lived processes
+keep writing directly.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+DURABILITIES = ("sync", "async")
+
+_STOP = object()
+
+
+def enabled() -> bool:
+    from . import config as _cfg  # live reference, set from env by init()
+
+    return _cfg.WRITER_ENABLED
+
+
+class _BatchingMixin:
+    """Turns commit/rollback from write functions into savepoint operations."""
+
+    def commit(self):
+        pass  # the writer commits the whole batch
+
+    def rollback(self):
+        self.execute("ROLLBACK TO op")
+
+
+def _writer_factory() -> type:
+    from . import perf
+
+    base = perf.TimedConnection if perf.enabled() else sqlite3.Connection
+    return type("WriterConnection", (_BatchingMixin, base), {})
+
+
+class _Op:
+    __slots__ = ("fn", "args", "kwargs", "durability", "future", "barrier")
+
+    def __init__(self, fn, args, kwargs, durability, barrier=False):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.durability = durability
+        self.future: Future = Future()
+        self.barrier = barrier
+
+
+class WriteCoordinator:
+    """Background thread that owns the write connection and group-commits."""
+
+    def __init__(
+        self,
+        batch_window_ms: float,
+        max_batch: int,
+        queue_max: int = 0,
+    ):
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_batch = max(1, max_batch)
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_max)
+        self._thread: Optional[threading.Thread] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._commit_ms: deque[float] = deque(maxlen=512)
+        self._stats = {
+            "batches": 0,
+            "ops": 0,
+            "failed_ops": 0,
+            "async_errors": 0,
+            "failed_commits": 0,
+            "max_batch_size": 0,
+            "max_queue_depth": 0,
+        }
+
+    # -- public ---------------------------------------------------------
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="jaybrain-writer", daemon=True,
+            )
+            self._thread.start()
+
+    def submit(self, fn: Callable, *args, durability: str = "sync", **kwargs) -> Future:
+        if durability not in DURABILITIES:
+            raise ValueError(
+                f"Unknown durability '{durability}'. Valid: {', '.join(DURABILITIES)}"
+            )
+        op = _Op(fn, args, kwargs, durability)
+        self._enqueue(op)
+        return op.future
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until everything submitted so far has committed."""
+        if self._thread is None:
+            return
+        op = _Op(None, (), {}, "sync", barrier=True)
+        self._enqueue(op)
+        op.future.result(timeout)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Commit what is queued, then stop the thread and close the connection."""
+        thread = self._thread
+        if thread is None:
+            return
+        if thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join(timeout)
+        self._thread = None
+
+    def on_writer_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    @property
+    def connection(self) -> Optional[sqlite3.Connection]:
+        return self._conn
+
+    def stats(self) -> dict:
+        s = dict(self._stats)
+        batches = s["batches"]
+        commits = sorted(self._commit_ms)
+
+        def pct(q: float) -> Optional[float]:
+            if not commits:
+                return None
+            return round(commits[min(len(commits) - 1, int(q * len(commits)))], 3)
+
+        return {
+            "enabled": enabled(),
+            "running": self._thread is not None and self._thread.is_alive(),
+            "queue_depth": self._queue.qsize(),
+            **s,
+            "avg_batch_size": round(s["ops"] / batches, 2) if batches else 0.0,
+            "commit_ms": {
+                "last": round(self._commit_ms[-1], 3) if commits else None,
+                "avg": round(sum(commits) / len(commits), 3) if commits else None,
+                "p50": pct(0.50),
+                "p95": pct(0.95),
+                "max": round(commits[-1], 3) if commits else None,
+            },
+        }
+
+    # -- writer thread --------------------------------------------------
+
+    def _enqueue(self, op: _Op) -> None:
+        self.start()
+        self._queue.put(op)
+        depth = self._queue.qsize()
+        if depth > self._stats["max_queue_depth"]:
+            self._stats["max_queue_depth"] = depth
+
+    def _run(self) -> None:
+        try:
+            while True:
+                first = self._queue.get()
+                if first is _STOP:
+                    return
+                batch = [first]
+                stopping = False
+                deadline = time.monotonic() + self.batch_window
+                while len(batch) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    try:
+                        if remaining > 0:
+                            item = self._queue.get(timeout=remaining)
+                        else:
+                            item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+                self._commit_batch(batch)
+                if stopping:
+                    return
+        finally:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except Exception:
+                    pass
+                self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        from .db import get_connection
+
+        conn = get_connection(factory=_writer_factory())
+        conn.isolation_level = None  # BEGIN/COMMIT are issued explicitly
+        return conn
+
+    def _commit_batch(self, batch: list[_Op]) -> None:
+        outcomes: list[tuple[_Op, Any, Optional[BaseException]]] = []
+        try:
+            if self._conn is None:
+                self._conn = self._connect()
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+        except Exception as e:
+            logger.error("Writer could not start a batch of %d ops: %s", len(batch), e)
+            self._stats["failed_commits"] += 1
+            self._reset_connection()
+            for op in batch:
+                self._settle(op, None, e)
+            return
+
+        for op in batch:
+            if op.barrier:
+                outcomes.append((op, None, None))
+                continue
+            conn.execute("SAVEPOINT op")
+            try:
+                result = op.fn(conn, *op.args, **op.kwargs)
+            except Exception as e:
+                conn.execute("ROLLBACK TO op")
+                conn.execute("RELEASE op")
+                outcomes.append((op, None, e))
+            else:
+                conn.execute("RELEASE op")
+                outcomes.append((op, result, None))
+
+        start = time.perf_counter()
+        try:
+            conn.execute("COMMIT")
+        except Exception as e:
+            logger.error("Writer batch commit failed (%d ops): %s", len(batch), e)
+            self._stats["failed_commits"] += 1
+            self._reset_connection()
+            for op in batch:
+                self._settle(op, None, e)
+            return
+        self._commit_ms.append((time.perf_counter() - start) * 1000)
+
+        ops = sum(1 for op in batch if not op.barrier)
+        self._stats["batches"] += 1
+        self._stats["ops"] += ops
+        self._stats["max_batch_size"] = max(self._stats["max_batch_size"], ops)
+        for op, result, error in outcomes:
+            self._settle(op, result, error)
+
+    def _settle(self, op: _Op, result: Any, error: Optional[BaseException]) -> None:
+        if error is None:
+            op.future.set_result(result)
+            return
+        if not op.barrier:
+            self._stats["failed_ops"] += 1
+        if op.durability == "async":
+            self._stats["async_errors"] += 1
+            logger.warning(
+                "Async write %s failed: %s",
+                getattr(op.fn, "__name__", op.fn), error,
+            )
+        op.future.set_exception(error)
+
+    def _reset_connection(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+
+_coordinator: Optional[WriteCoordinator] = None
+_coordinator_lock = threading.Lock()
+
+
+def get_coordinator() -> WriteCoordinator:
+    """The process-wide coordinator, created on first use."""
+    global _coordinator
+    if _coordinator is None:
+        with _coordinator_lock:
+            if _coordinator is None:
+                from . import config as _cfg
+
+                _coordinator = WriteCoordinator(
+                    _cfg.WRITER_BATCH_WINDOW_MS,
+                    _cfg.WRITER_MAX_BATCH,
+                    _cfg.WRITER_QUEUE_MAX,
+                )
+                atexit.register(shutdown)
+    return _coordinator
+
+
+def submit(fn: Callable, *args, durability: str = "sync", **kwargs) -> Future:
+    """Queue ``fn(writer_conn, *args, **kwargs)`` on the writer thread."""
+    return get_coordinator().submit(fn, *args, durability=durability, **kwargs)
+
+
+def write(
+    conn: Optional[sqlite3.Connection],
+    fn: Callable,
+    *args,
+    durability: str = "sync",
+    **kwargs,
+) -> Any:
+    """Run the write function ``fn(conn, *args, **kwargs)``.
+
+    With the coordinator off, runs inline on ``conn`` (or a fresh
+    connection when ``conn`` is None). With it on, hands the call to the
+    writer thread: "sync" waits for the commit and returns fn's result,
+    "async" returns None immediately.
+
+    Runs inline regardless when ``conn`` has an open transaction (the
+    writer would wait on the caller's own lock) or when already on the
+    writer thread.
+    """
+    if not enabled() or (conn is not None and conn.in_transaction):
+        if conn is not None:
+            return fn(conn, *args, **kwargs)
+        from .db import get_connection
+
+        own = get_connection()
+        try:
+            return fn(own, *args, **kwargs)
+        finally:
+            own.close()
+
+    coordinator = get_coordinator()
+    if coordinator.on_writer_thread():
+        return fn(coordinator.connection, *args, **kwargs)
+    future = coordinator.submit(fn, *args, durability=durability, **kwargs)
+    if durability == "async":
+        return None
+    return future.result()
+
+
+def flush(timeout: Optional[float] = None) -> None:
+    """Wait until all writes submitted so far have committed."""
+    if _coordinator is not None:
+        _coordinator.flush(timeout)
+
+
+def shutdown() -> None:
+    """Commit pending writes and stop the writer thread (atexit, tests)."""
+    if _coordinator is not None:
+        _coordinator.stop()
+
+
+def stats() -> dict:
+    """Queue depth, batch sizes and commit latency for daemon_status."""
+    if _coordinator is None:
+        return {"enabled": enabled(), "running": False, "queue_depth": 0}
+    return _coordinator.stats()
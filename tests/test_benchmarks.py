@@ -0,0 +1,203 @@
+"""Tests for the synthetic-corpus benchmark suite (benchmarks/ package)."""
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks import compare, run_benchmarks  # noqa: E402
+from benchmarks.embedder import StubEmbedder, installed  # noqa: E402
+from benchmarks.generators import generate_memories, generate_news  # noqa: E402
+from benchmarks.runner import parse_scale  # noqa: E402
+from jaybrain.db import get_connection, init_db  # noqa: E402
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _cos(a, b):
+    return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+class TestStubEmbedder:
+    def test_deterministic_and_topic_structured(self):
+        emb = StubEmbedder(seed=1)
+        assert emb.embed("topic-3 alpha") == StubEmbedder(seed=1).embed("topic-3 alpha")
+        same = _cos(emb.embed("topic-3 alpha"), emb.embed("topic-3 beta"))
+        other = _cos(emb.embed("topic-3 alpha"), emb.embed("topic-9 alpha"))
+        assert same > 0.6
+        assert other < same - 0.3
+        assert len(emb.embed("no topic here")) == 384
+
+    def test_installed_patches_and_restores(self):
+        from jaybrain import memory, search
+
+        original = search.embed_text
+        emb = StubEmbedder()
+        with installed(emb):
+            assert memory.embed_text("topic-1 x") == emb.embed("topic-1 x")
+        assert search.embed_text is original
+
+
+class TestGenerators:
+    def _memory_snapshot(self):
+        conn = get_connection()
+        try:
+            return conn.execute(
+                "SELECT id, content, category, importance, created_at FROM memories ORDER BY id"
+            ).fetchall()
+        finally:
+            conn.close()
+
+    def test_memories_are_reproducible(self):
+        init_db()
+        conn = get_connection()
+        try:
+            facts = generate_memories(conn, 400, 7, StubEmbedder(7), now=NOW)
+        finally:
+            conn.close()
+        first = [tuple(r) for r in self._memory_snapshot()]
+
+        conn = get_connection()
+        try:
+            conn.execute("DELETE FROM memories")
+            conn.execute("DELETE FROM memories_vec")
+            conn.commit()
+            generate_memories(conn, 400, 7, StubEmbedder(7), now=NOW)
+            vec_count = conn.execute("SELECT COUNT(*) FROM memories_vec").fetchone()[0]
+            fts_hits = conn.execute(
+                "SELECT COUNT(*) FROM memories_fts WHERE memories_fts MATCH '\"topic-0\"'"
+            ).fetchone()[0]
+        finally:
+            conn.close()
+
+        assert [tuple(r) for r in self._memory_snapshot()] == first
+        assert facts["rows"] == 400 and facts["duplicates"] > 0
+        assert vec_count == 400
+        assert fts_hits > 0
+
+    def test_news_has_story_structure(self):
+        init_db()
+        conn = get_connection()
+        try:
+            facts = generate_news(conn, 300, 0, StubEmbedder(), now=NOW)
+            counts = conn.execute(
+                "SELECT (SELECT COUNT(*) FROM knowledge), "
+                "(SELECT COUNT(*) FROM signalforge_articles), "
+                "(SELECT COUNT(DISTINCT source_id) FROM news_feed_articles)"
+            ).fetchone()
+        finally:
+            conn.close()
+        assert tuple(counts)[:2] == (300, 300)
+        assert counts[2] > 5
+        assert 0 < facts["multi_article_stories"] < facts["stories"]
+
+
+class TestRunner:
+    def test_small_run_records_metrics(self, tmp_path):
+        result = run_benchmarks(
+            300, ["recall", "recall_ranking", "signalforge_clustering", "forge_readiness"],
+            iterations=2, data_dir=tmp_path / "bench",
+        )
+        assert result["meta"]["embedder"] == "stub"
+        assert set(result["corpora"]) == {"memories", "news", "forge"}
+        for name in ("recall", "recall_ranking", "signalforge_clustering", "forge_readiness"):
+            r = result["scenarios"][name]
+            assert r["status"] == "ok", r
+            assert r["iterations"] == 2
+            assert 0 < r["p50_ms"] <= r["p95_ms"] <= r["max_ms"]
+            assert r["ops_per_s"] > 0 and r["cpu_ms"] > 0
+
+    def test_quadratic_scenario_skipped_above_cap(self, tmp_path):
+        result = run_benchmarks(20_000, ["find_clusters"], data_dir=tmp_path / "bench")
+        assert result["scenarios"]["find_clusters"]["status"] == "skipped"
+        assert result["corpora"] == {}
+
+    def test_unknown_scenario(self):
+        with pytest.raises(ValueError, match="Unknown scenario"):
+            run_benchmarks(10, ["nope"])
+
+    def test_parse_scale(self):
+        assert parse_scale("10k") == 10_000
+        assert parse_scale("1M") == 1_000_000
+        assert parse_scale("2500") == 2500
+        with pytest.raises(ValueError):
+            parse_scale("lots")
+
+
+class TestCompare:
+    def _run(self, **scenarios):
+        return {"meta": {"scale": 10_000, "seed": 0, "embedder": "stub"},
+                "scenarios": {k: {"status": "ok", **v} for k, v in scenarios.items()}}
+
+    def test_flags_regressions_and_ignores_noise(self):
+        base = self._run(
+            recall={"p50_ms": 10.0, "p95_ms": 12.0, "ops_per_s": 100.0},
+            forge_readiness={"p50_ms": 0.2, "p95_ms": 0.3, "ops_per_s": 4000.0},
+        )
+        new = self._run(
+            recall={"p50_ms": 15.0, "p95_ms": 12.5, "ops_per_s": 66.0},
+            forge_readiness={"p50_ms": 0.5, "p95_ms": 0.6, "ops_per_s": 3900.0},
+        )
+        report = compare(base, new, threshold=0.2)
+        flagged = {(r["scenario"], r["metric"]) for r in report["regressions"]}
+        assert flagged == {("recall", "p50_ms"), ("recall", "ops_per_s")}
+        assert report["improvements"] == []
+
+    def test_improvements_and_mismatch_warning(self):
+        base = self._run(recall={"p50_ms": 20.0, "p95_ms": 30.0, "ops_per_s": 50.0})
+        new = self._run(recall={"p50_ms": 10.0, "p95_ms": 30.0, "ops_per_s": 50.0})
+        new["meta"]["scale"] = 100_000
+        report = compare(base, new)
+        assert [r["metric"] for r in report["improvements"]] == ["p50_ms"]
+        assert report["warnings"] == ["scale differs: 10000 vs 100000"]
+
+
+class TestSoak:
+    def test_short_soak_reports_contention_metrics(self, tmp_path):
+        from benchmarks.soak import run_soak
+
+        report = run_soak(
+            mix={"session_hook": 2, "daemon": 1, "watchdog": 1},
+            rates={"session_hook": 40, "daemon": 10, "watchdog": 5},
+            duration=1.5, data_dir=tmp_path / "soak", sample_interval=0.05,
+        )
+        assert report["errors"] == []
+        ops = report["operations"]
+        assert ops["hook_tool_use"]["count"] > 10
+        assert "daemon_heartbeat" in ops and "watchdog_check" in ops
+        assert all(o["p50_ms"] <= o["p99_ms"] <= o["max_ms"] for o in ops.values())
+        assert report["busy_wait"]["write_begin"]["count"] > 0
+        assert report["busy_wait"]["commit"]["count"] > 0
+        assert report["wal"]["samples"] > 0
+        assert report["wal"]["max_bytes"] > 0
+        assert report["slowest_sql"]
+
+    def test_rejects_unknown_role(self):
+        from benchmarks.soak import parse_pairs, run_soak
+
+        assert parse_pairs("mcp=2, daemon=1") == {"mcp": 2, "daemon": 1}
+        assert parse_pairs("session_hook=2.5", float) == {"session_hook": 2.5}
+        with pytest.raises(ValueError, match="Unknown role"):
+            run_soak(mix={"cron": 1}, duration=0.1)
+        with pytest.raises(ValueError, match="role=value"):
+            parse_pairs("mcp")
+
+
+class TestFtsReport:
+    def test_external_content_is_smaller_and_cheaper_to_update(self, tmp_path):
+        from benchmarks.fts_report import fts_report
+
+        report = fts_report(rows=300, data_dir=tmp_path / "fts")
+        v = report["variants"]
+        assert v["external"]["db_bytes"] < v["standalone"]["db_bytes"]
+        assert v["external_column"]["db_bytes"] <= v["external"]["db_bytes"]
+        assert v["external"]["update_rows_per_s"] > v["external_wide"]["update_rows_per_s"]
+        assert v["external"]["phrase_queries"] and not v["external_column"]["phrase_queries"]
+        with pytest.raises(ValueError, match="Unknown variant"):
+            fts_report(rows=1, variants=["contentless"])
@@ -34,6 +34,249 @@ class TestEvaluateJsAllowlist:
             assert expr not in SAFE_JS_EXPRESSIONS, f"Raw JS '{expr}' should not be a key"
 
 
+class _FakePage:
+    """Page stub serving scripted accessibility trees. No browser needed."""
+
+    def __init__(self, tree, url="https://example.com/", visible=()):
+        self.tree = tree
+        self.url = url
+        self.visible = list(visible)
+        self.accessibility = self
+
+    def snapshot(self):
+        return self.tree
+
+    def title(self):
+        return "Example"
+
+    def evaluate(self, script):
+        return self.visible
+
+    def is_closed(self):
+        return False
+
+
+def _tree(*children):
+    return {"role": "WebArea", "name": "Example", "children": list(children)}
+
+
+class TestSnapshotDiff:
+    """Unit tests for stable refs and incremental snapshots. No browser needed."""
+
+    @pytest.fixture(autouse=True)
+    def fake_page(self, monkeypatch):
+        from jaybrain import browser
+
+        page = _FakePage(_tree(
+            {"role": "heading", "name": "Welcome"},
+            {"role": "link", "name": "Home"},
+            {"role": "button", "name": "Save"},
+            {"role": "textbox", "name": "Search", "value": ""},
+        ))
+        monkeypatch.setitem(browser._state, "page", page)
+        browser._reset_refs()
+        yield page
+        browser._reset_refs()
+
+    def test_first_snapshot_is_full(self, fake_page):
+        from jaybrain.browser import snapshot
+
+        result = snapshot()
+        assert result["mode"] == "full"
+        assert '[1] link "Home"' in result["snapshot"]
+        assert result["size"]["returned_chars"] == result["size"]["full_chars"]
+
+    def test_diff_reports_only_changes_with_stable_refs(self, fake_page):
+        from jaybrain.browser import snapshot
+
+        snapshot()
+        fake_page.tree = _tree(
+            {"role": "link", "name": "Back"},
+            {"role": "link", "name": "Home"},
+            {"role": "button", "name": "Save"},
+            {"role": "textbox", "name": "Search", "value": "jobs"},
+            {"role": "alert", "name": "Saved"},
+        )
+        result = snapshot()
+        assert result["mode"] == "diff"
+        assert result["changes"] == {"added": 2, "removed": 1, "changed": 1}
+        lines = result["snapshot"].splitlines()
+        assert '+ [4] link "Back"' in lines
+        assert '+ alert "Saved"' in lines
+        assert '~ [3] textbox "Search" value="jobs"' in lines
+        assert '- heading "Welcome"' in lines
+        assert result["size"]["returned_chars"] < result["size"]["full_chars"]
+
+        # Existing elements kept their refs
+        full = snapshot(full=True)["snapshot"]
+        assert '[1] link "Home"' in full
+        assert '[2] button "Save"' in full
+
+    def test_no_changes(self, fake_page):
+        from jaybrain.browser import snapshot
+
+        snapshot()
+        assert snapshot()["snapshot"] == "(no changes)"
+
+    def test_url_change_resets_baseline(self, fake_page):
+        from jaybrain.browser import snapshot
+
+        snapshot()
+        fake_page.url = "https://example.com/other"
+        fake_page.tree = _tree({"role": "button", "name": "Next"})
+        result = snapshot()
+        assert result["mode"] == "full"
+        assert '[1] button "Next"' in result["snapshot"]
+
+    def test_role_filter(self, fake_page):
+        from jaybrain.browser import snapshot
+
+        text = snapshot(roles=["button", "textbox"])["snapshot"]
+        assert "Save" in text and "Search" in text
+        assert "Home" not in text and "Welcome" not in text
+
+    def test_viewport_scope(self, fake_page):
+        from jaybrain.browser import snapshot
+
+        fake_page.visible = ["Welcome", "Home"]
+        text = snapshot(viewport=True)["snapshot"]
+        assert "Welcome" in text and "Home" in text
+        assert "Save" not in text
+
+    def test_duplicate_names_get_distinct_refs(self, fake_page):
+        from jaybrain.browser import _resolve_ref, snapshot
+
+        fake_page.tree = _tree(
+            {"role": "button", "name": "Delete"},
+            {"role": "button", "name": "Delete"},
+        )
+        snapshot()
+        assert _resolve_ref(2)["nth"] == 1
+
+
+class TestBrowserHandles:
+    """Unit tests for the per-handle session pool. No browser needed."""
+
+    @pytest.fixture(autouse=True)
+    def clean_pool(self):
+        from jaybrain import browser
+
+        yield
+        for name in list(browser._handles):
+            browser.release_handle(name)
+
+    def test_handles_run_in_parallel_on_own_threads(self):
+        import threading
+        from jaybrain.browser import submit
+
+        barrier = threading.Barrier(2, timeout=5)
+
+        def work():
+            barrier.wait()  # deadlocks unless both handles run at once
+            return threading.current_thread().name
+
+        a, b = submit("a", work), submit("b", work)
+        names = {a.result(timeout=10), b.result(timeout=10)}
+        assert len(names) == 2
+        assert all(n.startswith("pw-") for n in names)
+
+    def test_state_is_isolated_per_handle(self):
+        from jaybrain import browser
+
+        def set_page(url):
+            browser._state["page"] = _FakePage(_tree(), url=url)
+
+        browser.run("a", set_page, "https://a.example/")
+        browser.run("b", set_page, "https://b.example/")
+        assert browser.run("a", lambda: browser._state["page"].url) == "https://a.example/"
+        assert browser.run("b", lambda: browser._state["page"].url) == "https://b.example/"
+
+        urls = {h["handle"]: h["url"] for h in browser.list_handles()["handles"]}
+        assert urls["a"] == "https://a.example/"
+        assert urls["b"] == "https://b.example/"
+
+    def test_same_handle_reuses_thread(self):
+        import threading
+        from jaybrain.browser import run
+
+        first = run("a", lambda: threading.current_thread().ident)
+        assert run("a", lambda: threading.current_thread().ident) == first
+
+    def test_full_pool_evicts_least_recently_used(self, monkeypatch):
+        from jaybrain import browser
+
+        monkeypatch.setattr(browser, "MAX_BROWSER_HANDLES", 2)
+        browser.run("a", lambda: None)
+        browser.run("b", lambda: None)
+        browser.run("a", lambda: None)  # b is now least recently used
+        browser.run("c", lambda: None)
+        live = {h["handle"] for h in browser.list_handles()["handles"]}
+        assert live == {"a", "c"}
+
+    def test_full_pool_of_busy_handles_raises(self, monkeypatch):
+        import threading
+        from jaybrain import browser
+
+        monkeypatch.setattr(browser, "MAX_BROWSER_HANDLES", 1)
+        gate = threading.Event()
+        busy = browser.submit("a", gate.wait, 5)
+        try:
+            with pytest.raises(RuntimeError, match="Browser pool full"):
+                browser.submit("b", lambda: None)
+        finally:
+            gate.set()
+            busy.result(timeout=10)
+
+    def test_release_handle(self):
+        from jaybrain import browser
+
+        browser.run("a", lambda: None)
+        assert browser.release_handle("a") == {"status": "closed", "handle": "a"}
+        assert "a" not in browser._handles
+        assert browser.release_handle("a")["status"] == "not_found"
+
+    def test_release_does_not_wait_on_done_callbacks(self, monkeypatch):
+        import time
+        from concurrent.futures import Future
+        from jaybrain import browser
+
+        # Done-callbacks run after result() waiters wake; make them lag
+        add_done_callback = Future.add_done_callback
+
+        def lagging(self, fn):
+            def late(future):
+                time.sleep(0.05)
+                fn(future)
+            add_done_callback(self, late)
+
+        monkeypatch.setattr(Future, "add_done_callback", lagging)
+        for _ in range(3):
+            browser.run("a", lambda: None)
+            assert browser.release_handle("a")["status"] == "closed"
+            assert "a" not in browser._handles
+
+    def test_submit_racing_release_runs_before_close(self, monkeypatch):
+        import threading
+        from jaybrain import browser
+
+        browser.run("a", lambda: None)
+        executor = browser._handles["a"].executor
+        real_submit = executor.submit
+        released = []
+        racer = threading.Thread(target=lambda: released.append(browser.release_handle("a")))
+
+        def racing_submit(*args, **kwargs):
+            if racer.ident is None:  # the tool call; later calls are the close
+                racer.start()
+                racer.join(0.5)  # blocks on _handles_lock unless submit dropped it
+            return real_submit(*args, **kwargs)
+
+        monkeypatch.setattr(executor, "submit", racing_submit)
+        assert browser.submit("a", lambda: "ran").result(timeout=10) == "ran"
+        racer.join(10)
+        assert released == [{"status": "closed", "handle": "a"}]
+
+
 def test_browser_launch_and_close():
     """Test launching and closing the browser."""
     from jaybrain.browser import launch_browser, close_browser
@@ -224,7 +467,7 @@ def test_server_tools_registered():
         "browser_fill_from_bw", "browser_select_option", "browser_wait",
         "browser_hover", "browser_evaluate", "browser_go_back",
         "browser_go_forward", "browser_tab_list", "browser_tab_new",
-        "browser_tab_switch", "browser_tab_close",
+        "browser_tab_switch", "browser_tab_close", "browser_handles",
     ]
     for name in expected:
         assert name in tool_names, f"Tool {name} not registered in MCP server"
@@ -185,6 +185,42 @@ class TestSummarizeConversation:
         assert "2 tool calls" in result
         assert "remember" in result
 
+    def test_summaries_share_llm_concurrency_limit(self, monkeypatch):
+        import sys
+        import threading
+        import time
+        import jaybrain.config as config
+        from jaybrain import llm
+        from jaybrain.conversation_archive import summarize_conversation
+
+        monkeypatch.setattr(config, "LLM_MAX_CONCURRENCY", 2)
+        monkeypatch.setenv("CLAUDE_BINARY_PATH", sys.executable)
+        lock = threading.Lock()
+        state = {"in_flight": 0, "peak": 0}
+
+        def fake_claude(cmd, **kwargs):
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            time.sleep(0.05)
+            with lock:
+                state["in_flight"] -= 1
+            return MagicMock(returncode=0, stdout="summary")
+
+        conversation = {"turns": [{"role": "user", "text": "Hello"}], "tool_calls": []}
+        with patch("subprocess.run", side_effect=fake_claude):
+            # Two archive runs' pools at once, each wider than the limit
+            runs = [
+                threading.Thread(target=llm.map_concurrent,
+                                 args=(summarize_conversation, [conversation] * 4, 4))
+                for _ in range(2)
+            ]
+            for t in runs:
+                t.start()
+            for t in runs:
+                t.join(5)
+        assert state["peak"] == 2
+
 
 class TestRunArchive:
     def test_run_archive_no_conversations(self, temp_data_dir, tmp_path, monkeypatch):
@@ -60,6 +60,18 @@ class TestDaemonManager:
         assert row["status"] == "running"
         assert row["pid"] == os.getpid()
 
+    def test_heartbeat_reports_file_watcher_stats(self, temp_data_dir):
+        self._setup_db()
+        from jaybrain.daemon import DaemonManager, get_daemon_status
+
+        dm = DaemonManager()
+        dm._file_watcher = MagicMock()
+        dm._file_watcher.stats.return_value = {"queue_depth": 3, "dropped": 1}
+        dm._write_heartbeat()
+
+        status = get_daemon_status()
+        assert status["file_watcher"] == {"queue_depth": 3, "dropped": 1}
+
     def test_write_status(self, temp_data_dir):
         self._setup_db()
         from jaybrain.daemon import DaemonManager
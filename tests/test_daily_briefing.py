@@ -18,6 +18,8 @@ from jaybrain.daily_briefing import (
     collect_upcoming_deadlines,
     collect_time_allocation,
     collect_signalforge_synthesis,
+    collect_sections,
+    clear_section_cache,
     format_telegram_briefing,
     build_email_html,
     _badge,
@@ -26,6 +28,14 @@ from jaybrain.daily_briefing import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _fresh_section_cache():
+    """Collected sections are cached per process; isolate each test."""
+    clear_section_cache()
+    yield
+    clear_section_cache()
+
+
 def _setup_db(temp_data_dir):
     ensure_data_dirs()
     init_db()
@@ -485,6 +495,179 @@ class TestRunTelegramBriefing:
         assert "JayBrain Daily Briefing" in msg
 
 
+class TestCollectSections:
+    def test_collectors_run_concurrently(self):
+        import time
+
+        def slow(result):
+            def run():
+                time.sleep(0.3)
+                return result
+            return run
+
+        with patch("jaybrain.daily_briefing.collect_homelab", side_effect=slow({"past_entries": []})), \
+             patch("jaybrain.daily_briefing.collect_news", side_effect=slow({"general": [], "tech": []})), \
+             patch("jaybrain.daily_briefing.collect_time_allocation", side_effect=slow({"domains": []})):
+            start = time.monotonic()
+            sections, report = collect_sections(["homelab", "news", "time_allocation"])
+            elapsed = time.monotonic() - start
+
+        assert elapsed < 0.8
+        assert sections["homelab"] == {"past_entries": []}
+        assert set(report["timings_ms"]) == {"homelab", "news", "time_allocation"}
+
+    def test_timeout_renders_fallback(self, monkeypatch):
+        import time
+        import jaybrain.config as config
+        monkeypatch.setattr(config, "BRIEFING_COLLECTOR_TIMEOUTS", {"homelab": 0.2})
+
+        def hang():
+            time.sleep(1.5)
+            return {"past_entries": []}
+
+        with patch("jaybrain.daily_briefing.collect_homelab", side_effect=hang), \
+             patch("jaybrain.daily_briefing.collect_time_allocation", return_value={"domains": []}):
+            start = time.monotonic()
+            sections, report = collect_sections(["homelab", "time_allocation"])
+            elapsed = time.monotonic() - start
+
+        assert elapsed < 1.2
+        assert report["timed_out"] == ["homelab"]
+        assert "Timed out" in sections["homelab"]["error"]
+        assert sections["time_allocation"] == {"domains": []}
+
+    def test_queued_collectors_time_out_behind_hung_workers(self, monkeypatch):
+        import threading
+        import time
+        import jaybrain.config as config
+        monkeypatch.setattr(config, "BRIEFING_COLLECTOR_WORKERS", 2)
+        monkeypatch.setattr(config, "BRIEFING_COLLECTOR_TIMEOUT", 0.3)
+        monkeypatch.setattr(config, "BRIEFING_COLLECTOR_TIMEOUTS", {})
+        release = threading.Event()
+        calls = []
+
+        def hang(name):
+            def run():
+                calls.append(name)
+                release.wait(5)
+                return {}
+            return run
+
+        names = ["homelab", "news", "time_allocation", "domains"]
+        try:
+            with patch("jaybrain.daily_briefing.collect_homelab", side_effect=hang("homelab")), \
+                 patch("jaybrain.daily_briefing.collect_news", side_effect=hang("news")), \
+                 patch("jaybrain.daily_briefing.collect_time_allocation",
+                       side_effect=hang("time_allocation")), \
+                 patch("jaybrain.life_domains.get_domain_overview", side_effect=hang("domains")):
+                start = time.monotonic()
+                sections, report = collect_sections(names)
+                elapsed = time.monotonic() - start
+        finally:
+            release.set()
+
+        assert elapsed < 1.5
+        assert sorted(report["timed_out"]) == sorted(names)
+        assert all("Timed out" in sections[n]["error"] for n in names[:3])
+        assert sections["domains"] is None
+        time.sleep(0.2)
+        assert len(calls) == 2  # the queued two were dropped, not run late
+
+    def test_awaited_collection_cancelled_by_other_pass(self):
+        import threading
+        from concurrent.futures import Future
+        import jaybrain.daily_briefing as db_mod
+
+        # Another pass owns "news", still queued behind a hung collector
+        collection = db_mod._Collection("news")
+        collection.future = Future()
+        db_mod._inflight["news"] = collection
+
+        def owner_times_it_out():
+            collection.future.cancel()
+            collection.future.set_running_or_notify_cancel()  # worker frees up
+
+        threading.Timer(0.1, owner_times_it_out).start()
+        sections, report = collect_sections(["news"])
+
+        assert report["timed_out"] == ["news"]
+        assert "Timed out" in sections["news"]["error"]
+
+    def test_cache_shared_between_passes(self):
+        with patch("jaybrain.daily_briefing.collect_time_allocation",
+                   return_value={"domains": []}) as mock_collect:
+            collect_sections(["time_allocation"])
+            sections, report = collect_sections(["time_allocation"])
+            assert mock_collect.call_count == 1
+            assert report["cached"] == ["time_allocation"]
+            assert sections["time_allocation"] == {"domains": []}
+
+            collect_sections(["time_allocation"], refresh=True)
+            assert mock_collect.call_count == 2
+
+    def test_error_results_not_cached(self):
+        with patch("jaybrain.daily_briefing.collect_homelab",
+                   return_value={"error": "unreachable"}) as mock_collect:
+            collect_sections(["homelab"])
+            collect_sections(["homelab"])
+        assert mock_collect.call_count == 2
+
+    def test_collector_exception_falls_back(self):
+        with patch("jaybrain.daily_briefing.collect_news", side_effect=RuntimeError("boom")):
+            sections, report = collect_sections(["news"])
+        assert report["failed"] == ["news"]
+        assert sections["news"]["general"] == []
+        assert sections["news"]["error"] == "boom"
+
+    def test_missing_prerequisites_fall_back(self):
+        with patch("jaybrain.daily_briefing._get_db_connection", return_value=None), \
+             patch("jaybrain.daily_briefing._get_google_credentials", return_value=None) as mock_creds:
+            sections, report = collect_sections(["tasks", "deadlines", "calendar", "networking"])
+        assert sections["tasks"]["error"] == "Database unavailable"
+        assert sections["deadlines"] == []
+        assert sections["calendar"]["error"] == "No Google credentials"
+        assert sections["networking"]["items"] == []
+        assert report["failed"] == []
+        # Credentials are loaded once per pass, not once per Google section
+        assert mock_creds.call_count == 1
+
+    def test_db_collectors_use_own_connections(self, temp_data_dir):
+        _setup_db(temp_data_dir)
+        conn = get_connection()
+        insert_task(conn, "t1", "Briefing task", "", "todo", "high", "", [], None)
+        conn.close()
+
+        sections, _ = collect_sections(["tasks", "pipeline", "forge", "deadlines"])
+        assert [t["title"] for t in sections["tasks"]["tasks"]] == ["Briefing task"]
+        assert "error" not in sections["forge"]
+
+    def test_timings_logged(self, temp_data_dir):
+        _setup_db(temp_data_dir)
+        with patch("jaybrain.daily_briefing.collect_homelab", return_value={"past_entries": []}), \
+             patch("jaybrain.daily_briefing.collect_news", return_value={"error": "no key"}):
+            collect_sections(["homelab", "news"])
+
+        from jaybrain.db import attach_ops
+
+        conn = _get_plain_conn(temp_data_dir)
+        attach_ops(conn)
+        rows = {
+            r["module_name"]: r
+            for r in conn.execute(
+                "SELECT * FROM daemon_execution_log WHERE module_name LIKE 'daily_briefing.%'"
+            )
+        }
+        conn.close()
+        assert rows["daily_briefing.homelab"]["status"] == "success"
+        assert rows["daily_briefing.homelab"]["duration_ms"] is not None
+        assert rows["daily_briefing.news"]["status"] == "error"
+        assert rows["daily_briefing.news"]["error_message"] == "no key"
+
+    def test_unknown_section(self):
+        with pytest.raises(ValueError):
+            collect_sections(["weather"])
+
+
 # ---------------------------------------------------------------------------
 # SignalForge synthesis tests
 # ---------------------------------------------------------------------------
@@ -1,6 +1,7 @@
 """Tests for the db module (schema, CRUD, serialization)."""
 
 import json
+import sqlite3
 import struct
 import pytest
 
@@ -17,6 +18,7 @@ from jaybrain.db import (
     delete_memory,
     get_memories_batch,
     update_memory_access,
+    update_memories_access,
     get_all_memories,
     # Task CRUD
     insert_task,
@@ -43,6 +45,12 @@ from jaybrain.db import (
     reindex_queue,
     # Stats
     get_stats,
+    OPS_TABLES,
+    # FTS indexes
+    fts_is_external,
+    rebuild_fts_table,
+    resume_fts_rebuilds,
+    search_knowledge_fts,
 )
 from jaybrain.config import ensure_data_dirs
 
@@ -241,6 +249,19 @@ class TestMemoryCRUD:
         assert row["last_accessed"] is not None
         conn.close()
 
+    def test_update_access_batch(self, temp_data_dir):
+        _setup(temp_data_dir)
+        conn = get_connection()
+        insert_memory(conn, "a1", "Content", "semantic", [], 0.5)
+        insert_memory(conn, "a2", "Content", "semantic", [], 0.5)
+        update_memories_access(conn, ["a1", "a2", "a1", "missing"])
+        update_memories_access(conn, [])
+
+        assert get_memory(conn, "a1")["access_count"] == 2
+        assert get_memory(conn, "a2")["access_count"] == 1
+        assert get_memory(conn, "a2")["last_accessed"] is not None
+        conn.close()
+
     def test_get_all_memories(self, temp_data_dir):
         _setup(temp_data_dir)
         conn = get_connection()
@@ -515,3 +536,347 @@ class TestMigrations:
         }
         assert "queue_position" in task_cols
         conn.close()
+
+    def test_graph_entities_fts_backfilled(self, temp_data_dir):
+        """Entities that predate the trigram index are searchable after migrating."""
+        _setup(temp_data_dir)
+        conn = get_connection()
+        conn.executescript("""
+            DROP TRIGGER graph_entities_ai;
+            DROP TRIGGER graph_entities_ad;
+            DROP TRIGGER graph_entities_au;
+            DROP TABLE graph_entities_fts;
+            DELETE FROM schema_version WHERE version >= 26;
+        """)
+        conn.execute(
+            """INSERT INTO graph_entities (id, name, entity_type, aliases, created_at, updated_at)
+            VALUES ('e1', 'Wireshark', 'tool', '["packet sniffer"]', '2026-01-01', '2026-01-01')"""
+        )
+        conn.commit()
+        conn.close()
+
+        init_db()
+        conn = get_connection()
+        rows = conn.execute(
+            "SELECT rowid FROM graph_entities_fts WHERE graph_entities_fts MATCH '\"sniff\"'"
+        ).fetchall()
+        assert len(rows) == 1
+        conn.close()
+
+
+class TestOpsDatabase:
+    def _legacy_logs(self, rows=7):
+        """Recreate pre-split log tables in main with rows, as an old DB would have."""
+        conn = get_connection()
+        conn.executescript("""
+            CREATE TABLE main.heartbeat_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                check_name TEXT NOT NULL,
+                triggered INTEGER NOT NULL DEFAULT 0,
+                message TEXT NOT NULL DEFAULT '',
+                notified INTEGER NOT NULL DEFAULT 0,
+                checked_at TEXT NOT NULL
+            );
+            CREATE TABLE main.git_shadow_log (
+                id TEXT PRIMARY KEY,
+                timestamp TEXT NOT NULL,
+                stash_hash TEXT NOT NULL,
+                changed_files TEXT NOT NULL DEFAULT '[]',
+                repo_path TEXT NOT NULL,
+                branch TEXT NOT NULL DEFAULT ''
+            );
+            DELETE FROM schema_version WHERE version >= 32;
+        """)
+        for i in range(rows):
+            conn.execute(
+                "INSERT INTO main.heartbeat_log (id, check_name, checked_at) VALUES (?, 'c', ?)",
+                (i + 1, f"2026-01-0{i % 9 + 1}"),
+            )
+        conn.execute(
+            "INSERT INTO main.git_shadow_log (id, timestamp, stash_hash, repo_path) "
+            "VALUES ('g1', '2026-01-01', 'abc', '/repo')"
+        )
+        conn.commit()
+        conn.close()
+
+    def test_logs_live_in_ops_file(self, temp_data_dir):
+        _setup(temp_data_dir)
+        conn = get_connection()
+        main_tables = {r[0] for r in conn.execute("SELECT name FROM main.sqlite_master")}
+        ops_tables = {r[0] for r in conn.execute("SELECT name FROM ops.sqlite_master")}
+        conn.execute("INSERT INTO heartbeat_log (check_name, checked_at) VALUES ('x', ?)", (now_iso(),))
+        conn.commit()
+        conn.close()
+        assert not main_tables & set(OPS_TABLES)
+        assert set(OPS_TABLES) <= ops_tables
+        assert (temp_data_dir / "jaybrain_ops.db").exists()
+
+    def test_migration_moves_rows_in_chunks(self, temp_data_dir, monkeypatch):
+        import jaybrain.db as db_mod
+
+        _setup(temp_data_dir)
+        self._legacy_logs()
+        monkeypatch.setattr(db_mod, "OPS_MIGRATION_CHUNK_ROWS", 3)
+        init_db()
+
+        conn = get_connection()
+        try:
+            assert not conn.execute(
+                "SELECT 1 FROM main.sqlite_master WHERE name IN ('heartbeat_log', 'git_shadow_log')"
+            ).fetchone()
+            ids = [r[0] for r in conn.execute("SELECT id FROM ops.heartbeat_log ORDER BY id")]
+            shadow = conn.execute("SELECT status FROM ops.git_shadow_log WHERE id = 'g1'").fetchone()
+        finally:
+            conn.close()
+        assert ids == list(range(1, 8))
+        assert shadow["status"] == "snapshot"  # column added by the ops schema default
+
+    def test_migration_reassigns_colliding_ids(self, temp_data_dir):
+        _setup(temp_data_dir)
+        conn = get_connection()
+        conn.execute("INSERT INTO ops.heartbeat_log (id, check_name, checked_at) VALUES (1, 'new', 'x')")
+        conn.commit()
+        conn.close()
+        self._legacy_logs(rows=2)
+        init_db()
+
+        conn = get_connection()
+        names = [r[0] for r in conn.execute("SELECT check_name FROM heartbeat_log ORDER BY id")]
+        conn.close()
+        assert names == ["new", "c", "c"]
+
+    def test_run_ops_maintenance_applies_retention(self, temp_data_dir):
+        from jaybrain.db import run_ops_maintenance
+
+        _setup(temp_data_dir)
+        conn = get_connection()
+        conn.execute("INSERT INTO heartbeat_log (check_name, checked_at) VALUES ('old', '2000-01-01')")
+        conn.execute("INSERT INTO heartbeat_log (check_name, checked_at) VALUES ('new', ?)", (now_iso(),))
+        conn.commit()
+        conn.close()
+
+        result = run_ops_maintenance()
+        assert result["pruned"]["heartbeat_log"] == 1
+        assert result["checkpoint"]["busy"] is False
+        assert result["ops_db_size_bytes"] > 0
+        conn = get_connection()
+        assert [r[0] for r in conn.execute("SELECT check_name FROM heartbeat_log")] == ["new"]
+        conn.close()
+
+
+class _WritesAfterCommit(sqlite3.Connection):
+    """Runs queued statements right after each COMMIT, between rebuild chunks."""
+
+    pending: list = []
+
+    def execute(self, sql, params=()):
+        cursor = super().execute(sql, params)
+        if sql == "COMMIT" and self.pending:
+            for statement in self.pending.pop(0):
+                super().execute(*statement)
+        return cursor
+
+
+class _CrashAfterCommits(sqlite3.Connection):
+    """Dies after ``commits`` COMMITs, like a process killed mid-rebuild."""
+
+    commits = 0
+
+    def execute(self, sql, params=()):
+        cursor = super().execute(sql, params)
+        if sql == "COMMIT":
+            type(self).commits -= 1
+            if self.commits == 0:
+                raise KeyboardInterrupt
+        return cursor
+
+
+class TestFtsIndexes:
+    def _articles(self, n=10):
+        conn = get_connection()
+        for i in range(n):
+            insert_knowledge(conn, f"k{i}", f"title{i}", f"body{i} shared", "general", [], "")
+        conn.close()
+
+    def _matches(self, conn, term):
+        return sorted(kid for kid, _ in search_knowledge_fts(conn, term, limit=50))
+
+    def _integrity_check(self, conn):
+        # rank=1 also compares the index against the content table
+        conn.execute("INSERT INTO knowledge_fts(knowledge_fts, rank) VALUES ('integrity-check', 1)")
+
+    def test_non_text_update_skips_index(self, temp_data_dir):
+        _setup(temp_data_dir)
+        self._articles(1)
+        conn = get_connection()
+        segments = conn.execute("SELECT COUNT(*) FROM knowledge_fts_data").fetchone()[0]
+        update_knowledge(conn, "k0", category="networking")
+        assert conn.execute("SELECT COUNT(*) FROM knowledge_fts_data").fetchone()[0] == segments
+
+        update_knowledge(conn, "k0", title="renamed")
+        assert self._matches(conn, "renamed") == ["k0"]
+        assert self._matches(conn, "title0") == []
+        self._integrity_check(conn)
+        conn.close()
+
+    def test_online_rebuild_mirrors_writes_between_chunks(self, temp_data_dir):
+        _setup(temp_data_dir)
+        self._articles(10)
+        _WritesAfterCommit.pending = [
+            [],  # staging table created, nothing copied yet
+            [   # rows 1-3 copied: these must go through the rebuild triggers
+                ("DELETE FROM knowledge WHERE id = 'k0'",),
+                ("UPDATE knowledge SET title = 'moved' WHERE id = 'k1'",),
+                ("UPDATE knowledge SET content = 'late' WHERE id = 'k8'",),
+                ("INSERT INTO knowledge (id, title, content, created_at, updated_at) "
+                 "VALUES ('k10', 'fresh', 'body10', '2026', '2026')",),
+            ],
+        ]
+        conn = sqlite3.connect(temp_data_dir / "jaybrain.db", factory=_WritesAfterCommit)
+        try:
+            # rows copied by the chunks: k0 before its delete, k10 after its insert
+            assert rebuild_fts_table(conn, "knowledge_fts", chunk_rows=3) == 11
+        finally:
+            conn.close()
+
+        conn = get_connection()
+        assert self._matches(conn, "shared") == [f"k{i}" for i in range(1, 8)] + ["k9"]
+        assert self._matches(conn, "moved") == ["k1"]
+        assert self._matches(conn, "title1") == []
+        assert self._matches(conn, "late") == ["k8"]
+        assert self._matches(conn, "fresh") == ["k10"]
+        assert conn.execute("SELECT COUNT(*) FROM fts_rebuild_state").fetchone()[0] == 0
+        assert not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name LIKE 'knowledge_fts_r%'"
+        ).fetchone()
+        self._integrity_check(conn)
+        conn.close()
+
+    def test_interrupted_rebuild_is_resumed(self, temp_data_dir):
+        _setup(temp_data_dir)
+        self._articles(10)
+        _CrashAfterCommits.commits = 3  # setup plus two chunks
+        conn = sqlite3.connect(temp_data_dir / "jaybrain.db", factory=_CrashAfterCommits)
+        with pytest.raises(KeyboardInterrupt):
+            rebuild_fts_table(conn, "knowledge_fts", "column", chunk_rows=3)
+        conn.close()
+
+        conn = get_connection()
+        assert conn.execute("SELECT copied_upto FROM fts_rebuild_state").fetchone()[0] == 6
+        conn.execute("UPDATE knowledge SET title = 'moved' WHERE id = 'k1'")  # already copied
+        conn.execute("DELETE FROM knowledge WHERE id = 'k8'")  # not yet copied
+        conn.commit()
+
+        assert resume_fts_rebuilds(conn, chunk_rows=3) == {"knowledge_fts": 3}
+        assert self._matches(conn, "moved") == ["k1"]
+        assert self._matches(conn, "shared") == [f"k{i}" for i in range(10) if i != 8]
+        sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'knowledge_fts'").fetchone()[0]
+        assert "detail=column" in sql
+        assert conn.execute("SELECT COUNT(*) FROM fts_rebuild_state").fetchone()[0] == 0
+        assert not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name LIKE 'knowledge_fts_r%'"
+        ).fetchone()
+        self._integrity_check(conn)
+        assert resume_fts_rebuilds(conn) == {}
+        conn.close()
+
+    def test_unresumable_rebuild_is_discarded(self, temp_data_dir):
+        _setup(temp_data_dir)
+        self._articles(4)
+        _CrashAfterCommits.commits = 1
+        conn = sqlite3.connect(temp_data_dir / "jaybrain.db", factory=_CrashAfterCommits)
+        with pytest.raises(KeyboardInterrupt):
+            rebuild_fts_table(conn, "knowledge_fts", chunk_rows=3)
+        conn.close()
+
+        conn = get_connection()
+        conn.execute("DROP TABLE knowledge_fts_rebuild")
+        conn.commit()
+        assert resume_fts_rebuilds(conn) == {}
+        assert conn.execute("SELECT COUNT(*) FROM fts_rebuild_state").fetchone()[0] == 0
+        assert not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'knowledge_fts_rb_%'"
+        ).fetchone()
+        update_knowledge(conn, "k0", title="renamed")  # no dangling trigger
+        assert self._matches(conn, "renamed") == ["k0"]
+        conn.close()
+
+    def test_rebuild_with_column_detail(self, temp_data_dir):
+        _setup(temp_data_dir)
+        self._articles(4)
+        conn = get_connection()
+        rebuild_fts_table(conn, "knowledge_fts", "column")
+        sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'knowledge_fts'").fetchone()[0]
+        assert "detail=column" in sql and fts_is_external(conn, "knowledge_fts")
+        assert self._matches(conn, "body2") == ["k2"]
+        assert self._matches(conn, "bod*") == [f"k{i}" for i in range(4)]
+        with pytest.raises(ValueError, match="Unknown FTS5 detail"):
+            rebuild_fts_table(conn, "knowledge_fts", "partial")
+        conn.close()
+
+    def test_graph_entity_index_skips_non_text_updates(self, temp_data_dir):
+        from jaybrain.db import insert_graph_entity, search_graph_entities, update_graph_entity
+
+        _setup(temp_data_dir)
+        conn = get_connection()
+        insert_graph_entity(conn, "e1", "Wireshark", "tool", aliases=["packet sniffer"])
+        segments = conn.execute("SELECT COUNT(*) FROM graph_entities_fts_data").fetchone()[0]
+        update_graph_entity(conn, "e1", memory_ids=["m1"], properties={"k": "v"})
+        assert conn.execute("SELECT COUNT(*) FROM graph_entities_fts_data").fetchone()[0] == segments
+
+        rebuild_fts_table(conn, "graph_entities_fts")
+        sql = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'graph_entities_fts'"
+        ).fetchone()[0]
+        assert "trigram" in sql
+        assert [r["id"] for r in search_graph_entities(conn, "sniff")] == ["e1"]
+        with pytest.raises(ValueError, match="needs detail=full"):
+            rebuild_fts_table(conn, "graph_entities_fts", "column")
+        conn.close()
+
+    def test_migration_narrows_graph_entity_trigger(self, temp_data_dir):
+        _setup(temp_data_dir)
+        conn = get_connection()
+        conn.executescript("""
+            DROP TRIGGER graph_entities_au;
+            CREATE TRIGGER graph_entities_au AFTER UPDATE ON graph_entities BEGIN
+                SELECT 1;
+            END;
+            DELETE FROM schema_version WHERE version >= 35;
+        """)
+        conn.close()
+        init_db()
+
+        conn = get_connection()
+        au = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'graph_entities_au'"
+        ).fetchone()[0]
+        conn.close()
+        assert "AFTER UPDATE OF name, aliases, description ON graph_entities" in au
+
+    def test_migration_converts_standalone_index(self, temp_data_dir):
+        _setup(temp_data_dir)
+        conn = get_connection()
+        conn.executescript("""
+            DROP TRIGGER knowledge_ai;
+            DROP TRIGGER knowledge_ad;
+            DROP TRIGGER knowledge_au;
+            DROP TABLE knowledge_fts;
+            CREATE VIRTUAL TABLE knowledge_fts USING fts5(title, content, tags);
+            CREATE TRIGGER knowledge_ai AFTER INSERT ON knowledge BEGIN
+                INSERT INTO knowledge_fts(rowid, title, content, tags)
+                VALUES (new.rowid, new.title, new.content, new.tags);
+            END;
+            DELETE FROM schema_version WHERE version >= 34;
+        """)
+        conn.close()
+        self._articles(3)
+        init_db()
+
+        conn = get_connection()
+        assert fts_is_external(conn, "knowledge_fts")
+        assert self._matches(conn, "shared") == ["k0", "k1", "k2"]
+        au = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'knowledge_au'").fetchone()[0]
+        assert "AFTER UPDATE OF title, content, tags ON knowledge" in au
+        self._integrity_check(conn)
+        conn.close()
@@ -10,7 +10,9 @@ from jaybrain.config import ensure_data_dirs
 from jaybrain.db import init_db
 from jaybrain.file_watcher import (
     DeletionHandler,
+    DeletionWriter,
     FileWatcherThread,
+    _coalesce,
     _should_ignore,
     query_deletions,
 )
@@ -109,6 +111,99 @@ class TestDeletionHandler:
         assert results[0]["event_type"] == "dir_deleted"
 
 
+class TestCoalesce:
+    def test_tree_collapses_to_one_row(self):
+        events = [
+            ("t1", "/p/build/a.o", False),
+            ("t2", "/p/build/sub/b.o", False),
+            ("t3", "/p/build/sub", True),
+            ("t4", "/p/src/keep.py", False),
+            ("t5", "/p/build", True),
+        ]
+        rows = _coalesce(events)
+        assert rows == [
+            ("t4", "/p/src/keep.py", "keep.py", "file_deleted", 0),
+            ("t5", "/p/build", "build", "dir_deleted", 3),
+        ]
+
+    def test_sibling_prefix_not_coalesced(self):
+        rows = _coalesce([("t1", "/p/build2/x", False), ("t2", "/p/build", True)])
+        assert [r[1] for r in rows] == ["/p/build2/x", "/p/build"]
+
+
+class TestDeletionWriter:
+    def test_batches_written_on_stop(self, temp_data_dir, monkeypatch):
+        _setup(temp_data_dir)
+        import jaybrain.file_watcher as fw_mod
+        monkeypatch.setattr(fw_mod, "FILE_WATCHER_FLUSH_INTERVAL", 60)
+        monkeypatch.setattr(fw_mod, "FILE_WATCHER_BATCH_SIZE", 4)
+
+        writer = DeletionWriter()
+        writer.start()
+        for i in range(10):
+            writer.submit(f"/project/f{i}.py", False)
+        writer.stop()
+
+        assert len(query_deletions(limit=100)) == 10
+        stats = writer.stats()
+        assert stats["rows_written"] == 10
+        assert stats["batches"] == 3
+        assert stats["queue_depth"] == 0
+
+    def test_directory_tree_summarized(self, temp_data_dir):
+        _setup(temp_data_dir)
+        writer = DeletionWriter()
+        writer.start()
+        for i in range(50):
+            writer.submit(f"/project/build/f{i}.o", False)
+        writer.submit("/project/build", True)
+        writer.stop()
+
+        rows = query_deletions(limit=100)
+        assert len(rows) == 1
+        assert rows[0]["event_type"] == "dir_deleted"
+        assert rows[0]["child_count"] == 50
+        assert writer.stats()["coalesced"] == 50
+
+    def test_tree_larger_than_a_batch_summarized(self, temp_data_dir, monkeypatch):
+        _setup(temp_data_dir)
+        import jaybrain.file_watcher as fw_mod
+        monkeypatch.setattr(fw_mod, "FILE_WATCHER_BATCH_SIZE", 20)
+
+        sep = os.sep
+        build = f"{sep}project{sep}build"
+        writer = DeletionWriter()
+        writer.start()
+        writer.submit(f"{sep}project{sep}build2{sep}keep.o", False)
+        for i in range(30):
+            writer.submit(f"{build}{sep}sub{sep}f{i}.o", False)
+        writer.submit(f"{build}{sep}sub", True)
+        for i in range(45):
+            writer.submit(f"{build}{sep}g{i}.o", False)
+        writer.submit(build, True)
+        writer.stop()
+
+        rows = query_deletions(limit=200)
+        assert sorted((r["file_path"], r["child_count"]) for r in rows) == [
+            (build, 76),
+            (f"{sep}project{sep}build2{sep}keep.o", 0),
+        ]
+        assert writer.stats()["batches"] > 3
+        assert writer.stats()["coalesced"] == 76
+
+    def test_full_queue_drops_and_counts(self, temp_data_dir, monkeypatch):
+        import jaybrain.file_watcher as fw_mod
+        monkeypatch.setattr(fw_mod, "FILE_WATCHER_QUEUE_MAX", 2)
+
+        writer = DeletionWriter()  # not started: nothing drains the queue
+        assert writer.submit("/p/a", False)
+        assert writer.submit("/p/b", False)
+        assert not writer.submit("/p/c", False)
+        stats = writer.stats()
+        assert stats["dropped"] == 1
+        assert stats["queue_depth"] == 2
+
+
 class TestQueryDeletions:
     def test_query_all(self, temp_data_dir):
         _setup(temp_data_dir)
@@ -185,6 +280,41 @@ class TestFileWatcherThread:
         watcher.start()
         assert not watcher.is_running
 
+    def test_events_flow_through_writer(self, temp_data_dir, monkeypatch):
+        _setup(temp_data_dir)
+        watched = temp_data_dir / "watched"
+        (watched / "tree").mkdir(parents=True)
+        for i in range(5):
+            (watched / "tree" / f"f{i}.txt").write_text("x")
+        (watched / "notes.md").write_text("x")
+        (watched / "junk.pyc").write_text("x")
+
+        import jaybrain.file_watcher as fw_mod
+        monkeypatch.setattr(fw_mod, "FILE_WATCHER_ENABLED", True)
+        monkeypatch.setattr(fw_mod, "FILE_WATCHER_PATHS", [str(watched)])
+        monkeypatch.setattr(fw_mod, "FILE_WATCHER_FLUSH_INTERVAL", 0.5)
+
+        watcher = FileWatcherThread()
+        watcher.start()
+        try:
+            import shutil
+            shutil.rmtree(watched / "tree")
+            (watched / "notes.md").unlink()
+            (watched / "junk.pyc").unlink()
+            deadline = time.time() + 10
+            while time.time() < deadline and not any(
+                r["filename"] == "notes.md" for r in query_deletions(limit=100)
+            ):
+                time.sleep(0.1)
+        finally:
+            watcher.stop()
+
+        rows = {r["filename"]: r for r in query_deletions(limit=100)}
+        assert "notes.md" in rows
+        assert "junk.pyc" not in rows
+        assert rows["tree"]["event_type"] == "dir_deleted"
+        assert watcher.stats()["ignored"] >= 1
+
     def test_nonexistent_path_handled(self, temp_data_dir, monkeypatch):
         _setup(temp_data_dir)
 
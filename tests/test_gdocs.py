@@ -22,6 +22,7 @@ from jaybrain.gdocs import (
     build_delete_range_request,
     build_update_text_style_request,
     sort_requests_reverse,
+    plan_doc_edit,
     get_doc_structure,
     replace_text,
     append_to_doc,
@@ -453,3 +454,46 @@ class TestEditAPINoCredentials:
         with patch("jaybrain.gdocs._get_credentials", return_value=None):
             result = append_to_doc("fake-id", "text")
             assert "error" in result
+
+
+class TestPlanDocEdit:
+    def setup_method(self):
+        self.structure = parse_doc_structure(
+            {**SAMPLE_DOC_JSON, "revisionId": "rev-9"}
+        )
+
+    def test_revision_id_parsed(self):
+        assert self.structure.revision_id == "rev-9"
+
+    def test_replace_section_requests(self):
+        requests, result = plan_doc_edit(
+            self.structure,
+            {"operation": "replace_section", "heading": "Sub Heading", "content": "New"},
+        )
+        assert requests == [
+            build_delete_range_request(50, 70),
+            build_insert_text_request(50, "New\n"),
+        ]
+        assert result["characters_deleted"] == 20
+
+    def test_append_at_doc_end(self):
+        requests, result = plan_doc_edit(
+            self.structure, {"operation": "append", "content": "Tail"},
+        )
+        assert requests == [build_insert_text_request(104, "\nTail")]
+        assert result["characters_inserted"] == 5
+
+    def test_missing_heading_plans_nothing(self):
+        requests, result = plan_doc_edit(
+            self.structure, {"operation": "delete_section", "heading": "Nope"},
+        )
+        assert requests == []
+        assert result["status"] == "not_found"
+
+    def test_replace_text_needs_no_structure(self):
+        requests, _ = plan_doc_edit(None, {"operation": "replace_text", "find": "a", "replace": "b"})
+        assert requests == [build_replace_text_request("a", "b")]
+
+    def test_unknown_operation(self):
+        with pytest.raises(ValueError, match="Unknown operation"):
+            plan_doc_edit(self.structure, {"operation": "rewrite"})
@@ -169,6 +169,110 @@ class TestRunGitShadow:
         assert result["snapshots_created"] == 1
 
 
+class TestFingerprintGating:
+    def test_unchanged_repo_skipped(self, temp_data_dir, tmp_path):
+        _setup(temp_data_dir)
+        repo = tmp_path / "repo"
+        _create_git_repo(repo)
+        (repo / "README.md").write_text("# Modified")
+
+        assert _snapshot_repo(str(repo))["status"] == "snapshot"
+        result = _snapshot_repo(str(repo))
+        assert result["status"] == "unchanged"
+        assert result["skipped"] is True
+        assert len(query_shadow_history(repo=str(repo))) == 1
+
+    def test_further_edit_snapshots_again(self, temp_data_dir, tmp_path):
+        _setup(temp_data_dir)
+        repo = tmp_path / "repo"
+        _create_git_repo(repo)
+        (repo / "README.md").write_text("# Modified")
+        _snapshot_repo(str(repo))
+
+        # Same porcelain status, different file contents
+        (repo / "README.md").write_text("# Modified again, longer")
+        assert _snapshot_repo(str(repo))["status"] == "snapshot"
+
+    def test_failed_stash_retried_next_run(self, temp_data_dir, tmp_path, monkeypatch):
+        import jaybrain.git_shadow as gs_mod
+
+        _setup(temp_data_dir)
+        repo = tmp_path / "repo"
+        _create_git_repo(repo)
+        (repo / "README.md").write_text("# Modified")
+
+        real_git_cmd = gs_mod._git_cmd
+        failures = []
+
+        def flaky_git_cmd(args, cwd, **kwargs):
+            if args[:2] == ["stash", "create"] and not failures:
+                failures.append(args)
+                return 1, "fatal: index.lock exists"
+            return real_git_cmd(args, cwd, **kwargs)
+
+        monkeypatch.setattr(gs_mod, "_git_cmd", flaky_git_cmd)
+        assert _snapshot_repo(str(repo))["status"] == "no_stash"
+        assert _snapshot_repo(str(repo))["status"] == "snapshot"
+        assert _snapshot_repo(str(repo))["status"] == "unchanged"
+
+    def test_failed_log_write_retried_next_run(self, temp_data_dir, tmp_path, monkeypatch):
+        import jaybrain.git_shadow as gs_mod
+
+        _setup(temp_data_dir)
+        repo = tmp_path / "repo"
+        _create_git_repo(repo)
+        (repo / "README.md").write_text("# Modified")
+
+        def locked():
+            raise sqlite3.OperationalError("database is locked")
+
+        real_get_conn = gs_mod._get_conn
+        monkeypatch.setattr(gs_mod, "_get_conn", locked)
+        assert _snapshot_repo(str(repo))["status"] == "snapshot"
+        monkeypatch.setattr(gs_mod, "_get_conn", real_get_conn)
+        assert _snapshot_repo(str(repo))["status"] == "snapshot"
+        assert len(query_shadow_history(repo=str(repo))) == 1
+
+    def test_rename_and_untracked_listed(self, temp_data_dir, tmp_path):
+        _setup(temp_data_dir)
+        repo = tmp_path / "repo"
+        _create_git_repo(repo)
+        subprocess.run(["git", "mv", "README.md", "DOCS.md"], cwd=str(repo), capture_output=True)
+        (repo / "new file.txt").write_text("x")
+
+        result = _snapshot_repo(str(repo))
+        assert result["status"] == "snapshot"
+        files = json.loads(query_shadow_history(repo=str(repo))[0]["changed_files"])
+        assert files == ["DOCS.md", "README.md", "[untracked] new file.txt"]
+
+    def test_run_logs_every_repo(self, temp_data_dir, tmp_path, monkeypatch):
+        _setup(temp_data_dir)
+        repos = [tmp_path / f"repo{i}" for i in range(3)]
+        for repo in repos:
+            _create_git_repo(repo)
+        (repos[0] / "README.md").write_text("changed")
+
+        import jaybrain.git_shadow as gs_mod
+        monkeypatch.setattr(gs_mod, "GIT_SHADOW_REPO_PATHS", [str(r) for r in repos])
+
+        first = run_git_shadow()
+        assert first["snapshots_created"] == 1
+        assert first["skipped"] == 2
+        second = run_git_shadow()
+        assert second["snapshots_created"] == 0
+        assert second["unchanged"] == 3
+        assert all("duration_ms" in d for d in second["details"])
+
+        rows = query_shadow_history(limit=100, include_skipped=True)
+        statuses = sorted(r["status"] for r in rows)
+        assert statuses == ["clean", "clean"] + ["snapshot"] + ["unchanged"] * 3
+        assert all(r["duration_ms"] is not None for r in rows)
+        assert len(query_shadow_history(limit=100)) == 1
+
+        skip_id = next(r["id"] for r in rows if r["status"] == "unchanged")
+        assert "error" in restore_file(skip_id, "README.md")
+
+
 class TestQueryHistory:
     def test_query_all(self, temp_data_dir, tmp_path):
         _setup(temp_data_dir)
@@ -0,0 +1,394 @@
+"""Tests for the shared Google API client layer (google_clients) and the
+gdocs/Drive operations built on it, run against a local fake Google API server.
+"""
+
+import copy
+import email
+import json
+import re
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from jaybrain import google_clients
+from tests.test_gdocs import SAMPLE_DOC_JSON
+
+
+# ---------------------------------------------------------------------------
+# Fake Google API server
+# ---------------------------------------------------------------------------
+
+
+class FakeGoogleAPI:
+    """Minimal in-memory Docs + Drive backend speaking the REST wire format."""
+
+    def __init__(self):
+        self.calls: list[tuple[str, str]] = []  # (method, path) of every HTTP request
+        self.doc = copy.deepcopy(SAMPLE_DOC_JSON)
+        self.doc["revisionId"] = "rev-1"
+        self.batch_updates: list[dict] = []
+        self.conflicts = 0  # concurrent edits to simulate before a batchUpdate
+        self.folders: list[dict] = []
+
+    def add_folder(self, name, parent=""):
+        folder = {"id": f"folder-{len(self.folders) + 1}", "name": name,
+                  "parents": [parent] if parent else ["root"]}
+        self.folders.append(folder)
+        return folder["id"]
+
+    def handle(self, method, target, body):
+        parsed = urlsplit(target)
+        path, query = parsed.path, parse_qs(parsed.query)
+
+        if method == "GET" and path.startswith("/v1/documents/"):
+            return 200, self.doc
+        if method == "POST" and path.endswith(":batchUpdate"):
+            if self.conflicts:
+                self.conflicts -= 1
+                self.doc["revisionId"] += "+"
+            required = body.get("writeControl", {}).get("requiredRevisionId")
+            if required and required != self.doc["revisionId"]:
+                return 400, {"error": {
+                    "code": 400, "status": "FAILED_PRECONDITION",
+                    "message": "The required revision ID does not match the latest revision.",
+                }}
+            self.batch_updates.append(body)
+            replies = [
+                {"replaceAllText": {"occurrencesChanged": 2}} if "replaceAllText" in r else {}
+                for r in body["requests"]
+            ]
+            return 200, {"documentId": self.doc["documentId"], "replies": replies}
+
+        if method == "GET" and path == "/drive/v3/files":
+            q = query.get("q", [""])[0]
+            name = re.search(r"name = '((?:[^'\\]|\\.)*)'", q).group(1).replace("\\'", "'")
+            files = [f for f in self.folders if f["name"] == name]
+            parent = re.search(r"'([^']+)' in parents", q)
+            if parent:
+                files = [f for f in files if parent.group(1) in f["parents"]]
+            return 200, {"files": files}
+        if method == "POST" and path == "/drive/v3/files":
+            parents = body.get("parents", [])
+            folder_id = self.add_folder(body["name"], parents[0] if parents else "")
+            return 200, {"id": folder_id, "name": body["name"]}
+
+        return 404, {"error": {"code": 404, "message": f"No fake route for {method} {path}"}}
+
+    def handle_batch(self, content_type, raw):
+        message = email.message_from_bytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + raw
+        )
+        parts = []
+        for part in message.get_payload():
+            request_text = part.get_payload()
+            head, _, body = request_text.partition("\r\n\r\n")
+            if not _:
+                head, _, body = request_text.partition("\n\n")
+            method, target, _version = head.splitlines()[0].split(" ", 2)
+            self.calls.append((method, urlsplit(target).path))
+            status, payload = self.handle(method, target, json.loads(body) if body.strip() else {})
+            content_id = part["Content-ID"].strip("<>")
+            parts.append(
+                "--batch_fake\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} OK\r\n"
+                "Content-Type: application/json\r\n\r\n"
+                f"{json.dumps(payload)}\r\n"
+            )
+        return "".join(parts) + "--batch_fake--\r\n"
+
+
+@pytest.fixture
+def fake_google(monkeypatch):
+    """Run a FakeGoogleAPI on localhost and point all Google clients at it."""
+    from google.oauth2.credentials import Credentials
+
+    import jaybrain.config as config
+
+    api = FakeGoogleAPI()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _respond(self, status, body, content_type="application/json"):
+            data = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            api.calls.append(("GET", urlsplit(self.path).path))
+            self._respond(*api.handle("GET", self.path, {}))
+
+        def do_POST(self):
+            raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if urlsplit(self.path).path.startswith("/batch/"):
+                api.calls.append(("POST", urlsplit(self.path).path))
+                body = api.handle_batch(self.headers["Content-Type"], raw)
+                self._respond(200, body, "multipart/mixed; boundary=batch_fake")
+                return
+            api.calls.append(("POST", urlsplit(self.path).path))
+            self._respond(*api.handle("POST", self.path, json.loads(raw or b"{}")))
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    # httplib2 would route even localhost through an environment proxy
+    for var in ("HTTP_PROXY", "HTTPS_PROXY", "http_proxy", "https_proxy"):
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.setattr(config, "GOOGLE_API_ENDPOINT", f"http://127.0.0.1:{server.server_port}")
+    google_clients.reset_clients()
+    google_clients.set_credentials(Credentials(token="fake-token"))
+    yield api
+
+    google_clients.reset_clients()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def _reset_clients():
+    google_clients.reset_clients()
+    yield
+    google_clients.reset_clients()
+
+
+# ---------------------------------------------------------------------------
+# Credentials + service caching
+# ---------------------------------------------------------------------------
+
+
+def _write_token(path, expired=False):
+    from google.auth import _helpers
+
+    import jaybrain.config as config
+
+    expiry = _helpers.utcnow() + timedelta(hours=-1 if expired else 1)
+    path.write_text(json.dumps({
+        "token": "access", "refresh_token": "refresh",
+        "client_id": "cid", "client_secret": "secret",
+        "token_uri": "https://oauth2.googleapis.com/token",
+        "scopes": config.OAUTH_SCOPES,
+        "expiry": expiry.isoformat() + "Z",
+    }))
+
+
+class TestCredentials:
+    def test_loaded_once_per_process(self, tmp_path, monkeypatch):
+        import jaybrain.config as config
+        token = tmp_path / "token.json"
+        _write_token(token)
+        monkeypatch.setattr(config, "OAUTH_TOKEN_PATH", token)
+
+        first = google_clients.get_credentials()
+        token.unlink()
+        assert first is not None
+        assert google_clients.get_credentials() is first
+
+    def test_refreshed_only_when_expired(self, tmp_path, monkeypatch):
+        from google.auth import _helpers
+        from google.oauth2.credentials import Credentials
+
+        import jaybrain.config as config
+        token = tmp_path / "token.json"
+        _write_token(token, expired=True)
+        monkeypatch.setattr(config, "OAUTH_TOKEN_PATH", token)
+
+        def fake_refresh(self, request):
+            self.token = "refreshed"
+            self.expiry = _helpers.utcnow() + timedelta(hours=1)
+
+        with patch.object(Credentials, "refresh", autospec=True, side_effect=fake_refresh) as refresh:
+            creds = google_clients.get_credentials()
+            google_clients.get_credentials()
+            assert refresh.call_count == 1
+
+            # Expiring again triggers exactly one more refresh of the same object
+            creds.expiry = _helpers.utcnow() - timedelta(minutes=1)
+            assert google_clients.get_credentials() is creds
+            assert refresh.call_count == 2
+
+        assert json.loads(token.read_text())["token"] == "refreshed"
+
+    def test_missing_scopes_rejected_non_interactive(self, tmp_path, monkeypatch):
+        import jaybrain.config as config
+        token = tmp_path / "token.json"
+        _write_token(token)
+        data = json.loads(token.read_text())
+        data["scopes"] = data["scopes"][:1]
+        token.write_text(json.dumps(data))
+        monkeypatch.setattr(config, "OAUTH_TOKEN_PATH", token)
+
+        assert google_clients.get_credentials(interactive=False) is None
+
+    def test_no_token_non_interactive(self, tmp_path, monkeypatch):
+        import jaybrain.config as config
+        monkeypatch.setattr(config, "OAUTH_TOKEN_PATH", tmp_path / "missing.json")
+        assert google_clients.get_credentials(interactive=False) is None
+
+
+class TestServiceCache:
+    def test_reused_within_thread(self, fake_google):
+        creds = google_clients.get_credentials()
+        assert google_clients.get_service("docs", "v1", creds) is google_clients.get_service("docs", "v1", creds)
+
+    def test_separate_per_thread(self, fake_google):
+        creds = google_clients.get_credentials()
+        main = google_clients.get_service("docs", "v1", creds)
+        other = []
+        t = threading.Thread(target=lambda: other.append(google_clients.get_service("docs", "v1", creds)))
+        t.start()
+        t.join()
+        assert other[0] is not main
+
+    def test_rebuilt_for_new_credentials(self, fake_google):
+        from google.oauth2.credentials import Credentials
+        first = google_clients.get_service("drive", "v3", Credentials(token="a"))
+        assert google_clients.get_service("drive", "v3", Credentials(token="b")) is not first
+
+    def test_endpoint_override(self, fake_google):
+        creds = google_clients.get_credentials()
+        service = google_clients.get_service("docs", "v1", creds)
+        service.documents().get(documentId="test-doc-123").execute()
+        assert fake_google.calls == [("GET", "/v1/documents/test-doc-123")]
+
+
+class TestExecuteBatch:
+    def test_one_round_trip(self, fake_google):
+        fake_google.add_folder("Alpha")
+        fake_google.add_folder("Beta")
+        drive = google_clients.get_service("drive", "v3")
+        requests = [
+            drive.files().list(q=f"name = '{n}' and trashed = false", fields="files(id, name, parents)")
+            for n in ("Alpha", "Beta", "Gamma")
+        ]
+        results = google_clients.execute_batch(drive, "drive", "v3", requests)
+
+        assert [len(r["files"]) for r, _ in results] == [1, 1, 0]
+        assert all(err is None for _, err in results)
+        http_posts = [c for c in fake_google.calls if c[1].startswith("/batch/")]
+        assert http_posts == [("POST", "/batch/drive/v3")]
+
+    def test_chunks_at_max_size(self, fake_google, monkeypatch):
+        monkeypatch.setattr(google_clients, "MAX_BATCH_SIZE", 2)
+        drive = google_clients.get_service("drive", "v3")
+        requests = [drive.files().list(q=f"name = 'n{i}'") for i in range(5)]
+        results = google_clients.execute_batch(drive, "drive", "v3", requests)
+        assert len(results) == 5
+        assert sum(1 for c in fake_google.calls if c[1].startswith("/batch/")) == 3
+
+
+# ---------------------------------------------------------------------------
+# Drive folder chains
+# ---------------------------------------------------------------------------
+
+
+class TestFindOrCreateFolderPath:
+    def test_creates_only_missing_levels(self, fake_google):
+        from jaybrain.gdocs import find_or_create_folder_path
+
+        job_search = fake_google.add_folder("Job Search")
+        year = fake_google.add_folder("2026", job_search)
+        fake_google.add_folder("2026")  # same name elsewhere must not match
+
+        result = find_or_create_folder_path("Job Search/2026/Acme")
+
+        assert result["created"] == ["Acme"]
+        acme = next(f for f in fake_google.folders if f["name"] == "Acme")
+        assert acme["parents"] == [year]
+        assert result["folder_id"] == acme["id"]
+        # All lookups in one batch, then a single create
+        assert [c for c in fake_google.calls if c[0] == "POST"] == [
+            ("POST", "/batch/drive/v3"), ("POST", "/drive/v3/files"),
+        ]
+
+    def test_existing_path_creates_nothing(self, fake_google):
+        from jaybrain.gdocs import find_or_create_folder_path
+
+        a = fake_google.add_folder("A")
+        b = fake_google.add_folder("B", a)
+        result = find_or_create_folder_path("A/B/")
+        assert result == {"folder_id": b, "folder_name": "B", "path": "A/B", "created": []}
+
+    def test_empty_path(self, fake_google):
+        from jaybrain.gdocs import find_or_create_folder_path
+        assert "error" in find_or_create_folder_path(" / ")
+
+
+# ---------------------------------------------------------------------------
+# Docs batched edits
+# ---------------------------------------------------------------------------
+
+
+class TestApplyDocEdits:
+    def test_single_batch_update_with_write_control(self, fake_google):
+        from jaybrain.gdocs import apply_doc_edits
+
+        result = apply_doc_edits("test-doc-123", [
+            {"operation": "replace_section", "heading": "Main", "content": "New intro"},
+            {"operation": "insert_after_heading", "heading": "Another", "content": "Added"},
+            {"operation": "replace_text", "find": "Final", "replace": "Last"},
+        ])
+
+        assert result["status"] == "ok"
+        assert len(fake_google.batch_updates) == 1
+        body = fake_google.batch_updates[0]
+        assert body["writeControl"] == {"requiredRevisionId": "rev-1"}
+        # Reverse document order, replaceAllText last
+        kinds = [next(iter(r)) for r in body["requests"]]
+        assert kinds == ["insertText", "deleteContentRange", "insertText", "replaceAllText"]
+        assert result["results"][0]["characters_deleted"] == 54
+        assert result["results"][2]["occurrences_changed"] == 2
+        assert fake_google.calls.count(("GET", "/v1/documents/test-doc-123")) == 1
+
+    def test_revision_conflict_replans_once(self, fake_google):
+        from jaybrain.gdocs import replace_section
+
+        fake_google.conflicts = 1
+        result = replace_section("test-doc-123", "Another", "Rewritten")
+
+        assert result["status"] == "ok"
+        assert fake_google.calls.count(("GET", "/v1/documents/test-doc-123")) == 2
+        assert fake_google.batch_updates[0]["writeControl"]["requiredRevisionId"] == "rev-1+"
+
+    def test_persistent_conflict_reports_error(self, fake_google):
+        from jaybrain.gdocs import delete_section
+
+        fake_google.conflicts = 5
+        result = delete_section("test-doc-123", "Sub Heading")
+        assert "error" in result
+        assert fake_google.batch_updates == []
+
+    def test_overlapping_edits_rejected(self, fake_google):
+        from jaybrain.gdocs import apply_doc_edits
+
+        result = apply_doc_edits("test-doc-123", [
+            {"operation": "replace_section", "heading": "Main", "content": "x"},
+            {"operation": "delete_section", "heading": "Sub Heading"},
+        ])
+        assert "overlapping" in result["error"]
+        assert fake_google.batch_updates == []
+
+    def test_replace_text_skips_document_read(self, fake_google):
+        from jaybrain.gdocs import replace_text
+
+        result = replace_text("test-doc-123", "body", "BODY")
+        assert result == {"status": "ok", "occurrences_changed": 2}
+        assert ("GET", "/v1/documents/test-doc-123") not in fake_google.calls
+        assert "writeControl" not in fake_google.batch_updates[0]
+
+    def test_heading_not_found_sends_nothing(self, fake_google):
+        from jaybrain.gdocs import insert_after_heading
+
+        result = insert_after_heading("test-doc-123", "Nope", "text")
+        assert result["status"] == "not_found"
+        assert fake_google.batch_updates == []
@@ -158,6 +158,204 @@ class TestQueryNeighborhood:
         assert result["relationship_count"] == 0
 
 
+@pytest.fixture(params=[True, False], ids=["adjacency_cache", "recursive_cte"])
+def traversal_mode(request, monkeypatch):
+    """Run traversal tests against both the CSR cache and the SQL CTE path."""
+    import jaybrain.graph as graph_mod
+    monkeypatch.setattr(graph_mod, "GRAPH_ADJACENCY_CACHE", request.param)
+    monkeypatch.setattr(graph_mod, "_adjacency", None)
+    return request.param
+
+
+def _build_chain(names: list[str]) -> None:
+    from jaybrain.graph import add_entity, add_relationship
+    for name in names:
+        add_entity(name, "concept")
+    for a, b in zip(names, names[1:]):
+        add_relationship(a, b, "related_to")
+
+
+class TestTraversalModes:
+    def test_depths_reported(self, temp_data_dir, traversal_mode):
+        _setup_db()
+        from jaybrain.graph import query_neighborhood
+
+        _build_chain(["A", "B", "C", "D"])
+        result = query_neighborhood("A", depth=2)
+        depths = {e["name"]: e["depth"] for e in result["entities"]}
+        assert depths == {"A": 0, "B": 1, "C": 2}
+        # Edges expanded from A and B only; C->D is beyond the horizon
+        assert result["relationship_count"] == 2
+
+    def test_incoming_edges_followed(self, temp_data_dir, traversal_mode):
+        _setup_db()
+        from jaybrain.graph import add_entity, add_relationship, query_neighborhood
+
+        add_entity("Hub", "project")
+        for i in range(5):
+            add_entity(f"Spoke{i}", "tool")
+            add_relationship(f"Spoke{i}", "Hub", "part_of")
+        result = query_neighborhood("Hub", depth=1)
+        assert result["entity_count"] == 6
+        assert result["relationship_count"] == 5
+        assert len({r["id"] for r in result["relationships"]}) == 5
+
+    def test_cycle_does_not_duplicate(self, temp_data_dir, traversal_mode):
+        _setup_db()
+        from jaybrain.graph import add_relationship, query_neighborhood
+
+        _build_chain(["X", "Y", "Z"])
+        add_relationship("Z", "X", "related_to")
+        result = query_neighborhood("X", depth=3)
+        assert result["entity_count"] == 3
+        assert result["relationship_count"] == 3
+
+    def test_depth_clamped_to_max(self, temp_data_dir, traversal_mode):
+        _setup_db()
+        from jaybrain.config import GRAPH_MAX_DEPTH
+        from jaybrain.graph import query_neighborhood
+
+        names = [f"N{i}" for i in range(GRAPH_MAX_DEPTH + 3)]
+        _build_chain(names)
+        result = query_neighborhood("N0", depth=100)
+        assert result["depth"] == GRAPH_MAX_DEPTH
+        assert result["entity_count"] == GRAPH_MAX_DEPTH + 1
+
+    def test_modes_agree(self, temp_data_dir, monkeypatch):
+        _setup_db()
+        import jaybrain.graph as graph_mod
+        from jaybrain.graph import add_relationship, query_neighborhood
+
+        _build_chain(["P", "Q", "R", "S", "T"])
+        add_relationship("P", "S", "depends_on")
+        monkeypatch.setattr(graph_mod, "GRAPH_ADJACENCY_CACHE", True)
+        cached = query_neighborhood("Q", depth=2)
+        monkeypatch.setattr(graph_mod, "GRAPH_ADJACENCY_CACHE", False)
+        sql = query_neighborhood("Q", depth=2)
+        assert cached["entities"] == sql["entities"]
+        assert cached["relationships"] == sql["relationships"]
+
+
+class TestAdjacencyCache:
+    def test_cache_invalidated_on_new_relationship(self, temp_data_dir, monkeypatch):
+        _setup_db()
+        import jaybrain.graph as graph_mod
+        from jaybrain.graph import add_entity, add_relationship, query_neighborhood
+
+        monkeypatch.setattr(graph_mod, "GRAPH_ADJACENCY_CACHE", True)
+        _build_chain(["A", "B"])
+        assert query_neighborhood("A")["entity_count"] == 2
+
+        add_entity("C", "concept")
+        add_relationship("A", "C", "related_to")
+        assert query_neighborhood("A")["entity_count"] == 3
+
+    def test_cache_invalidated_on_entity_delete(self, temp_data_dir, monkeypatch):
+        _setup_db()
+        import jaybrain.graph as graph_mod
+        from jaybrain.db import delete_graph_entity, get_graph_entity_by_name
+        from jaybrain.graph import query_neighborhood
+
+        monkeypatch.setattr(graph_mod, "GRAPH_ADJACENCY_CACHE", True)
+        _build_chain(["A", "B", "C"])
+        assert query_neighborhood("A", depth=2)["entity_count"] == 3
+
+        conn = get_connection()
+        try:
+            delete_graph_entity(conn, get_graph_entity_by_name(conn, "B")["id"])
+        finally:
+            conn.close()
+        result = query_neighborhood("A", depth=2)
+        assert result["entity_count"] == 1
+        assert result["relationship_count"] == 0
+
+    def test_cache_notices_external_writes(self, temp_data_dir, monkeypatch):
+        """Edges written without going through db helpers (another process) are picked up."""
+        _setup_db()
+        import jaybrain.graph as graph_mod
+        from jaybrain.graph import add_entity, query_neighborhood
+
+        monkeypatch.setattr(graph_mod, "GRAPH_ADJACENCY_CACHE", True)
+        _build_chain(["A", "B"])
+        add_entity("C", "concept")
+        assert query_neighborhood("A")["entity_count"] == 2
+
+        conn = get_connection()
+        try:
+            ids = {r["name"]: r["id"] for r in conn.execute("SELECT id, name FROM graph_entities")}
+            conn.execute(
+                """INSERT INTO graph_relationships
+                (id, source_entity_id, target_entity_id, rel_type, properties,
+                 created_at, updated_at)
+                VALUES ('ext1', ?, ?, 'uses', '{}', '2026-01-01', '2026-01-01')""",
+                (ids["A"], ids["C"]),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        assert query_neighborhood("A")["entity_count"] == 3
+
+
+class TestFindPath:
+    def test_shortest_path(self, temp_data_dir, traversal_mode):
+        _setup_db()
+        from jaybrain.graph import add_relationship, find_path
+
+        _build_chain(["A", "B", "C", "D", "E"])
+        add_relationship("B", "D", "depends_on")
+        result = find_path("A", "E")
+        assert result["found"] is True
+        assert result["hops"] == 3
+        assert [e["name"] for e in result["path"]] == ["A", "B", "D", "E"]
+        assert [r["rel_type"] for r in result["relationships"]] == [
+            "related_to", "depends_on", "related_to",
+        ]
+
+    def test_path_ignores_direction(self, temp_data_dir, traversal_mode):
+        _setup_db()
+        from jaybrain.graph import find_path
+
+        _build_chain(["A", "B", "C"])
+        result = find_path("C", "A")
+        assert result["found"] is True
+        assert [e["name"] for e in result["path"]] == ["C", "B", "A"]
+
+    def test_no_path(self, temp_data_dir, traversal_mode):
+        _setup_db()
+        from jaybrain.graph import add_entity, find_path
+
+        _build_chain(["A", "B"])
+        add_entity("Island", "concept")
+        result = find_path("A", "Island")
+        assert result["found"] is False
+        assert result["path"] == []
+
+    def test_max_depth_limits_search(self, temp_data_dir, traversal_mode):
+        _setup_db()
+        from jaybrain.graph import find_path
+
+        _build_chain(["A", "B", "C", "D"])
+        assert find_path("A", "D", max_depth=2)["found"] is False
+        assert find_path("A", "D", max_depth=3)["found"] is True
+
+    def test_same_entity(self, temp_data_dir, traversal_mode):
+        _setup_db()
+        from jaybrain.graph import find_path
+
+        _build_chain(["A", "B"])
+        result = find_path("A", "A")
+        assert result["found"] is True
+        assert result["hops"] == 0
+
+    def test_unknown_entity(self, temp_data_dir, traversal_mode):
+        _setup_db()
+        from jaybrain.graph import find_path
+
+        _build_chain(["A", "B"])
+        assert "error" in find_path("A", "Ghost")
+        assert "error" in find_path("Ghost", "A")
+
+
 class TestSearchEntities:
     def test_search_by_name(self, temp_data_dir):
         _setup_db()
@@ -191,6 +389,121 @@ class TestSearchEntities:
         results = search_entities("ZZZnonexistent")
         assert results == []
 
+    def test_search_matches_alias(self, temp_data_dir):
+        _setup_db()
+        from jaybrain.graph import add_entity, search_entities
+
+        add_entity("PostgreSQL", "tool", aliases=["postgres", "pg"])
+        add_entity("Python", "skill")
+        results = search_entities("gres")
+        assert [e["name"] for e in results] == ["PostgreSQL"]
+
+    def test_name_hits_rank_above_alias_hits(self, temp_data_dir):
+        _setup_db()
+        from jaybrain.graph import add_entity, search_entities
+
+        add_entity("Snake Language", "concept", aliases=["python"])
+        add_entity("Python", "skill")
+        results = search_entities("python")
+        assert [e["name"] for e in results] == ["Python", "Snake Language"]
+
+    def test_search_case_insensitive(self, temp_data_dir):
+        _setup_db()
+        from jaybrain.graph import add_entity, search_entities
+
+        add_entity("JayBrain", "project")
+        assert len(search_entities("JAYBR")) == 1
+
+    def test_short_query_falls_back_to_scan(self, temp_data_dir):
+        _setup_db()
+        from jaybrain.graph import add_entity, search_entities
+
+        add_entity("Go", "skill")
+        add_entity("Django", "tool")
+        names = {e["name"] for e in search_entities("go")}
+        assert names == {"Go", "Django"}
+
+    def test_description_not_searched(self, temp_data_dir):
+        _setup_db()
+        from jaybrain.graph import add_entity, search_entities
+
+        add_entity("Alice", "person", description="Knows Python well")
+        assert search_entities("Python") == []
+
+    def test_index_tracks_updates(self, temp_data_dir):
+        _setup_db()
+        from jaybrain.graph import add_entity, search_entities
+
+        add_entity("Kubernetes", "tool")
+        assert search_entities("k8s") == []
+        add_entity("Kubernetes", "tool", aliases=["k8s"])
+        assert [e["name"] for e in search_entities("k8s")] == ["Kubernetes"]
+
+    def test_index_tracks_deletes(self, temp_data_dir):
+        _setup_db()
+        from jaybrain.db import delete_graph_entity
+        from jaybrain.graph import add_entity, search_entities
+
+        entity = add_entity("Temporary", "concept")["entity"]
+        conn = get_connection()
+        try:
+            delete_graph_entity(conn, entity["id"])
+        finally:
+            conn.close()
+        assert search_entities("Temporary") == []
+
+    def test_fuzzy_finds_typo(self, temp_data_dir):
+        _setup_db()
+        from jaybrain.graph import add_entity, search_entities
+
+        add_entity("Kubernetes", "tool")
+        add_entity("Terraform", "tool")
+        assert search_entities("Kubernets") == []
+        results = search_entities("Kubernets", fuzzy=True)
+        assert [e["name"] for e in results] == ["Kubernetes"]
+        assert 0 < results[0]["similarity"] < 1
+
+    def test_fuzzy_keeps_exact_hits_first(self, temp_data_dir):
+        _setup_db()
+        from jaybrain.graph import add_entity, search_entities
+
+        add_entity("Docker", "tool")
+        add_entity("Docker Compose", "tool")
+        add_entity("Dockerfile Linter", "tool")
+        results = search_entities("Docker", fuzzy=True)
+        assert results[0]["name"] == "Docker"
+        assert all("similarity" not in e for e in results)
+
+
+class TestAliasMerge:
+    def test_name_matching_alias_merges(self, temp_data_dir):
+        _setup_db()
+        from jaybrain.graph import add_entity, get_entities
+
+        add_entity("PostgreSQL", "tool", aliases=["Postgres"])
+        result = add_entity("postgres", "tool", source_memory_ids=["m1"])
+        assert result["status"] == "updated"
+        assert result["matched_alias"] == "postgres"
+        assert result["entity"]["name"] == "PostgreSQL"
+        assert result["entity"]["memory_ids"] == ["m1"]
+        assert len(get_entities()) == 1
+
+    def test_alias_merge_respects_type(self, temp_data_dir):
+        _setup_db()
+        from jaybrain.graph import add_entity
+
+        add_entity("PostgreSQL", "tool", aliases=["postgres"])
+        result = add_entity("postgres", "skill")
+        assert result["status"] == "created"
+
+    def test_partial_alias_does_not_merge(self, temp_data_dir):
+        _setup_db()
+        from jaybrain.graph import add_entity
+
+        add_entity("PostgreSQL", "tool", aliases=["postgres"])
+        result = add_entity("gres", "tool")
+        assert result["status"] == "created"
+
 
 class TestGetEntities:
     def test_list_all(self, temp_data_dir):
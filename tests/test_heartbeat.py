@@ -259,7 +259,7 @@ class TestMigration10:
             tables = {
                 row[0]
                 for row in conn.execute(
-                    "SELECT name FROM sqlite_master WHERE type='table'"
+                    "SELECT name FROM ops.sqlite_master WHERE type='table'"
                 ).fetchall()
             }
             assert "heartbeat_log" in tables
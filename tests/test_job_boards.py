@@ -1,5 +1,7 @@
 """Tests for the job_boards module."""
 
+import threading
+
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -206,6 +208,27 @@ class TestAutoFetchBoards:
         assert "1 job board(s) have new content" in msg
         assert "Board A" in msg
 
+    def test_boards_fetched_in_parallel(self, temp_data_dir):
+        _setup_db(temp_data_dir)
+        for i in range(4):
+            add_board(f"Board {i}", f"https://board{i}.example.com")
+        barrier = threading.Barrier(4, timeout=5)
+
+        def fake_fetch_pages(url, max_pages=0, render="auto"):
+            barrier.wait()  # deadlocks unless all four boards are in flight
+            return self._mock_pages(f"jobs at {url}")
+
+        with patch("jaybrain.scraping.fetch_pages", side_effect=fake_fetch_pages):
+            with patch("jaybrain.telegram.send_telegram_message"):
+                result = auto_fetch_boards()
+
+        assert result["checked"] == 4
+        assert result["changed"] == 4
+        conn = get_connection()
+        rows = conn.execute("SELECT content_hash, last_checked FROM job_boards").fetchall()
+        conn.close()
+        assert all(len(r["content_hash"]) == 64 and r["last_checked"] for r in rows)
+
     def test_updates_content_hash(self, temp_data_dir):
         """content_hash should be stored after fetch."""
         _setup_db(temp_data_dir)
@@ -0,0 +1,267 @@
+"""Tests for the shared LLM call layer, against a local mock Anthropic API."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from jaybrain import llm
+
+
+class MockAnthropic:
+    """Minimal Messages + Message Batches API with scripted failures."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.message_bodies = []
+        self.fail_statuses = []  # consumed one per /v1/messages call
+        self.delay = 0.0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.batches = {}
+        self.batch_polls = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @staticmethod
+    def message(body, text=None):
+        prompt = body["messages"][-1]["content"]
+        return {
+            "id": "msg_test",
+            "type": "message",
+            "role": "assistant",
+            "model": body["model"],
+            "content": [{"type": "text", "text": text or f"echo: {prompt}"}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": 10,
+                "output_tokens": 5,
+                "cache_read_input_tokens": 7,
+                "cache_creation_input_tokens": 0,
+            },
+        }
+
+    def batch(self, batch_id, status):
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": status,
+            "request_counts": {
+                "processing": 0, "succeeded": 0, "errored": 0, "canceled": 0, "expired": 0,
+            },
+            "created_at": "2026-01-01T00:00:00Z",
+            "expires_at": "2026-01-02T00:00:00Z",
+            "ended_at": None,
+            "cancel_initiated_at": None,
+            "archived_at": None,
+            "results_url": (
+                f"{self.url}/v1/messages/batches/{batch_id}/results" if status == "ended" else None
+            ),
+        }
+
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _json(self, status, payload, headers=None):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                if self.path == "/v1/messages":
+                    with api.lock:
+                        api.message_bodies.append(body)
+                        status = api.fail_statuses.pop(0) if api.fail_statuses else None
+                        api.in_flight += 1
+                        api.peak_in_flight = max(api.peak_in_flight, api.in_flight)
+                    try:
+                        time.sleep(api.delay)
+                        if status:
+                            self._json(
+                                status,
+                                {"type": "error", "error": {"type": "overloaded_error", "message": "busy"}},
+                                {"retry-after": "0"},
+                            )
+                        else:
+                            self._json(200, api.message(body))
+                    finally:
+                        with api.lock:
+                            api.in_flight -= 1
+                elif self.path == "/v1/messages/batches":
+                    batch_id = f"msgbatch_{len(api.batches)}"
+                    api.batches[batch_id] = body["requests"]
+                    self._json(200, api.batch(batch_id, "in_progress"))
+                else:
+                    self._json(404, {"type": "error", "error": {"type": "not_found_error", "message": self.path}})
+
+            def do_GET(self):
+                parts = self.path.strip("/").split("/")
+                batch_id = parts[3]
+                if len(parts) == 4:
+                    api.batch_polls += 1
+                    self._json(200, api.batch(batch_id, "ended" if api.batch_polls > 1 else "in_progress"))
+                    return
+                lines = []
+                for req in api.batches[batch_id]:
+                    if "fail" in req["params"]["messages"][-1]["content"]:
+                        result = {"type": "errored", "error": {"type": "error", "error": {
+                            "type": "invalid_request_error", "message": "bad"}}}
+                    else:
+                        result = {"type": "succeeded", "message": api.message(req["params"])}
+                    lines.append(json.dumps({"custom_id": req["custom_id"], "result": result}))
+                data = "\n".join(lines).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/binary")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+
+@pytest.fixture
+def mock_anthropic(monkeypatch):
+    import jaybrain.config as config
+
+    for var in ("HTTP_PROXY", "HTTPS_PROXY", "http_proxy", "https_proxy"):
+        monkeypatch.delenv(var, raising=False)
+    api = MockAnthropic()
+    api.thread.start()
+    monkeypatch.setattr(config, "ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setattr(config, "ANTHROPIC_BASE_URL", api.url)
+    monkeypatch.setattr(config, "LLM_RETRY_BASE_DELAY", 0.01)
+    monkeypatch.setattr(config, "LLM_BATCH_POLL_INTERVAL", 0.0)
+    llm.reset_client()
+    yield api
+    llm.reset_client()
+    api.server.shutdown()
+    api.server.server_close()
+
+
+class TestComplete:
+    def test_round_trip_with_cached_system(self, mock_anthropic):
+        result = llm.complete("static system", "hello", 50, "claude-test")
+        assert result == {
+            "text": "echo: hello",
+            "input_tokens": 10,
+            "output_tokens": 5,
+            "cache_read_tokens": 7,
+            "cache_write_tokens": 0,
+            "model": "claude-test",
+        }
+        body = mock_anthropic.message_bodies[0]
+        assert body["system"] == [{
+            "type": "text", "text": "static system", "cache_control": {"type": "ephemeral"},
+        }]
+
+    def test_retries_429_and_529(self, mock_anthropic):
+        mock_anthropic.fail_statuses = [429, 529]
+        result = llm.complete("sys", "hi", 50, "claude-test")
+        assert result["text"] == "echo: hi"
+        assert len(mock_anthropic.message_bodies) == 3
+
+    def test_gives_up_after_max_retries(self, mock_anthropic, monkeypatch):
+        import anthropic
+        import jaybrain.config as config
+
+        monkeypatch.setattr(config, "LLM_MAX_RETRIES", 1)
+        mock_anthropic.fail_statuses = [529, 529, 529]
+        with pytest.raises(anthropic.APIStatusError):
+            llm.complete("sys", "hi", 50, "claude-test")
+        assert len(mock_anthropic.message_bodies) == 2
+
+    def test_client_errors_not_retried(self, mock_anthropic):
+        import anthropic
+
+        mock_anthropic.fail_statuses = [400]
+        with pytest.raises(anthropic.BadRequestError):
+            llm.complete("sys", "hi", 50, "claude-test")
+        assert len(mock_anthropic.message_bodies) == 1
+
+    def test_missing_api_key(self, monkeypatch):
+        import jaybrain.config as config
+
+        monkeypatch.setattr(config, "ANTHROPIC_API_KEY", "")
+        llm.reset_client()
+        with pytest.raises(RuntimeError, match="ANTHROPIC_API_KEY not set"):
+            llm.get_client()
+
+
+class TestConcurrency:
+    def test_map_concurrent_bounded_and_ordered(self, mock_anthropic, monkeypatch):
+        import jaybrain.config as config
+
+        monkeypatch.setattr(config, "LLM_MAX_CONCURRENCY", 2)
+        mock_anthropic.delay = 0.1
+        prompts = [f"p{i}" for i in range(6)]
+        results = llm.map_concurrent(
+            lambda p: llm.complete("sys", p, 20, "claude-test")["text"], prompts, max_workers=6,
+        )
+        assert results == [f"echo: {p}" for p in prompts]
+        assert mock_anthropic.peak_in_flight == 2
+
+
+class TestCompleteBatch:
+    def test_batch_results_in_order(self, mock_anthropic):
+        requests = [
+            {"system": "sys", "prompt": "first", "max_tokens": 20, "model": "claude-test"},
+            {"system": "sys", "prompt": "please fail", "max_tokens": 20, "model": "claude-test"},
+            {"system": "sys", "prompt": "third", "max_tokens": 20, "model": "claude-test"},
+        ]
+        results = llm.complete_batch(requests)
+        assert results[0]["text"] == "echo: first"
+        assert results[2]["text"] == "echo: third"
+        assert results[2]["cache_read_tokens"] == 7
+        assert "error" in results[1]
+        submitted = mock_anthropic.batches["msgbatch_0"]
+        assert submitted[0]["params"]["system"][0]["cache_control"] == {"type": "ephemeral"}
+
+    def test_batch_timeout(self, mock_anthropic, monkeypatch):
+        monkeypatch.setattr(mock_anthropic, "batch_polls", -1000)
+        with pytest.raises(TimeoutError):
+            llm.complete_batch(
+                [{"system": "s", "prompt": "p", "max_tokens": 5, "model": "m"}],
+                poll_interval=0.01, timeout=0.05,
+            )
+
+
+class TestSignalForgeSynthesis:
+    def _cluster(self, i):
+        return {
+            "cluster_id": f"c{i}",
+            "label": f"Story {i}",
+            "significance": 3.0,
+            "article_count": 1,
+            "articles": [{"title": f"T{i}", "source": "src", "text": "body"}],
+        }
+
+    def test_clusters_synthesized_concurrently(self, mock_anthropic):
+        from jaybrain.signalforge import _synthesize_clusters
+
+        mock_anthropic.delay = 0.1
+        results = _synthesize_clusters([self._cluster(i) for i in range(4)])
+        assert [r["cluster_id"] for r in results] == ["c0", "c1", "c2", "c3"]
+        assert all("error" not in r for r in results)
+        assert mock_anthropic.peak_in_flight > 1
+
+    def test_clusters_via_batch(self, mock_anthropic):
+        from jaybrain.signalforge import _synthesize_clusters
+
+        results = _synthesize_clusters([self._cluster(i) for i in range(3)], batch=True)
+        assert [r["label"] for r in results] == ["Story 0", "Story 1", "Story 2"]
+        assert mock_anthropic.message_bodies == []
+        assert len(mock_anthropic.batches["msgbatch_0"]) == 3
@@ -0,0 +1,199 @@
+"""Tests for incremental database maintenance (WAL checkpoints, vacuum slices)."""
+
+import json
+import sqlite3
+
+import pytest
+
+import jaybrain.maintenance as maint
+from jaybrain.config import ensure_data_dirs
+from jaybrain.db import get_connection, init_db
+
+
+def _setup():
+    ensure_data_dirs()
+    init_db()
+
+
+def _churn(rows=400):
+    """Insert then delete enough rows to leave free pages behind."""
+    conn = get_connection()
+    try:
+        conn.executemany(
+            "INSERT INTO heartbeat_log (check_name, message, checked_at) VALUES ('c', ?, '2026')",
+            [("x" * 2000,)] * rows,
+        )
+        conn.commit()
+        conn.execute("DELETE FROM heartbeat_log")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+class TestIncrementalVacuum:
+    def test_new_databases_use_incremental_auto_vacuum(self, temp_data_dir):
+        _setup()
+        conn = get_connection()
+        try:
+            assert conn.execute("PRAGMA main.auto_vacuum").fetchone()[0] == 2
+            assert conn.execute("PRAGMA ops.auto_vacuum").fetchone()[0] == 2
+        finally:
+            conn.close()
+
+    def test_reclaims_in_bounded_slices(self, temp_data_dir, monkeypatch):
+        _setup()
+        _churn()
+        monkeypatch.setattr(maint, "MAINT_VACUUM_SLICE_PAGES", 10)
+        conn = get_connection()
+        try:
+            free = conn.execute("PRAGMA ops.freelist_count").fetchone()[0]
+            assert free > 30
+            assert maint.incremental_vacuum(conn, "ops", max_slices=2) == 20
+            assert maint.incremental_vacuum(conn, "ops", max_slices=None) == free - 20
+            assert conn.execute("PRAGMA ops.freelist_count").fetchone()[0] == 0
+        finally:
+            conn.close()
+
+    def test_reclaim_converts_legacy_database_once(self, temp_data_dir):
+        import jaybrain.db as db_mod
+
+        # A pre-existing file created without auto_vacuum
+        legacy = sqlite3.connect(str(db_mod.DB_PATH))
+        legacy.execute("PRAGMA journal_mode=WAL")
+        legacy.execute("CREATE TABLE legacy (x)")
+        legacy.commit()
+        legacy.close()
+        _setup()
+
+        first = maint.reclaim_free_pages()
+        second = maint.reclaim_free_pages()
+        assert first["main"] == {
+            "mode": "converted_to_incremental", "fts_rebuilt": sorted(maint.FTS_TABLES),
+        }
+        assert second["main"]["mode"] == "incremental"
+        assert second["ops"]["mode"] == "incremental"
+
+
+class TestCheckpoint:
+    def test_thresholds_pick_mode(self, temp_data_dir, monkeypatch):
+        _setup()
+        conn = get_connection()
+        try:
+            conn.execute("INSERT INTO heartbeat_log (check_name, checked_at) VALUES ('c', '2026')")
+            conn.commit()
+            monkeypatch.setattr(maint, "MAINT_WAL_PASSIVE_BYTES", 10**12)
+            monkeypatch.setattr(maint, "MAINT_WAL_TRUNCATE_BYTES", 10**12)
+            assert maint.checkpoint(conn, "ops")["mode"] == ""
+
+            monkeypatch.setattr(maint, "MAINT_WAL_PASSIVE_BYTES", 1)
+            assert maint.checkpoint(conn, "ops")["mode"] == "PASSIVE"
+
+            monkeypatch.setattr(maint, "MAINT_WAL_TRUNCATE_BYTES", 1)
+            result = maint.checkpoint(conn, "ops")
+            assert result["mode"] == "TRUNCATE"
+            assert result["busy"] is False
+            assert result["wal_bytes_after"] == 0
+        finally:
+            conn.close()
+
+
+class TestRunDbMaintenance:
+    def test_logs_metrics_and_rotates_quick_check(self, temp_data_dir, monkeypatch):
+        _setup()
+        _churn()
+        monkeypatch.setattr(maint, "MAINT_WAL_PASSIVE_BYTES", 1)
+
+        first = maint.run_db_maintenance()
+        second = maint.run_db_maintenance()
+
+        assert set(first) == {"main", "ops"}
+        assert first["ops"]["pages_vacuumed"] > 0
+        assert first["ops"]["checkpoint"]["mode"] in ("PASSIVE", "TRUNCATE")
+        assert first["main"]["optimized"] and not second["main"]["optimized"]
+        assert first["main"]["quick_check_result"] == "ok"
+        assert not set(first["main"]["quick_checked"]) & set(second["main"]["quick_checked"])
+
+        conn = get_connection()
+        try:
+            rows = conn.execute(
+                "SELECT schema_name, quick_checked FROM db_maintenance_log ORDER BY id"
+            ).fetchall()
+            status = maint.maintenance_status(conn)
+        finally:
+            conn.close()
+        assert [r["schema_name"] for r in rows] == ["main", "ops", "main", "ops"]
+        assert len(json.loads(rows[0]["quick_checked"])) == 2
+        assert status["ops"]["last_24h"]["runs"] == 2
+        assert status["main"]["quick_check_result"] == "ok"
+
+    def test_finishes_interrupted_fts_rebuild(self, temp_data_dir, monkeypatch):
+        from jaybrain import db
+
+        def killed(*args):
+            raise KeyboardInterrupt
+
+        _setup()
+        conn = get_connection()
+        try:
+            db.insert_knowledge(conn, "k0", "title0", "body0", "general", [], "")
+            with monkeypatch.context() as m:
+                m.setattr(db, "_copy_fts_chunks", killed)  # dies after setup
+                with pytest.raises(KeyboardInterrupt):
+                    db.rebuild_fts_table(conn, "knowledge_fts")
+            assert conn.execute("SELECT COUNT(*) FROM fts_rebuild_state").fetchone()[0] == 1
+        finally:
+            conn.close()
+
+        result = maint.run_db_maintenance()
+
+        assert result["main"]["fts_resumed"] == {"knowledge_fts": 1}
+        assert "fts_resumed" not in maint.run_db_maintenance()["main"]
+
+    def test_daemon_status_reports_maintenance(self, temp_data_dir):
+        from jaybrain.daemon import DaemonManager, get_daemon_status
+
+        _setup()
+        maint.run_db_maintenance()
+        DaemonManager()._write_heartbeat()
+
+        status = get_daemon_status()
+        assert {"main", "ops"} == set(status["db_maintenance"])
+        assert "free_pages" in status["db_maintenance"]["main"]
+
+
+class TestRebuildFts:
+    def test_rebuild_reports_size_and_applies_detail(self, temp_data_dir):
+        from jaybrain.db import insert_knowledge
+
+        _setup()
+        conn = get_connection()
+        for i in range(50):
+            insert_knowledge(conn, f"k{i}", f"note {i}", "packet capture filters " * 20,
+                             "general", [], "")
+        conn.close()
+
+        result = maint.rebuild_fts("knowledge_fts", detail="column")
+        stats = result["knowledge_fts"]
+        assert stats["rows"] == 50 and stats["detail"] == "column"
+        assert stats["bytes_after"] < stats["bytes_before"]
+
+        full = maint.rebuild_fts()
+        assert set(full) == set(maint.FTS_TABLES)
+        assert full["knowledge_fts"]["detail"] == "full"
+
+    def test_unknown_table(self, temp_data_dir):
+        _setup()
+        with pytest.raises(ValueError, match="Unknown FTS table"):
+            maint.rebuild_fts("nope_fts")
+
+
+class TestForgeMaintenance:
+    def test_run_maintenance_uses_incremental_vacuum(self, temp_data_dir):
+        from jaybrain.forge import run_maintenance
+
+        _setup()
+        _churn()
+        result = run_maintenance()
+        assert result["integrity_check"] == "ok"
+        assert result["vacuum"]["ops"]["mode"] == "incremental"
+        assert result["vacuum"]["ops"]["pages"] > 0
@@ -6,9 +6,13 @@ from unittest.mock import patch
 import pytest
 
 from jaybrain.config import ensure_data_dirs
+import numpy as np
+
 from jaybrain.db import init_db, get_connection, insert_memory, get_memories_batch
-from jaybrain.db import fts5_safe_query
-from jaybrain.memory import compute_decay, _write_memory_markdown, _parse_memory_row
+from jaybrain.db import fts5_safe_query, get_memories_for_ranking
+from jaybrain.memory import (
+    compute_decay, compute_decay_batch, recall, _write_memory_markdown, _parse_memory_row,
+)
 from jaybrain.models import Memory, MemoryCategory
 
 
@@ -101,6 +105,27 @@ class TestComputeDecay:
         decay = compute_decay(ancient, importance=0.0, access_count=0, now=now)
         assert decay >= 0.05
 
+    def test_batch_matches_scalar(self):
+        """Vectorized decay gives the same value as compute_decay per row."""
+        now = datetime.now(timezone.utc)
+        cases = [
+            (now, 0.5, 0, None),
+            (now - timedelta(days=30), 1.0, 3, None),
+            (now - timedelta(days=365), 0.2, 1, now - timedelta(days=5)),
+            (now - timedelta(days=10), 0.7, 200, now - timedelta(days=20)),
+            (now - timedelta(days=5000), 0.0, 0, None),
+            (now + timedelta(days=1), 0.5, 0, None),
+        ]
+        batch = compute_decay_batch(
+            np.array([c[0].timestamp() for c in cases]),
+            np.array([c[1] for c in cases]),
+            np.array([c[2] for c in cases]),
+            np.array([c[3].timestamp() if c[3] else np.nan for c in cases]),
+            now.timestamp(),
+        )
+        expected = [compute_decay(c, i, n, a, now) for c, i, n, a in cases]
+        assert batch == pytest.approx(expected, rel=1e-9)
+
 
 class TestFts5SafeQuery:
     def test_simple_query(self):
@@ -263,3 +288,73 @@ class TestDatabaseOperations:
             assert "nope" not in result
         finally:
             conn.close()
+
+    def test_ranking_rows_have_epoch_times(self, temp_data_dir):
+        ensure_data_dirs()
+        init_db()
+        conn = get_connection()
+        try:
+            insert_memory(conn, "r1", "Ranked memory", "semantic", ["a"], 0.4)
+            conn.execute(
+                "UPDATE memories SET created_at = '2026-01-01T12:00:00.250000+02:00', "
+                "last_accessed = '2026-01-02T00:00:00' WHERE id = 'r1'"
+            )
+            row = get_memories_for_ranking(conn, ["r1", "nope"])["r1"]
+        finally:
+            conn.close()
+        assert "content" not in row.keys()
+        created = datetime.fromisoformat("2026-01-01T12:00:00.250000+02:00")
+        accessed = datetime(2026, 1, 2, tzinfo=timezone.utc)
+        assert row["created_ts"] == pytest.approx(created.timestamp(), abs=1e-3)
+        assert row["accessed_ts"] == pytest.approx(accessed.timestamp(), abs=1e-3)
+        assert row["importance"] == 0.4 and row["access_count"] == 0
+
+
+class TestRecall:
+    """Ranking runs on lightweight rows; only the top results become models."""
+
+    def _seed(self):
+        ensure_data_dirs()
+        init_db()
+        conn = get_connection()
+        try:
+            now = datetime.now(timezone.utc)
+            for mid, importance, age_days, tags in [
+                ("old", 1.0, 400, ["x"]), ("mid", 0.5, 10, ["y"]),
+                ("new", 1.0, 0, ["x"]), ("low", 0.0, 0, ["y"]),
+            ]:
+                insert_memory(conn, mid, f"zebra fact {mid}", "semantic", tags, importance)
+                conn.execute(
+                    "UPDATE memories SET created_at = ? WHERE id = ?",
+                    ((now - timedelta(days=age_days)).isoformat(), mid),
+                )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _recall(self, **kwargs):
+        # Fixed search scores, so the order comes from decay alone
+        merged = [("old", 1.0), ("mid", 0.9), ("new", 0.8), ("low", 0.7)]
+        with patch("jaybrain.memory.embed_text", side_effect=RuntimeError("no model")), \
+                patch("jaybrain.memory.hybrid_search", return_value=merged):
+            return recall("zebra", **kwargs)
+
+    def test_top_limit_ordered_by_decayed_score(self, temp_data_dir):
+        self._seed()
+        results = self._recall(limit=2)
+
+        assert [r.memory.id for r in results] == ["new", "mid"]
+        assert [r.score for r in results] == [0.8, pytest.approx(0.625, abs=1e-3)]
+        # Models reflect the rows as found, before this recall's access bump
+        assert all(r.memory.access_count == 0 for r in results)
+        conn = get_connection()
+        try:
+            counts = dict(conn.execute("SELECT id, access_count FROM memories").fetchall())
+        finally:
+            conn.close()
+        assert counts == {"old": 1, "mid": 1, "new": 1, "low": 1}
+
+    def test_tag_filter(self, temp_data_dir):
+        self._seed()
+        results = self._recall(tags=["x"])
+        assert [r.memory.id for r in results] == ["new", "old"]
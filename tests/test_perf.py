@@ -0,0 +1,176 @@
+"""Tests for opt-in latency instrumentation and the perf_report rollups."""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+import jaybrain.config as config
+from jaybrain import perf
+from jaybrain.db import get_connection, init_db
+
+
+@pytest.fixture
+def perf_on(monkeypatch):
+    init_db()
+    perf.reset()
+    monkeypatch.setattr(config, "PERF_ENABLED", True)
+    yield
+    perf.reset()
+
+
+def _rows(kind):
+    conn = get_connection()
+    try:
+        return {
+            r["name"]: r for r in conn.execute(
+                "SELECT * FROM perf_rollups WHERE kind = ?", (kind,)
+            )
+        }
+    finally:
+        conn.close()
+
+
+class TestHistogram:
+    def test_percentiles_within_bucket_error(self):
+        buckets = [0] * perf._NBUCKETS
+        for ms in range(1, 101):
+            buckets[perf._bucket(float(ms))] += 1
+        assert perf.percentile(buckets, 0.50) == pytest.approx(50, rel=0.25)
+        assert perf.percentile(buckets, 0.95) == pytest.approx(95, rel=0.25)
+        assert perf.percentile(buckets, 0.99) == pytest.approx(99, rel=0.25)
+        assert perf.percentile([0] * perf._NBUCKETS, 0.5) is None
+
+    def test_bucket_edges(self):
+        assert perf._bucket(0.0) == 0
+        assert perf._bucket(perf._BOUNDS[3]) == 3
+        assert perf._bucket(perf._BOUNDS[3] * 1.01) == 4
+        assert perf._bucket(1e9) == perf._NBUCKETS - 1
+
+
+class TestRecording:
+    def test_disabled_is_noop(self):
+        perf.reset()
+        perf.record("tool", "recall", 5.0)
+        with perf.timer("embed", "embed_text"):
+            pass
+        assert perf._agg == {}
+        conn = get_connection()
+        try:
+            assert not isinstance(conn, perf.TimedConnection)
+        finally:
+            conn.close()
+
+    def test_sql_and_lock_timings(self, perf_on):
+        conn = get_connection()
+        try:
+            assert isinstance(conn, perf.TimedConnection)
+            conn.execute("CREATE TABLE IF NOT EXISTS t (x)")
+            conn.execute("INSERT INTO t VALUES (?)", (1,))
+            conn.commit()
+            conn.execute("SELECT   x\n  FROM t").fetchall()
+        finally:
+            conn.close()
+        assert perf.flush() > 0
+
+        sql = _rows("sql")
+        assert "SELECT x FROM t" in sql
+        assert "INSERT INTO t VALUES (?)" in sql
+        lock = _rows("lock")
+        assert lock["commit"]["count"] >= 1
+        assert lock["write_begin"]["count"] >= 1
+
+    def test_flush_merges_into_existing_rollup(self, perf_on):
+        perf.record("tool", "recall", 2.0)
+        perf.flush()
+        perf.record("tool", "recall", 8.0)
+        perf.flush()
+        row = _rows("tool")["recall"]
+        assert row["count"] == 2
+        assert row["total_ms"] == pytest.approx(10.0)
+        assert row["max_ms"] == pytest.approx(8.0)
+        assert sum(json.loads(row["buckets"])) == 2
+
+    def test_tool_and_embed_hooks(self, perf_on, monkeypatch):
+        from jaybrain import search, tool_exec
+
+        monkeypatch.setattr(search, "_embed_text", lambda text: [0.0])
+        search.embed_text("hello")
+
+        @tool_exec.offload("db")
+        def quick() -> str:
+            return "ok"
+
+        assert asyncio.run(quick()) == "ok"
+        perf.flush()
+        assert _rows("embed")["embed_text"]["count"] == 1
+        assert _rows("tool")["quick"]["count"] == 1
+
+    def test_snapshot_merges_unflushed_samples(self, perf_on):
+        perf.record("lock", "commit", 2.0)
+        perf.record("lock", "commit", 6.0)
+        perf.record("tool", "recall", 1.0)
+        snap = perf.snapshot("lock")
+        assert set(snap) == {"commit"}
+        assert snap["commit"]["count"] == 2
+        assert snap["commit"]["max_ms"] == pytest.approx(6.0)
+        assert set(perf.snapshot()) == {"lock:commit", "tool:recall"}
+
+
+class TestReport:
+    def _insert(self, period, kind, name, samples_ms):
+        buckets = [0] * perf._NBUCKETS
+        for ms in samples_ms:
+            buckets[perf._bucket(ms)] += 1
+        conn = get_connection()
+        try:
+            conn.execute(
+                "INSERT INTO perf_rollups (period, kind, name, count, total_ms, max_ms, buckets) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (period, kind, name, len(samples_ms), sum(samples_ms),
+                 max(samples_ms), json.dumps(buckets)),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def test_report_percentiles_and_slowest_queries(self, perf_on):
+        now = perf._period()
+        self._insert(now, "sql", "SELECT fast", [1.0] * 50)
+        self._insert(now, "sql", "SELECT slow", [200.0] * 5)
+        self._insert(now, "tool", "recall", [10.0] * 30)
+
+        result = perf.report()
+        assert result["enabled"] is True
+        assert result["kinds"]["tool"]["count"] == 30
+        assert result["kinds"]["tool"]["p50_ms"] == pytest.approx(10, rel=0.25)
+        names = [q["name"] for q in result["slowest_queries"]]
+        assert names[0] == "SELECT slow"
+        assert "SELECT fast" in names
+
+        only_tools = perf.report(kind="tool")
+        assert set(only_tools["kinds"]) == {"tool"}
+
+    def test_regression_vs_last_week(self, perf_on):
+        self._insert(perf._period(), "tool", "recall", [50.0] * 30)
+        self._insert(perf._period(), "tool", "stats", [5.0] * 30)
+        week_ago = perf._period(time.time() - 7 * 86400)
+        self._insert(week_ago, "tool", "recall", [10.0] * 30)
+        self._insert(week_ago, "tool", "stats", [5.0] * 30)
+
+        regressions = perf.report()["regressions"]
+        assert [r["name"] for r in regressions] == ["recall"]
+        assert regressions[0]["ratio"] > 3
+
+    def test_unknown_kind(self, perf_on):
+        with pytest.raises(ValueError, match="Unknown kind"):
+            perf.report(kind="gpu")
+
+    def test_stats_tool_includes_perf(self, perf_on):
+        from jaybrain.server import stats
+
+        perf.record("tool", "recall", 3.0)
+        result = json.loads(asyncio.run(stats()))
+        assert result["perf"]["enabled"] is True
+        assert "tool" in result["perf"]["kinds"]
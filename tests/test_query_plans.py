@@ -0,0 +1,80 @@
+"""Tests for the EXPLAIN QUERY PLAN regression check (benchmarks/query_plans.py)."""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.query_plans import (  # noqa: E402
+    check_query_plans,
+    explain,
+    extract_queries,
+    scratch_database,
+    suggest_index,
+)
+
+
+class TestExtraction:
+    def test_literal_and_fstring_queries(self, tmp_path):
+        src = tmp_path / "mod.py"
+        src.write_text(
+            "def count(conn, ids):\n"
+            "    placeholders = ','.join('?' * len(ids))\n"
+            "    conn.execute(f'SELECT COUNT(*) FROM t WHERE k IN ({placeholders})', ids)\n"
+            "    conn.execute('CREATE TABLE x (a)')\n"
+            "    conn.execute('UPDATE t SET a = ? ' 'WHERE k = ?', (1, 2))\n"
+            "    conn.execute(sql)\n"
+        )
+        queries = extract_queries([src])
+        assert [(q.function, q.sql) for q in queries] == [
+            ("count", "SELECT COUNT(*) FROM t WHERE k IN (?)"),
+            ("count", "UPDATE t SET a = ? WHERE k = ?"),
+        ]
+
+
+class TestAdvisor:
+    COLUMNS = {"subject_id", "reviewed_at", "concept_id", "rating"}
+
+    def test_equality_then_range_then_order(self):
+        sql = ("SELECT * FROM forge_reviews WHERE subject_id = ? AND reviewed_at >= ? "
+               "ORDER BY rating DESC")
+        assert suggest_index(sql, "forge_reviews", self.COLUMNS) == (
+            "CREATE INDEX IF NOT EXISTS idx_forge_reviews_subject_id_reviewed_at_rating "
+            "ON forge_reviews(subject_id, reviewed_at, rating)"
+        )
+
+    def test_alias_and_other_tables_columns(self):
+        sql = ("SELECT * FROM forge_reviews fr JOIN forge_concepts c ON c.id = fr.concept_id "
+               "WHERE c.rating = ? AND fr.subject_id = ?")
+        assert suggest_index(sql, "forge_reviews", self.COLUMNS, "fr").endswith(
+            "ON forge_reviews(subject_id)"
+        )
+        assert suggest_index("SELECT * FROM forge_reviews WHERE note LIKE ?",
+                             "forge_reviews", self.COLUMNS) is None
+
+
+class TestPlans:
+    def test_no_new_full_scans(self, tmp_path):
+        report = check_query_plans(data_dir=tmp_path / "plans")
+        assert report.explained > 300
+        new = [f"{s.key}: {s.query.normalized[:120]}" for s in report.new]
+        assert new == [], "new full table scans; add an index or update the baseline"
+
+    def test_hot_queries_use_new_indexes(self, tmp_path):
+        with scratch_database(tmp_path / "plans") as conn:
+            plans = {
+                "news": explain(conn, "SELECT COUNT(DISTINCT nfa.source_id) FROM "
+                                      "news_feed_articles nfa WHERE nfa.knowledge_id IN (?, ?)"),
+                "readiness": explain(conn, "SELECT COUNT(DISTINCT concept_id) FROM forge_reviews "
+                                           "WHERE subject_id = ? AND reviewed_at >= ?"),
+                "pulse": explain(conn, "SELECT * FROM claude_sessions "
+                                       "ORDER BY last_heartbeat DESC LIMIT 20"),
+                "latest_session": explain(conn, "SELECT * FROM sessions "
+                                                "ORDER BY started_at DESC LIMIT 1"),
+            }
+        assert any("idx_news_feed_articles_knowledge" in d for d in plans["news"])
+        assert any("idx_forge_reviews_subject_date" in d for d in plans["readiness"])
+        assert any("idx_claude_sessions_heartbeat" in d for d in plans["pulse"])
+        assert any("idx_sessions_started_at" in d for d in plans["latest_session"])
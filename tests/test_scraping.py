@@ -1,12 +1,21 @@
 """Tests for the enhanced scraping module."""
 
+import gzip
+import sys
+import threading
+import time
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 
+import jaybrain.scraping as scraping
 from jaybrain.scraping import (
     should_render,
     extract_clean_text,
     extract_metadata,
     discover_next_page,
+    fetch_page,
 )
 
 
@@ -243,3 +252,278 @@ class TestDiscoverNextPage:
         </body></html>"""
         result = discover_next_page(html, "https://example.com/jobs")
         assert result == "https://example.com/jobs?offset=20"
+
+
+# --- Fetching ---
+
+_ARTICLE = "<html><body><main>" + "<p>Plenty of readable static text.</p>" * 20 + "</main></body></html>"
+
+
+class _Site:
+    """Local HTTP/1.1 server: gzip pages, scripted 503s, client port tracking."""
+
+    def __init__(self):
+        self.fail_next = 0
+        self.retry_after = "0"
+        self.client_ports = set()
+        self.requests = 0
+        self.paths = []
+        self.last_page = 5
+        self.delay = 0.0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.lock = threading.Lock()
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with site.lock:
+                    site.requests += 1
+                    site.paths.append(self.path)
+                    site.client_ports.add(self.client_address[1])
+                    site.in_flight += 1
+                    site.peak_in_flight = max(site.peak_in_flight, site.in_flight)
+                try:
+                    time.sleep(site.delay)
+                    self._respond()
+                finally:
+                    with site.lock:
+                        site.in_flight -= 1
+
+            def _respond(self):
+                if site.fail_next:
+                    site.fail_next -= 1
+                    self.send_response(503)
+                    self.send_header("Retry-After", site.retry_after)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                html = _ARTICLE
+                if self.path.startswith("/list"):
+                    page = int(self.path.rsplit("=", 1)[1]) if "page=" in self.path else 1
+                    nav = f'<a href="/list?page={page + 1}">Next</a>' if page < site.last_page else ""
+                    html = html.replace("</main>", f"<p>Page {page}</p></main>{nav}")
+                body = gzip.compress(html.encode())
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+
+@pytest.fixture
+def site(monkeypatch):
+    import jaybrain.config as config
+
+    for var in ("HTTP_PROXY", "HTTPS_PROXY", "http_proxy", "https_proxy"):
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.setattr(config, "SSRF_ALLOWED_HOSTS", {"127.0.0.1"})
+    monkeypatch.setattr(scraping, "SCRAPE_RETRY_BACKOFF", 0.0)
+    scraping.reset_session()
+    s = _Site()
+    yield s
+    scraping.reset_session()
+    s.server.shutdown()
+    s.server.server_close()
+
+
+class TestFetchPage:
+    def test_session_reuses_connection(self, site):
+        for i in range(3):
+            result = fetch_page(f"{site.url}/jobs?page={i}", render="never")
+            assert "readable static text" in result["html"]  # gzip decoded
+            assert result["fetch_ms"] is not None
+            assert result["render_ms"] is None
+        assert len(site.client_ports) == 1
+
+    def test_retries_transient_errors(self, site):
+        site.fail_next = 2
+        result = fetch_page(f"{site.url}/jobs", render="never")
+        assert result["status_code"] == 200
+        assert site.requests == 3
+
+    def test_long_retry_after_is_capped(self, site, monkeypatch):
+        monkeypatch.setattr(scraping, "SCRAPE_RETRY_AFTER_MAX", 0.2)
+        site.fail_next = 1
+        site.retry_after = "21600"
+        started = time.monotonic()
+        result = fetch_page(f"{site.url}/jobs", render="never")
+        assert result["status_code"] == 200
+        assert 0.2 <= time.monotonic() - started < 2
+
+    def test_gives_up_after_retries(self, site):
+        import requests
+
+        site.fail_next = 10
+        with pytest.raises(requests.HTTPError):
+            fetch_page(f"{site.url}/jobs", render="never")
+        assert site.requests == scraping.SCRAPE_MAX_RETRIES + 1
+
+
+class TestPrefetch:
+    def test_predicts_page_counter(self):
+        assert scraping._predict_next_urls(
+            "https://x.com/jobs?q=py", "https://x.com/jobs?q=py&page=2", 2,
+        ) == ["https://x.com/jobs?q=py&page=3", "https://x.com/jobs?q=py&page=4"]
+
+    def test_unpredictable_links(self):
+        predict = scraping._predict_next_urls
+        assert predict("https://x.com/jobs", "https://x.com/jobs?cursor=abc", 2) == []
+        assert predict("https://x.com/jobs?page=2", "https://x.com/jobs?page=4", 2) == []
+        assert predict("https://x.com/a?page=1", "https://x.com/b?page=2", 2) == []
+        assert predict("https://x.com/a?page=1&q=x", "https://x.com/a?page=2&q=y", 2) == []
+
+    def test_prefetched_pages_match_serial_crawl(self, site, monkeypatch):
+        monkeypatch.setattr(scraping, "SCRAPE_PREFETCH_PAGES", 2)
+        site.delay = 0.05
+        pages = scraping.fetch_pages(f"{site.url}/list?page=1", max_pages=4, render="never")
+        assert [p["page_url"].split("?")[1] for p in pages] == [
+            "page=1", "page=2", "page=3", "page=4",
+        ]
+        assert [f"Page {i}" in p["text"] for i, p in zip(range(1, 5), pages)] == [True] * 4
+        assert [p["prefetched"] for p in pages] == [False, True, True, True]
+        assert site.peak_in_flight >= 2
+        # Never fetched beyond max_pages
+        assert sorted(site.paths) == [f"/list?page={i}" for i in range(1, 5)]
+
+    def test_stops_at_last_page(self, site):
+        site.last_page = 2
+        pages = scraping.fetch_pages(f"{site.url}/list?page=1", max_pages=5, render="never")
+        assert len(pages) == 2
+
+    def test_per_domain_limit(self, site, monkeypatch):
+        monkeypatch.setattr(scraping, "SCRAPE_PER_DOMAIN_CONCURRENCY", 1)
+        monkeypatch.setattr(scraping, "_domain_slots", {})
+        site.delay = 0.05
+        pages = scraping.fetch_pages(f"{site.url}/list?page=1", max_pages=4, render="never")
+        assert len(pages) == 4
+        assert site.peak_in_flight == 1
+
+
+# --- Browser pool ---
+
+
+class _FakePlaywright:
+    """Stands in for playwright.sync_api and records browser lifecycle."""
+
+    def __init__(self):
+        self.launches = 0
+        self.contexts = []
+        self.closed = []
+        self.threads = set()
+        self.routes = []
+
+    def module(self):
+        fake = self
+        mod = types.ModuleType("playwright.sync_api")
+
+        class Page:
+            def goto(self, url, **kwargs):
+                fake.threads.add(threading.get_ident())
+                self.url = url
+
+            def content(self):
+                return f"<html>rendered {self.url}</html>"
+
+            def close(self):
+                pass
+
+        class Context:
+            def __init__(self):
+                fake.contexts.append(self)
+
+            def new_page(self):
+                return Page()
+
+            def route(self, pattern, handler):
+                fake.routes.append(handler)
+
+            def clear_cookies(self):
+                pass
+
+            def close(self):
+                fake.closed.append("context")
+
+        class Browser:
+            def new_context(self, **kwargs):
+                return Context()
+
+            def close(self):
+                fake.closed.append("browser")
+
+        class Driver:
+            chromium = types.SimpleNamespace(launch=lambda **kw: fake._launch(Browser))
+
+            def stop(self):
+                fake.closed.append("driver")
+
+        mod.sync_playwright = lambda: types.SimpleNamespace(start=Driver)
+        return mod
+
+    def _launch(self, browser_cls):
+        self.launches += 1
+        return browser_cls()
+
+
+@pytest.fixture
+def fake_playwright(monkeypatch):
+    fake = _FakePlaywright()
+    monkeypatch.setitem(sys.modules, "playwright", types.ModuleType("playwright"))
+    monkeypatch.setitem(sys.modules, "playwright.sync_api", fake.module())
+    pool = scraping._BrowserPool()
+    monkeypatch.setattr(scraping, "_browser_pool", pool)
+    yield fake
+    pool.close()
+
+
+class TestBrowserPool:
+    def test_browser_and_context_reused(self, fake_playwright):
+        for i in range(3):
+            html = scraping._render_with_playwright(f"https://example.com/{i}")
+            assert html == f"<html>rendered https://example.com/{i}</html>"
+        assert fake_playwright.launches == 1
+        assert len(fake_playwright.contexts) == 1
+        assert len(fake_playwright.threads) == 1  # all Playwright calls on one thread
+
+    def test_resource_blocking_uses_own_context(self, fake_playwright):
+        scraping._render_with_playwright("https://example.com/a", block_resources=True)
+        scraping._render_with_playwright("https://example.com/b", block_resources=False)
+        assert len(fake_playwright.contexts) == 2
+        assert len(fake_playwright.routes) == 1
+
+        aborted = []
+        route = types.SimpleNamespace(
+            request=types.SimpleNamespace(resource_type="image"),
+            abort=lambda: aborted.append(True),
+            continue_=lambda: None,
+        )
+        fake_playwright.routes[0](route)
+        assert aborted == [True]
+
+    def test_idle_browser_reaped(self, fake_playwright, monkeypatch):
+        monkeypatch.setattr(scraping, "SCRAPE_BROWSER_IDLE_SECONDS", 0.1)
+        scraping._render_with_playwright("https://example.com/")
+        deadline = time.time() + 5
+        while time.time() < deadline and "driver" not in fake_playwright.closed:
+            time.sleep(0.05)
+        assert fake_playwright.closed == ["context", "browser", "driver"]
+
+        scraping._render_with_playwright("https://example.com/again")
+        assert fake_playwright.launches == 2
+
+    def test_unavailable_returns_none(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "playwright.sync_api", None)
+        pool = scraping._BrowserPool()
+        monkeypatch.setattr(scraping, "_browser_pool", pool)
+        assert scraping._render_with_playwright("https://example.com/") is None
+        pool.close()
@@ -1435,6 +1435,53 @@ class TestRunSynthesis:
         conn.close()
         assert old is None
 
+    def test_force_reuses_unchanged_cluster_summaries(self, temp_data_dir):
+        from jaybrain.signalforge import get_synthesis_status, run_signalforge_synthesis
+
+        self._setup_clusters(temp_data_dir)
+
+        def _run(*responses):
+            mock_client = MagicMock()
+            mock_client.messages.create.side_effect = list(responses)
+            with patch("jaybrain.signalforge._get_anthropic_client", return_value=mock_client):
+                with patch("jaybrain.gdocs.create_google_doc", side_effect=Exception("no gdocs")):
+                    result = run_signalforge_synthesis(force=True)
+            return result, mock_client.messages.create.call_count
+
+        combine = _mock_anthropic_response(text="# Title\n\nBody.", input_tokens=300, output_tokens=150)
+        first, calls = _run(
+            _mock_anthropic_response(text="Cluster summary.", input_tokens=200, output_tokens=80),
+            combine,
+        )
+        assert calls == 2
+        assert first["reused_clusters"] == 0
+
+        # Same membership: only the combine step calls the model
+        second, calls = _run(combine)
+        assert calls == 1
+        assert second["reused_clusters"] == 1
+        assert second["tokens_saved"] == 280
+        assert second["input_tokens"] == 300
+
+        status = get_synthesis_status()
+        assert status["summary_reuse"]["memoized_summaries"] == 1
+        assert status["summary_reuse"]["total_reuses"] == 1
+        assert status["token_usage"]["total_tokens_saved"] == 280
+        assert status["recent_syntheses"][0]["reused_clusters"] == 1
+
+        # A new article in the cluster changes its membership hash
+        conn = get_connection()
+        _insert_knowledge_row(conn, "synth_kid_new", title="Late Article",
+                              embedding=_make_similar_vectors(1)[0])
+        insert_cluster_article(conn, "synth_c1", "synth_kid_new")
+        conn.close()
+        third, calls = _run(
+            _mock_anthropic_response(text="Updated summary.", input_tokens=220, output_tokens=90),
+            combine,
+        )
+        assert calls == 2
+        assert third["reused_clusters"] == 0
+
     def test_no_clusters_above_threshold(self, temp_data_dir):
         from jaybrain.signalforge import run_signalforge_synthesis
 
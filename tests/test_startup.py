@@ -0,0 +1,82 @@
+"""Tests for MCP server startup cost: init_db fast path and import budget."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import jaybrain.db as db
+from jaybrain.db import SCHEMA_VERSION, get_connection, init_db
+
+BENCH_SCRIPT = Path(__file__).parent.parent / "scripts" / "bench_startup.py"
+
+# Generous ceiling for a warm `import jaybrain.server` (currently ~1.5 s,
+# dominated by fastmcp and tool registration). Guards against gross
+# regressions such as loading the embedding model at import time.
+STARTUP_BUDGET_MS = 6000
+
+
+class TestSchemaFastPath:
+    def test_schema_version_matches_latest_migration(self):
+        init_db()
+        conn = get_connection()
+        try:
+            assert db._get_schema_version(conn) == SCHEMA_VERSION
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == db._schema_fingerprint()
+        finally:
+            conn.close()
+
+    def test_current_schema_skips_ddl(self, monkeypatch):
+        init_db()
+
+        def fail(conn):
+            raise AssertionError("migrations ran on a current schema")
+
+        monkeypatch.setattr(db, "_run_migrations", fail)
+        init_db()
+
+    def test_schema_change_triggers_full_init(self, monkeypatch):
+        init_db()
+        monkeypatch.setattr(
+            db, "SCHEMA_SQL", db.SCHEMA_SQL + "\nCREATE TABLE IF NOT EXISTS startup_probe (x);\n",
+        )
+        init_db()
+        conn = get_connection()
+        try:
+            assert conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'startup_probe'"
+            ).fetchone()
+        finally:
+            conn.close()
+
+    def test_unfingerprinted_database_is_migrated(self):
+        init_db()
+        conn = get_connection()
+        try:
+            conn.execute("PRAGMA user_version = 0")
+            conn.execute("DELETE FROM schema_version WHERE version = ?", (SCHEMA_VERSION,))
+            conn.commit()
+        finally:
+            conn.close()
+
+        init_db()
+        conn = get_connection()
+        try:
+            assert db._get_schema_version(conn) == SCHEMA_VERSION
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == db._schema_fingerprint()
+        finally:
+            conn.close()
+
+
+class TestStartupBudget:
+    def test_server_startup_is_lean(self, tmp_path):
+        proc = subprocess.run(
+            [sys.executable, str(BENCH_SCRIPT), "--runs", "2", "--json",
+             "--data-dir", str(tmp_path / "bench")],
+            capture_output=True, text=True, timeout=300,
+        )
+        assert proc.returncode == 0, proc.stderr
+        report = json.loads(proc.stdout)
+        assert report["first_call_ok"]
+        assert report["heavy_modules"] == []
+        assert report["warm"]["import_ms"] < STARTUP_BUDGET_MS
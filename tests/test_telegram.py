@@ -0,0 +1,229 @@
+"""Tests for the GramCracker Telegram bot's Claude tool loop.
+
+The Telegram and Anthropic clients are replaced with in-process fakes; the
+bot is built without GramCracker.__init__ so no tokens or network are needed.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+import jaybrain.telegram as tg
+from jaybrain.config import ensure_data_dirs
+from jaybrain.db import get_connection, init_db
+
+
+def _text(text):
+    return SimpleNamespace(type="text", text=text)
+
+
+def _tool_use(name, tool_id, inputs=None):
+    return SimpleNamespace(type="tool_use", name=name, id=tool_id, input=inputs or {})
+
+
+def _usage(inp=0, out=0, read=0, write=0):
+    return SimpleNamespace(
+        input_tokens=inp, output_tokens=out,
+        cache_read_input_tokens=read, cache_creation_input_tokens=write,
+    )
+
+
+class FakeStream:
+    def __init__(self, content, usage, deltas):
+        self._message = SimpleNamespace(content=content, usage=usage)
+        self.text_stream = iter(deltas)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def get_final_message(self):
+        return self._message
+
+
+class FakeMessages:
+    """Replays scripted responses and records every request."""
+
+    def __init__(self, responses):
+        self._responses = list(responses)
+        self.calls = []
+
+    def stream(self, **kwargs):
+        self.calls.append(kwargs)
+        content, usage, deltas = self._responses.pop(0)
+        return FakeStream(content, usage, deltas)
+
+
+class FakeAPI:
+    def __init__(self):
+        self.sent = []
+        self.edits = []
+
+    def send_message(self, chat_id, text):
+        self.sent.append(("md", text))
+        return {"message_id": len(self.sent)}
+
+    def send_message_plain(self, chat_id, text):
+        self.sent.append(("plain", text))
+        return {"message_id": len(self.sent)}
+
+    def edit_message_text(self, chat_id, message_id, text, markdown=False):
+        self.edits.append((message_id, text, markdown))
+        return {"message_id": message_id}
+
+    def send_chat_action(self, chat_id, action="typing"):
+        return {}
+
+
+def _make_bot(responses):
+    bot = tg.GramCracker.__new__(tg.GramCracker)
+    bot.api = FakeAPI()
+    bot.rate_limiter = tg.RateLimiter(max_calls=1000)
+    bot.claude = SimpleNamespace(messages=FakeMessages(responses))
+    bot._chat_id = 42
+    bot._tool_pool = ThreadPoolExecutor(max_workers=4)
+    return bot
+
+
+@pytest.fixture(autouse=True)
+def _reset_prompt_cache(monkeypatch):
+    ensure_data_dirs()
+    init_db()
+    tg.invalidate_system_prompt()
+    monkeypatch.setattr(tg, "_tool_definitions", None)
+    monkeypatch.setattr(tg, "TELEGRAM_STREAM_EDIT_INTERVAL", 0.0)
+    monkeypatch.setattr(tg, "TELEGRAM_STREAM_MIN_CHARS", 5)
+    yield
+    tg.invalidate_system_prompt()
+
+
+class TestToolExecution:
+    def test_reads_run_concurrently_in_order(self, monkeypatch):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake_execute(name, inputs):
+            barrier.wait()  # deadlocks unless all three run at once
+            return f"{name}:{inputs['n']}"
+
+        monkeypatch.setattr(tg, "_execute_tool", fake_execute)
+        bot = _make_bot([])
+        uses = [_tool_use("recall", f"t{i}", {"n": i}) for i in range(3)]
+        assert bot._execute_tool_calls(uses) == ["recall:0", "recall:1", "recall:2"]
+
+    def test_write_tools_are_barriers(self, monkeypatch):
+        events = []
+        lock = threading.Lock()
+
+        def fake_execute(name, inputs):
+            with lock:
+                events.append(("start", name))
+            time.sleep(0.02)
+            with lock:
+                events.append(("end", name))
+            return name
+
+        monkeypatch.setattr(tg, "_execute_tool", fake_execute)
+        bot = _make_bot([])
+        uses = [
+            _tool_use("forge_readiness", "a"),
+            _tool_use("forge_review", "b"),
+            _tool_use("forge_study", "c"),
+        ]
+        assert bot._execute_tool_calls(uses) == ["forge_readiness", "forge_review", "forge_study"]
+        review_start = events.index(("start", "forge_review"))
+        review_end = events.index(("end", "forge_review"))
+        assert events.index(("end", "forge_readiness")) < review_start
+        assert review_end < events.index(("start", "forge_study"))
+
+    def test_context_tools_invalidate_prompt(self, monkeypatch):
+        builds = []
+        monkeypatch.setattr(tg, "_build_system_prompt", lambda: builds.append(1) or "prompt")
+        monkeypatch.setattr(tg, "_execute_tool", lambda name, inputs: "ok")
+        bot = _make_bot([])
+
+        tg._get_system_prompt()
+        tg._get_system_prompt()
+        assert len(builds) == 1
+
+        bot._execute_tool_calls([_tool_use("recall", "a")])
+        tg._get_system_prompt()
+        assert len(builds) == 1
+
+        bot._execute_tool_calls([_tool_use("task_create", "b")])
+        tg._get_system_prompt()
+        assert len(builds) == 2
+
+
+class TestPromptCaching:
+    def test_system_prompt_ttl(self, monkeypatch):
+        builds = []
+        monkeypatch.setattr(tg, "_build_system_prompt", lambda: builds.append(1) or "prompt")
+        monkeypatch.setattr(tg, "TELEGRAM_SYSTEM_PROMPT_TTL", 0)
+        tg._get_system_prompt()
+        tg._get_system_prompt()
+        assert len(builds) == 2
+
+    def test_cache_breakpoints(self, monkeypatch):
+        monkeypatch.setattr(tg, "_build_system_prompt", lambda: "static prompt")
+        bot = _make_bot([([_text("hello there")], _usage(), ["hello there"])])
+        messages = [{"role": "user", "content": "hi"}]
+        bot._run_tool_loop(tg._system_blocks(), messages)
+
+        call = bot.claude.messages.calls[0]
+        assert call["tools"][-1]["cache_control"] == {"type": "ephemeral"}
+        assert all("cache_control" not in t for t in call["tools"][:-1])
+        assert call["system"][0]["text"] == "static prompt"
+        assert call["system"][0]["cache_control"] == {"type": "ephemeral"}
+        assert call["system"][1]["text"].startswith("Current time:")
+        assert "cache_control" not in call["system"][1]
+        assert call["messages"][-1]["content"][-1]["cache_control"] == {"type": "ephemeral"}
+        # The caller's history is not mutated
+        assert messages == [{"role": "user", "content": "hi"}]
+
+
+class TestClaudeResponse:
+    def test_streams_and_logs_usage(self, monkeypatch):
+        monkeypatch.setattr(tg, "_build_system_prompt", lambda: "prompt")
+        monkeypatch.setattr(tg, "_execute_tool", lambda name, inputs: '{"results": []}')
+        bot = _make_bot([
+            ([_text("Checking."), _tool_use("recall", "t1", {"query": "x"})],
+             _usage(100, 10, write=90), ["Checking."]),
+            ([_text("Nothing stored about that yet.")],
+             _usage(20, 8, read=90), ["Nothing stored", " about that yet."]),
+        ])
+
+        reply = bot._get_claude_response("what do you know about x?")
+
+        assert reply == "Nothing stored about that yet."
+        # One draft message, edited in place, finalized as Markdown
+        assert bot.api.sent == [("plain", "Checking.")]
+        assert bot.api.edits[-1] == (1, "Nothing stored about that yet.", True)
+
+        conn = get_connection()
+        try:
+            row = conn.execute(
+                "SELECT * FROM telegram_messages WHERE role = 'assistant'"
+            ).fetchone()
+        finally:
+            conn.close()
+        assert row["content"] == reply
+        assert row["input_tokens"] == 120
+        assert row["output_tokens"] == 18
+        assert row["cache_read_tokens"] == 90
+        assert row["cache_write_tokens"] == 90
+        assert row["tool_calls"] == 1
+        assert row["first_message_ms"] is not None
+        assert row["response_ms"] >= row["first_message_ms"]
+
+    def test_short_reply_sent_without_draft(self, monkeypatch):
+        monkeypatch.setattr(tg, "_build_system_prompt", lambda: "prompt")
+        monkeypatch.setattr(tg, "TELEGRAM_STREAM_MIN_CHARS", 40)
+        bot = _make_bot([([_text("Hi!")], _usage(5, 2), ["Hi!"])])
+        bot._get_claude_response("hello")
+        assert bot.api.sent == [("md", "Hi!")]
+        assert bot.api.edits == []
@@ -0,0 +1,180 @@
+"""Tests for MCP tool execution lanes, timeouts, cancellation and jobs."""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+import jaybrain.config as config
+from jaybrain import tool_exec
+
+
+@pytest.fixture(autouse=True)
+def fresh_lanes(monkeypatch):
+    monkeypatch.setattr(config, "TOOL_LANE_WORKERS", {"cpu": 1, "io": 4, "db": 2})
+    tool_exec.shutdown_lanes(wait=True)
+    yield
+    tool_exec.shutdown_lanes(wait=True)
+    tool_exec._jobs.clear()
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+class TestOffload:
+    def test_runs_off_the_event_loop(self):
+        @tool_exec.offload("io")
+        def slow(n: int) -> str:
+            time.sleep(0.2)
+            return json.dumps({"n": n, "thread": threading.current_thread().name})
+
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            t = asyncio.create_task(ticker())
+            start = time.monotonic()
+            results = await asyncio.gather(slow(1), slow(2), slow(3))
+            elapsed = time.monotonic() - start
+            t.cancel()
+            return results, elapsed, ticks
+
+        results, elapsed, ticks = asyncio.run(main())
+        assert [json.loads(r)["n"] for r in results] == [1, 2, 3]
+        assert all(json.loads(r)["thread"].startswith("tool-io") for r in results)
+        assert elapsed < 0.5  # ran in parallel
+        assert ticks > 5  # loop kept serving other work
+
+    def test_keeps_signature_and_doc(self):
+        def recall(query: str, limit: int = 10) -> str:
+            """Search memories."""
+            return query
+
+        wrapped = tool_exec.offload("cpu")(recall)
+        assert wrapped.__name__ == "recall"
+        assert wrapped.__doc__ == "Search memories."
+        import inspect
+        assert list(inspect.signature(wrapped).parameters) == ["query", "limit"]
+        assert inspect.iscoroutinefunction(wrapped)
+
+    def test_unknown_lane_rejected(self):
+        with pytest.raises(ValueError, match="Unknown tool lane"):
+            tool_exec.offload("gpu")(lambda: None)
+
+    def test_timeout_returns_error_and_signals_cancel(self, monkeypatch):
+        monkeypatch.setitem(config.TOOL_TIMEOUTS, "stuck", 0.1)
+        saw_cancel = threading.Event()
+
+        @tool_exec.offload("db")
+        def stuck() -> str:
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                if tool_exec.cancel_requested():
+                    saw_cancel.set()
+                    return "stopped"
+                time.sleep(0.01)
+            return "finished"
+
+        result = json.loads(asyncio.run(stuck()))
+        assert result == {"error": "stuck timed out after 0.1s", "timed_out": True}
+        assert saw_cancel.wait(2)
+        assert tool_exec.lane_stats()["db"]["timed_out"] == 1
+
+    def test_client_cancellation_drops_queued_call(self):
+        started = threading.Event()
+        release = threading.Event()
+        ran = []
+
+        def blocker():
+            started.set()
+            release.wait(5)
+
+        def queued():
+            ran.append(True)
+
+        async def main():
+            first = asyncio.create_task(tool_exec.run_in_lane("cpu", blocker))
+            await asyncio.sleep(0)
+            second = asyncio.create_task(tool_exec.run_in_lane("cpu", queued))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+            second.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await second
+            release.set()
+            await first
+
+        asyncio.run(main())
+        time.sleep(0.05)
+        assert ran == []
+        assert tool_exec.lane_stats()["cpu"]["cancelled"] == 1
+
+    def test_check_cancelled_is_noop_outside_tools(self):
+        tool_exec.check_cancelled()
+        assert tool_exec.cancel_requested() is False
+
+
+class TestJobs:
+    def test_job_runs_to_completion(self):
+        job = tool_exec.start_job("news_feed_poll", "io", lambda x: {"new": x}, 3)
+        assert job["status"] in ("queued", "running", "done")
+        _wait_for(lambda: tool_exec.get_job(job["job_id"])["status"] == "done")
+        done = tool_exec.get_job(job["job_id"])
+        assert done["result"] == {"new": 3}
+        assert done["tool"] == "news_feed_poll"
+        assert [j["job_id"] for j in tool_exec.list_jobs()] == [job["job_id"]]
+        assert "result" not in tool_exec.list_jobs()[0]
+
+    def test_job_error_recorded(self):
+        def boom():
+            raise RuntimeError("feed down")
+
+        job = tool_exec.start_job("news_feed_poll", "io", boom)
+        _wait_for(lambda: tool_exec.get_job(job["job_id"])["status"] == "error")
+        assert tool_exec.get_job(job["job_id"])["error"] == "feed down"
+
+    def test_cancel_running_job(self):
+        started = threading.Event()
+
+        def loop():
+            started.set()
+            for _ in range(500):
+                tool_exec.check_cancelled()
+                time.sleep(0.01)
+            return "finished"
+
+        job = tool_exec.start_job("signalforge_synthesize", "io", loop)
+        assert started.wait(5)
+        assert tool_exec.cancel_job(job["job_id"])["status"] == "cancelling"
+        _wait_for(lambda: tool_exec.get_job(job["job_id"])["status"] == "cancelled")
+
+    def test_cancel_queued_job(self):
+        release = threading.Event()
+        tool_exec.start_job("forge_reembed", "cpu", release.wait, 5)
+        queued = tool_exec.start_job("forge_reembed", "cpu", lambda: "never")
+        assert tool_exec.cancel_job(queued["job_id"])["status"] == "cancelled"
+        release.set()
+        assert tool_exec.get_job(queued["job_id"])["result"] is None
+
+    def test_unknown_job(self):
+        assert tool_exec.get_job("missing") is None
+        assert tool_exec.cancel_job("missing") is None
+
+    def test_finished_jobs_pruned(self, monkeypatch):
+        monkeypatch.setattr(config, "TOOL_JOB_MAX_FINISHED", 2)
+        ids = []
+        for i in range(4):
+            job = tool_exec.start_job("t", "db", lambda v=i: v)
+            _wait_for(lambda j=job: tool_exec.get_job(j["job_id"])["status"] == "done")
+            ids.append(job["job_id"])
+        assert {j["job_id"] for j in tool_exec.list_jobs()} == set(ids[2:])
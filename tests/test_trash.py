@@ -2,6 +2,9 @@
 
 import os
 import shutil
+import subprocess
+import sys
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from unittest.mock import patch
@@ -11,7 +14,9 @@ import pytest
 from jaybrain.config import TRASH_DIR, ensure_data_dirs
 from jaybrain.db import get_connection, init_db
 from jaybrain.trash import (
+    _PatternSet,
     _categorize_file,
+    _matches_any_pattern,
     _sha256,
     list_trash,
     restore_file,
@@ -28,6 +33,21 @@ def _setup(temp_data_dir):
     init_db()
 
 
+def _git_repo(path: Path, gitignore: str = "", tracked: tuple = ()) -> Path:
+    """Create a real git repo at path with a .gitignore and tracked files."""
+    path.mkdir(parents=True, exist_ok=True)
+    subprocess.run(["git", "init", "-q"], cwd=path, check=True)
+    if gitignore:
+        (path / ".gitignore").write_text(gitignore)
+    for rel in tracked:
+        f = path / rel
+        f.parent.mkdir(parents=True, exist_ok=True)
+        if not f.exists():
+            f.write_bytes(b"\x00" * 10)
+        subprocess.run(["git", "add", "-f", rel], cwd=path, check=True)
+    return path
+
+
 class TestHelpers:
     def test_sha256_file(self, temp_data_dir):
         _setup(temp_data_dir)
@@ -323,37 +343,113 @@ class TestScanFiles:
 
     def test_scan_finds_pycache(self, temp_data_dir):
         _setup(temp_data_dir)
-        project = temp_data_dir / "myproject"
-        project.mkdir()
+        project = _git_repo(temp_data_dir / "myproject", gitignore="__pycache__/\n*.pyc\n")
         cache = project / "__pycache__"
         cache.mkdir()
         (cache / "mod.cpython-313.pyc").write_bytes(b"\x00" * 50)
 
-        # Mock: not tracked, is ignored
-        with patch("jaybrain.trash._find_git_root", return_value=project):
-            with patch("jaybrain.trash._is_git_tracked", return_value=False):
-                with patch("jaybrain.trash._is_git_ignored", return_value=True):
-                    result = scan_files(scan_dirs=[project])
+        result = scan_files(scan_dirs=[project])
 
         assert result["auto_count"] >= 1
         categories = [i["category"] for i in result["auto"]]
         assert "bytecode" in categories
 
+    def test_tracked_and_unignored_files_not_auto(self, temp_data_dir):
+        _setup(temp_data_dir)
+        project = _git_repo(
+            temp_data_dir / "myproject",
+            gitignore="*.pyc\n!keep.pyc\n",
+            tracked=("pkg/tracked.pyc",),
+        )
+        (project / "pkg" / "junk.pyc").write_bytes(b"\x00" * 5)
+        (project / "pkg" / "keep.pyc").write_bytes(b"\x00" * 5)
+
+        result = scan_files(scan_dirs=[project])
+
+        auto_paths = {Path(i["path"]).name for i in result["auto"]}
+        assert auto_paths == {"junk.pyc"}  # tracked and negated files are kept
+        assert result["git_repos"] == 1
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="shell-script git wrapper")
+    def test_hung_check_ignore_times_out(self, temp_data_dir, monkeypatch):
+        _setup(temp_data_dir)
+        project = _git_repo(temp_data_dir / "myproject", gitignore="*.pyc\n")
+        (project / "x.pyc").write_bytes(b"\x00")
+        # A git whose check-ignore never answers (stuck on a lock or hook).
+        bin_dir = temp_data_dir / "bin"
+        bin_dir.mkdir()
+        wrapper = bin_dir / "git"
+        wrapper.write_text(
+            "#!/bin/sh\n"
+            '[ "$1" = check-ignore ] && exec sleep 30\n'
+            f'exec "{shutil.which("git")}" "$@"\n'
+        )
+        wrapper.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+        monkeypatch.setattr("jaybrain.trash._GIT_TIMEOUT", 0.3)
+
+        start = time.monotonic()
+        result = scan_files(scan_dirs=[project])
+
+        assert time.monotonic() - start < 10
+        assert result["auto_count"] == 0  # unknown git status keeps files out
+
+    def test_nested_repos_use_their_own_git_status(self, temp_data_dir):
+        _setup(temp_data_dir)
+        projects = temp_data_dir / "projects"
+        projects.mkdir()
+        repo_a = _git_repo(projects / "a", gitignore="*.pyc\n")
+        repo_b = _git_repo(projects / "b", tracked=("mod.pyc",))
+        (repo_a / "x.pyc").write_bytes(b"\x00")
+
+        result = scan_files(scan_dirs=[projects])
+
+        auto_paths = {i["path"] for i in result["auto"]}
+        assert str(repo_a / "x.pyc") in auto_paths
+        assert str(repo_b / "mod.pyc") not in auto_paths
+        assert result["git_repos"] == 2
+
+    def test_reports_throughput(self, temp_data_dir):
+        _setup(temp_data_dir)
+        project = temp_data_dir / "myproject"
+        for i in range(20):
+            d = project / f"d{i % 4}"
+            d.mkdir(parents=True, exist_ok=True)
+            (d / f"f{i}.txt").write_text("x")
+
+        result = scan_files(scan_dirs=[project])
+
+        assert result["files_scanned"] == 20
+        assert result["files_per_sec"] > 0
+        assert result["scan_seconds"] >= 0
+
+    def test_pattern_set_matches_fnmatch_semantics(self):
+        from jaybrain.config import TRASH_AUTO_PATTERNS, TRASH_PROTECTED_PATTERNS, TRASH_SUSPECT_PATTERNS
+
+        base = Path("/proj")
+        samples = [
+            "null", "a/null", "__pycache__", "a/__pycache__", "a/b/mod.pyc", "mod.pyc",
+            ".env", "a/.env", "a/node_modules/x/y.js", "a/.git/config", "LICENSE.md",
+            "a/LICENSE", "x.tmp", "a/b/c.bak", "a/Thumbs.db", "pkg.egg-info", "a/pkg.egg-info",
+            "a/.coverage.123", "readme.txt",
+        ]
+        for patterns in (TRASH_AUTO_PATTERNS, TRASH_PROTECTED_PATTERNS, TRASH_SUSPECT_PATTERNS):
+            compiled = _PatternSet(patterns)
+            for rel in samples:
+                path = base / rel
+                assert compiled.matches(rel, path.name) == _matches_any_pattern(path, patterns, base), rel
+
 
 class TestRunAutoCleanup:
     def test_auto_cleanup_scan_finds_pycache(self, temp_data_dir):
         """Verify scan detects __pycache__ dirs as auto-trashable."""
         _setup(temp_data_dir)
-        project = temp_data_dir / "myproject"
-        project.mkdir()
+        project = _git_repo(temp_data_dir / "myproject", gitignore="__pycache__/\n")
         cache = project / "__pycache__"
         cache.mkdir()
         (cache / "mod.cpython-313.pyc").write_bytes(b"\x00" * 50)
 
-        with patch("jaybrain.trash._find_git_root", return_value=project):
-            with patch("jaybrain.trash._is_git_tracked", return_value=False):
-                with patch("jaybrain.trash._is_git_ignored", return_value=True):
-                    scan = scan_files(scan_dirs=[project])
+        scan = scan_files(scan_dirs=[project])
 
         assert scan["auto_count"] >= 1
         categories = [i["category"] for i in scan["auto"]]
@@ -377,14 +473,12 @@ class TestRunAutoCleanup:
 
     def test_auto_cleanup_skips_tracked(self, temp_data_dir):
         _setup(temp_data_dir)
-        project = temp_data_dir / "myproject"
-        project.mkdir()
+        project = _git_repo(
+            temp_data_dir / "myproject", gitignore="*.pyc\n", tracked=("important.pyc",),
+        )
         f = project / "important.pyc"
-        f.write_bytes(b"\x00" * 50)
 
-        with patch("jaybrain.trash._find_git_root", return_value=project):
-            with patch("jaybrain.trash._is_git_tracked", return_value=True):
-                scan = scan_files(scan_dirs=[project])
+        scan = scan_files(scan_dirs=[project])
 
         # Tracked files should not appear in auto list
         assert scan["auto_count"] == 0
@@ -0,0 +1,130 @@
+"""Tests for the optional single-writer coordinator."""
+
+import pytest
+
+import jaybrain.config as config
+from jaybrain import writer
+from jaybrain.db import get_connection, init_db, insert_memory
+
+
+def _insert_note(conn, note_id, fail=False):
+    conn.execute(
+        "INSERT INTO consolidation_log (id, action, source_memory_ids, created_at) "
+        "VALUES (?, 'archive', '[]', '2026-01-01T00:00:00+00:00')",
+        (note_id,),
+    )
+    if fail:
+        raise RuntimeError("boom")
+    conn.commit()
+    return note_id
+
+
+def _log_ids():
+    conn = get_connection()
+    try:
+        return {r["id"] for r in conn.execute("SELECT id FROM consolidation_log")}
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def coordinator(monkeypatch):
+    """Writer on, with a wide batch window so submissions group reliably."""
+    init_db()
+    monkeypatch.setattr(config, "WRITER_ENABLED", True)
+    monkeypatch.setattr(config, "WRITER_BATCH_WINDOW_MS", 100.0)
+    monkeypatch.setattr(writer, "_coordinator", None)
+    yield writer.get_coordinator()
+    writer.shutdown()
+
+
+class TestWriteCoordinator:
+    def test_group_commits_async_ops(self, coordinator):
+        for i in range(20):
+            writer.submit(_insert_note, f"n{i}", durability="async")
+        writer.flush(timeout=10)
+
+        assert _log_ids() == {f"n{i}" for i in range(20)}
+        s = writer.stats()
+        assert s["ops"] == 20
+        assert s["batches"] < 20
+        assert s["max_batch_size"] > 1
+        assert s["commit_ms"]["p50"] is not None
+        assert s["queue_depth"] == 0 and s["running"]
+
+    def test_failing_op_is_isolated(self, coordinator):
+        ok1 = writer.submit(_insert_note, "a")
+        bad = writer.submit(_insert_note, "b", fail=True)
+        ok2 = writer.submit(_insert_note, "c")
+
+        assert ok1.result(10) == "a" and ok2.result(10) == "c"
+        with pytest.raises(RuntimeError, match="boom"):
+            bad.result(10)
+        assert _log_ids() == {"a", "c"}
+        assert writer.stats()["failed_ops"] == 1
+
+    def test_sync_write_is_visible_to_caller(self, coordinator):
+        conn = get_connection()
+        try:
+            assert writer.write(conn, _insert_note, "s1") == "s1"
+            row = conn.execute("SELECT id FROM consolidation_log WHERE id = 's1'").fetchone()
+        finally:
+            conn.close()
+        assert row is not None
+        assert writer.stats()["ops"] == 1
+
+    def test_open_transaction_runs_inline(self, coordinator):
+        conn = get_connection()
+        try:
+            conn.execute(
+                "INSERT INTO consolidation_log (id, action, source_memory_ids, created_at) "
+                "VALUES ('t0', 'archive', '[]', '2026-01-01')"
+            )
+            writer.write(conn, _insert_note, "t1")  # would deadlock if queued
+        finally:
+            conn.close()
+        assert writer.stats()["ops"] == 0
+
+    def test_async_errors_are_counted_not_raised(self, coordinator):
+        assert writer.write(None, _insert_note, "e", fail=True, durability="async") is None
+        writer.flush(timeout=10)
+        assert writer.stats()["async_errors"] == 1
+        assert _log_ids() == set()
+
+    def test_unknown_durability(self, coordinator):
+        with pytest.raises(ValueError, match="Unknown durability"):
+            writer.submit(_insert_note, "x", durability="eventually")
+
+    def test_reinforce_goes_through_writer(self, coordinator):
+        from jaybrain.memory import reinforce
+
+        conn = get_connection()
+        try:
+            insert_memory(conn, "m1", "writer test", "semantic", [], 0.5)
+        finally:
+            conn.close()
+        memory = reinforce("m1")
+        assert memory.access_count == 1
+        assert writer.stats()["ops"] == 1
+
+
+class TestDisabled:
+    def test_write_runs_inline_without_thread(self, monkeypatch):
+        init_db()
+        monkeypatch.setattr(writer, "_coordinator", None)
+        assert writer.write(None, _insert_note, "d1") == "d1"
+        assert _log_ids() == {"d1"}
+        assert writer._coordinator is None
+        assert writer.stats() == {"enabled": False, "running": False, "queue_depth": 0}
+
+
+class TestDaemonStatus:
+    def test_heartbeat_reports_writer_stats(self, coordinator):
+        from jaybrain.daemon import DaemonManager, get_daemon_status
+
+        writer.write(None, _insert_note, "h1")
+        DaemonManager()._write_heartbeat()
+
+        status = get_daemon_status()
+        assert status["writer"]["ops"] == 1
+        assert {"queue_depth", "batches", "avg_batch_size", "commit_ms"} <= set(status["writer"])